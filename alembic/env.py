@@ -64,6 +64,19 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Monthly partitions of these tables are created and archived at runtime by
+# AuditPartitionManager, so autogenerate must not try to drop them
+PARTITIONED_AUDIT_TABLES = ("audit_logs", "phi_access_logs")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Exclude audit table partitions from autogenerate comparisons."""
+    if type_ == "table" and reflected and compare_to is None:
+        for parent in PARTITIONED_AUDIT_TABLES:
+            if name == f"{parent}_default" or name.startswith(f"{parent}_y"):
+                return False
+    return True
+
 def get_database_url():
     """Get database URL from settings."""
     settings = get_settings()
@@ -91,6 +104,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -118,7 +132,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,56 @@
+"""Add blind index columns and name token table for encrypted patient search
+
+Revision ID: add_patient_blind_indexes
+Revises: add_immunization_series_fields
+Create Date: 2025-08-10 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_patient_blind_indexes'
+down_revision = 'add_immunization_series_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add HMAC blind index columns to patients and the patient_search_tokens table."""
+    op.add_column('patients', sa.Column('mrn_bidx', sa.String(length=64), nullable=True, comment='HMAC blind index of normalized MRN'))
+    op.add_column('patients', sa.Column('date_of_birth_bidx', sa.String(length=64), nullable=True, comment='HMAC blind index of ISO date of birth'))
+    op.add_column('patients', sa.Column('phone_bidx', sa.String(length=64), nullable=True, comment='HMAC blind index of normalized phone number'))
+    op.add_column('patients', sa.Column('blind_index_version', sa.Integer(), nullable=True, comment='Blind index scheme version, NULL until backfilled'))
+
+    op.create_index(op.f('ix_patients_mrn_bidx'), 'patients', ['mrn_bidx'], unique=False)
+    op.create_index(op.f('ix_patients_date_of_birth_bidx'), 'patients', ['date_of_birth_bidx'], unique=False)
+    op.create_index(op.f('ix_patients_phone_bidx'), 'patients', ['phone_bidx'], unique=False)
+
+    op.create_table('patient_search_tokens',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('patient_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('field', sa.String(length=32), nullable=False),
+        sa.Column('token_bidx', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_patient_search_tokens_lookup', 'patient_search_tokens', ['token_bidx', 'field', 'patient_id'], unique=False)
+    op.create_index('idx_patient_search_tokens_patient', 'patient_search_tokens', ['patient_id', 'field'], unique=False)
+
+
+def downgrade():
+    """Remove blind index columns and the patient_search_tokens table."""
+    op.drop_index('idx_patient_search_tokens_patient', table_name='patient_search_tokens')
+    op.drop_index('idx_patient_search_tokens_lookup', table_name='patient_search_tokens')
+    op.drop_table('patient_search_tokens')
+
+    op.drop_index(op.f('ix_patients_phone_bidx'), table_name='patients')
+    op.drop_index(op.f('ix_patients_date_of_birth_bidx'), table_name='patients')
+    op.drop_index(op.f('ix_patients_mrn_bidx'), table_name='patients')
+
+    op.drop_column('patients', 'blind_index_version')
+    op.drop_column('patients', 'phone_bidx')
+    op.drop_column('patients', 'date_of_birth_bidx')
+    op.drop_column('patients', 'mrn_bidx')
@@ -0,0 +1,50 @@
+"""Add composite (sort key, id) indexes for keyset pagination
+
+Revision ID: add_keyset_pagination_indexes
+Revises: add_patient_blind_indexes
+Create Date: 2025-08-11 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_keyset_pagination_indexes'
+down_revision = 'add_patient_blind_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - each serves ORDER BY sort_key, id in both
+# directions plus the (sort_key, id) < (:k, :id) seek of the next page
+KEYSET_INDEXES = [
+    ('idx_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id']),
+    ('idx_document_storage_uploaded_at_id', 'document_storage', ['uploaded_at', 'id']),
+    ('idx_patients_created_at_id', 'patients', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    """Create keyset pagination indexes without blocking writes."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in KEYSET_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade():
+    """Drop keyset pagination indexes."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(KEYSET_INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
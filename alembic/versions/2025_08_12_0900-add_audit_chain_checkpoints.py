@@ -0,0 +1,40 @@
+"""Add audit_chain_checkpoints table for incremental audit chain verification
+
+Revision ID: add_audit_chain_checkpoints
+Revises: add_keyset_pagination_indexes
+Create Date: 2025-08-12 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_audit_chain_checkpoints'
+down_revision = 'add_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the signed audit chain checkpoint table."""
+    op.create_table('audit_chain_checkpoints',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('chain_name', sa.String(length=100), nullable=False),
+        sa.Column('last_log_id', postgresql.UUID(as_uuid=True), nullable=False, comment='Last verified audit_logs.id'),
+        sa.Column('last_timestamp', sa.DateTime(), nullable=False, comment='Timestamp of the last verified row'),
+        sa.Column('last_log_hash', sa.String(length=64), nullable=False, comment='Chain head hash at the checkpoint'),
+        sa.Column('records_verified', sa.BigInteger(), nullable=False),
+        sa.Column('signature', sa.String(length=64), nullable=False, comment='HMAC-SHA256 over the checkpoint fields'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_audit_chain_checkpoints_chain_created', 'audit_chain_checkpoints', ['chain_name', 'created_at'], unique=False)
+
+
+def downgrade():
+    """Drop the audit chain checkpoint table."""
+    op.drop_index('idx_audit_chain_checkpoints_chain_created', table_name='audit_chain_checkpoints')
+    op.drop_table('audit_chain_checkpoints')
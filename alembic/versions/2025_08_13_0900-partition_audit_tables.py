@@ -0,0 +1,127 @@
+"""Partition audit_logs and phi_access_logs by month
+
+Revision ID: partition_audit_tables
+Revises: add_audit_chain_checkpoints
+Create Date: 2025-08-13 09:00:00.000000
+
+Rebuilds both tables as RANGE-partitioned parents with one partition per
+month from the oldest row through MONTHS_AHEAD months from now, plus a
+DEFAULT partition. The partition key joins the primary key, as PostgreSQL
+requires. Secondary indexes and foreign keys are carried over. Later months
+are created by the audit maintenance task (AuditPartitionManager).
+
+The rows are copied once, so run this in a maintenance window sized to the
+current table.
+"""
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_audit_tables'
+down_revision = 'add_audit_chain_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+# (table, partition key column)
+PARTITIONED_TABLES = [
+    ('audit_logs', 'timestamp'),
+    ('phi_access_logs', 'access_started_at'),
+]
+MONTHS_AHEAD = 3
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_bound(month):
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def _capture_dependents(bind, table):
+    """Secondary (non-unique) index definitions and foreign keys of a table."""
+    index_defs = bind.execute(
+        sa.text(
+            "SELECT i.indexdef FROM pg_indexes i "
+            "WHERE i.schemaname = current_schema() AND i.tablename = :table_name "
+            "AND i.indexname NOT IN ("
+            "  SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table_name) AND contype IN ('p', 'u')"
+            ") AND i.indexdef NOT LIKE 'CREATE UNIQUE%'"
+        ),
+        {"table_name": table}
+    ).scalars().all()
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table_name) AND contype = 'f'"
+        ),
+        {"table_name": table}
+    ).all()
+    return index_defs, foreign_keys
+
+
+def _restore_dependents(table, index_defs, foreign_keys):
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+    for index_def in index_defs:
+        op.execute(index_def)
+
+
+def upgrade():
+    """Rebuild the audit tables as monthly range-partitioned tables."""
+    bind = op.get_bind()
+    current_month = datetime.now(timezone.utc).date().replace(day=1)
+
+    for table, key in PARTITIONED_TABLES:
+        index_defs, foreign_keys = _capture_dependents(bind, table)
+        legacy = f"{table}_unpartitioned"
+
+        op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        op.execute(f'UPDATE "{legacy}" SET "{key}" = COALESCE(created_at, now()) WHERE "{key}" IS NULL')
+        op.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ("{key}")'
+        )
+        op.execute(f'ALTER TABLE "{table}" ALTER COLUMN "{key}" SET NOT NULL')
+
+        oldest = bind.execute(sa.text(f'SELECT min("{key}") FROM "{legacy}"')).scalar()
+        month = oldest.date().replace(day=1) if oldest else current_month
+        last_month = _add_months(current_month, MONTHS_AHEAD)
+        while month <= last_month:
+            op.execute(
+                f'CREATE TABLE "{table}_y{month.year:04d}m{month.month:02d}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ({_month_bound(month)}) TO ({_month_bound(_add_months(month, 1))})"
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+        op.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        op.execute(f'DROP TABLE "{legacy}"')
+
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY ("{key}", id)')
+        _restore_dependents(table, index_defs, foreign_keys)
+
+
+def downgrade():
+    """Rebuild the audit tables as plain tables keyed on id."""
+    bind = op.get_bind()
+
+    for table, key in reversed(PARTITIONED_TABLES):
+        index_defs, foreign_keys = _capture_dependents(bind, table)
+        partitioned = f"{table}_partitioned"
+
+        op.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+        op.execute(
+            f'CREATE TABLE "{table}" (LIKE "{partitioned}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING STORAGE INCLUDING COMMENTS)'
+        )
+        op.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+        op.execute(f'DROP TABLE "{partitioned}" CASCADE')
+
+        op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id)')
+        _restore_dependents(table, index_defs, foreign_keys)
@@ -0,0 +1,37 @@
+"""Add siem_export_cursors table for resumable streaming SIEM exports
+
+Revision ID: add_siem_export_cursors
+Revises: partition_audit_tables
+Create Date: 2025-08-14 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_siem_export_cursors'
+down_revision = 'partition_audit_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the SIEM export high-water mark table."""
+    op.create_table('siem_export_cursors',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('export_name', sa.String(length=100), nullable=False),
+        sa.Column('last_timestamp', sa.DateTime(), nullable=True, comment='Timestamp of the last delivered audit_logs row'),
+        sa.Column('last_log_id', postgresql.UUID(as_uuid=True), nullable=True, comment='id of the last delivered audit_logs row'),
+        sa.Column('events_exported', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('export_name', name='uq_siem_export_cursors_export_name')
+    )
+
+
+def downgrade():
+    """Drop the SIEM export high-water mark table."""
+    op.drop_table('siem_export_cursors')
@@ -0,0 +1,87 @@
+"""Add event_store and event_outbox tables for the HybridEventBus outbox relay
+
+Revision ID: add_event_store_and_outbox
+Revises: add_siem_export_cursors
+Create Date: 2025-08-15 09:00:00.000000
+
+The outbox relay claims rows through each aggregate's oldest pending row,
+found with idx_event_outbox_aggregate_pending. A statement-level insert
+trigger NOTIFYs the relay's LISTEN connection so it does not have to poll.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_event_store_and_outbox'
+down_revision = 'add_siem_export_cursors'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the event store, the outbox and its NOTIFY trigger."""
+    op.create_table('event_store',
+        sa.Column('sequence', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column('event_id', sa.String(length=64), nullable=False),
+        sa.Column('aggregate_id', sa.String(length=255), nullable=False),
+        sa.Column('aggregate_type', sa.String(length=100), nullable=False),
+        sa.Column('event_type', sa.String(length=255), nullable=False),
+        sa.Column('event_class', sa.String(length=255), nullable=False, comment='module:QualName the event is rebuilt as'),
+        sa.Column('event_version', sa.Integer(), nullable=False),
+        sa.Column('event_data', sa.JSON(), nullable=False),
+        sa.Column('correlation_id', sa.String(length=64), nullable=True),
+        sa.Column('causation_id', sa.String(length=64), nullable=True),
+        sa.Column('checksum', sa.String(length=64), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sequence'),
+        sa.UniqueConstraint('event_id', name='uq_event_store_event_id')
+    )
+    op.create_index('idx_event_store_aggregate_sequence', 'event_store', ['aggregate_id', 'sequence'])
+
+    op.create_table('event_outbox',
+        sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False, comment='Delivery order'),
+        sa.Column('event_id', sa.String(length=64), nullable=False),
+        sa.Column('aggregate_id', sa.String(length=255), nullable=False),
+        sa.Column('event_type', sa.String(length=255), nullable=False),
+        sa.Column('event_class', sa.String(length=255), nullable=False),
+        sa.Column('event_data', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('available_at', sa.DateTime(), nullable=False, server_default=sa.text("(now() AT TIME ZONE 'utc')")),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_event_outbox_claim', 'event_outbox', ['status', 'available_at', 'id'])
+    op.create_index(
+        'idx_event_outbox_aggregate_pending', 'event_outbox', ['aggregate_id', 'id'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_event_outbox() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('event_outbox', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER event_outbox_notify
+        AFTER INSERT ON event_outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_event_outbox()
+    """)
+
+
+def downgrade():
+    """Drop the outbox, its trigger and the event store."""
+    op.execute("DROP TRIGGER IF EXISTS event_outbox_notify ON event_outbox")
+    op.execute("DROP FUNCTION IF EXISTS notify_event_outbox()")
+    op.drop_index('idx_event_outbox_aggregate_pending', table_name='event_outbox')
+    op.drop_index('idx_event_outbox_claim', table_name='event_outbox')
+    op.drop_table('event_outbox')
+    op.drop_index('idx_event_store_aggregate_sequence', table_name='event_store')
+    op.drop_table('event_store')
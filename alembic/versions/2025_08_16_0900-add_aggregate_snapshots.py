@@ -0,0 +1,39 @@
+"""Add aggregate_snapshots table for snapshot-based event replay
+
+Revision ID: add_aggregate_snapshots
+Revises: add_event_store_and_outbox
+Create Date: 2025-08-16 09:00:00.000000
+
+One row per (aggregate, projection) holding the compressed folded state
+and the event_store sequence it covers; replay reads only later events.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_aggregate_snapshots'
+down_revision = 'add_event_store_and_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the aggregate snapshot table."""
+    op.create_table('aggregate_snapshots',
+        sa.Column('aggregate_id', sa.String(length=255), nullable=False),
+        sa.Column('projection', sa.String(length=100), nullable=False),
+        sa.Column('aggregate_type', sa.String(length=100), nullable=False),
+        sa.Column('schema_version', sa.Integer(), nullable=False, comment='Projection state schema; other versions are ignored'),
+        sa.Column('aggregate_version', sa.BigInteger(), nullable=False, comment='Events folded into the state'),
+        sa.Column('last_sequence', sa.BigInteger(), nullable=False, comment='event_store sequence of the last folded event'),
+        sa.Column('state_codec', sa.String(length=20), nullable=False),
+        sa.Column('state', sa.LargeBinary(), nullable=False, comment='zlib-compressed codec bytes'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('aggregate_id', 'projection')
+    )
+
+
+def downgrade():
+    """Drop the aggregate snapshot table."""
+    op.drop_table('aggregate_snapshots')
@@ -0,0 +1,31 @@
+"""Record the chain sequence number in audit chain checkpoints
+
+Revision ID: add_chain_checkpoint_sequence
+Revises: add_aggregate_snapshots
+Create Date: 2025-08-17 09:00:00.000000
+
+The audit chain is walked in audit_logs.sequence_number order, so
+checkpoints resume from a sequence number. Existing checkpoints keep NULL
+and are ignored, forcing one full verification.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_chain_checkpoint_sequence'
+down_revision = 'add_aggregate_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the checkpoint sequence number column."""
+    op.add_column('audit_chain_checkpoints',
+        sa.Column('last_sequence_number', sa.BigInteger(), nullable=True, comment='audit_logs.sequence_number of the last verified row')
+    )
+
+
+def downgrade():
+    """Drop the checkpoint sequence number column."""
+    op.drop_column('audit_chain_checkpoints', 'last_sequence_number')
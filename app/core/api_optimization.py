@@ -52,6 +52,8 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.compression import CompressionMiddleware
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.core.cache_invalidation import TagInvalidator
+
 try:
     import redis.asyncio as aioredis
     import redis
@@ -260,6 +262,15 @@ class InMemoryCache:
             self.hit_count = 0
             self.miss_count = 0
     
+    def evict(self, keys: Optional[List[str]]):
+        """Drop the given keys, or everything for None (invalidation listener)"""
+        if keys is None:
+            self.clear()
+            return
+        with self.lock:
+            for key in keys:
+                self.delete(key)
+    
     def invalidate_by_tags(self, tags: List[str]):
         """Invalidate cache entries by tags"""
         with self.lock:
@@ -296,11 +307,13 @@ class InMemoryCache:
             self.cache.pop(lru_key, None)
 
 class RedisCache:
-    """Redis-based distributed cache"""
+    """Redis-based distributed cache with a tag index shared by all workers"""
     
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, on_invalidate: Optional[Callable[[Optional[List[str]]], None]] = None):
         self.redis_url = redis_url
         self.redis_client = None
+        self.invalidator: Optional[TagInvalidator] = None
+        self.on_invalidate = on_invalidate
         self._initialized = False
     
     async def _ensure_connected(self):
@@ -316,6 +329,11 @@ class RedisCache:
                 )
                 # Test connection
                 await self.redis_client.ping()
+                self.invalidator = TagInvalidator(self.redis_client)
+                if self.on_invalidate:
+                    # Tag invalidations on other workers evict this worker's memory copies
+                    self.invalidator.add_listener(self.on_invalidate)
+                    await self.invalidator.start()
                 self._initialized = True
                 logger.info("API_CACHE - Redis cache connected", url=self.redis_url.split('@')[0] + '@***')
             except Exception as e:
@@ -347,14 +365,9 @@ class RedisCache:
         
         try:
             value_json = json.dumps(value)
-            await self.redis_client.setex(key, ttl, value_json)
+            # Value and tag set membership are written atomically
+            await self.invalidator.store(key, value_json, ttl, tags or [])
             
-            # Store tags for invalidation
-            if tags:
-                for tag in tags:
-                    await self.redis_client.sadd(f"tag:{tag}", key)
-                    await self.redis_client.expire(f"tag:{tag}", ttl)
-                    
         except Exception as e:
             logger.debug("API_CACHE - Redis put failed", key=key, error=str(e))
     
@@ -380,11 +393,7 @@ class RedisCache:
             return
         
         try:
-            for tag in tags:
-                keys = await self.redis_client.smembers(f"tag:{tag}")
-                if keys:
-                    await self.redis_client.delete(*keys)
-                    await self.redis_client.delete(f"tag:{tag}")
+            await self.invalidator.invalidate(tags)
         except Exception as e:
             logger.debug("API_CACHE - Redis tag invalidation failed", tags=tags, error=str(e))
 
@@ -397,7 +406,7 @@ class HybridCache:
         self.redis_cache = None
         
         if config.redis_url and REDIS_AVAILABLE:
-            self.redis_cache = RedisCache(config.redis_url)
+            self.redis_cache = RedisCache(config.redis_url, on_invalidate=self.memory_cache.evict)
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from hybrid cache (memory first, then Redis)"""
@@ -31,9 +31,9 @@ import hashlib
 import hmac
 import secrets
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union, Tuple, Set
+from typing import Callable, Dict, List, Optional, Any, Union, Tuple, Set
 from enum import Enum, auto
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, replace
 from abc import ABC, abstractmethod
 import structlog
 import uuid
@@ -140,89 +140,235 @@ class IntegrityAlert:
     investigation_required: bool
     alert_escalated: bool = False
 
-class MerkleTree:
-    """Merkle tree implementation for batch audit log verification"""
+MERKLE_LEAF_PREFIX = b"\x00"
+MERKLE_NODE_PREFIX = b"\x01"
+MERKLE_HASH_SIZE = 32
+EMPTY_MERKLE_ROOT = hashlib.sha256(b"").digest()
+
+def hash_merkle_leaf(data: bytes) -> bytes:
+    """RFC 6962 leaf hash (domain-separated from interior nodes)"""
+    return hashlib.sha256(MERKLE_LEAF_PREFIX + data).digest()
+
+def hash_merkle_node(left: bytes, right: bytes) -> bytes:
+    """RFC 6962 interior node hash"""
+    return hashlib.sha256(MERKLE_NODE_PREFIX + left + right).digest()
+
+def _largest_power_of_two_below(n: int) -> int:
+    return 1 << ((n - 1).bit_length() - 1)
+
+@dataclass(frozen=True)
+class SignedTreeHead:
+    """Signed Merkle root for a tree size, used to prove later append-only growth"""
+    tree_size: int
+    root_hash: str
+    timestamp: datetime
+    signature: Optional[str]
     
-    def __init__(self):
-        self.leaves: List[bytes] = []
-        self.tree: List[List[bytes]] = []
-        self.root_hash: Optional[bytes] = None
-    
-    def add_leaf(self, data: bytes):
-        """Add leaf to Merkle tree"""
-        leaf_hash = hashlib.sha256(data).digest()
-        self.leaves.append(leaf_hash)
-        self._rebuild_tree()
-    
-    def _rebuild_tree(self):
-        """Rebuild Merkle tree from leaves"""
-        if not self.leaves:
-            self.root_hash = None
-            return
-        
-        current_level = self.leaves.copy()
-        self.tree = [current_level.copy()]
-        
-        while len(current_level) > 1:
-            next_level = []
-            
-            # Process pairs of hashes
-            for i in range(0, len(current_level), 2):
-                left = current_level[i]
-                right = current_level[i + 1] if i + 1 < len(current_level) else left
-                
-                # Combine and hash
-                combined = left + right
-                parent_hash = hashlib.sha256(combined).digest()
-                next_level.append(parent_hash)
-            
-            self.tree.append(next_level.copy())
-            current_level = next_level
-        
-        self.root_hash = current_level[0] if current_level else None
+    def signing_payload(self) -> bytes:
+        return f"{self.tree_size}:{self.root_hash}:{self.timestamp.isoformat()}".encode()
+
+class MerkleAccumulator:
+    """
+    Append-only Merkle accumulator with RFC 6962 tree shape.
     
-    def get_proof(self, leaf_index: int) -> List[Tuple[bytes, str]]:
-        """Get Merkle proof for leaf at index"""
-        if leaf_index >= len(self.leaves):
-            raise IndexError("Leaf index out of range")
-        
-        proof = []
-        current_index = leaf_index
-        
-        for level in range(len(self.tree) - 1):
-            current_level = self.tree[level]
-            
-            # Determine sibling
-            if current_index % 2 == 0:
-                # Left node, sibling is right
-                sibling_index = current_index + 1
-                side = "right"
-            else:
-                # Right node, sibling is left
-                sibling_index = current_index - 1
-                side = "left"
+    Appends are O(log n): only the frontier (roots of the perfect subtrees
+    that make up the current tree) is rehashed. Interior nodes are kept only
+    at every ``tile_height``-th level in flat bytearrays; any other node is
+    rebuilt from the nearest stored level below it, so inclusion and
+    consistency proofs, including against earlier tree sizes, never
+    materialize the full tree.
+    
+    Leaf hashes are kept in a bytearray unless ``leaf_hash_reader`` is given,
+    in which case they are fetched on demand (e.g. recomputed from stored
+    audit records) and the accumulator holds roughly n / 2**tile_height nodes.
+    """
+    
+    def __init__(self, tile_height: int = 8,
+                 leaf_hash_reader: Optional[Callable[[int, int], bytes]] = None):
+        if tile_height < 1:
+            raise ValueError("tile_height must be at least 1")
+        self.tile_height = tile_height
+        self.size = 0
+        self._leaf_hash_reader = leaf_hash_reader
+        self._leaf_hashes: Optional[bytearray] = None if leaf_hash_reader else bytearray()
+        self._frontier: List[bytes] = []  # Perfect subtree roots, largest first
+        self._levels: Dict[int, bytearray] = {}
+        self._lock = threading.RLock()
+    
+    def add_leaf(self, data: bytes) -> int:
+        """Hash and append a leaf; returns its index"""
+        return self.append_leaf_hash(hash_merkle_leaf(data))
+    
+    def append_leaf_hash(self, leaf_hash: bytes) -> int:
+        """Append an already hashed leaf; returns its index"""
+        with self._lock:
+            index = self.size
+            if self._leaf_hashes is not None:
+                self._leaf_hashes += leaf_hash
             
-            if sibling_index < len(current_level):
-                sibling_hash = current_level[sibling_index]
-                proof.append((sibling_hash, side))
+            node, level, carry = leaf_hash, 0, index
+            while carry & 1:
+                node = hash_merkle_node(self._frontier.pop(), node)
+                level += 1
+                carry >>= 1
+                if level % self.tile_height == 0:
+                    self._levels.setdefault(level, bytearray()).extend(node)
+            self._frontier.append(node)
+            self.size = index + 1
+            return index
+    
+    def root(self, tree_size: Optional[int] = None) -> bytes:
+        """Merkle root of the current tree, or of its first tree_size leaves"""
+        with self._lock:
+            if tree_size is not None and tree_size != self.size:
+                self._check_size(tree_size)
+                return self._range_hash(0, tree_size) if tree_size else EMPTY_MERKLE_ROOT
+            if not self._frontier:
+                return EMPTY_MERKLE_ROOT
+            root = self._frontier[-1]
+            for node in reversed(self._frontier[:-1]):
+                root = hash_merkle_node(node, root)
+            return root
+    
+    @property
+    def root_hash(self) -> Optional[bytes]:
+        return self.root() if self.size else None
+    
+    def inclusion_proof(self, leaf_index: int, tree_size: Optional[int] = None) -> List[bytes]:
+        """RFC 6962 audit path for a leaf in the tree of the given size (bottom-up)"""
+        with self._lock:
+            size = self.size if tree_size is None else tree_size
+            self._check_size(size)
+            if not 0 <= leaf_index < size:
+                raise IndexError("Leaf index out of range")
             
-            current_index = current_index // 2
-        
-        return proof
+            proof = []
+            start, end = 0, size
+            while end - start > 1:
+                split = start + _largest_power_of_two_below(end - start)
+                if leaf_index < split:
+                    proof.append(self._range_hash(split, end))
+                    end = split
+                else:
+                    proof.append(self._range_hash(start, split))
+                    start = split
+            proof.reverse()
+            return proof
     
-    def verify_proof(self, leaf_data: bytes, proof: List[Tuple[bytes, str]]) -> bool:
-        """Verify Merkle proof"""
-        current_hash = hashlib.sha256(leaf_data).digest()
-        
-        for sibling_hash, side in proof:
-            if side == "left":
-                combined = sibling_hash + current_hash
-            else:
-                combined = current_hash + sibling_hash
+    def consistency_proof(self, old_size: int, new_size: Optional[int] = None) -> List[bytes]:
+        """RFC 6962 proof that the tree of old_size is a prefix of the tree of new_size"""
+        with self._lock:
+            size = self.size if new_size is None else new_size
+            self._check_size(size)
+            if not 0 < old_size <= size:
+                raise ValueError("old_size must be between 1 and the new tree size")
             
-            current_hash = hashlib.sha256(combined).digest()
-        
-        return current_hash == self.root_hash
+            proof = []
+            start, end, remaining, complete = 0, size, old_size, True
+            while remaining != end - start:
+                split = start + _largest_power_of_two_below(end - start)
+                if remaining <= split - start:
+                    proof.append(self._range_hash(split, end))
+                    end = split
+                else:
+                    proof.append(self._range_hash(start, split))
+                    remaining -= split - start
+                    start, complete = split, False
+            if not complete:
+                proof.append(self._range_hash(start, end))
+            proof.reverse()
+            return proof
+    
+    def storage_bytes(self) -> int:
+        """Bytes held for leaves, stored levels and the frontier"""
+        leaves = len(self._leaf_hashes) if self._leaf_hashes is not None else 0
+        return leaves + sum(len(level) for level in self._levels.values()) + len(self._frontier) * MERKLE_HASH_SIZE
+    
+    def _check_size(self, tree_size: int):
+        if not 0 <= tree_size <= self.size:
+            raise ValueError(f"Tree size {tree_size} outside 0..{self.size}")
+    
+    def _leaf_range(self, start: int, end: int) -> bytes:
+        if self._leaf_hashes is not None:
+            return bytes(self._leaf_hashes[start * MERKLE_HASH_SIZE:end * MERKLE_HASH_SIZE])
+        return self._leaf_hash_reader(start, end)
+    
+    def _stored_nodes(self, level: int, start: int, count: int) -> List[bytes]:
+        if level == 0:
+            data = self._leaf_range(start, start + count)
+        else:
+            data = self._levels[level][start * MERKLE_HASH_SIZE:(start + count) * MERKLE_HASH_SIZE]
+        return [bytes(data[i:i + MERKLE_HASH_SIZE]) for i in range(0, len(data), MERKLE_HASH_SIZE)]
+    
+    def _subtree_hash(self, level: int, index: int) -> bytes:
+        """Hash of the complete subtree of height level covering leaves [index << level, (index + 1) << level)"""
+        base = level - level % self.tile_height
+        width = 1 << (level - base)
+        nodes = self._stored_nodes(base, index * width, width)
+        while len(nodes) > 1:
+            nodes = [hash_merkle_node(nodes[i], nodes[i + 1]) for i in range(0, len(nodes), 2)]
+        return nodes[0]
+    
+    def _range_hash(self, start: int, end: int) -> bytes:
+        """Merkle hash of leaves [start, end); start is aligned as in RFC 6962 decomposition"""
+        count = end - start
+        if count & (count - 1) == 0:
+            level = count.bit_length() - 1
+            return self._subtree_hash(level, start >> level)
+        split = start + _largest_power_of_two_below(count)
+        return hash_merkle_node(self._range_hash(start, split), self._range_hash(split, end))
+
+def verify_inclusion_proof(leaf_hash: bytes, leaf_index: int, tree_size: int,
+                           proof: List[bytes], root: bytes) -> bool:
+    """Verify an RFC 6962 audit path (RFC 9162 section 2.1.3.2)"""
+    if not 0 <= leaf_index < tree_size:
+        return False
+    fn, sn, node = leaf_index, tree_size - 1, leaf_hash
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            node = hash_merkle_node(sibling, node)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            node = hash_merkle_node(node, sibling)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(node, root)
+
+def verify_consistency_proof(old_size: int, new_size: int, old_root: bytes,
+                             new_root: bytes, proof: List[bytes]) -> bool:
+    """Verify an RFC 6962 consistency proof (RFC 9162 section 2.1.4.2)"""
+    if not 0 < old_size <= new_size:
+        return False
+    if old_size == new_size:
+        return not proof and hmac.compare_digest(old_root, new_root)
+    if old_size & (old_size - 1) == 0:
+        proof = [old_root] + list(proof)
+    if not proof:
+        return False
+    
+    fn, sn = old_size - 1, new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    old_node = new_node = proof[0]
+    for node in proof[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            old_node = hash_merkle_node(node, old_node)
+            new_node = hash_merkle_node(node, new_node)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            new_node = hash_merkle_node(new_node, node)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(old_node, old_root) and hmac.compare_digest(new_node, new_root)
 
 class DigitalSignatureVerifier:
     """Digital signature verification for audit logs"""
@@ -293,7 +439,8 @@ class DigitalSignatureVerifier:
 class AuditIntegrityVerifier:
     """Real-time audit log integrity verification system"""
     
-    def __init__(self, verification_level: VerificationLevel = VerificationLevel.HASH_CHAIN):
+    def __init__(self, verification_level: VerificationLevel = VerificationLevel.HASH_CHAIN,
+                 tree_head_sink: Optional[Callable[[SignedTreeHead], None]] = None):
         self.verification_level = verification_level
         self.signature_verifier = DigitalSignatureVerifier()
         
@@ -309,9 +456,12 @@ class AuditIntegrityVerifier:
         self.last_hash: Optional[str] = None
         self.sequence_counter: int = 0
         
-        # Merkle tree for batch verification
-        self.merkle_tree = MerkleTree()
+        # Merkle accumulator for batch verification; a signed tree head is
+        # issued every merkle_batch_size entries and handed to tree_head_sink
+        self.merkle_tree = MerkleAccumulator()
         self.merkle_batch_size = 100
+        self.latest_tree_head: Optional[SignedTreeHead] = None
+        self.tree_head_sink = tree_head_sink
         
         # Real-time monitoring
         self.monitoring_active = True
@@ -368,7 +518,7 @@ class AuditIntegrityVerifier:
         
         # Calculate Merkle leaf hash
         merkle_leaf_data = f"{entry_id}{content_hash}".encode()
-        merkle_leaf_hash = hashlib.sha256(merkle_leaf_data).hexdigest()
+        merkle_leaf_hash = hash_merkle_leaf(merkle_leaf_data)
         
         # Digital signature
         digital_signature = None
@@ -389,7 +539,7 @@ class AuditIntegrityVerifier:
             sequence_number=self.sequence_counter,
             previous_hash=previous_hash,
             content_hash=content_hash,
-            merkle_leaf_hash=merkle_leaf_hash,
+            merkle_leaf_hash=merkle_leaf_hash.hex(),
             digital_signature=digital_signature
         )
         
@@ -399,7 +549,9 @@ class AuditIntegrityVerifier:
         self.sequence_counter += 1
         
         # Add to Merkle tree
-        self.merkle_tree.add_leaf(merkle_leaf_data)
+        self.merkle_tree.append_leaf_hash(merkle_leaf_hash)
+        if self.merkle_tree.size % self.merkle_batch_size == 0:
+            self.sign_tree_head()
         
         # Immediate verification for critical events
         if outcome == "failure" or "error" in event_type.lower():
@@ -594,20 +746,63 @@ class AuditIntegrityVerifier:
     async def _verify_merkle_inclusion(self, entry: AuditLogEntry) -> bool:
         """Verify Merkle tree inclusion"""
         
-        # Find entry index in sequence
-        try:
-            entry_index = self.entry_sequence.index(entry.entry_id)
-        except ValueError:
-            return False
+        # Leaf index equals the entry's sequence number
+        entry_index = entry.sequence_number
         
         # Reconstruct leaf data
         merkle_leaf_data = f"{entry.entry_id}{entry.content_hash}".encode()
         
-        # Get Merkle proof
+        # Get Merkle proof against a consistent snapshot of the tree
+        try:
+            tree_size = self.merkle_tree.size
+            proof = self.merkle_tree.inclusion_proof(entry_index, tree_size)
+            return verify_inclusion_proof(
+                hash_merkle_leaf(merkle_leaf_data), entry_index, tree_size, proof,
+                self.merkle_tree.root(tree_size)
+            )
+        except (IndexError, ValueError):
+            return False
+    
+    def sign_tree_head(self) -> SignedTreeHead:
+        """Sign the current Merkle root and hand it to the tree head sink"""
+        
+        tree_size = self.merkle_tree.size
+        unsigned = SignedTreeHead(
+            tree_size=tree_size,
+            root_hash=self.merkle_tree.root(tree_size).hex(),
+            timestamp=datetime.utcnow(),
+            signature=None
+        )
+        tree_head = replace(unsigned, signature=self.signature_verifier.sign_entry(unsigned.signing_payload()))
+        self.latest_tree_head = tree_head
+        
+        if self.tree_head_sink:
+            try:
+                self.tree_head_sink(tree_head)
+            except Exception as e:
+                logger.error("Failed to persist signed tree head", tree_size=tree_size, error=str(e))
+        
+        logger.info("AUDIT_INTEGRITY - Signed tree head issued",
+                   tree_size=tree_size,
+                   root_hash=tree_head.root_hash)
+        return tree_head
+    
+    def verify_tree_head_consistency(self, tree_head: SignedTreeHead) -> bool:
+        """Check a signed tree head's signature and that the current tree extends it"""
+        
+        if tree_head.signature is not None and not self.signature_verifier.verify_signature(
+            tree_head.signing_payload(), tree_head.signature
+        ):
+            return False
+        
         try:
-            proof = self.merkle_tree.get_proof(entry_index)
-            return self.merkle_tree.verify_proof(merkle_leaf_data, proof)
-        except (IndexError, Exception):
+            tree_size = self.merkle_tree.size
+            proof = self.merkle_tree.consistency_proof(tree_head.tree_size, tree_size)
+            return verify_consistency_proof(
+                tree_head.tree_size, tree_size, bytes.fromhex(tree_head.root_hash),
+                self.merkle_tree.root(tree_size), proof
+            )
+        except ValueError:
             return False
     
     async def _verify_timestamp(self, entry: AuditLogEntry) -> bool:
@@ -794,6 +989,14 @@ class AuditIntegrityVerifier:
                            entry_id=entry_id,
                            error=str(e))
         
+        # Prove the tree only grew since the last signed root
+        results["tree_head_consistent"] = (
+            self.verify_tree_head_consistency(self.latest_tree_head)
+            if self.latest_tree_head else None
+        )
+        if results["tree_head_consistent"] is False:
+            results["chain_valid"] = False
+        
         results["verification_time_seconds"] = time.time() - verification_start
         
         logger.info("AUDIT_INTEGRITY - Full chain verification completed",
@@ -32,9 +32,10 @@ from sqlalchemy import text, insert, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert as postgres_insert
 
-from app.core.database_unified import get_db, AuditEventType
+from app.core.database_unified import get_db, AuditEventType, DataClassification
 from app.core.config import get_settings
 from app.core.redis_caching import cache_manager
+from app.core.audit_spool import AuditSpool, AuditSpoolDrainer, open_spool_slot
 
 logger = structlog.get_logger()
 
@@ -191,6 +192,70 @@ class AuditLogProcessor:
         self.circuit_breaker_failures = 0
         self.circuit_breaker_threshold = 5
         
+        # Durable spool: events are fsync'd locally and loaded into the
+        # database by a background drainer, so callers never wait on inserts
+        self.spool_enabled = self.settings.AUDIT_SPOOL_ENABLED
+        self.spool: Optional[AuditSpool] = None
+        self.spool_drainer: Optional[AuditSpoolDrainer] = None
+        self._spool_lock = asyncio.Lock()
+        
+    async def _get_spool(self) -> AuditSpool:
+        """Open this process's spool slot and start its drainer on first use."""
+        if self.spool is None:
+            async with self._spool_lock:
+                if self.spool is None:
+                    spool = await open_spool_slot(
+                        self.settings.AUDIT_SPOOL_DIR,
+                        segment_max_bytes=self.settings.AUDIT_SPOOL_SEGMENT_MAX_BYTES,
+                        group_commit_interval=self.settings.AUDIT_SPOOL_GROUP_COMMIT_MS / 1000,
+                        fsync=self.settings.AUDIT_SPOOL_FSYNC
+                    )
+                    self.spool_drainer = AuditSpoolDrainer(
+                        spool,
+                        batch_size=self.settings.AUDIT_SPOOL_DRAIN_BATCH_SIZE,
+                        interval=self.settings.AUDIT_SPOOL_DRAIN_INTERVAL_SECONDS,
+                        backlog_warning_records=self.settings.AUDIT_SPOOL_BACKLOG_WARNING_RECORDS
+                    )
+                    self.spool_drainer.start()
+                    self.spool = spool
+        return self.spool
+    
+    def _entry_to_spool_row(self, entry: AuditLogEntry) -> Dict[str, Any]:
+        """Map an entry onto audit_logs columns as JSON-serializable values."""
+        try:
+            resource_uuid = str(uuid.UUID(str(entry.resource_id))) if entry.resource_id else None
+        except ValueError:
+            resource_uuid = None
+        
+        return {
+            "id": str(uuid.uuid4()),
+            "timestamp": entry.timestamp.isoformat(),
+            "event_type": entry.event_type,
+            "user_id": entry.user_id,
+            "aggregate_id": entry.patient_id,
+            "aggregate_type": "Patient" if entry.patient_id else None,
+            "resource_type": entry.resource_type,
+            "resource_id": resource_uuid,
+            "action": entry.action,
+            "outcome": entry.outcome,
+            "ip_address": entry.client_info.get("ip_address"),
+            "user_agent": entry.client_info.get("user_agent"),
+            "config_metadata": {
+                "event_id": entry.event_id,
+                "patient_id": entry.patient_id,
+                "resource_id": entry.resource_id,
+                "client_info": entry.client_info,
+                "metadata": entry.metadata,
+                "phi_accessed": entry.phi_accessed,
+                "log_level": entry.log_level.value,
+                "event_hash": entry.calculate_hash()
+            },
+            "compliance_tags": entry.compliance_flags,
+            "data_classification": (
+                DataClassification.PHI if entry.phi_accessed else DataClassification.INTERNAL
+            ).value
+        }
+    
     async def log_audit_event(
         self,
         event_type: Union[str, AuditEventType],
@@ -219,6 +284,16 @@ class AuditLogProcessor:
         # Add compliance flags
         entry.compliance_flags = self._get_compliance_flags(entry)
         
+        if self.spool_enabled:
+            try:
+                spool = await self._get_spool()
+                await spool.append(self._entry_to_spool_row(entry))
+                return entry.event_id
+            except Exception as e:
+                # Local disk failure: keep the event in memory rather than lose it
+                logger.error("Audit spool append failed, buffering in memory",
+                             event_id=entry.event_id, error=str(e))
+        
         # Add to buffer
         needs_flush = self.buffer.add_entry(entry)
         
@@ -519,8 +594,16 @@ class AuditLogProcessor:
             avg_db_write_time = 0
             success_rate = 100
         
+        spool_stats = None
+        if self.spool is not None:
+            spool_stats = {
+                **self.spool.get_stats(),
+                "drainer": self.spool_drainer.get_stats()
+            }
+        
         return {
             "buffer_statistics": buffer_stats,
+            "spool_statistics": spool_stats,
             "processing_performance": {
                 "average_batch_processing_time_ms": avg_processing_time,
                 "average_db_write_time_ms": avg_db_write_time,
@@ -537,11 +620,28 @@ class AuditLogProcessor:
         """Force flush buffer for immediate processing."""
         logger.info("Forcing audit buffer flush")
         
+        if self.spool is not None:
+            while await self.spool_drainer.drain_once():
+                pass
+        
         if self.is_processing:
             logger.warning("Audit processing already in progress")
             return None
         
         return await self._process_buffer_batch()
+    
+    async def close(self) -> None:
+        """Stop the drainer (loading what it can) and close the spool."""
+        if self.spool is None:
+            return
+        try:
+            await self.spool_drainer.stop(drain=True)
+        except Exception as e:
+            # Undrained records stay in the spool and load on next start
+            logger.warning("Audit spool not fully drained at shutdown", error=str(e))
+        await self.spool.close()
+        self.spool = None
+        self.spool_drainer = None
 
 
 class AuditLogArchiver:
@@ -553,65 +653,40 @@ class AuditLogArchiver:
         self.retention_days = int(getattr(self.settings, 'audit_log_retention_days', 2555))  # 7 years
     
     async def archive_old_logs(self, archive_before_days: int = 90) -> Dict[str, Any]:
-        """Archive audit logs older than specified days."""
+        """
+        Archive audit log months that ended more than archive_before_days ago.
+        
+        Whole monthly partitions are detached, exported to Parquet and dropped;
+        rows are never copied or deleted individually.
+        """
+        from app.modules.audit_logger.partitioning import get_audit_partition_manager
+        
         cutoff_date = datetime.utcnow() - timedelta(days=archive_before_days)
         
         try:
-            async for session in get_db():
-                # Find logs to archive
-                count_query = select(func.count()).select_from(
-                    text("audit_logs")
-                ).where(text("created_at < :cutoff_date"))
-                
-                result = await session.execute(count_query, {"cutoff_date": cutoff_date})
-                logs_to_archive = result.scalar()
-                
-                if logs_to_archive == 0:
-                    return {"message": "No logs to archive", "archived_count": 0}
-                
-                # Create archive table if needed
-                await self._create_archive_table(session)
-                
-                # Move logs to archive
-                archive_query = text("""
-                    INSERT INTO audit_logs_archive 
-                    SELECT * FROM audit_logs 
-                    WHERE created_at < :cutoff_date
-                """)
-                
-                await session.execute(archive_query, {"cutoff_date": cutoff_date})
-                
-                # Delete from main table
-                delete_query = text("DELETE FROM audit_logs WHERE created_at < :cutoff_date")
-                await session.execute(delete_query, {"cutoff_date": cutoff_date})
-                
-                await session.commit()
-                
-                logger.info(
-                    "Audit logs archived successfully",
-                    archived_count=logs_to_archive,
-                    cutoff_date=cutoff_date.isoformat()
-                )
-                
-                return {
-                    "message": "Audit logs archived successfully",
-                    "archived_count": logs_to_archive,
-                    "cutoff_date": cutoff_date.isoformat()
-                }
-                
+            results = await get_audit_partition_manager().archive_before(cutoff_date.date())
+            archived_count = sum(result.rows for result in results)
+            
+            if not results:
+                return {"message": "No audit partitions to archive", "archived_count": 0}
+            
+            logger.info(
+                "Audit logs archived successfully",
+                archived_count=archived_count,
+                partitions=[result.partition for result in results],
+                cutoff_date=cutoff_date.isoformat()
+            )
+            
+            return {
+                "message": "Audit logs archived successfully",
+                "archived_count": archived_count,
+                "cutoff_date": cutoff_date.isoformat(),
+                "partitions": [result.to_dict() for result in results]
+            }
+            
         except Exception as e:
             logger.error("Audit log archiving failed", error=str(e))
             return {"error": str(e)}
-    
-    async def _create_archive_table(self, session: AsyncSession) -> None:
-        """Create archive table with same structure as main audit table."""
-        create_archive_table_sql = text("""
-            CREATE TABLE IF NOT EXISTS audit_logs_archive (
-                LIKE audit_logs INCLUDING ALL
-            )
-        """)
-        
-        await session.execute(create_archive_table_sql)
 
 
 # =============================================================================
@@ -674,6 +749,10 @@ class OptimizedAuditLogger:
         """Force flush buffer for testing or emergency."""
         return await self.processor.force_flush()
     
+    async def shutdown(self) -> None:
+        """Drain what the database will take and close the spool."""
+        await self.processor.close()
+    
     async def archive_old_logs(self, archive_before_days: int = 90) -> Dict[str, Any]:
         """Archive old audit logs."""
         return await self.archiver.archive_old_logs(archive_before_days)
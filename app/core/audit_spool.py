@@ -0,0 +1,652 @@
+"""
+Durable Audit Spool
+
+Write-ahead spool that decouples audit logging from database availability:
+- Audit rows are appended to local, append-only segment files
+- Concurrent appends are group-committed: one write() and one fsync per group
+- Every record is hash-chained to its predecessor so torn or edited spool
+  data is detected before it reaches the database
+- A drainer appends durable records to the audit_logs hash chain in drain
+  order and advances an fsync'd cursor; rows already loaded are skipped, so
+  replay after a crash is safe
+- Backlog and fsync metrics expose backpressure when the database lags
+
+Requests only wait for the local fsync, never for the database, and an
+event acknowledged by append() survives a database outage or process crash.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import select
+
+from app.core.database_unified import AuditLog, DataClassification, get_session_factory, mark_primary_write
+from app.modules.audit_logger.chain_verification import append_audit_rows
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    FCNTL_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+SPOOL_GENESIS_HASH = "SPOOL_GENESIS"
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+CURSOR_FILE = "drain.cursor"
+LOCK_FILE = "spool.lock"
+
+# AuditLog columns stored as strings in the spool and converted back on load
+_UUID_COLUMNS = ("id", "session_id", "correlation_id", "resource_id")
+_DATETIME_COLUMNS = ("timestamp",)
+
+
+class SpoolCorruptionError(Exception):
+    """Raised when durable spool records fail chain verification."""
+
+
+class SpoolLockedError(Exception):
+    """Raised when another process owns the spool directory."""
+
+
+def _canonical_json(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _record_hash(seq: int, previous_hash: str, row: Dict[str, Any]) -> str:
+    return hashlib.sha256(f"{seq}:{previous_hash}:{_canonical_json(row)}".encode("utf-8")).hexdigest()
+
+
+def _segment_name(segment: int) -> str:
+    return f"{SEGMENT_PREFIX}{segment:012d}{SEGMENT_SUFFIX}"
+
+
+@dataclass
+class SpoolRecord:
+    """One durable spool record."""
+    seq: int
+    previous_hash: str
+    record_hash: str
+    row: Dict[str, Any]
+
+
+@dataclass
+class SpoolCursor:
+    """Drain position: next byte to read and the last drained record."""
+    segment: int = 1
+    offset: int = 0
+    seq: int = 0
+    last_hash: str = SPOOL_GENESIS_HASH
+
+
+class AuditSpool:
+    """Append-only, fsync'd, hash-chained segment files with group commit."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        group_commit_interval: float = 0.002,
+        fsync: bool = True
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.group_commit_interval = group_commit_interval
+        self.fsync = fsync
+
+        self._opened = False
+        self._open_lock = asyncio.Lock()
+        self._lock_handle = None
+        self._file = None
+
+        # Chain head and write position, owned by the flusher
+        self._segment = 1
+        self._segment_size = 0
+        self._head_seq = 0
+        self._head_hash = SPOOL_GENESIS_HASH
+
+        # Durable end, read by the drainer thread
+        self._durable_lock = threading.Lock()
+        self._durable: Tuple[int, int] = (1, 0)
+
+        # Group commit state
+        self._pending: List[Dict[str, Any]] = []
+        self._group_future: Optional[asyncio.Future] = None
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+        self._cursor: Optional[SpoolCursor] = None
+        self.stats = {
+            "records_appended": 0,
+            "groups_committed": 0,
+            "largest_group": 0,
+            "fsync_time_ms_total": 0.0,
+            "fsync_time_ms_max": 0.0,
+            "write_failures": 0,
+            "torn_bytes_truncated": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Opening and recovery
+    # ------------------------------------------------------------------
+
+    async def open(self) -> None:
+        """Lock the directory, recover the chain head and start the flusher."""
+        if self._opened:
+            return
+        async with self._open_lock:
+            if self._opened:
+                return
+            await asyncio.to_thread(self._recover)
+            self._flusher = asyncio.create_task(self._flush_loop())
+            self._opened = True
+            logger.info(
+                "Audit spool opened",
+                directory=str(self.directory),
+                head_seq=self._head_seq,
+                segment=self._segment,
+                backlog_records=self.backlog_records
+            )
+
+    def _acquire_directory_lock(self) -> None:
+        self._lock_handle = open(self.directory / LOCK_FILE, "a+")
+        if not FCNTL_AVAILABLE:
+            return
+        try:
+            fcntl.flock(self._lock_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_handle.close()
+            self._lock_handle = None
+            raise SpoolLockedError(f"Audit spool {self.directory} is in use by another process")
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        )
+
+    def _recover(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._acquire_directory_lock()
+        self._cursor = self.load_cursor()
+
+        self._head_seq, self._head_hash = self._cursor.seq, self._cursor.last_hash
+        segments = self._segments()
+        self._segment = segments[-1] if segments else max(self._cursor.segment, 1)
+
+        for segment in segments:
+            if segment < self._cursor.segment:
+                continue
+            start = self._cursor.offset if segment == self._cursor.segment else 0
+            records, valid_end = self._scan_segment(segment, start, self._head_seq, self._head_hash)
+            if records:
+                self._head_seq = records[-1].seq
+                self._head_hash = records[-1].record_hash
+
+            path = self.directory / _segment_name(segment)
+            size = path.stat().st_size
+            if valid_end < size:
+                with open(path, "r+b") as handle:
+                    handle.seek(valid_end)
+                    tail = handle.read()
+                    # A crash mid-write leaves one partial, unacknowledged line at the very
+                    # end; complete lines that fail verification mean tampering
+                    if segment != segments[-1] or b"\n" in tail:
+                        raise SpoolCorruptionError(
+                            f"Spool segment {segment} fails verification at byte {valid_end}"
+                        )
+                    handle.truncate(valid_end)
+                    os.fsync(handle.fileno())
+                self.stats["torn_bytes_truncated"] += size - valid_end
+                logger.warning(
+                    "Truncated torn audit spool tail", segment=segment, bytes=size - valid_end
+                )
+                size = valid_end
+            self._segment_size = size
+
+        self._file = open(self.directory / _segment_name(self._segment), "ab")
+        self._segment_size = self._file.tell()
+        with self._durable_lock:
+            self._durable = (self._segment, self._segment_size)
+
+    def _scan_segment(
+        self, segment: int, offset: int, seq: int, last_hash: str, limit: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Tuple[List[SpoolRecord], int]:
+        """Read and verify records from offset; returns them and the end of the last valid one."""
+        records: List[SpoolRecord] = []
+        path = self.directory / _segment_name(segment)
+        if not path.exists():
+            return records, offset
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            position = offset
+            while limit is None or len(records) < limit:
+                if end is not None and position >= end:
+                    break
+                line = handle.readline()
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    data = json.loads(line)
+                    record = SpoolRecord(data["seq"], data["prev"], data["hash"], data["row"])
+                except (ValueError, KeyError):
+                    break
+                if (
+                    record.seq != seq + 1
+                    or record.previous_hash != last_hash
+                    or record.record_hash != _record_hash(record.seq, record.previous_hash, record.row)
+                ):
+                    break
+                records.append(record)
+                seq, last_hash = record.seq, record.record_hash
+                position += len(line)
+        return records, position
+
+    # ------------------------------------------------------------------
+    # Appending (group commit)
+    # ------------------------------------------------------------------
+
+    async def append(self, row: Dict[str, Any]) -> int:
+        """
+        Append a JSON-serializable row and wait until it is fsync'd.
+
+        Returns:
+            The record's spool sequence number
+        """
+        await self.open()
+        if self._group_future is None:
+            self._group_future = asyncio.get_running_loop().create_future()
+        future = self._group_future
+        index = len(self._pending)
+        self._pending.append(row)
+        self._wakeup.set()
+        first_seq = await asyncio.shield(future)
+        return first_seq + index
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if self.group_commit_interval:
+                # Let concurrent requests join this group
+                await asyncio.sleep(self.group_commit_interval)
+            self._wakeup.clear()
+            rows, future = self._pending, self._group_future
+            self._pending, self._group_future = [], None
+            if not rows:
+                continue
+            try:
+                first_seq = await asyncio.to_thread(self._write_group, rows)
+            except Exception as e:
+                self.stats["write_failures"] += 1
+                logger.critical("Audit spool write failed", error=str(e), records=len(rows))
+                future.set_exception(e)
+            else:
+                future.set_result(first_seq)
+
+    def _write_group(self, rows: List[Dict[str, Any]]) -> int:
+        seq, previous_hash = self._head_seq, self._head_hash
+        lines = []
+        for row in rows:
+            seq += 1
+            record_hash = _record_hash(seq, previous_hash, row)
+            lines.append(_canonical_json({"seq": seq, "prev": previous_hash, "hash": record_hash, "row": row}))
+            previous_hash = record_hash
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+
+        if self._segment_size and self._segment_size + len(payload) > self.segment_max_bytes:
+            self._rotate()
+
+        start = time.perf_counter()
+        try:
+            self._file.write(payload)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except Exception:
+            # Nothing past the durable end was acknowledged; cut it back off
+            self._file.truncate(self._segment_size)
+            raise
+        fsync_ms = (time.perf_counter() - start) * 1000
+
+        first_seq = self._head_seq + 1
+        self._head_seq, self._head_hash = seq, previous_hash
+        self._segment_size += len(payload)
+        with self._durable_lock:
+            self._durable = (self._segment, self._segment_size)
+
+        self.stats["records_appended"] += len(rows)
+        self.stats["groups_committed"] += 1
+        self.stats["largest_group"] = max(self.stats["largest_group"], len(rows))
+        self.stats["fsync_time_ms_total"] += fsync_ms
+        self.stats["fsync_time_ms_max"] = max(self.stats["fsync_time_ms_max"], fsync_ms)
+        return first_seq
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._segment += 1
+        self._segment_size = 0
+        self._file = open(self.directory / _segment_name(self._segment), "ab")
+        self._fsync_directory()
+
+    def _fsync_directory(self) -> None:
+        if not self.fsync or not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.directory, os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # ------------------------------------------------------------------
+    # Draining
+    # ------------------------------------------------------------------
+
+    def load_cursor(self) -> SpoolCursor:
+        """Load the committed drain cursor."""
+        path = self.directory / CURSOR_FILE
+        if not path.exists():
+            segments = self._segments()
+            return SpoolCursor(segment=segments[0] if segments else 1)
+        return SpoolCursor(**json.loads(path.read_text()))
+
+    def read_batch(self, cursor: SpoolCursor, limit: int) -> Tuple[List[SpoolRecord], SpoolCursor]:
+        """
+        Read up to limit durable records after the cursor.
+
+        Raises:
+            SpoolCorruptionError: A durable record fails chain verification
+        """
+        with self._durable_lock:
+            durable_segment, durable_end = self._durable
+
+        records: List[SpoolRecord] = []
+        position = SpoolCursor(**asdict(cursor))
+        while len(records) < limit and position.segment <= durable_segment:
+            end = durable_end if position.segment == durable_segment else None
+            batch, offset = self._scan_segment(
+                position.segment, position.offset, position.seq, position.last_hash,
+                limit - len(records), end
+            )
+            records.extend(batch)
+            position.offset = offset
+            if batch:
+                position.seq, position.last_hash = batch[-1].seq, batch[-1].record_hash
+
+            if len(records) >= limit:
+                break
+            if position.segment == durable_segment:
+                if end is not None and offset < end:
+                    raise SpoolCorruptionError(f"Spool segment {position.segment} fails verification at byte {offset}")
+                break
+            segment_size = (self.directory / _segment_name(position.segment)).stat().st_size
+            if offset < segment_size:
+                raise SpoolCorruptionError(f"Spool segment {position.segment} fails verification at byte {offset}")
+            position.segment, position.offset = position.segment + 1, 0
+        return records, position
+
+    def commit_cursor(self, cursor: SpoolCursor) -> None:
+        """Atomically persist the drain cursor and delete fully drained segments."""
+        path = self.directory / CURSOR_FILE
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as handle:
+            handle.write(json.dumps(asdict(cursor)))
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+        self._fsync_directory()
+        self._cursor = cursor
+
+        for segment in self._segments():
+            if segment < cursor.segment:
+                (self.directory / _segment_name(segment)).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Metrics and shutdown
+    # ------------------------------------------------------------------
+
+    @property
+    def cursor(self) -> Optional[SpoolCursor]:
+        """Last committed drain cursor (None until opened)."""
+        return self._cursor
+
+    @property
+    def backlog_records(self) -> int:
+        cursor_seq = self._cursor.seq if self._cursor else 0
+        return self._head_seq - cursor_seq
+
+    def backlog_bytes(self) -> int:
+        if self._cursor is None:
+            return 0
+        total = 0
+        for segment in self._segments():
+            if segment < self._cursor.segment:
+                continue
+            size = (self.directory / _segment_name(segment)).stat().st_size
+            total += size - (self._cursor.offset if segment == self._cursor.segment else 0)
+        return total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Spool throughput, fsync latency and backlog statistics."""
+        groups = self.stats["groups_committed"]
+        return {
+            **self.stats,
+            "average_group_size": self.stats["records_appended"] / groups if groups else 0,
+            "average_fsync_time_ms": self.stats["fsync_time_ms_total"] / groups if groups else 0,
+            "head_seq": self._head_seq,
+            "drained_seq": self._cursor.seq if self._cursor else 0,
+            "backlog_records": self.backlog_records,
+            "backlog_bytes": self.backlog_bytes() if self._opened else 0,
+            "segments": len(self._segments()) if self._opened else 0,
+            "pending_in_group": len(self._pending)
+        }
+
+    async def close(self) -> None:
+        """Flush the open group, stop the flusher and release the directory."""
+        if not self._opened:
+            return
+        while self._pending or self._group_future is not None:
+            await asyncio.sleep(self.group_commit_interval or 0)
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+        self._file.close()
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+        self._opened = False
+
+
+async def open_spool_slot(base_directory: str, max_slots: int = 64, **spool_kwargs) -> AuditSpool:
+    """
+    Open the first spool slot under base_directory not locked by another process.
+    
+    Worker processes sharing a base directory each get their own slot, and a
+    restarted worker takes over (and drains) the slot a crashed one left behind.
+    """
+    for slot in range(max_slots):
+        spool = AuditSpool(os.path.join(base_directory, f"slot-{slot}"), **spool_kwargs)
+        try:
+            await spool.open()
+            return spool
+        except SpoolLockedError:
+            continue
+    raise SpoolLockedError(f"All {max_slots} audit spool slots under {base_directory} are in use")
+
+
+def spool_row_to_audit_log(record: SpoolRecord) -> Dict[str, Any]:
+    """
+    Convert a spooled row to AuditLog insert values.
+    
+    Each process spools its own chain, so the spool link is kept in
+    config_metadata as evidence of the on-disk record; the drainer appends
+    the row to the table-wide audit chain (sequence_number, previous_log_hash
+    and log_hash) when it loads it.
+    """
+    row = dict(record.row)
+    for column in _UUID_COLUMNS:
+        if row.get(column):
+            row[column] = uuid.UUID(row[column])
+    for column in _DATETIME_COLUMNS:
+        if row.get(column):
+            value = datetime.fromisoformat(row[column])
+            # Stored naive UTC; the chain hash must match the value read back
+            row[column] = value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+    if row.get("data_classification"):
+        row["data_classification"] = DataClassification(row["data_classification"])
+    row["config_metadata"] = {
+        **(row.get("config_metadata") or {}),
+        "spool": {"seq": record.seq, "previous_hash": record.previous_hash, "hash": record.record_hash}
+    }
+    return row
+
+
+class AuditSpoolDrainer:
+    """Background task that bulk-loads durable spool records into audit_logs."""
+
+    def __init__(
+        self,
+        spool: AuditSpool,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: int = 2000,
+        interval: float = 0.5,
+        max_backoff: float = 30.0,
+        backlog_warning_records: int = 100000
+    ):
+        self.spool = spool
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.backlog_warning_records = backlog_warning_records
+
+        self._task: Optional[asyncio.Task] = None
+        self.backpressure = False
+        self.stats = {
+            "records_drained": 0,
+            "batches_drained": 0,
+            "consecutive_failures": 0,
+            "last_drain_at": None,
+            "last_error": None,
+            "last_batch_ms": 0.0
+        }
+
+    async def _get_session_factory(self):
+        if self._session_factory is None:
+            self._session_factory = await get_session_factory()
+        return self._session_factory
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        session_factory = await self._get_session_factory()
+        async with session_factory() as session:
+            # Idempotent: a crash between commit and cursor update replays the batch.
+            # Rows already loaded are dropped before chaining, so no chain position
+            # is spent on a row that is not inserted (timestamp bounds the
+            # partitions scanned).
+            loaded = set((await session.execute(
+                select(AuditLog.id).where(
+                    AuditLog.id.in_([row["id"] for row in rows]),
+                    AuditLog.timestamp.between(
+                        min(row["timestamp"] for row in rows), max(row["timestamp"] for row in rows)
+                    )
+                )
+            )).scalars())
+            await append_audit_rows(session, [row for row in rows if row["id"] not in loaded])
+            await session.commit()
+        mark_primary_write()
+
+    async def drain_once(self) -> int:
+        """Load one batch into the database; returns the number of records drained."""
+        await self.spool.open()
+        records, next_cursor = await asyncio.to_thread(self.spool.read_batch, self.spool.cursor, self.batch_size)
+        if not records:
+            return 0
+
+        start = time.perf_counter()
+        await self._insert([spool_row_to_audit_log(record) for record in records])
+        await asyncio.to_thread(self.spool.commit_cursor, next_cursor)
+
+        self.stats["records_drained"] += len(records)
+        self.stats["batches_drained"] += 1
+        self.stats["last_batch_ms"] = (time.perf_counter() - start) * 1000
+        self.stats["last_drain_at"] = time.time()
+        self._update_backpressure()
+        return len(records)
+
+    def _update_backpressure(self) -> None:
+        backlog = self.spool.backlog_records
+        backpressure = backlog >= self.backlog_warning_records
+        if backpressure != self.backpressure:
+            self.backpressure = backpressure
+            log = logger.warning if backpressure else logger.info
+            log("Audit spool backpressure changed", backpressure=backpressure, backlog_records=backlog)
+
+    async def run(self) -> None:
+        """Drain continuously, backing off exponentially while the database is unavailable."""
+        backoff = self.interval
+        while True:
+            try:
+                drained = await self.drain_once()
+                self.stats["consecutive_failures"] = 0
+                backoff = self.interval
+                if drained < self.batch_size:
+                    await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                raise
+            except SpoolCorruptionError as e:
+                logger.critical("Audit spool corruption detected - draining halted", error=str(e))
+                self.stats["last_error"] = str(e)
+                raise
+            except Exception as e:
+                self.stats["consecutive_failures"] += 1
+                self.stats["last_error"] = str(e)
+                self._update_backpressure()
+                logger.error(
+                    "Audit spool drain failed, backing off",
+                    error=str(e),
+                    backoff_seconds=backoff,
+                    backlog_records=self.spool.backlog_records
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self) -> None:
+        """Start the background drain task if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self, drain: bool = True) -> None:
+        """Stop draining, optionally loading what is already spooled first."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, SpoolCorruptionError):
+                pass
+            self._task = None
+        if drain:
+            while await self.drain_once():
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Drain throughput, failure and lag statistics."""
+        last_drain_at = self.stats["last_drain_at"]
+        return {
+            **self.stats,
+            "running": self._task is not None and not self._task.done(),
+            "backpressure": self.backpressure,
+            "seconds_since_last_drain": time.time() - last_drain_at if last_drain_at else None
+        }
@@ -0,0 +1,256 @@
+"""
+Codecs for cached healthcare payloads.
+
+Cache entries are written as a small header followed by the payload::
+
+    magic (0xC1) | serializer | compression | dictionary id (uint32)
+
+- serializer: raw bytes (stored as-is), JSON (stdlib or orjson - same
+  output), msgpack, or pickle for values neither JSON nor msgpack can carry
+- compression: none, gzip or zstd; zstd may use a dictionary trained per
+  CacheKeyType, whose id is recorded so entries stay readable after the
+  dictionary is retrained
+
+Payloads below the size threshold, or that do not shrink, are stored
+uncompressed. Decoding works on a memoryview of the entry, so the payload
+is handed to the decompressor and deserializer without intermediate copies.
+
+Entries written before this header existed start with ``{``/``[`` (JSON),
+0x1f (gzip) or 0x80 (pickle) and are recognised by is_codec_entry() so the
+caller can fall back to the legacy path.
+"""
+
+import gzip
+import json
+import pickle
+import struct
+from typing import Any, Dict, Iterable, List, Optional
+
+import structlog
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+CACHE_ENTRY_MAGIC = 0xC1
+_HEADER = struct.Struct(">BBBI")
+
+SERIALIZER_RAW = 0
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+SERIALIZER_PICKLE = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_GZIP = 1
+COMPRESSION_ZSTD = 2
+
+SERIALIZER_NAMES = {"json": SERIALIZER_JSON, "orjson": SERIALIZER_JSON, "msgpack": SERIALIZER_MSGPACK}
+COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "gzip": COMPRESSION_GZIP, "zstd": COMPRESSION_ZSTD}
+
+
+def is_codec_entry(data: bytes) -> bool:
+    """True for entries written by CacheCodec (as opposed to legacy JSON/gzip/pickle)."""
+    return len(data) >= _HEADER.size and data[0] == CACHE_ENTRY_MAGIC
+
+
+class CacheCodec:
+    """Serializes and compresses cache values into self-describing entries."""
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        min_compress_bytes: int = 256,
+        compression_level: int = 3
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            serializer: orjson, msgpack or json; msgpack degrades to JSON
+                when the package is not installed, orjson to stdlib JSON
+            compression: zstd, gzip or none; zstd degrades to gzip
+            min_compress_bytes: Smallest serialized payload worth compressing
+            compression_level: zstd / gzip level
+        """
+        if serializer not in SERIALIZER_NAMES or compression not in COMPRESSION_NAMES:
+            raise ValueError(f"Unknown cache codec: {serializer}/{compression}")
+        if serializer == "msgpack" and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, caching with JSON")
+            serializer = "orjson"
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed, compressing cache entries with gzip")
+            compression = "gzip"
+
+        self.serializer = SERIALIZER_NAMES[serializer]
+        self.compression = COMPRESSION_NAMES[compression]
+        self.min_compress_bytes = min_compress_bytes
+        self.compression_level = compression_level
+        # dictionary id -> zstd dictionary, and the one new entries of a key type use
+        self.dictionaries: Dict[int, Any] = {}
+        self.active_dictionaries: Dict[str, int] = {}
+        self._compressors: Dict[int, Any] = {}
+        self._decompressors: Dict[int, Any] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "CacheCodec":
+        """Build the codec from CACHE_* settings."""
+        return cls(
+            serializer=settings.CACHE_CODEC,
+            compression=settings.CACHE_COMPRESSION,
+            min_compress_bytes=settings.CACHE_COMPRESSION_MIN_BYTES,
+            compression_level=settings.CACHE_COMPRESSION_LEVEL
+        )
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def serialize(self, data: Any) -> tuple:
+        """(serializer id, payload) for a value."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return SERIALIZER_RAW, data
+        if isinstance(data, (dict, list)):
+            try:
+                if self.serializer == SERIALIZER_MSGPACK:
+                    return SERIALIZER_MSGPACK, msgpack.packb(data, use_bin_type=True, default=str)
+                if ORJSON_AVAILABLE:
+                    return SERIALIZER_JSON, orjson.dumps(data, default=str)
+                return SERIALIZER_JSON, json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+            except (TypeError, ValueError, OverflowError):
+                # e.g. non-string dict keys or out-of-range integers
+                pass
+        return SERIALIZER_PICKLE, pickle.dumps(data)
+
+    @staticmethod
+    def deserialize(serializer: int, payload: memoryview) -> Any:
+        """Value from a serializer id and its payload."""
+        if serializer == SERIALIZER_RAW:
+            return bytes(payload)
+        if serializer == SERIALIZER_MSGPACK:
+            if not MSGPACK_AVAILABLE:
+                raise ValueError("msgpack cache entry but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        if serializer == SERIALIZER_JSON:
+            return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(bytes(payload))
+        if serializer == SERIALIZER_PICKLE:
+            return pickle.loads(payload)
+        raise ValueError(f"Unknown cache serializer id: {serializer}")
+
+    # ------------------------------------------------------------------
+    # Entries
+    # ------------------------------------------------------------------
+
+    def encode(self, data: Any, key_type: Optional[str] = None, compress: bool = True) -> bytes:
+        """Serialize a value and compress it when configured and worthwhile."""
+        serializer, payload = self.serialize(data)
+        compression, dictionary_id = COMPRESSION_NONE, 0
+
+        if compress and self.compression != COMPRESSION_NONE and len(payload) >= self.min_compress_bytes:
+            if self.compression == COMPRESSION_ZSTD:
+                dictionary_id = self.active_dictionaries.get(key_type, 0) if key_type else 0
+                compressed = self._compressor(dictionary_id).compress(payload)
+            else:
+                compressed = gzip.compress(payload, compresslevel=min(self.compression_level, 9))
+            if len(compressed) < len(payload):
+                compression, payload = self.compression, compressed
+            else:
+                dictionary_id = 0
+
+        return b"".join((_HEADER.pack(CACHE_ENTRY_MAGIC, serializer, compression, dictionary_id), payload))
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Value of an entry written by encode().
+
+        Raises:
+            KeyError: The entry needs a compression dictionary not loaded here
+            ValueError: Malformed entry or codec package missing
+        """
+        if not is_codec_entry(data):
+            raise ValueError("Not a cache codec entry")
+        _, serializer, compression, dictionary_id = _HEADER.unpack_from(data)
+        payload = memoryview(data)[_HEADER.size:]
+
+        if compression == COMPRESSION_ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("zstd cache entry but zstandard is not installed")
+            if dictionary_id and dictionary_id not in self.dictionaries:
+                raise KeyError(dictionary_id)
+            payload = memoryview(self._decompressor(dictionary_id).decompress(payload))
+        elif compression == COMPRESSION_GZIP:
+            payload = memoryview(gzip.decompress(payload))
+        elif compression != COMPRESSION_NONE:
+            raise ValueError(f"Unknown cache compression id: {compression}")
+
+        return self.deserialize(serializer, payload)
+
+    @staticmethod
+    def entry_dictionary_id(data: bytes) -> int:
+        """Compression dictionary an entry was written with (0 for none)."""
+        return _HEADER.unpack_from(data)[3] if is_codec_entry(data) else 0
+
+    # ------------------------------------------------------------------
+    # Compression dictionaries
+    # ------------------------------------------------------------------
+
+    def train_dictionary(self, samples: Iterable[Any], dict_size: int = 16384) -> Any:
+        """Train a zstd dictionary on serialized sample values of one key type."""
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstandard is not installed")
+        payloads: List[bytes] = [bytes(self.serialize(sample)[1]) for sample in samples]
+        return zstandard.train_dictionary(dict_size, payloads)
+
+    def add_dictionary(self, dictionary: Any, key_type: Optional[str] = None) -> int:
+        """Register a dictionary (object or raw bytes); with key_type it becomes that type's active one."""
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstandard is not installed")
+        if isinstance(dictionary, (bytes, bytearray, memoryview)):
+            dictionary = zstandard.ZstdCompressionDict(bytes(dictionary))
+        dictionary_id = dictionary.dict_id()
+        self.dictionaries[dictionary_id] = dictionary
+        if key_type:
+            self.active_dictionaries[key_type] = dictionary_id
+        return dictionary_id
+
+    def _compressor(self, dictionary_id: int):
+        compressor = self._compressors.get(dictionary_id)
+        if compressor is None:
+            dictionary = self.dictionaries.get(dictionary_id) if dictionary_id else None
+            compressor = self._compressors[dictionary_id] = zstandard.ZstdCompressor(
+                level=self.compression_level, dict_data=dictionary
+            )
+        return compressor
+
+    def _decompressor(self, dictionary_id: int):
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            dictionary = self.dictionaries[dictionary_id] if dictionary_id else None
+            decompressor = self._decompressors[dictionary_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+        return decompressor
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Codec configuration and loaded dictionaries."""
+        return {
+            "serializer": {v: k for k, v in SERIALIZER_NAMES.items()}[self.serializer],
+            "compression": {v: k for k, v in COMPRESSION_NAMES.items()}[self.compression],
+            "min_compress_bytes": self.min_compress_bytes,
+            "dictionaries": len(self.dictionaries),
+            "active_dictionaries": dict(self.active_dictionaries)
+        }
@@ -0,0 +1,189 @@
+"""
+Tag-based cache invalidation over Redis.
+
+Cached entries register in one Redis set per tag (patient id, tenant, resource
+type, cache key type ...) as they are written. Invalidating a tag deletes the
+set's members and the set in a single Lua script, so the cost is proportional
+to the entries affected instead of a KEYS scan of the whole keyspace.
+
+Every invalidation is also broadcast on a pub/sub channel with the keys it
+deleted; each worker's listener evicts its in-process copies of those keys.
+Keys rather than tags are broadcast because local copies filled from Redis
+reads do not know which tags their entry was written with.
+
+Tag sets expire with their longest-lived member. Members whose entries expired
+earlier stay in the set until then and are deleted harmlessly on invalidation.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import structlog
+
+logger = structlog.get_logger()
+
+INVALIDATION_CHANNEL = "cache:invalidations"
+TAG_KEY_PREFIX = "cache:tag:"
+
+# KEYS[1] entry key, KEYS[2..n] tag sets; ARGV[1] ttl seconds, ARGV[2] value
+_STORE_TAGGED = """
+redis.call('setex', KEYS[1], ARGV[1], ARGV[2])
+for i = 2, #KEYS do
+    redis.call('sadd', KEYS[i], KEYS[1])
+    if redis.call('ttl', KEYS[i]) < tonumber(ARGV[1]) then
+        redis.call('expire', KEYS[i], ARGV[1])
+    end
+end
+return 1
+"""
+
+# KEYS tag sets; deletes every member, then the sets.
+# Returns {entries deleted, {distinct member keys}}
+_INVALIDATE_TAGS = """
+local deleted = 0
+local seen = {}
+local keys = {}
+for i = 1, #KEYS do
+    local members = redis.call('smembers', KEYS[i])
+    for j = 1, #members, 1000 do
+        deleted = deleted + redis.call('unlink', unpack(members, j, math.min(j + 999, #members)))
+    end
+    for _, member in ipairs(members) do
+        if not seen[member] then
+            seen[member] = true
+            keys[#keys + 1] = member
+        end
+    end
+    redis.call('unlink', KEYS[i])
+end
+return {deleted, keys}
+"""
+
+# Called with the invalidated cache keys, or None when every local entry must go
+InvalidationListener = Callable[[Optional[List[str]]], None]
+
+
+class TagInvalidator:
+    """Tag index and invalidation broadcast for one Redis client."""
+
+    def __init__(
+        self,
+        client,
+        channel: str = INVALIDATION_CHANNEL,
+        key_prefix: str = TAG_KEY_PREFIX
+    ):
+        """
+        Initialize the invalidator.
+
+        Args:
+            client: redis.asyncio client (bytes or decoded responses)
+            channel: Pub/sub channel shared by all workers
+            key_prefix: Key prefix of the tag sets
+        """
+        self.client = client
+        self.channel = channel
+        self.key_prefix = key_prefix
+        self.instance_id = uuid.uuid4().hex
+        self._store_tagged = client.register_script(_STORE_TAGGED)
+        self._invalidate_tags = client.register_script(_INVALIDATE_TAGS)
+        self._listeners: List[InvalidationListener] = []
+        self._listen_task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, int] = {
+            "invalidations": 0,
+            "keys_deleted": 0,
+            "broadcasts_received": 0,
+            "listener_errors": 0
+        }
+
+    def tag_key(self, tag: str) -> str:
+        """Redis key of a tag's member set."""
+        return f"{self.key_prefix}{tag}"
+
+    def add_listener(self, listener: InvalidationListener) -> None:
+        """Register an in-process cache to evict on every invalidation."""
+        self._listeners.append(listener)
+
+    async def store(self, key: str, value: Any, ttl_seconds: int, tags: Sequence[str] = ()) -> None:
+        """SETEX an entry and add it to its tag sets atomically."""
+        await self._store_tagged(
+            keys=[key, *(self.tag_key(tag) for tag in tags)],
+            args=[int(ttl_seconds), value]
+        )
+
+    async def invalidate(self, tags: Sequence[str]) -> int:
+        """Delete every entry registered under any of ``tags`` on all workers."""
+        tags = list(dict.fromkeys(tags))
+        if not tags:
+            return 0
+
+        deleted, keys = await self._invalidate_tags(keys=[self.tag_key(tag) for tag in tags])
+        keys = [key.decode("utf-8") if isinstance(key, bytes) else key for key in keys]
+
+        # This worker evicts directly; the broadcast is for the others
+        self._notify(keys)
+        if keys:
+            await self.client.publish(self.channel, json.dumps({
+                "origin": self.instance_id, "tags": tags, "keys": keys
+            }))
+
+        self.metrics["invalidations"] += 1
+        self.metrics["keys_deleted"] += deleted
+        logger.info("Cache tag invalidation", tags=tags, deleted_count=deleted)
+        return deleted
+
+    async def start(self) -> None:
+        """Start listening for invalidations broadcast by other workers."""
+        if self._listen_task is None:
+            self._listen_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop the broadcast listener."""
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            await asyncio.gather(self._listen_task, return_exceptions=True)
+            self._listen_task = None
+
+    async def _listen(self) -> None:
+        resubscribing = False
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                if resubscribing:
+                    # Broadcasts may have been missed while disconnected
+                    self._notify(None)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Cache invalidation listener disconnected", error=str(e))
+                resubscribing = True
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.reset()
+
+    def _handle_message(self, data: Any) -> None:
+        try:
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            payload = json.loads(data)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning("Malformed cache invalidation broadcast")
+            return
+
+        if payload.get("origin") == self.instance_id:
+            return
+        self.metrics["broadcasts_received"] += 1
+        self._notify(payload.get("keys") or [])
+
+    def _notify(self, tags: Optional[List[str]]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(tags)
+            except Exception as e:
+                self.metrics["listener_errors"] += 1
+                logger.error("Cache invalidation listener failed", error=str(e))
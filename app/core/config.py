@@ -25,6 +25,12 @@ class Settings(BaseSettings):
     )
     DATABASE_POOL_SIZE: int = Field(default=5, description="DB connection pool size")
     DATABASE_MAX_OVERFLOW: int = Field(default=10, description="DB max overflow")
+    DATABASE_READ_REPLICA_URLS: List[str] = Field(default=[], description="Read replica connection strings for read-only sessions")
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, description="Replication lag above which a replica leaves rotation")
+    DATABASE_REPLICA_HEALTH_CHECK_INTERVAL: float = Field(default=10.0, description="Seconds between replica health checks")
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = Field(default=5.0, description="Reads stay on the primary this long after a write in the same request")
+    DATABASE_FANOUT_MAX_CONCURRENCY: int = Field(default=4, description="Independent read queries of one request run concurrently, each holding its own pooled connection")
+    DATABASE_FANOUT_QUERY_TIMEOUT_SECONDS: float = Field(default=5.0, description="Deadline of each fanned-out read query before it resolves to its fallback")
     
     # IRIS API Configuration
     IRIS_API_BASE_URL: str = Field(
@@ -50,11 +56,41 @@ class Settings(BaseSettings):
         default_factory=lambda: secrets.token_urlsafe(16),
         description="Encryption salt for key derivation"
     )
+    PHI_DECRYPT_THREAD_POOL_SIZE: int = Field(default=4, description="Threads for bulk PHI decryption")
+    PHI_DECRYPT_CHUNK_SIZE: int = Field(default=64, description="Ciphertexts per bulk decryption task")
+    PHI_KEY_CACHE_MAX_SIZE: int = Field(default=10000, description="Max cached per-patient PHI field keys")
+    PHI_KEY_CACHE_TTL_SECONDS: int = Field(default=3600, description="Lifetime of cached derived PHI keys")
+    PATIENT_BULK_IMPORT_CHUNK_SIZE: int = Field(default=2000, description="Patients per bulk import chunk (one transaction and audit record each)")
+    PATIENT_BULK_IMPORT_USE_COPY: bool = Field(default=True, description="Write bulk imports with COPY when the driver supports it")
     
     # Audit Logging
     ENABLE_AUDIT_LOGGING: bool = Field(default=True, description="Enable audit logging")
     AUDIT_LOG_RETENTION_DAYS: int = Field(default=2555, description="7 years retention")
     AUDIT_LOG_ENCRYPTION: bool = Field(default=True, description="Encrypt audit logs")
+    AUDIT_CHAIN_VERIFY_BATCH_SIZE: int = Field(default=5000, description="Rows fetched per server-side cursor batch during audit chain verification")
+    AUDIT_CHAIN_VERIFY_WORKERS: int = Field(default=4, description="Worker processes for parallel segmented audit chain verification")
+    AUDIT_SPOOL_ENABLED: bool = Field(default=True, description="Write audit events to a durable local spool before the database")
+    AUDIT_SPOOL_DIR: str = Field(default="data/audit_spool", description="Base directory for audit spool segment files (one slot per process)")
+    AUDIT_SPOOL_SEGMENT_MAX_BYTES: int = Field(default=64 * 1024 * 1024, description="Audit spool segment rotation size")
+    AUDIT_SPOOL_GROUP_COMMIT_MS: float = Field(default=2.0, description="Window for batching concurrent audit appends into one fsync")
+    AUDIT_SPOOL_FSYNC: bool = Field(default=True, description="fsync audit spool writes (disable only for tests)")
+    AUDIT_SPOOL_DRAIN_BATCH_SIZE: int = Field(default=2000, description="Audit spool records loaded into the database per transaction")
+    AUDIT_SPOOL_DRAIN_INTERVAL_SECONDS: float = Field(default=0.5, description="Audit spool drainer idle poll interval")
+    AUDIT_SPOOL_BACKLOG_WARNING_RECORDS: int = Field(default=100000, description="Undrained audit spool records that signal backpressure")
+    AUDIT_PARTITION_MONTHS_AHEAD: int = Field(default=3, description="Future monthly audit_logs/phi_access_logs partitions kept in place")
+    AUDIT_PARTITION_ARCHIVE_AFTER_MONTHS: int = Field(default=0, description="Archive audit partitions older than this many months (0 keeps all online)")
+    AUDIT_ARCHIVE_DIR: str = Field(default="data/audit_archive", description="Local directory for Parquet archives of detached audit partitions")
+    AUDIT_ARCHIVE_UPLOAD_TO_DATA_LAKE: bool = Field(default=False, description="Upload audit partition archives to the data lake audit bucket")
+    COMPLIANCE_ROLLUPS_ENABLED: bool = Field(default=True, description="Build compliance reports from columnar audit rollups instead of live aggregate queries")
+    COMPLIANCE_ROLLUP_DIR: str = Field(default="data/compliance_rollups", description="Directory for daily audit rollup Parquet files")
+    COMPLIANCE_ROLLUP_SETTLE_MINUTES: int = Field(default=60, description="Minutes after midnight before the previous day is rolled up")
+    SIEM_EXPORT_DESTINATION: Optional[str] = Field(default=None, description="Streaming SIEM export sink (file:///path, tcp://host:port or tcp+tls://host:port); disabled when unset")
+    SIEM_EXPORT_FORMAT: str = Field(default="cef", description="Streaming SIEM export record format (cef/leef/json)")
+    SIEM_EXPORT_BATCH_SIZE: int = Field(default=500, description="Audit rows read, encoded and delivered per SIEM batch")
+    SIEM_EXPORT_MAX_RETRIES: int = Field(default=5, description="Delivery retries per SIEM batch before the run fails")
+    SIEM_EXPORT_RETRY_BACKOFF_SECONDS: float = Field(default=1.0, description="First SIEM delivery retry delay, doubled per attempt")
+    SIEM_EXPORT_SETTLE_SECONDS: float = Field(default=5.0, description="Lag behind the wall clock so in-flight audit writes are not skipped")
+    SIEM_EXPORT_MAX_PENDING_BATCHES: int = Field(default=4, description="Encoded SIEM batches buffered ahead of a slow sink")
     
     # Purge Scheduler
     PURGE_CHECK_INTERVAL_MINUTES: int = Field(default=60, description="Purge check interval")
@@ -67,6 +103,27 @@ class Settings(BaseSettings):
         description="Redis connection string"
     )
     
+    # Event bus transport
+    EVENT_BUS_TRANSPORT: str = Field(default="memory", description="HybridEventBus transport: memory (single node) or redis_streams")
+    EVENT_BUS_REDIS_URL: Optional[str] = Field(default=None, description="Redis for the event bus streams (defaults to REDIS_URL)")
+    EVENT_BUS_STREAM_PREFIX: str = Field(default="healthcare:events", description="Key prefix of event bus partition streams")
+    EVENT_BUS_STREAM_PARTITIONS: int = Field(default=16, description="Event bus stream partitions (aggregates hash to one; the unit of ordering and scaling)")
+    EVENT_BUS_CONSUMER_GROUP: str = Field(default="event-bus", description="Redis Streams consumer group shared by all nodes")
+    EVENT_BUS_STREAM_MAXLEN: int = Field(default=1000000, description="Approximate entries retained per partition stream")
+    EVENT_BUS_PARTITION_LEASE_MS: int = Field(default=15000, description="Partition ownership lease; a dead node's partitions move after this long")
+    EVENT_BUS_AGGREGATE_QUEUE_SIZE: int = Field(default=10000, description="In-memory events queued per aggregate before its publishers get backpressure")
+    EVENT_BUS_BACKPRESSURE: str = Field(default="wait", description="Publisher backpressure when in-memory queues are full: wait (up to the timeout) or reject (immediately); rejected events go to the outbox")
+    EVENT_BUS_BACKPRESSURE_TIMEOUT_SECONDS: float = Field(default=1.0, description="Longest a publisher waits for queue space in wait mode")
+    EVENT_CODEC: str = Field(default="orjson", description="Event envelope codec: orjson, msgpack or json (stdlib)")
+    EVENT_OUTBOX_RELAY_WORKERS: int = Field(default=4, description="Concurrent outbox relay workers per process (claims use SKIP LOCKED, so instances scale out; 0 disables)")
+    EVENT_OUTBOX_BATCH_SIZE: int = Field(default=100, description="Outbox rows claimed per relay batch")
+    EVENT_OUTBOX_POLL_INTERVAL_SECONDS: float = Field(default=1.0, description="Outbox relay idle poll interval (fallback when LISTEN/NOTIFY is on)")
+    EVENT_OUTBOX_LISTEN_NOTIFY: bool = Field(default=True, description="Wake the outbox relay via PostgreSQL LISTEN/NOTIFY instead of waiting for the next poll")
+    EVENT_OUTBOX_MAX_ATTEMPTS: int = Field(default=10, description="Outbox publish attempts before an event is dead-lettered")
+    EVENT_SNAPSHOT_EVERY: int = Field(default=500, description="Events folded between aggregate snapshots during replay")
+    EVENT_REPLAY_WORKERS: int = Field(default=8, description="Aggregates replayed concurrently when rebuilding projections")
+    EVENT_REPLAY_BATCH_SIZE: int = Field(default=1000, description="Event store rows read per replay batch")
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = Field(
         default=["http://localhost:3000", "http://localhost:8000"],
@@ -124,6 +181,15 @@ class Settings(BaseSettings):
     REDIS_CACHE_TTL: int = Field(default=3600, description="Redis cache TTL")
     ENABLE_QUERY_RESULT_CACHING: bool = Field(default=True, description="Enable query result caching")
     CACHE_WARMUP_ENABLED: bool = Field(default=True, description="Enable cache warmup")
+    CACHE_LOCAL_TIER_ENABLED: bool = Field(default=True, description="Serve hot cache entries from a per-process LRU in front of Redis")
+    CACHE_LOCAL_MAX_SIZE: int = Field(default=5000, description="Max entries in the per-process cache tier")
+    CACHE_CODEC: str = Field(default="orjson", description="Cache entry serializer: orjson, msgpack or json (stdlib)")
+    CACHE_COMPRESSION: str = Field(default="zstd", description="Cache entry compression: zstd, gzip or none")
+    CACHE_COMPRESSION_MIN_BYTES: int = Field(default=256, description="Cache payloads smaller than this are stored uncompressed")
+    CACHE_COMPRESSION_LEVEL: int = Field(default=3, description="zstd/gzip level for cache entries")
+    DASHBOARD_PROJECTION_ENABLED: bool = Field(default=True, description="Serve dashboard counters and activities from the event-driven projection instead of per-request aggregates")
+    DASHBOARD_PROJECTION_MAX_ACTIVITIES: int = Field(default=500, description="Recent activities kept by the dashboard projection")
+    DASHBOARD_RECONCILE_INTERVAL_SECONDS: float = Field(default=300.0, description="Time between rebuilds of the dashboard projection from the database")
     
     # Phase 5 Security Enhancements
     ADVANCED_THREAT_DETECTION: bool = Field(default=True, description="Enable advanced threat detection")
@@ -146,6 +212,11 @@ class Settings(BaseSettings):
     LOG_AUDIT_LEVEL: str = Field(default="INFO", description="Audit log level")
     LOG_SECURITY_LEVEL: str = Field(default="WARNING", description="Security log level")
     LOG_PHI_ACCESS: bool = Field(default=True, description="Log PHI access")
+    PHI_AUDIT_BUFFER_CAPACITY: int = Field(default=10000, description="PHI access records buffered between the request path and the audit writer")
+    PHI_AUDIT_OVERFLOW_POLICY: str = Field(default="fail_closed", description="When the PHI audit buffer is full: fail_closed (503), drop_oldest or drop_newest")
+    PHI_AUDIT_BATCH_SIZE: int = Field(default=200, description="PHI access records enriched and persisted per writer batch")
+    PHI_AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(default=0.5, description="Longest a captured PHI access record waits before being persisted")
+    PHI_AUDIT_FALLBACK_DIR: str = Field(default="/var/log/healthcare/phi_audit_fallback", description="JSONL fallback for PHI access records the audit pipeline rejected")
     LOG_COMPLIANCE_EVENTS: bool = Field(default=True, description="Log compliance events")
     
     # Security Headers Configuration
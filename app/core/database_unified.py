@@ -4,10 +4,11 @@ This file replaces both database.py and database_advanced.py to eliminate confli
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, Session
+from sqlalchemy import event, exc
 from sqlalchemy import (
-    DateTime, String, Boolean, Text, Integer, JSON, UUID, 
-    ForeignKey, Enum, CheckConstraint, Index, text
+    DateTime, String, Boolean, Text, Integer, BigInteger, JSON, UUID, LargeBinary,
+    ForeignKey, Enum, CheckConstraint, Index, DDL, text
 )
 from sqlalchemy.dialects.postgresql import ARRAY, INET
 from sqlalchemy import TypeDecorator
@@ -19,6 +20,10 @@ import uuid
 import enum
 import asyncio
 import sys
+import time
+import itertools
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 # Import asyncpg explicitly to ensure it's available
 import asyncpg
 
@@ -204,6 +209,7 @@ class AuditEventType(enum.Enum):
     PATIENT_UPDATED = "PATIENT_UPDATED"
     PATIENT_ACCESSED = "PATIENT_ACCESSED"
     PATIENT_SEARCH = "PATIENT_SEARCH"
+    PATIENT_BULK_IMPORTED = "PATIENT_BULK_IMPORTED"
     
     # Clinical Document Events
     DOCUMENT_CREATED = "DOCUMENT_CREATED"
@@ -415,9 +421,10 @@ class RolePermission(BaseModel):
 class AuditLog(BaseModel):
     """Immutable audit log entries for SOC2/HIPAA compliance."""
     __tablename__ = "audit_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (timestamp)"}
     
-    # Event identification
-    timestamp: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), index=True)
+    # Event identification (timestamp is the monthly partition key, so it is part of the primary key)
+    timestamp: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None), primary_key=True, index=True)
     event_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     
     # Enterprise SOC2 compliance fields
@@ -461,7 +468,94 @@ class AuditLog(BaseModel):
     # Blockchain-style integrity (for compliance)
     previous_log_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     log_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # Made optional for flexibility
-    sequence_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    sequence_number: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)  # Chain position; set only by append_audit_rows
+
+class AuditChainCheckpoint(BaseModel):
+    """Signed high-water mark of a verified audit hash chain prefix."""
+    __tablename__ = "audit_chain_checkpoints"
+    
+    chain_name: Mapped[str] = mapped_column(String(100), nullable=False, default="audit_logs")
+    last_sequence_number: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)  # Resume point; NULL on legacy checkpoints
+    last_log_id: Mapped[uuid.UUID] = mapped_column(UUIDType(), nullable=False)
+    last_timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_log_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    records_verified: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    signature: Mapped[str] = mapped_column(String(64), nullable=False)
+    
+    __table_args__ = (
+        Index('idx_audit_chain_checkpoints_chain_created', 'chain_name', 'created_at'),
+    )
+
+class SIEMExportCursor(BaseModel):
+    """Persisted high-water mark of a streaming SIEM export."""
+    __tablename__ = "siem_export_cursors"
+    
+    export_name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    last_timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_log_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUIDType(), nullable=True)
+    events_exported: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+# =============================================================================
+# EVENT STORE MODELS
+# =============================================================================
+
+class EventStoreRecord(Base):
+    """Append-only domain event log of the HybridEventBus."""
+    __tablename__ = "event_store"
+
+    sequence: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    aggregate_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    aggregate_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_class: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    event_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    correlation_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    causation_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    __table_args__ = (
+        Index('idx_event_store_aggregate_sequence', 'aggregate_id', 'sequence'),
+    )
+
+class EventOutboxEntry(Base):
+    """Transactional outbox row awaiting relay to the event bus (ids give delivery order)."""
+    __tablename__ = "event_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    aggregate_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_class: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_data: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    delivered_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_event_outbox_claim', 'status', 'available_at', 'id'),
+        Index('idx_event_outbox_aggregate_pending', 'aggregate_id', 'id', postgresql_where=text("status = 'pending'")),
+    )
+
+class AggregateSnapshot(Base):
+    """Latest folded state of an aggregate for one projection (replay resumes after last_sequence)."""
+    __tablename__ = "aggregate_snapshots"
+
+    aggregate_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    projection: Mapped[str] = mapped_column(String(100), primary_key=True)
+    aggregate_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    schema_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    aggregate_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_sequence: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    state_codec: Mapped[str] = mapped_column(String(20), nullable=False)
+    state: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
 
 # =============================================================================
 # HEALTHCARE RECORDS MODELS
@@ -481,6 +575,12 @@ class Patient(BaseModel, SoftDeleteMixin):
     date_of_birth_encrypted: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     ssn_encrypted: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
+    # Blind indexes (keyed HMAC) for equality search over encrypted PHI
+    mrn_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    date_of_birth_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    phone_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    blind_index_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
     # Basic patient information
     gender: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -535,6 +635,22 @@ class Patient(BaseModel, SoftDeleteMixin):
         lazy="select"
     )
 
+class PatientSearchToken(Base):
+    """Blind-indexed patient name token (and its prefixes) for encrypted name search."""
+    __tablename__ = "patient_search_tokens"
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUIDType(), primary_key=True, default=uuid.uuid4)
+    patient_id: Mapped[uuid.UUID] = mapped_column(
+        UUIDType(), ForeignKey("patients.id", ondelete="CASCADE"), nullable=False
+    )
+    field: Mapped[str] = mapped_column(String(32), nullable=False)
+    token_bidx: Mapped[str] = mapped_column(String(64), nullable=False)
+    
+    __table_args__ = (
+        Index('idx_patient_search_tokens_lookup', 'token_bidx', 'field', 'patient_id'),
+        Index('idx_patient_search_tokens_patient', 'patient_id', 'field'),
+    )
+
 class ClinicalDocument(BaseModel, SoftDeleteMixin):
     """Clinical documents with FHIR compliance."""
     __tablename__ = "clinical_documents"
@@ -663,8 +779,8 @@ class PHIAccessLog(BaseModel):
     risk_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     flagged_for_review: Mapped[bool] = mapped_column(Boolean, default=False)
     
-    # Timing
-    access_started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Timing (access_started_at is the monthly partition key, so it is part of the primary key)
+    access_started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, nullable=False)
     access_ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Relationships
@@ -680,6 +796,7 @@ class PHIAccessLog(BaseModel):
         Index('idx_patient_access_audit', 'patient_id', 'access_started_at'),
         Index('idx_user_access_audit', 'user_id', 'access_started_at'),
         Index('idx_unusual_access', 'unusual_access_pattern', 'flagged_for_review'),
+        {"postgresql_partition_by": "RANGE (access_started_at)"},
     )
 
 # =============================================================================
@@ -1175,6 +1292,7 @@ async def get_session_factory():
         async_session_factory = async_sessionmaker(
             bind=engine,      # SQLAlchemy 2.0+ requires named bind parameter
             class_=AsyncSession,
+            sync_session_class=PrimarySession,  # Tracks writes for read-your-writes routing
             expire_on_commit=False,
             autoflush=False,  # Manual flush control for enterprise transactions
             autocommit=False, # Explicit transaction control for SOC2 compliance
@@ -1237,6 +1355,273 @@ async def get_async_session_factory():
     """Get the main async session factory for performance testing."""
     return await get_session_factory()
 
+# =============================================================================
+# READ REPLICA ROUTING
+# =============================================================================
+
+@dataclass
+class _RoutingState:
+    """Per-request routing state shared with tasks spawned by the request."""
+    last_write_at: Optional[float] = None
+
+
+_routing_state: ContextVar[Optional[_RoutingState]] = ContextVar("db_routing_state", default=None)
+
+
+def ensure_routing_scope() -> _RoutingState:
+    """
+    Get the current request's routing state, creating it if needed.
+    
+    Called by the session dependencies so child tasks of the request share
+    one mutable state object and see each other's writes.
+    """
+    state = _routing_state.get()
+    if state is None:
+        state = _RoutingState()
+        _routing_state.set(state)
+    return state
+
+
+def mark_primary_write() -> None:
+    """Record a write so reads in this request stick to the primary."""
+    ensure_routing_scope().last_write_at = time.monotonic()
+
+
+def should_read_from_primary() -> bool:
+    """True while a write made earlier in this request may not have replicated yet."""
+    state = _routing_state.get()
+    if state is None or state.last_write_at is None:
+        return False
+    window = get_settings().DATABASE_READ_YOUR_WRITES_SECONDS
+    return time.monotonic() - state.last_write_at < window
+
+
+class PrimarySession(Session):
+    """Session class for the primary engine; flushes and DML mark the request as written."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _track_primary_flush(session, flush_context):
+    mark_primary_write()
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _track_primary_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_primary_write()
+
+
+def _to_async_url(database_url: str) -> str:
+    """Normalize a database URL to an async driver."""
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if database_url.startswith("postgres://"):
+        return database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if database_url.startswith("sqlite://"):
+        return database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return database_url
+
+
+# Replay lag in seconds; 0 when the replica has replayed everything it received
+_POSTGRES_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+@dataclass
+class ReplicaState:
+    """Health and lag of one read replica."""
+    url: str
+    engine: Any
+    session_factory: Any
+    healthy: bool = True
+    lag_seconds: float = 0.0
+    last_checked: float = 0.0
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to healthy read replicas.
+    
+    Replicas are health-checked at most once per interval. A replica is
+    taken out of rotation when its health query fails or its replay lag
+    exceeds the threshold; when none are usable, reads go to the primary.
+    """
+    
+    def __init__(
+        self,
+        replica_urls: List[str],
+        max_lag_seconds: float = 5.0,
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 2.0,
+        pool_size: int = 5,
+        max_overflow: int = 10
+    ):
+        self.max_lag_seconds = max_lag_seconds
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.replicas = [
+            self._create_replica(url, pool_size, max_overflow) for url in replica_urls
+        ]
+        self._round_robin = itertools.count()
+        self._health_lock = asyncio.Lock()
+        self._last_health_check = 0.0
+    
+    @staticmethod
+    def _create_replica(url: str, pool_size: int, max_overflow: int) -> ReplicaState:
+        async_url = _to_async_url(url)
+        engine_kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+        if async_url.startswith("postgresql"):
+            engine_kwargs.update(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_recycle=600,
+                pool_timeout=15,
+                connect_args={
+                    "server_settings": {
+                        "application_name": "healthcare_backend_replica",
+                        "default_transaction_read_only": "on",
+                        "statement_timeout": "60s",
+                        "jit": "off"
+                    },
+                    "command_timeout": 30
+                }
+            )
+        replica_engine = create_async_engine(async_url, **engine_kwargs)
+        session_factory = async_sessionmaker(
+            bind=replica_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+            info={"read_only": True, "replica_url": replica_engine.url.render_as_string(hide_password=True)}
+        )
+        return ReplicaState(url=async_url, engine=replica_engine, session_factory=session_factory)
+    
+    async def _measure_lag(self, replica: ReplicaState) -> float:
+        """Replication lag in seconds; stand-ins without replication report 0."""
+        async with replica.engine.connect() as conn:
+            if replica.engine.dialect.name == "postgresql":
+                lag = (await conn.execute(_POSTGRES_REPLICA_LAG_SQL)).scalar()
+                return float(lag or 0)
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+    
+    async def _check_replica(self, replica: ReplicaState) -> None:
+        try:
+            lag = await asyncio.wait_for(self._measure_lag(replica), timeout=self.health_check_timeout)
+            replica.lag_seconds = lag
+            replica.healthy = lag <= self.max_lag_seconds
+            replica.consecutive_failures = 0
+            replica.last_error = None if replica.healthy else f"replication lag {lag:.1f}s"
+        except Exception as e:
+            replica.healthy = False
+            replica.consecutive_failures += 1
+            replica.last_error = str(e) or type(e).__name__
+        replica.last_checked = time.monotonic()
+        if not replica.healthy:
+            logger.warning(
+                "Read replica out of rotation",
+                replica=replica.engine.url.render_as_string(hide_password=True),
+                reason=replica.last_error,
+                consecutive_failures=replica.consecutive_failures
+            )
+    
+    async def check_health(self, force: bool = False) -> None:
+        """Refresh replica health if the check interval has elapsed."""
+        if not force and time.monotonic() - self._last_health_check < self.health_check_interval:
+            return
+        async with self._health_lock:
+            # Another request may have refreshed while we waited for the lock
+            if not force and time.monotonic() - self._last_health_check < self.health_check_interval:
+                return
+            await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+            self._last_health_check = time.monotonic()
+    
+    async def pick(self) -> Optional[ReplicaState]:
+        """Next healthy replica in round-robin order, or None to use the primary."""
+        await self.check_health()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+    
+    def report_failure(self, replica: ReplicaState, error: Exception) -> None:
+        """Take a replica out of rotation until its next successful health check."""
+        replica.healthy = False
+        replica.consecutive_failures += 1
+        replica.last_error = str(error) or type(error).__name__
+        logger.warning(
+            "Read replica failed during query",
+            replica=replica.engine.url.render_as_string(hide_password=True),
+            error=replica.last_error
+        )
+    
+    def get_status(self) -> List[Dict[str, Any]]:
+        """Replica health snapshot for health endpoints."""
+        return [
+            {
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "consecutive_failures": replica.consecutive_failures,
+                "last_error": replica.last_error
+            }
+            for replica in self.replicas
+        ]
+    
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await _safe_engine_dispose(replica.engine)
+
+
+_replica_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """Get the replica router, or None when no replicas are configured."""
+    global _replica_router
+    if _replica_router is None:
+        settings = get_settings()
+        if not settings.DATABASE_READ_REPLICA_URLS:
+            return None
+        _replica_router = ReplicaRouter(
+            settings.DATABASE_READ_REPLICA_URLS,
+            max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+            health_check_interval=settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW
+        )
+        logger.info("Read replica routing enabled", replicas=len(_replica_router.replicas))
+    return _replica_router
+
+
+async def get_readonly_session_factory():
+    """
+    Session factory for read-only work.
+    
+    Returns a healthy replica's factory, or the primary factory when no
+    replica is configured or usable, or when this request has written and
+    the read-your-writes window is still open.
+    
+    Returns:
+        Tuple of (session factory, ReplicaState or None for the primary)
+    """
+    if should_read_from_primary():
+        return await get_session_factory(), None
+    router = get_replica_router()
+    if router is not None:
+        replica = await router.pick()
+        if replica is not None:
+            return replica.session_factory, replica
+        logger.warning("No healthy read replica, reading from primary")
+    return await get_session_factory(), None
+
 class DatabaseSessionManager:
     """
     Enterprise database session manager with proper connection pool management.
@@ -1640,15 +2025,37 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         else:
             raise
     
+    ensure_routing_scope()
     session_factory = await get_session_factory()
     
     # Use healthcare-grade session manager for compliance with event loop protection
     async with HealthcareSessionManager(session_factory) as session:
         yield session
 
-def get_db_session():
+async def get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database dependency for dashboards, analytics and audit queries.
+    
+    Routes to a healthy read replica, falling back to the primary. Do not
+    write through this session; use get_db for endpoints that write.
+    """
+    ensure_routing_scope()
+    session_factory, replica = await get_readonly_session_factory()
+    
+    async with HealthcareSessionManager(session_factory) as session:
+        try:
+            yield session
+        except (OSError, asyncpg.PostgresConnectionError, exc.OperationalError, exc.InterfaceError) as e:
+            # Connection-level failure: stop routing to this replica until it recovers
+            if replica is not None:
+                get_replica_router().report_failure(replica, e)
+            raise
+
+def get_db_session(readonly: bool = False):
     """Get database session context manager for manual transaction control.
     
+    Pass readonly=True from read-only services to route to a read replica.
+    
     Returns a context manager that handles proper database session lifecycle:
     - Automatic session creation and cleanup
     - Guaranteed session.close() calls to prevent connection pool warnings
@@ -1664,7 +2071,10 @@ def get_db_session():
     # Create an async factory function that can be used as a context manager
     class AsyncSessionFactory:
         async def __aenter__(self):
-            session_factory = await get_session_factory()
+            if readonly:
+                session_factory, _ = await get_readonly_session_factory()
+            else:
+                session_factory = await get_session_factory()
             self.manager = HealthcareSessionManager(session_factory)
             return await self.manager.__aenter__()
             
@@ -2025,7 +2435,7 @@ async def close_db():
     - Connection pool is drained with timeout protection
     - Event loop closure is handled safely
     """
-    global engine, async_session_factory
+    global engine, async_session_factory, _replica_router
     
     if engine is None:
         logger.debug("Database engine already closed")
@@ -2060,6 +2470,11 @@ async def close_db():
             logger.debug("Clearing session factory to prevent new connections")
             async_session_factory = None
         
+        if _replica_router is not None:
+            logger.debug("Disposing read replica engines")
+            await _replica_router.dispose()
+            _replica_router = None
+        
         # Step 2: Wait for active operations to complete
         logger.debug("Waiting for active database operations to complete")
         await asyncio.sleep(0.1)
@@ -2392,6 +2807,19 @@ Index('idx_patients_mrn', Patient.mrn)
 Index('idx_users_email_active', User.email, User.is_active)
 Index('idx_phi_access_patient_user', PHIAccessLog.patient_id, PHIAccessLog.user_id)
 
+# Monthly partitions of the audit tables are managed by
+# app.modules.audit_logger.partitioning; the DEFAULT partition makes a table
+# created by create_all() writable before any monthly partition exists
+for _partitioned_table in (AuditLog.__table__, PHIAccessLog.__table__):
+    event.listen(
+        _partitioned_table,
+        "after_create",
+        DDL(
+            f'CREATE TABLE IF NOT EXISTS "{_partitioned_table.name}_default" '
+            f'PARTITION OF "{_partitioned_table.name}" DEFAULT'
+        ).execute_if(dialect="postgresql")
+    )
+
 # =============================================================================
 # FHIR ENTERPRISE HEALTHCARE RESOURCES
 # =============================================================================
@@ -2523,10 +2951,13 @@ __all__ = [
     "User", "Role", "Permission", "UserRole", "RolePermission",
     
     # Audit and compliance
-    "AuditLog",
+    "AuditLog", "AuditChainCheckpoint", "SIEMExportCursor",
+    
+    # Event store
+    "EventStoreRecord", "EventOutboxEntry", "AggregateSnapshot",
     
     # Healthcare records
-    "Patient", "ClinicalDocument", "Consent", "PHIAccessLog",
+    "Patient", "PatientSearchToken", "ClinicalDocument", "Consent", "PHIAccessLog",
     
     # FHIR Enterprise Resources
     "Appointment", "CarePlan", "Procedure",
@@ -2547,7 +2978,10 @@ __all__ = [
     "Organization",
     
     # Database functions
-    "get_engine", "get_session_factory", "get_db", "get_db_session", "init_db", "close_db", "audit_change", "get_async_session"
+    "get_engine", "get_session_factory", "get_db", "get_db_session", "init_db", "close_db", "audit_change", "get_async_session",
+    
+    # Read replica routing
+    "get_db_readonly", "get_readonly_session_factory", "get_replica_router", "ReplicaRouter", "mark_primary_write"
 ]
 
 # Alias for backwards compatibility with existing imports
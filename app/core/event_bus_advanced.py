@@ -14,17 +14,18 @@ Designed for 10K+ events/second with SOC2 compliance.
 """
 
 import asyncio
+import importlib
 import time
-import json
 import uuid
 import hashlib
+import zlib
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, Callable, Type, Union, Set
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Type, Union, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import defaultdict, deque
 import structlog
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, field_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert, update, delete, and_, or_
 from contextlib import asynccontextmanager
@@ -32,6 +33,7 @@ import weakref
 
 from app.core.config import get_settings
 from app.core.database import get_db
+from app.core.event_codec import ENVELOPE_VERSION, EventCodec, canonical_bytes, codec_for_bytes, decode_envelope, get_event_codec
 
 logger = structlog.get_logger()
 
@@ -80,6 +82,9 @@ class EventMetadata:
     headers: Dict[str, Any] = field(default_factory=dict)
     checksum: Optional[str] = None
 
+# Excluded from checksums
+_VOLATILE_EVENT_FIELDS = frozenset({"timestamp", "retry_count"})
+
 class BaseEvent(BaseModel):
     """Base class for all domain events."""
     
@@ -105,6 +110,37 @@ class BaseEvent(BaseModel):
     # Additional data
     headers: Dict[str, Any] = Field(default_factory=dict)
     
+    # Encoding caches, filled on first use and cleared when a field is assigned
+    # (mutating a nested value such as headers in place is not detected)
+    _payload: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _canonical: Optional[bytes] = PrivateAttr(default=None)
+    _encoded: Dict[str, bytes] = PrivateAttr(default_factory=dict)
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._clear_encoding()
+    
+    def _clear_encoding(self):
+        self._payload = None
+        self._canonical = None
+        self._encoded = {}
+    
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied._clear_encoding()
+        return copied
+    
+    def __eq__(self, other: Any) -> bool:
+        # Field equality; the encoding caches do not take part
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+    
     def get_metadata(self) -> EventMetadata:
         """Extract metadata from event."""
         return EventMetadata(
@@ -122,15 +158,36 @@ class BaseEvent(BaseModel):
             headers=self.headers
         )
     
+    def to_payload(self) -> Dict[str, Any]:
+        """JSON-mode dump of the event, computed once (treat as read-only)."""
+        if self._payload is None:
+            self._payload = self.model_dump(mode="json")
+        return self._payload
+    
+    def canonical_bytes(self) -> bytes:
+        """Codec-independent bytes of the event's content, without volatile fields."""
+        if self._canonical is None:
+            payload = self.to_payload()
+            self._canonical = canonical_bytes({
+                key: value for key, value in payload.items() if key not in _VOLATILE_EVENT_FIELDS
+            })
+        return self._canonical
+    
     def calculate_checksum(self) -> str:
         """Calculate event checksum for integrity verification."""
-        event_dict = self.model_dump()
-        # Remove volatile fields
-        event_dict.pop('timestamp', None)
-        event_dict.pop('retry_count', None)
-        
-        content = json.dumps(event_dict, sort_keys=True)
-        return hashlib.sha256(content.encode()).hexdigest()
+        return hashlib.sha256(self.canonical_bytes()).hexdigest()
+    
+    def encode(self, codec: Optional[EventCodec] = None) -> bytes:
+        """Envelope bytes for a codec (default EVENT_CODEC), encoded once per codec."""
+        codec = codec or get_event_codec()
+        encoded = self._encoded.get(codec.name)
+        if encoded is None:
+            encoded = self._encoded[codec.name] = codec.dumps({
+                "v": ENVELOPE_VERSION,
+                "class": _event_class_path(type(self)),
+                "event": self.to_payload()
+            })
+        return encoded
     
     model_config = ConfigDict(
         json_encoders={
@@ -138,6 +195,48 @@ class BaseEvent(BaseModel):
         }
     )
 
+
+_event_class_cache: Dict[str, Type[BaseEvent]] = {}
+
+
+def _event_class_path(event_class: Type[BaseEvent]) -> str:
+    return f"{event_class.__module__}:{event_class.__qualname__}"
+
+
+def _resolve_event_class(class_path: Optional[str]) -> Type[BaseEvent]:
+    """Event class for a serialized class path (BaseEvent if it cannot be resolved)."""
+    if not class_path:
+        return BaseEvent
+    event_class = _event_class_cache.get(class_path)
+    if event_class is None:
+        event_class = BaseEvent
+        try:
+            module_name, _, qualname = class_path.partition(":")
+            resolved: Any = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                resolved = getattr(resolved, part)
+            if isinstance(resolved, type) and issubclass(resolved, BaseEvent):
+                event_class = resolved
+        except (ImportError, AttributeError, ValueError):
+            logger.warning("Unknown event class, decoding as BaseEvent", event_class=class_path)
+        _event_class_cache[class_path] = event_class
+    return event_class
+
+
+def serialize_event(event: BaseEvent, codec: Optional[EventCodec] = None) -> bytes:
+    """Envelope bytes of an event, with its concrete class, for cross-process transports."""
+    return event.encode(codec)
+
+
+def deserialize_event(data: Union[bytes, str]) -> BaseEvent:
+    """Rebuild an event from envelope bytes (any codec) as its original class."""
+    envelope = decode_envelope(data)
+    event = _resolve_event_class(envelope["class"]).model_validate(envelope["event"])
+    if isinstance(data, bytes) and envelope["v"] == ENVELOPE_VERSION:
+        # Re-publishing forwards the received bytes instead of encoding again
+        event._encoded[codec_for_bytes(data).name] = data
+    return event
+
 # ============================================
 # CIRCUIT BREAKER FOR SUBSCRIBERS
 # ============================================
@@ -232,6 +331,16 @@ class TypedEventHandler(EventHandler):
 # MEMORY QUEUE WITH ORDERING
 # ============================================
 
+# Scheduling order of the priority lanes and their weighted-fair-queuing shares
+PRIORITY_ORDER = [EventPriority.LOW, EventPriority.NORMAL, EventPriority.HIGH, EventPriority.CRITICAL]
+PRIORITY_WEIGHTS = {
+    EventPriority.CRITICAL: 8,
+    EventPriority.HIGH: 4,
+    EventPriority.NORMAL: 2,
+    EventPriority.LOW: 1
+}
+
+
 class AggregateQueue:
     """Per-aggregate ordered queue."""
     
@@ -239,6 +348,8 @@ class AggregateQueue:
         self.aggregate_id = aggregate_id
         self.max_size = max_size
         self.queue: asyncio.Queue[BaseEvent] = asyncio.Queue(maxsize=max_size)
+        self.enqueued_at: deque = deque()
+        self.priority_counts: Dict[EventPriority, int] = defaultdict(int)
         self.processing = False
         self.last_processed_version = 0
         self.metrics = {
@@ -248,26 +359,59 @@ class AggregateQueue:
             "processing_time_ms": deque(maxlen=100)
         }
     
-    async def enqueue(self, event: BaseEvent) -> bool:
-        """Enqueue event with backpressure handling."""
+    @property
+    def priority(self) -> EventPriority:
+        """
+        Highest priority pending in the queue.
+        
+        Events of one aggregate stay in order, so a critical event lifts the
+        whole queue ahead of it instead of overtaking it.
+        """
+        for priority in reversed(PRIORITY_ORDER):
+            if self.priority_counts.get(priority):
+                return priority
+        return EventPriority.NORMAL
+    
+    async def enqueue(self, event: BaseEvent, timeout: float = 1.0) -> bool:
+        """Enqueue event, waiting up to ``timeout`` seconds for space (backpressure)."""
         try:
-            await asyncio.wait_for(self.queue.put(event), timeout=1.0)
-            self.metrics["events_queued"] += 1
-            self.metrics["queue_size"] = self.queue.qsize()
-            return True
+            if self.queue.full():
+                if timeout <= 0:
+                    raise asyncio.TimeoutError()
+                await asyncio.wait_for(self.queue.put(event), timeout=timeout)
+            else:
+                self.queue.put_nowait(event)
         except asyncio.TimeoutError:
             # Queue is full, apply backpressure
             logger.warning("Queue full for aggregate", aggregate_id=self.aggregate_id)
             return False
+        self.enqueued_at.append(time.perf_counter())
+        self.priority_counts[event.priority] += 1
+        self.metrics["events_queued"] += 1
+        self.metrics["queue_size"] = self.queue.qsize()
+        return True
     
     async def dequeue(self) -> Optional[BaseEvent]:
         """Dequeue next event."""
         try:
             event = await asyncio.wait_for(self.queue.get(), timeout=0.1)
-            self.metrics["queue_size"] = self.queue.qsize()
-            return event
         except asyncio.TimeoutError:
             return None
+        self._dequeued(event)
+        return event
+    
+    def dequeue_nowait(self) -> Optional[tuple]:
+        """Next event and the perf_counter time it was enqueued, or None if empty."""
+        try:
+            event = self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        return event, self._dequeued(event)
+    
+    def _dequeued(self, event: BaseEvent) -> float:
+        self.priority_counts[event.priority] -= 1
+        self.metrics["queue_size"] = self.queue.qsize()
+        return self.enqueued_at.popleft() if self.enqueued_at else time.perf_counter()
     
     def is_empty(self) -> bool:
         """Check if queue is empty."""
@@ -277,6 +421,84 @@ class AggregateQueue:
         """Get current queue size."""
         return self.queue.qsize()
 
+
+class WeightedFairScheduler:
+    """
+    Hands aggregate queues with pending events to processors by priority.
+    
+    Each priority is a lane of ready aggregates. Lanes are served by
+    weighted fair queuing (start-time fair queuing over virtual time): a lane
+    with weight w gets w/sum(weights) of the dispatches while it is backlogged,
+    so critical aggregates are served first under load without starving low
+    priority ones. An aggregate is handed to one processor at a time, which
+    keeps its events in order across processors.
+    """
+    
+    def __init__(self, weights: Optional[Dict[EventPriority, int]] = None):
+        self.weights = dict(weights or PRIORITY_WEIGHTS)
+        self.lanes: Dict[EventPriority, deque] = {priority: deque() for priority in PRIORITY_ORDER}
+        self.finish_time: Dict[EventPriority, float] = {priority: 0.0 for priority in PRIORITY_ORDER}
+        self.virtual_time = 0.0
+        self.scheduled: Dict[str, EventPriority] = {}
+        self.ready = asyncio.Event()
+        self.metrics = {priority.value: 0 for priority in PRIORITY_ORDER}
+    
+    def schedule(self, queue: AggregateQueue) -> None:
+        """Make a queue with pending events available to processors (idempotent)."""
+        if queue.processing or queue.is_empty():
+            return
+        priority = queue.priority
+        current = self.scheduled.get(queue.aggregate_id)
+        if current is not None and PRIORITY_ORDER.index(current) >= PRIORITY_ORDER.index(priority):
+            return
+        # A newly backlogged lane starts at the current virtual time, not where it left off
+        if not self._backlogged(priority):
+            self.finish_time[priority] = max(self.finish_time[priority], self.virtual_time)
+        # Promotion leaves a stale entry in the old lane; _backlogged and next skip it
+        self.lanes[priority].append(queue)
+        self.scheduled[queue.aggregate_id] = priority
+        self.ready.set()
+    
+    async def next(self, timeout: float = 0.1) -> Optional[AggregateQueue]:
+        """Claim the next queue to process, waiting up to ``timeout`` seconds."""
+        while True:
+            candidates = [priority for priority in PRIORITY_ORDER if self._backlogged(priority)]
+            if candidates:
+                lane = min(candidates, key=lambda p: (self.finish_time[p], -PRIORITY_ORDER.index(p)))
+                queue = self.lanes[lane].popleft()
+                del self.scheduled[queue.aggregate_id]
+                self.virtual_time = self.finish_time[lane]
+                self.finish_time[lane] += 1.0 / self.weights[lane]
+                self.metrics[lane.value] += 1
+                queue.processing = True
+                return queue
+            self.ready.clear()
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+    
+    def release(self, queue: AggregateQueue) -> None:
+        """Return a processed queue; it is rescheduled if events remain."""
+        queue.processing = False
+        self.schedule(queue)
+    
+    def _backlogged(self, priority: EventPriority) -> bool:
+        lane = self.lanes[priority]
+        while lane and self.scheduled.get(lane[0].aggregate_id) is not priority:
+            lane.popleft()
+        return bool(lane)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Dispatches and ready aggregates per priority."""
+        ready = defaultdict(int)
+        for priority in self.scheduled.values():
+            ready[priority.value] += 1
+        return {
+            "dispatched": dict(self.metrics),
+            "ready_aggregates": {priority.value: ready[priority.value] for priority in PRIORITY_ORDER}
+        }
+
 # ============================================
 # EVENT STORE INTERFACE
 # ============================================
@@ -287,46 +509,58 @@ class EventStore:
     def __init__(self, db_session_factory):
         self.db_session_factory = db_session_factory
     
-    async def append_event(self, event: BaseEvent, session: Optional[AsyncSession] = None) -> bool:
-        """Append event to store (outbox pattern)."""
+    async def append_event(
+        self,
+        event: BaseEvent,
+        session: Optional[AsyncSession] = None,
+        enqueue_outbox: bool = True
+    ) -> bool:
+        """
+        Append event to store (outbox pattern).
+        
+        Args:
+            event: Event to append
+            session: Caller's session; the rows commit with the caller's transaction
+            enqueue_outbox: Also queue the event for the outbox relay (False when
+                it was already delivered)
+        """
+        from app.core.database_unified import EventOutboxEntry, EventStoreRecord
+        
         should_close = session is None
         if session is None:
             session = self.db_session_factory()
         
         try:
-            # Insert into event store
-            event_data = {
-                "id": event.event_id,
-                "aggregate_id": event.aggregate_id,
-                "aggregate_type": event.aggregate_type,
-                "event_type": event.event_type,
-                "event_version": event.event_version,
-                "event_data": event.model_dump(),
-                "metadata": event.get_metadata().__dict__,
-                "correlation_id": event.correlation_id,
-                "causation_id": event.causation_id,
-                "created_at": event.timestamp,
-                "checksum": event.calculate_checksum()
-            }
+            event_class = _event_class_path(type(event))
+            event_data = event.to_payload()
             
-            # This would insert into your event_store table
-            # await session.execute(insert(EventStoreTable).values(**event_data))
-            
-            # Insert into outbox for processing
-            outbox_data = {
-                "id": str(uuid.uuid4()),
-                "event_id": event.event_id,
-                "aggregate_id": event.aggregate_id,
-                "event_type": event.event_type,
-                "event_data": event.model_dump(),
-                "status": EventStatus.PENDING,
-                "created_at": datetime.now(timezone.utc),
-                "retry_count": 0,
-                "next_retry_at": None
-            }
+            # Insert into event store
+            await session.execute(insert(EventStoreRecord).values(
+                event_id=event.event_id,
+                aggregate_id=event.aggregate_id,
+                aggregate_type=event.aggregate_type,
+                event_type=event.event_type,
+                event_class=event_class,
+                event_version=event.event_version,
+                event_data=event_data,
+                correlation_id=event.correlation_id,
+                causation_id=event.causation_id,
+                checksum=event.calculate_checksum(),
+                occurred_at=event.timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+            ))
             
-            # This would insert into your outbox table
-            # await session.execute(insert(OutboxTable).values(**outbox_data))
+            # Insert into outbox for the relay
+            if enqueue_outbox:
+                await session.execute(insert(EventOutboxEntry).values(
+                    event_id=event.event_id,
+                    aggregate_id=event.aggregate_id,
+                    event_type=event.event_type,
+                    event_class=event_class,
+                    event_data=event_data,
+                    status=EventStatus.PENDING.value,
+                    attempts=0,
+                    available_at=datetime.now(timezone.utc).replace(tzinfo=None)
+                ))
             
             if should_close:
                 await session.commit()
@@ -348,15 +582,134 @@ class EventStore:
         from_version: int = 0,
         to_version: Optional[int] = None
     ) -> List[BaseEvent]:
-        """Get events for aggregate (for replay)."""
-        # Implementation would query event store
-        # and reconstruct events
-        return []
+        """
+        Get events for aggregate (for replay).
+        
+        Versions count an aggregate's events in append order starting at 1;
+        returns versions ``from_version + 1`` through ``to_version``.
+        """
+        from app.core.database_unified import EventStoreRecord
+        
+        query = (
+            select(EventStoreRecord)
+            .where(EventStoreRecord.aggregate_id == aggregate_id)
+            .order_by(EventStoreRecord.sequence)
+            .offset(from_version)
+        )
+        if to_version is not None:
+            query = query.limit(max(to_version - from_version, 0))
+        
+        async with self.db_session_factory() as session:
+            rows = (await session.execute(query)).scalars().all()
+        return [self._event_from_record(row) for row in rows]
+    
+    async def stream_events(
+        self,
+        aggregate_id: str,
+        after_sequence: int = 0,
+        batch_size: int = 1000
+    ):
+        """
+        Yield an aggregate's events after a store sequence, in batches.
+        
+        Pages by sequence over idx_event_store_aggregate_sequence, so resuming
+        from a snapshot reads only the events it does not cover.
+        
+        Yields:
+            Lists of (sequence, event) tuples
+        """
+        from app.core.database_unified import EventStoreRecord
+        
+        while True:
+            async with self.db_session_factory() as session:
+                rows = (await session.execute(
+                    select(EventStoreRecord)
+                    .where(
+                        EventStoreRecord.aggregate_id == aggregate_id,
+                        EventStoreRecord.sequence > after_sequence
+                    )
+                    .order_by(EventStoreRecord.sequence)
+                    .limit(batch_size)
+                )).scalars().all()
+            if not rows:
+                return
+            yield [(row.sequence, self._event_from_record(row)) for row in rows]
+            if len(rows) < batch_size:
+                return
+            after_sequence = rows[-1].sequence
+    
+    async def iter_aggregate_ids(self, aggregate_type: Optional[str] = None, batch_size: int = 1000):
+        """Yield the ids of aggregates with stored events, in id order."""
+        from app.core.database_unified import EventStoreRecord
+        
+        after: Optional[str] = None
+        while True:
+            query = select(EventStoreRecord.aggregate_id).distinct()
+            if aggregate_type is not None:
+                query = query.where(EventStoreRecord.aggregate_type == aggregate_type)
+            if after is not None:
+                query = query.where(EventStoreRecord.aggregate_id > after)
+            async with self.db_session_factory() as session:
+                ids = (await session.execute(
+                    query.order_by(EventStoreRecord.aggregate_id).limit(batch_size)
+                )).scalars().all()
+            for aggregate_id in ids:
+                yield aggregate_id
+            if len(ids) < batch_size:
+                return
+            after = ids[-1]
+    
+    async def get_snapshot(self, aggregate_id: str, projection: str):
+        """Latest AggregateSnapshot row of an aggregate for a projection (None if absent)."""
+        from app.core.database_unified import AggregateSnapshot
+        
+        async with self.db_session_factory() as session:
+            return await session.get(AggregateSnapshot, (aggregate_id, projection))
+    
+    async def save_snapshot(self, **values) -> bool:
+        """Insert or replace the snapshot of an aggregate for a projection."""
+        from app.core.database_unified import AggregateSnapshot
+        
+        async with self.db_session_factory() as session:
+            try:
+                await session.merge(AggregateSnapshot(
+                    created_at=datetime.now(timezone.utc).replace(tzinfo=None), **values
+                ))
+                await session.commit()
+                return True
+            except Exception as e:
+                await session.rollback()
+                logger.error("Failed to save aggregate snapshot",
+                           aggregate_id=values.get("aggregate_id"), error=str(e))
+                return False
+    
+    @staticmethod
+    def _event_from_record(row) -> BaseEvent:
+        return _resolve_event_class(row.event_class).model_validate(row.event_data)
     
     async def get_pending_outbox_events(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Get pending events from outbox for processing."""
-        # Implementation would query outbox table
-        return []
+        """Peek at pending outbox rows in delivery order (delivery itself goes through OutboxRelay)."""
+        from app.core.database_unified import EventOutboxEntry
+        
+        async with self.db_session_factory() as session:
+            rows = (await session.execute(
+                select(EventOutboxEntry)
+                .where(EventOutboxEntry.status == EventStatus.PENDING.value)
+                .order_by(EventOutboxEntry.id)
+                .limit(limit)
+            )).scalars().all()
+        return [
+            {
+                "id": row.id,
+                "event_id": row.event_id,
+                "aggregate_id": row.aggregate_id,
+                "event_type": row.event_type,
+                "event_data": row.event_data,
+                "attempts": row.attempts,
+                "available_at": row.available_at
+            }
+            for row in rows
+        ]
 
 # ============================================
 # DEAD LETTER QUEUE
@@ -476,6 +829,492 @@ class EventBusMetrics:
         
         return summary
 
+# ============================================
+# OUTBOX RELAY
+# ============================================
+
+class OutboxRelay:
+    """
+    Relays pending outbox rows to the bus with concurrent workers.
+    
+    Each worker claims a batch in its own transaction. It first locks the
+    oldest pending row ("head") of up to ``batch_size`` aggregates with
+    ``FOR UPDATE SKIP LOCKED``, then the pending rows queued behind those
+    heads. An aggregate's rows are only reachable through its head, so
+    workers of this and other instances never interleave one aggregate's
+    events, and a locked aggregate is skipped rather than waited on. Claimed
+    rows are published in id order and marked completed with one UPDATE;
+    committing releases the locks.
+    
+    A failed publish reschedules that row with backoff and holds back the
+    rest of its aggregate; after ``max_attempts`` the row is dead-lettered.
+    With PostgreSQL, workers wake on ``NOTIFY`` from the outbox insert
+    trigger and only poll as a fallback.
+    """
+    
+    def __init__(
+        self,
+        db_session_factory,
+        publish: Callable[[BaseEvent], Awaitable[bool]],
+        workers: int = 4,
+        batch_size: int = 100,
+        poll_interval_seconds: float = 1.0,
+        max_attempts: int = 10,
+        retry_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 300.0,
+        notify_dsn: Optional[str] = None,
+        notify_channel: str = "event_outbox",
+        on_dead_letter: Optional[Callable[[BaseEvent, str], Awaitable[None]]] = None
+    ):
+        """
+        Initialize the relay.
+        
+        Args:
+            db_session_factory: Async session factory
+            publish: Delivers one event; False or an exception means retry later
+            workers: Concurrent claiming workers (0: this process does not relay)
+            batch_size: Aggregates (and rows) claimed per batch
+            poll_interval_seconds: Idle poll interval (a fallback when NOTIFY is used)
+            max_attempts: Publish attempts before a row is dead-lettered
+            retry_backoff_seconds: Initial retry delay, doubled per attempt
+            max_backoff_seconds: Retry delay cap
+            notify_dsn: PostgreSQL DSN to LISTEN on (None: poll only)
+            notify_channel: Channel notified by the outbox insert trigger
+            on_dead_letter: Called with events that exhausted their attempts
+        """
+        self.db_session_factory = db_session_factory
+        self.publish = publish
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.notify_dsn = notify_dsn
+        self.notify_channel = notify_channel
+        self.on_dead_letter = on_dead_letter
+        
+        self.running = False
+        self._tasks: List[asyncio.Task] = []
+        self._wakeups: List[asyncio.Event] = []
+        self.metrics = {
+            "batches": 0,
+            "delivered": 0,
+            "retried": 0,
+            "dead_lettered": 0,
+            "notifications": 0
+        }
+    
+    async def start(self):
+        """Start the workers (and the LISTEN connection, if configured); zero workers disables the relay."""
+        if self.running or self.workers <= 0:
+            return
+        self.running = True
+        self._wakeups = [asyncio.Event() for _ in range(self.workers)]
+        self._tasks = [
+            asyncio.create_task(self._worker(wakeup), name=f"outbox-relay-{n}")
+            for n, wakeup in enumerate(self._wakeups)
+        ]
+        if self.notify_dsn:
+            self._tasks.append(asyncio.create_task(self._listen(), name="outbox-relay-listen"))
+        logger.info("Outbox relay started",
+                   workers=self.workers,
+                   batch_size=self.batch_size,
+                   listen_notify=bool(self.notify_dsn))
+    
+    async def stop(self):
+        """Stop the workers; claimed batches roll back and stay pending."""
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Outbox relay stopped", **self.metrics)
+    
+    def wake(self):
+        """Wake idle workers (new outbox rows were committed)."""
+        for wakeup in self._wakeups:
+            wakeup.set()
+    
+    def claim_heads_statement(self, now: datetime):
+        """Lock the oldest due pending row of up to batch_size aggregates, skipping locked ones."""
+        from app.core.database_unified import EventOutboxEntry
+        from sqlalchemy.orm import aliased
+        
+        pending = EventStatus.PENDING.value
+        head = aliased(EventOutboxEntry)
+        older_pending = select(EventOutboxEntry.id).where(
+            EventOutboxEntry.aggregate_id == head.aggregate_id,
+            EventOutboxEntry.status == pending,
+            EventOutboxEntry.id < head.id
+        ).exists()
+        return (
+            select(head.aggregate_id)
+            .where(head.status == pending, head.available_at <= now, ~older_pending)
+            .order_by(head.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True, of=head)
+        )
+    
+    async def relay_batch(self) -> int:
+        """Claim, publish and settle one batch; returns the number of rows claimed."""
+        from app.core.database_unified import EventOutboxEntry
+        
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        pending = EventStatus.PENDING.value
+        
+        async with self.db_session_factory() as session:
+            async with session.begin():
+                aggregate_ids = (await session.execute(self.claim_heads_statement(now))).scalars().all()
+                if not aggregate_ids:
+                    return 0
+                
+                rows = (await session.execute(
+                    select(EventOutboxEntry)
+                    .where(EventOutboxEntry.aggregate_id.in_(aggregate_ids), EventOutboxEntry.status == pending)
+                    .order_by(EventOutboxEntry.id)
+                    .limit(self.batch_size)
+                    .with_for_update()
+                )).scalars().all()
+                
+                delivered: List[int] = []
+                held_back: Set[str] = set()
+                for row in rows:
+                    if row.aggregate_id in held_back:
+                        continue
+                    try:
+                        event = _resolve_event_class(row.event_class).model_validate(row.event_data)
+                    except Exception as e:
+                        await self._dead_letter(row, f"undecodable: {e}", None)
+                        continue
+                    try:
+                        published = await self.publish(event)
+                        error = None if published else "publish rejected"
+                    except Exception as e:
+                        published, error = False, str(e)
+                    if published:
+                        delivered.append(row.id)
+                    else:
+                        held_back.add(row.aggregate_id)
+                        await self._schedule_retry(row, error, event, now)
+                
+                if delivered:
+                    await session.execute(
+                        update(EventOutboxEntry)
+                        .where(EventOutboxEntry.id.in_(delivered))
+                        .values(status=EventStatus.COMPLETED.value, delivered_at=now)
+                    )
+        
+        self.metrics["batches"] += 1
+        self.metrics["delivered"] += len(delivered)
+        return len(rows)
+    
+    async def _schedule_retry(self, row, error: str, event: BaseEvent, now: datetime):
+        row.attempts += 1
+        row.last_error = error
+        if row.attempts >= self.max_attempts:
+            await self._dead_letter(row, error, event)
+            return
+        delay = min(self.max_backoff_seconds, self.retry_backoff_seconds * 2 ** (row.attempts - 1))
+        row.available_at = now + timedelta(seconds=delay)
+        self.metrics["retried"] += 1
+        logger.warning("Outbox publish failed, retrying",
+                      event_id=row.event_id, attempts=row.attempts, retry_in_seconds=delay, error=error)
+    
+    async def _dead_letter(self, row, reason: str, event: Optional[BaseEvent]):
+        row.status = EventStatus.DEAD_LETTER.value
+        row.last_error = reason
+        self.metrics["dead_lettered"] += 1
+        logger.error("Outbox event dead-lettered", event_id=row.event_id, attempts=row.attempts, reason=reason)
+        if event is not None and self.on_dead_letter is not None:
+            await self.on_dead_letter(event, reason)
+    
+    async def _worker(self, wakeup: asyncio.Event):
+        while self.running:
+            wakeup.clear()
+            try:
+                claimed = await self.relay_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Outbox relay batch failed", error=str(e))
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue  # backlog: claim again right away
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _listen(self):
+        """Hold a LISTEN connection and wake the workers on each notification."""
+        import asyncpg
+        
+        def notified(*_):
+            self.metrics["notifications"] += 1
+            self.wake()
+        
+        while self.running:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.notify_dsn)
+                await connection.add_listener(self.notify_channel, notified)
+                self.wake()  # rows committed while not listening
+                while self.running and not connection.is_closed():
+                    await asyncio.sleep(self.poll_interval_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Outbox LISTEN connection failed, polling until reconnected", error=str(e))
+                await asyncio.sleep(self.poll_interval_seconds * 5)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "running": self.running, **self.metrics}
+
+# ============================================
+# SNAPSHOTS AND REPLAY
+# ============================================
+
+class Projection:
+    """
+    Folds an aggregate's events into a read-model state.
+    
+    State must be a dict of JSON-compatible values so it can be snapshotted.
+    Bump ``schema_version`` whenever the state shape changes: snapshots of
+    other versions are ignored and the aggregate is replayed from its first
+    event.
+    """
+    
+    name = "projection"
+    schema_version = 1
+    aggregate_type: Optional[str] = None  # limits rebuild_projection discovery
+    
+    def initial_state(self, aggregate_id: str) -> Dict[str, Any]:
+        """State before the aggregate's first event."""
+        return {}
+    
+    def apply(self, state: Dict[str, Any], event: BaseEvent) -> Dict[str, Any]:
+        """Return the state after ``event``."""
+        raise NotImplementedError
+    
+    async def save(self, aggregate_id: str, state: Dict[str, Any], version: int) -> None:
+        """Persist the rebuilt read model (called once per aggregate by rebuild)."""
+        pass
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of folding one aggregate."""
+    aggregate_id: str
+    state: Dict[str, Any]
+    version: int
+    snapshot_version: int = 0
+    snapshot_sequence: int = 0
+    events_applied: int = 0
+    snapshots_written: int = 0
+
+
+def encode_snapshot_state(state: Dict[str, Any], codec: Optional[EventCodec] = None) -> tuple:
+    """Compress a projection state; returns (codec name, bytes)."""
+    codec = codec or get_event_codec()
+    return codec.name, zlib.compress(codec.dumps(state), 6)
+
+
+def decode_snapshot_state(codec_name: str, data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_snapshot_state."""
+    return get_event_codec(codec_name).loads(zlib.decompress(data))
+
+
+class ReplayEngine:
+    """
+    Rebuilds projections from the event store, resuming from snapshots.
+    
+    Folding an aggregate starts from its latest snapshot for the projection
+    (when the schema version matches) and reads only later events, writing a
+    new snapshot every ``snapshot_every`` events. ``rebuild`` folds many
+    aggregates at once with a bounded pool of workers.
+    """
+    
+    def __init__(
+        self,
+        event_store: EventStore,
+        workers: int = 8,
+        snapshot_every: int = 500,
+        batch_size: int = 1000
+    ):
+        self.event_store = event_store
+        self.workers = workers
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+        self.metrics = {
+            "aggregates_replayed": 0,
+            "aggregates_failed": 0,
+            "events_applied": 0,
+            "snapshots_loaded": 0,
+            "snapshots_written": 0
+        }
+    
+    async def load(self, aggregate_id: str, projection: Projection) -> ReplayResult:
+        """Fold an aggregate's events into the projection state."""
+        result = await self._from_snapshot(aggregate_id, projection)
+        last_sequence = result.snapshot_sequence
+        since_snapshot = 0
+        
+        async for batch in self.event_store.stream_events(aggregate_id, last_sequence, self.batch_size):
+            for sequence, event in batch:
+                result.state = projection.apply(result.state, event)
+                result.version += 1
+                result.events_applied += 1
+                last_sequence = sequence
+                since_snapshot += 1
+                if self.snapshot_every and since_snapshot >= self.snapshot_every:
+                    if await self._write_snapshot(projection, event.aggregate_type, result, last_sequence):
+                        result.snapshots_written += 1
+                    since_snapshot = 0
+        
+        self.metrics["events_applied"] += result.events_applied
+        self.metrics["snapshots_written"] += result.snapshots_written
+        return result
+    
+    async def rebuild(self, projection: Projection, aggregate_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fold and save every aggregate of a projection.
+        
+        Args:
+            projection: Projection to rebuild
+            aggregate_ids: Aggregates to rebuild (default: all stored aggregates
+                of ``projection.aggregate_type``)
+        
+        Returns:
+            Summary with counts and the ids of aggregates that failed
+        """
+        started = time.time()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        summary = {"projection": projection.name, "aggregates": 0, "events_applied": 0,
+                   "snapshots_written": 0, "failed": []}
+        
+        async def worker():
+            while True:
+                aggregate_id = await queue.get()
+                try:
+                    if aggregate_id is None:
+                        return
+                    result = await self.load(aggregate_id, projection)
+                    await projection.save(aggregate_id, result.state, result.version)
+                    summary["aggregates"] += 1
+                    summary["events_applied"] += result.events_applied
+                    summary["snapshots_written"] += result.snapshots_written
+                    self.metrics["aggregates_replayed"] += 1
+                except Exception as e:
+                    summary["failed"].append(aggregate_id)
+                    self.metrics["aggregates_failed"] += 1
+                    logger.error("Aggregate replay failed", projection=projection.name,
+                               aggregate_id=aggregate_id, error=str(e))
+                finally:
+                    queue.task_done()
+        
+        tasks = [asyncio.create_task(worker()) for _ in range(max(self.workers, 1))]
+        try:
+            if aggregate_ids is None:
+                async for aggregate_id in self.event_store.iter_aggregate_ids(projection.aggregate_type, self.batch_size):
+                    await queue.put(aggregate_id)
+            else:
+                for aggregate_id in aggregate_ids:
+                    await queue.put(aggregate_id)
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        summary["duration_seconds"] = round(time.time() - started, 3)
+        logger.info("Projection rebuilt", **{k: v for k, v in summary.items() if k != "failed"},
+                   failed=len(summary["failed"]))
+        return summary
+    
+    async def _from_snapshot(self, aggregate_id: str, projection: Projection) -> ReplayResult:
+        result = ReplayResult(aggregate_id=aggregate_id, state=projection.initial_state(aggregate_id), version=0)
+        snapshot = await self.event_store.get_snapshot(aggregate_id, projection.name)
+        if snapshot is None or snapshot.schema_version != projection.schema_version:
+            return result
+        try:
+            result.state = decode_snapshot_state(snapshot.state_codec, snapshot.state)
+        except Exception as e:
+            logger.warning("Unreadable aggregate snapshot, replaying from the start",
+                          aggregate_id=aggregate_id, projection=projection.name, error=str(e))
+            return result
+        result.version = result.snapshot_version = snapshot.aggregate_version
+        result.snapshot_sequence = snapshot.last_sequence
+        self.metrics["snapshots_loaded"] += 1
+        return result
+    
+    async def _write_snapshot(
+        self, projection: Projection, aggregate_type: str, result: ReplayResult, last_sequence: int
+    ) -> bool:
+        state_codec, state = encode_snapshot_state(result.state)
+        return await self.event_store.save_snapshot(
+            aggregate_id=result.aggregate_id,
+            projection=projection.name,
+            aggregate_type=aggregate_type,
+            schema_version=projection.schema_version,
+            aggregate_version=result.version,
+            last_sequence=last_sequence,
+            state_codec=state_codec,
+            state=state
+        )
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get replay metrics."""
+        return {**self.metrics, "workers": self.workers, "snapshot_every": self.snapshot_every}
+
+# ============================================
+# PLUGGABLE TRANSPORT
+# ============================================
+
+class EventTransport:
+    """
+    Cross-process delivery for HybridEventBus.
+    
+    Without a transport the bus delivers through in-process AggregateQueues
+    (single-node). A transport carries published events to whichever node
+    consumes the event's aggregate and hands them back to that node's bus
+    through the ``deliver`` callback, preserving per-aggregate order.
+    """
+    
+    name = "base"
+    
+    async def start(self, deliver: Callable[[BaseEvent], Awaitable[None]]) -> None:
+        """Start consuming; ``deliver`` runs the local handlers for one event."""
+        raise NotImplementedError
+    
+    async def stop(self) -> None:
+        """Stop consuming and release any ownership held by this node."""
+        raise NotImplementedError
+    
+    async def send(self, event: BaseEvent) -> bool:
+        """Publish an event; False means the transport did not accept it."""
+        raise NotImplementedError
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Transport-specific metrics."""
+        return {"transport": self.name}
+
+
+def create_event_transport(settings=None) -> Optional[EventTransport]:
+    """Transport configured by EVENT_BUS_TRANSPORT (None for the in-memory default)."""
+    settings = settings or get_settings()
+    transport = getattr(settings, "EVENT_BUS_TRANSPORT", "memory")
+    if transport == "memory":
+        return None
+    if transport == "redis_streams":
+        from app.core.redis_streams_transport import RedisStreamsTransport
+        return RedisStreamsTransport.from_settings(settings)
+    raise ValueError(f"Unknown event bus transport: {transport}")
+
 # ============================================
 # HYBRID SMART EVENT BUS
 # ============================================
@@ -483,13 +1322,25 @@ class EventBusMetrics:
 class HybridEventBus:
     """Production-grade event bus with hybrid memory/PostgreSQL architecture."""
     
-    def __init__(self, db_session_factory, max_memory_events: int = 100000):
+    def __init__(
+        self,
+        db_session_factory,
+        max_memory_events: int = 100000,
+        transport: Optional[EventTransport] = None
+    ):
         self.db_session_factory = db_session_factory
         self.max_memory_events = max_memory_events
         
+        # Cross-process transport (None: in-process aggregate queues only)
+        self.transport = transport
+        
         # Core components
         self.event_store = EventStore(db_session_factory)
         self.aggregate_queues: Dict[str, AggregateQueue] = {}
+        self.scheduler = WeightedFairScheduler()
+        self.pending_events = 0
+        self.capacity_available = asyncio.Event()
+        self.capacity_available.set()
         self.handlers: Dict[str, EventHandler] = {}
         self.subscription_patterns: Dict[str, List[EventHandler]] = defaultdict(list)
         self.dead_letter_queue = DeadLetterQueue()
@@ -502,15 +1353,42 @@ class HybridEventBus:
         
         # Worker tasks
         self.processor_tasks: List[asyncio.Task] = []
-        self.outbox_processor_task: Optional[asyncio.Task] = None
         self.metrics_task: Optional[asyncio.Task] = None
         
         # Configuration
         self.settings = get_settings()
         self.batch_size = 100
         self.processing_timeout = 30.0
+        self.backpressure_mode = self.settings.EVENT_BUS_BACKPRESSURE
+        self.backpressure_timeout = self.settings.EVENT_BUS_BACKPRESSURE_TIMEOUT_SECONDS
+        self.aggregate_queue_size = self.settings.EVENT_BUS_AGGREGATE_QUEUE_SIZE
+        
+        # Outbox relay (events whose direct publish failed, or appended by other writers)
+        notify_dsn = None
+        if self.settings.EVENT_OUTBOX_LISTEN_NOTIFY and self.settings.DATABASE_URL.startswith("postgresql"):
+            notify_dsn = self.settings.database_url_sync
+        self.outbox_relay = OutboxRelay(
+            db_session_factory,
+            publish=self._publish_to_transport,
+            workers=self.settings.EVENT_OUTBOX_RELAY_WORKERS,
+            batch_size=self.settings.EVENT_OUTBOX_BATCH_SIZE,
+            poll_interval_seconds=self.settings.EVENT_OUTBOX_POLL_INTERVAL_SECONDS,
+            max_attempts=self.settings.EVENT_OUTBOX_MAX_ATTEMPTS,
+            notify_dsn=notify_dsn,
+            on_dead_letter=self._dead_letter_outbox_event
+        )
+        
+        # Snapshot-aware projection rebuilds
+        self.replay_engine = ReplayEngine(
+            self.event_store,
+            workers=self.settings.EVENT_REPLAY_WORKERS,
+            snapshot_every=self.settings.EVENT_SNAPSHOT_EVERY,
+            batch_size=self.settings.EVENT_REPLAY_BATCH_SIZE
+        )
         
-        logger.info("Hybrid Event Bus initialized", max_memory_events=max_memory_events)
+        logger.info("Hybrid Event Bus initialized",
+                   max_memory_events=max_memory_events,
+                   transport=transport.name if transport else "memory")
     
     async def start(self):
         """Start the event bus."""
@@ -528,12 +1406,16 @@ class HybridEventBus:
             task = asyncio.create_task(self._process_aggregate_queues(f"processor-{i}"))
             self.processor_tasks.append(task)
         
-        # Start outbox processor
-        self.outbox_processor_task = asyncio.create_task(self._process_outbox())
+        # Start outbox relay
+        await self.outbox_relay.start()
         
         # Start metrics collector
         self.metrics_task = asyncio.create_task(self._collect_metrics())
         
+        # Start consuming this node's share of the transport
+        if self.transport is not None:
+            await self.transport.start(self._deliver_from_transport)
+        
         logger.info("Event bus started", processors=num_processors)
     
     async def stop(self, timeout: float = 30.0):
@@ -547,13 +1429,22 @@ class HybridEventBus:
         self.running = False
         self.shutdown_event.set()
         
+        # Stop taking transport deliveries; unacknowledged entries are reclaimed by other nodes
+        if self.transport is not None:
+            try:
+                await self.transport.stop()
+            except Exception as e:
+                logger.error("Event transport stop failed", error=str(e))
+        
         # Wait for in-flight events to complete
         start_time = time.time()
         while self.in_flight_events and (time.time() - start_time) < timeout:
             await asyncio.sleep(0.1)
         
+        await self.outbox_relay.stop()
+        
         # Cancel tasks
-        all_tasks = self.processor_tasks + [self.outbox_processor_task, self.metrics_task]
+        all_tasks = self.processor_tasks + [self.metrics_task]
         for task in all_tasks:
             if task and not task.done():
                 task.cancel()
@@ -598,9 +1489,11 @@ class HybridEventBus:
             # Add to in-flight tracking
             self.in_flight_events.add(event.event_id)
             
-            # Dual write: Memory + PostgreSQL
-            memory_success = await self._publish_to_memory(event)
-            store_success = await self.event_store.append_event(event, session)
+            # Dual write: Memory (or transport) + PostgreSQL
+            memory_success = await self._publish_to_transport(event)
+            store_success = await self.event_store.append_event(
+                event, session, enqueue_outbox=not memory_success
+            )
             
             # Update metrics
             self.metrics.increment("events.published", tags={
@@ -631,24 +1524,77 @@ class HybridEventBus:
             # Remove from in-flight tracking
             self.in_flight_events.discard(event.event_id)
     
-    async def _publish_to_memory(self, event: BaseEvent) -> bool:
-        """Publish event to memory queues."""
-        aggregate_id = event.aggregate_id
-        
-        # Get or create aggregate queue
+    async def _publish_to_transport(self, event: BaseEvent) -> bool:
+        """Publish through the transport, degrading to this node's memory queues."""
+        if self.transport is not None:
+            try:
+                if await self.transport.send(event):
+                    return True
+            except Exception as e:
+                logger.warning("Event transport publish failed, delivering locally",
+                              event_id=event.event_id, transport=self.transport.name, error=str(e))
+            self.metrics.increment("events.transport_fallback", tags={
+                "transport": self.transport.name
+            })
+        return await self._publish_to_memory(event)
+    
+    def _get_aggregate_queue(self, aggregate_id: str) -> AggregateQueue:
+        """Get or create the in-process queue of an aggregate."""
         if aggregate_id not in self.aggregate_queues:
-            self.aggregate_queues[aggregate_id] = AggregateQueue(aggregate_id)
+            self.aggregate_queues[aggregate_id] = AggregateQueue(aggregate_id, self.aggregate_queue_size)
+        return self.aggregate_queues[aggregate_id]
+    
+    @property
+    def under_backpressure(self) -> bool:
+        """True while the in-memory queues hold max_memory_events or more events."""
+        return self.pending_events >= self.max_memory_events
+    
+    async def wait_for_capacity(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the in-memory queues drop below max_memory_events; False on timeout."""
+        try:
+            await asyncio.wait_for(self.capacity_available.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
+    async def _publish_to_memory(self, event: BaseEvent) -> bool:
+        """
+        Publish event to memory queues.
         
-        queue = self.aggregate_queues[aggregate_id]
-        success = await queue.enqueue(event)
+        When the queues are full the publisher waits up to the backpressure
+        timeout ("wait" mode) or is turned away at once ("reject" mode); a
+        rejected event is not lost, publish() appends it to the outbox for the
+        relay. Critical events are exempt from the bus-wide depth limit.
+        """
+        timeout = self.backpressure_timeout if self.backpressure_mode == "wait" else 0.0
+        if self.under_backpressure and event.priority != EventPriority.CRITICAL:
+            if timeout <= 0 or not await self.wait_for_capacity(timeout):
+                self._record_backpressure(event, "bus_full")
+                return False
         
-        if not success:
-            # Apply backpressure - could implement spillover to PostgreSQL here
-            self.metrics.increment("events.backpressure", tags={
-                "aggregate_id": aggregate_id
-            })
-            
-        return success
+        if not await self._enqueue(self._get_aggregate_queue(event.aggregate_id), event, timeout):
+            self._record_backpressure(event, "aggregate_full")
+            return False
+        return True
+    
+    async def _enqueue(self, queue: AggregateQueue, event: BaseEvent, timeout: float = 1.0) -> bool:
+        """Enqueue on an aggregate queue and make it available to processors."""
+        if not await queue.enqueue(event, timeout):
+            return False
+        self.pending_events += 1
+        if self.under_backpressure:
+            self.capacity_available.clear()
+        self.scheduler.schedule(queue)
+        return True
+    
+    def _record_backpressure(self, event: BaseEvent, reason: str) -> None:
+        self.metrics.increment("events.backpressure", tags={
+            "priority": event.priority.value,
+            "reason": reason
+        })
+        logger.warning("Event bus backpressure, event rejected from memory queues",
+                      event_id=event.event_id, priority=event.priority.value,
+                      reason=reason, pending_events=self.pending_events)
     
     async def _process_aggregate_queues(self, processor_name: str):
         """Process events from aggregate queues."""
@@ -656,22 +1602,21 @@ class HybridEventBus:
         
         while self.running or self.in_flight_events:
             try:
-                # Round-robin through aggregate queues
-                for aggregate_id, queue in list(self.aggregate_queues.items()):
-                    if self.shutdown_event.is_set() and not self.in_flight_events:
-                        break
-                    
-                    event = await queue.dequeue()
-                    if event:
-                        await self._process_event(event, queue)
-                    
+                # Weighted fair queuing across priority lanes, one aggregate per processor
+                queue = await self.scheduler.next(timeout=0.1)
+                if queue is None:
+                    continue
+                try:
+                    item = queue.dequeue_nowait()
+                    if item:
+                        event, enqueued_at = item
+                        self._release_capacity()
+                        await self._process_event(event, queue, enqueued_at)
+                finally:
+                    self.scheduler.release(queue)
                     # Clean up empty queues
-                    if queue.is_empty() and queue.size() == 0:
-                        del self.aggregate_queues[aggregate_id]
-                
-                # Brief pause if no events processed
-                if not any(not q.is_empty() for q in self.aggregate_queues.values()):
-                    await asyncio.sleep(0.01)
+                    if queue.is_empty() and not queue.processing:
+                        self.aggregate_queues.pop(queue.aggregate_id, None)
                     
             except Exception as e:
                 logger.error("Aggregate processor error", 
@@ -680,10 +1625,32 @@ class HybridEventBus:
         
         logger.info("Aggregate processor stopped", processor=processor_name)
     
-    async def _process_event(self, event: BaseEvent, queue: AggregateQueue):
+    async def _deliver_from_transport(self, event: BaseEvent) -> None:
+        """Run local handlers for an event consumed from the transport (retries requeue locally)."""
+        self.in_flight_events.add(event.event_id)
+        queue = self._get_aggregate_queue(event.aggregate_id)
+        try:
+            await self._process_event(event, queue)
+            self.metrics.increment("events.transport_delivered", tags={
+                "event_type": event.event_type
+            })
+        finally:
+            self.in_flight_events.discard(event.event_id)
+            if queue.is_empty() and not queue.processing:
+                self.aggregate_queues.pop(queue.aggregate_id, None)
+    
+    def _release_capacity(self) -> None:
+        self.pending_events -= 1
+        if not self.under_backpressure:
+            self.capacity_available.set()
+    
+    async def _process_event(self, event: BaseEvent, queue: AggregateQueue, enqueued_at: Optional[float] = None):
         """Process single event through handlers."""
         start_time = time.time()
         event_processed = False
+        priority_tags = {"priority": event.priority.value}
+        if enqueued_at is not None:
+            self.metrics.histogram("events.queue_latency_ms", (time.perf_counter() - enqueued_at) * 1000, tags=priority_tags)
         
         try:
             # Find matching handlers
@@ -770,58 +1737,25 @@ class HybridEventBus:
                         # Retry with exponential backoff
                         setattr(event, 'retry_count', retry_count + 1)
                         await asyncio.sleep(event.retry_delay_seconds * (2 ** retry_count))
-                        await queue.enqueue(event)  # Re-queue for retry
+                        await self._enqueue(queue, event)  # Re-queue for retry
             
             # Update queue metrics
             processing_time = (time.time() - start_time) * 1000
             queue.metrics["processing_time_ms"].append(processing_time)
             queue.metrics["events_processed"] += 1
+            if enqueued_at is not None:
+                self.metrics.histogram("events.end_to_end_latency_ms", (time.perf_counter() - enqueued_at) * 1000, tags=priority_tags)
             
         except Exception as e:
             logger.error("Event processing error", 
                         event_id=event.event_id, error=str(e))
     
-    async def _process_outbox(self):
-        """Process events from PostgreSQL outbox."""
-        logger.info("Starting outbox processor")
-        
-        while self.running:
-            try:
-                # Get pending events from outbox
-                pending_events = await self.event_store.get_pending_outbox_events(
-                    limit=self.batch_size
-                )
-                
-                if not pending_events:
-                    await asyncio.sleep(1.0)
-                    continue
-                
-                # Process each event
-                for event_data in pending_events:
-                    # Reconstruct event
-                    event_dict = event_data["event_data"]
-                    event = BaseEvent(**event_dict)
-                    
-                    # Publish to memory queues
-                    success = await self._publish_to_memory(event)
-                    
-                    if success:
-                        # Mark as processed in outbox
-                        # await self._mark_outbox_processed(event_data["id"])
-                        pass
-                    else:
-                        # Update retry count
-                        # await self._update_outbox_retry(event_data["id"])
-                        pass
-                
-                self.metrics.increment("outbox.batch_processed", 
-                                     value=len(pending_events))
-                
-            except Exception as e:
-                logger.error("Outbox processor error", error=str(e))
-                await asyncio.sleep(5.0)
-        
-        logger.info("Outbox processor stopped")
+    async def _dead_letter_outbox_event(self, event: BaseEvent, reason: str):
+        """Move an outbox event that exhausted its relay attempts to the DLQ."""
+        await self.dead_letter_queue.add_event(event, reason, "outbox_relay")
+        self.metrics.increment("outbox.dead_lettered", tags={
+            "event_type": event.event_type
+        })
     
     async def _collect_metrics(self):
         """Collect and log metrics periodically."""
@@ -835,6 +1769,7 @@ class HybridEventBus:
                 self.metrics.gauge("aggregate_queues.count", len(self.aggregate_queues))
                 self.metrics.gauge("handlers.count", len(self.handlers))
                 self.metrics.gauge("in_flight_events.count", len(self.in_flight_events))
+                self.metrics.gauge("pending_events.count", self.pending_events)
                 self.metrics.gauge("dead_letter_queue.size", self.dead_letter_queue.metrics["current_size"])
                 
                 # Log summary
@@ -849,14 +1784,19 @@ class HybridEventBus:
         from_version: int = 0,
         to_version: Optional[int] = None
     ) -> int:
-        """Replay events for aggregate."""
+        """
+        Redeliver an aggregate's stored events to handlers.
+        
+        The events are already in the store, so they go straight to the
+        transport instead of being appended again.
+        """
         events = await self.event_store.get_events_by_aggregate(
             aggregate_id, from_version, to_version
         )
         
         replayed = 0
         for event in events:
-            success = await self.publish(event)
+            success = await self._publish_to_transport(event)
             if success:
                 replayed += 1
         
@@ -866,6 +1806,14 @@ class HybridEventBus:
         
         return replayed
     
+    async def rebuild_projection(
+        self,
+        projection: Projection,
+        aggregate_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Rebuild a projection from snapshots and the event store (see ReplayEngine)."""
+        return await self.replay_engine.rebuild(projection, aggregate_ids)
+    
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics."""
         summary = self.metrics.get_summary()
@@ -887,8 +1835,17 @@ class HybridEventBus:
                 for name, handler in self.handlers.items()
             },
             "dead_letter_queue": self.dead_letter_queue.metrics,
+            "scheduler": {
+                **self.scheduler.get_metrics(),
+                "pending_events": self.pending_events,
+                "under_backpressure": self.under_backpressure,
+                "backpressure_mode": self.backpressure_mode
+            },
             "in_flight_events": len(self.in_flight_events),
-            "running": self.running
+            "running": self.running,
+            "transport": self.transport.get_metrics() if self.transport else {"transport": "memory"},
+            "outbox_relay": self.outbox_relay.get_metrics(),
+            "replay": self.replay_engine.get_metrics()
         })
         
         return summary
@@ -1008,7 +1965,7 @@ def get_event_bus() -> HybridEventBus:
 async def initialize_event_bus(db_session_factory) -> HybridEventBus:
     """Initialize global event bus."""
     global _event_bus
-    _event_bus = HybridEventBus(db_session_factory)
+    _event_bus = HybridEventBus(db_session_factory, transport=create_event_transport())
     await _event_bus.start()
     return _event_bus
 
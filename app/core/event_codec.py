@@ -0,0 +1,162 @@
+"""
+Event codecs for the HybridEventBus.
+
+Events cross process boundaries (transports, the outbox) in a
+schema-versioned envelope::
+
+    {"v": 1, "class": "module:QualName", "event": {...}}
+
+``event`` is the pydantic JSON-mode dump of the event and ``class`` the
+concrete event class it is rebuilt as. The envelope is written by one of:
+
+- ``orjson`` (default): JSON, several times faster than the stdlib
+- ``msgpack``: compact binary, smallest payloads
+- ``json``: stdlib fallback when neither optional package is installed
+
+Decoding detects the format from the first byte (JSON envelopes start with
+``{``), so nodes running different codecs interoperate during a rollout.
+
+Checksums are computed over canonical bytes - compact, key-sorted UTF-8
+JSON of the event without volatile fields - so they do not depend on the
+codec in use.
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+
+import structlog
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+ENVELOPE_VERSION = 1
+
+
+class EventCodec:
+    """Encodes envelopes (plain dicts of JSON-compatible values) to bytes and back."""
+
+    name = "base"
+
+    def dumps(self, payload: Dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class JSONEventCodec(EventCodec):
+    """Standard library JSON."""
+
+    name = "json"
+
+    def dumps(self, payload: Dict[str, Any]) -> bytes:
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return json.loads(data)
+
+
+class OrjsonEventCodec(EventCodec):
+    """orjson JSON (wire-compatible with JSONEventCodec)."""
+
+    name = "orjson"
+
+    def dumps(self, payload: Dict[str, Any]) -> bytes:
+        return orjson.dumps(payload)
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return orjson.loads(data)
+
+
+class MsgpackEventCodec(EventCodec):
+    """MessagePack binary."""
+
+    name = "msgpack"
+
+    def dumps(self, payload: Dict[str, Any]) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(data, raw=False)
+
+
+_CODEC_CLASSES = {
+    "json": (JSONEventCodec, True),
+    "orjson": (OrjsonEventCodec, ORJSON_AVAILABLE),
+    "msgpack": (MsgpackEventCodec, MSGPACK_AVAILABLE),
+}
+_codecs: Dict[str, EventCodec] = {}
+
+
+def available_codecs() -> list:
+    """Names of the codecs usable in this environment."""
+    return [name for name, (_, available) in _CODEC_CLASSES.items() if available]
+
+
+def get_event_codec(name: Optional[str] = None) -> EventCodec:
+    """
+    Codec by name (defaults to EVENT_CODEC).
+
+    A configured codec whose package is not installed degrades to the
+    stdlib JSON codec with a warning; an unknown name raises ValueError.
+    """
+    if name is None:
+        from app.core.config import get_settings
+        name = getattr(get_settings(), "EVENT_CODEC", "orjson")
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+    if name not in _CODEC_CLASSES:
+        raise ValueError(f"Unknown event codec: {name}")
+    codec_class, available = _CODEC_CLASSES[name]
+    if not available:
+        logger.warning("Event codec package not installed, using stdlib JSON", codec=name)
+        codec_class = JSONEventCodec
+    codec = _codecs[name] = codec_class()
+    return codec
+
+
+def codec_for_bytes(data: bytes) -> EventCodec:
+    """Codec able to decode an encoded envelope."""
+    if data[:1] == b"{":
+        return get_event_codec("orjson" if ORJSON_AVAILABLE else "json")
+    if not MSGPACK_AVAILABLE:
+        raise ValueError("Binary event envelope received but msgpack is not installed")
+    return get_event_codec("msgpack")
+
+
+def decode_envelope(data: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Decode an envelope into ``{"v", "class", "event"}``.
+
+    Also accepts the pre-envelope ``{"event_class", "event"}`` JSON form.
+
+    Raises:
+        ValueError: For envelope versions newer than this code understands
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    payload = codec_for_bytes(data).loads(data)
+    if "v" not in payload:
+        return {"v": 0, "class": payload.get("event_class"), "event": payload["event"]}
+    if payload["v"] > ENVELOPE_VERSION:
+        raise ValueError(f"Unsupported event envelope version: {payload['v']}")
+    return payload
+
+
+def canonical_bytes(data: Dict[str, Any]) -> bytes:
+    """Compact, key-sorted UTF-8 JSON of JSON-compatible data (the checksum input)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
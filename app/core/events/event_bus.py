@@ -30,6 +30,7 @@ from app.core.event_bus_advanced import (
     EventHandler, 
     TypedEventHandler,
     EventPriority,
+    Projection,
     get_event_bus as get_hybrid_event_bus,
     initialize_event_bus as init_hybrid_event_bus
 )
@@ -563,6 +564,14 @@ class HealthcareEventBus:
         """Replay events for an aggregate."""
         return await self.hybrid_bus.replay_events(aggregate_id, from_version, to_version)
 
+    async def rebuild_projection(
+        self,
+        projection: Projection,
+        aggregate_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Rebuild a projection from aggregate snapshots and the event store."""
+        return await self.hybrid_bus.rebuild_projection(projection, aggregate_ids)
+
     async def publish(self, event: BaseEvent) -> bool:
         """Publish an event (compatibility method for external callers)."""
         return await self._publish_event(event)
@@ -193,6 +193,24 @@ audit_buffer_size = Gauge(
     registry=healthcare_registry
 )
 
+audit_spool_backlog_records = Gauge(
+    'healthcare_audit_spool_backlog_records',
+    'Audit records fsync\'d to the local spool but not yet in the database',
+    registry=healthcare_registry
+)
+
+audit_spool_backlog_bytes = Gauge(
+    'healthcare_audit_spool_backlog_bytes',
+    'Bytes of undrained audit spool segments',
+    registry=healthcare_registry
+)
+
+audit_spool_drain_lag_seconds = Gauge(
+    'healthcare_audit_spool_drain_lag_seconds',
+    'Seconds since the audit spool drainer last loaded a batch',
+    registry=healthcare_registry
+)
+
 audit_events_processed_total = Counter(
     'healthcare_audit_events_processed_total',
     'Total audit events processed',
@@ -468,6 +486,8 @@ class MetricsCollector:
             cache_performance = cache_stats.get("cache_performance", {})
             hit_rate = cache_performance.get("hit_rate_percent", 0)
             cache_hit_rate.labels(cache_type="redis").set(hit_rate)
+            for key_type, key_type_stats in cache_performance.get("by_key_type", {}).items():
+                cache_hit_rate.labels(cache_type=key_type).set(key_type_stats["hit_rate_percent"])
             
         except Exception as e:
             logger.error("Failed to update cache metrics", error=str(e))
@@ -482,6 +502,15 @@ class MetricsCollector:
             current_buffer_size = buffer_stats.get("current_size", 0)
             audit_buffer_size.set(current_buffer_size)
             
+            # Update durable spool backlog
+            spool_stats = audit_performance.get("spool_statistics")
+            if spool_stats:
+                audit_spool_backlog_records.set(spool_stats.get("backlog_records", 0))
+                audit_spool_backlog_bytes.set(spool_stats.get("backlog_bytes", 0))
+                drain_lag = spool_stats.get("drainer", {}).get("seconds_since_last_drain")
+                if drain_lag is not None:
+                    audit_spool_drain_lag_seconds.set(drain_lag)
+            
         except Exception as e:
             logger.error("Failed to update audit metrics", error=str(e))
     
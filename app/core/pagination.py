@@ -0,0 +1,260 @@
+"""
+Keyset (cursor) pagination helpers.
+
+LIMIT/OFFSET makes the database walk and discard every skipped row, and an
+exact count(*) scans the whole filtered set, so both slow down linearly on
+deep pages of large tables. Keyset pagination seeks straight to the next
+page with a (sort key, id) row comparison that a composite B-tree index can
+serve, and the count can be replaced by a planner estimate or skipped.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+logger = structlog.get_logger()
+
+CURSOR_VERSION = 1
+
+
+class CountMode(str, Enum):
+    """How a paginated search reports its total."""
+    EXACT = "exact"          # count(*) over the filtered set
+    ESTIMATED = "estimated"  # planner row estimate from pg_class/pg_statistic
+    NONE = "none"            # no count at all
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another query."""
+
+
+@dataclass
+class KeysetPage:
+    """One page of keyset-paginated results."""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total_count: Optional[int] = None
+    count_is_estimate: bool = False
+
+
+def _encode_value(value: Any) -> List[Any]:
+    """Tag a sort key value with its type so it round-trips exactly."""
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["u", str(value)]
+    if isinstance(value, Enum):
+        return ["s", str(value.value)]
+    if isinstance(value, str):
+        return ["s", value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return ["n", value]
+    raise InvalidCursorError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def _decode_value(tagged: List[Any]) -> Any:
+    tag, value = tagged
+    if tag == "dt":
+        return datetime.fromisoformat(value)
+    if tag == "d":
+        return date.fromisoformat(value)
+    if tag == "u":
+        return uuid.UUID(value)
+    if tag in ("s", "n"):
+        return value
+    raise InvalidCursorError(f"Unknown cursor value tag: {tag}")
+
+
+def encode_cursor(sort_value: Any, row_id: Any, scope: str) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        sort_value: Sort key of the last row on the page
+        row_id: Primary key of the last row (tie-breaker)
+        scope: Identifies the query/sort the cursor belongs to
+
+    Returns:
+        URL-safe cursor token
+    """
+    payload = {
+        "v": CURSOR_VERSION,
+        "s": scope,
+        "k": [_encode_value(sort_value), _encode_value(row_id)]
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor created by encode_cursor for the same scope.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or from a different query
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload.get("v") != CURSOR_VERSION:
+            raise InvalidCursorError("Unsupported cursor version")
+        if payload.get("s") != scope:
+            raise InvalidCursorError("Cursor does not match this query's sort order")
+        sort_value, row_id = (_decode_value(item) for item in payload["k"])
+        return sort_value, row_id
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    query: Any,
+    sort_column: Any,
+    id_column: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    scope: str = ""
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (sort_column, id_column) starting after a cursor.
+
+    Sort columns must be non-nullable; NULLs break row-value comparison.
+
+    Args:
+        session: Database session
+        query: Filtered select of ORM entities (without ORDER BY/LIMIT)
+        sort_column: Primary sort column
+        id_column: Unique tie-breaker column
+        limit: Page size
+        cursor: Cursor from the previous page, or None for the first page
+        descending: Sort direction
+        scope: Cursor scope, usually "<table>:<sort column>:<direction>"
+
+    Returns:
+        Tuple of (rows, next cursor or None on the last page)
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, scope)
+        position = tuple_(sort_column, id_column)
+        # The redundant bound on sort_column alone lets the planner prune
+        # partitions keyed on it, which a row-value comparison does not
+        query = query.where(
+            position < (sort_value, row_id) if descending else position > (sort_value, row_id),
+            sort_column <= sort_value if descending else sort_column >= sort_value
+        )
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # One extra row tells us whether another page exists without counting
+    result = await session.execute(query.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key), scope)
+
+    return rows, next_cursor
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper so bound parameters compile normally."""
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_table_rows(session: AsyncSession, table_name: str) -> int:
+    """
+    Row estimate for a whole table from pg_class.reltuples (maintained by ANALYZE).
+
+    A partitioned parent holds no rows itself, so its partitions' estimates are summed.
+    """
+    result = await session.execute(
+        text(
+            "SELECT CASE WHEN p.relkind = 'p' THEN ("
+            "  SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0) FROM pg_inherits i"
+            "  JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = p.oid"
+            ") ELSE p.reltuples END::bigint "
+            "FROM pg_class p WHERE p.oid = to_regclass(:table_name)"
+        ),
+        {"table_name": table_name}
+    )
+    estimate = result.scalar()
+    # reltuples is -1 for tables that have never been analyzed
+    return max(int(estimate or 0), 0)
+
+
+async def estimate_row_count(session: AsyncSession, query: Any, table_name: Optional[str] = None) -> int:
+    """
+    Planner row estimate for a filtered query.
+
+    The planner derives it from pg_class.reltuples and pg_statistic selectivity,
+    so it costs a plan rather than a scan. Falls back to the table-level
+    pg_class estimate if EXPLAIN fails.
+    """
+    try:
+        # Savepoint so a failed EXPLAIN does not abort the caller's transaction
+        async with session.begin_nested():
+            result = await session.execute(_Explain(query.order_by(None).limit(None).offset(None)))
+            plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+    except Exception as e:
+        if table_name is None:
+            raise
+        logger.warning("Planner row estimate failed, using pg_class", table=table_name, error=str(e))
+        return await estimate_table_rows(session, table_name)
+
+
+async def resolve_total_count(
+    session: AsyncSession,
+    query: Any,
+    count_mode: CountMode,
+    table_name: Optional[str] = None
+) -> Tuple[Optional[int], bool]:
+    """
+    Compute a search total according to the requested count mode.
+
+    Args:
+        session: Database session
+        query: Filtered select (without ORDER BY/LIMIT)
+        count_mode: Exact, estimated or no count
+        table_name: Table for the pg_class fallback estimate
+
+    Returns:
+        Tuple of (total or None, whether the total is an estimate)
+    """
+    if count_mode == CountMode.NONE:
+        return None, False
+    if count_mode == CountMode.ESTIMATED:
+        return await estimate_row_count(session, query, table_name), True
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return (await session.execute(count_query)).scalar(), False
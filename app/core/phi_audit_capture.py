@@ -0,0 +1,383 @@
+"""
+Low-overhead PHI access audit capture.
+
+The request path only snapshots an immutable ``PHIAccessRecord`` (route
+template, principal, resource id, status, timing) into a fixed-capacity ring
+buffer. A background ``PHIAuditWriter`` drains the buffer in batches,
+enriches each record into a ``DataAccessEvent`` (resource type, event type,
+compliance tags) and persists it through the audit service, falling back to
+a local fsynced JSONL file when the audit pipeline is unavailable.
+
+The buffer is used from a single event loop, so ``reserve``/``publish``/
+``drain`` never await or take a lock. When it is full the configured
+overflow policy applies:
+
+- ``fail_closed`` (default): PHI requests are refused with 503 before the
+  handler runs, so no PHI is served without an audit slot.
+- ``drop_oldest`` / ``drop_newest``: the request proceeds and a record is
+  lost; every drop is counted and logged as a compliance gap.
+"""
+
+import asyncio
+import ipaddress
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from app.core.config import get_settings
+
+logger = structlog.get_logger()
+
+OVERFLOW_POLICIES = ("fail_closed", "drop_oldest", "drop_newest")
+
+# Path markers of PHI endpoints and the resource type each one implies
+PHI_PATH_MARKERS = (
+    ("/patients/", "patient_record"),
+    ("/healthcare/", "healthcare_record"),
+    ("/clinical-documents/", "clinical_document"),
+    ("/immunizations/", "immunization_record"),
+    ("/medical-records/", "medical_record"),
+    ("/phi/", "phi_data"),
+    ("/health-data/", "healthcare_data"),
+)
+
+_DATA_OPERATIONS = {"GET": "read", "HEAD": "read", "POST": "create", "PUT": "update", "PATCH": "update", "DELETE": "delete"}
+
+
+def is_phi_path(path: str) -> bool:
+    """Whether a request path addresses a PHI endpoint."""
+    path = path.lower()
+    return any(marker in path for marker, _ in PHI_PATH_MARKERS)
+
+
+def phi_resource_type(path: str) -> str:
+    """Resource type implied by a PHI path."""
+    path = path.lower()
+    for marker, resource_type in PHI_PATH_MARKERS:
+        if marker in path:
+            return resource_type
+    return "healthcare_data"
+
+
+def resource_id_from_path_params(path_params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The addressed resource id from matched path parameters (last ``*id`` parameter wins)."""
+    resource_id = None
+    for name, value in (path_params or {}).items():
+        if name == "id" or name.endswith("_id"):
+            resource_id = value
+    return str(resource_id) if resource_id is not None else None
+
+
+@dataclass(frozen=True)
+class PHIAccessRecord:
+    """Immutable snapshot of one PHI request, taken on the request path."""
+    captured_at: float
+    method: str
+    route_template: str
+    path: str
+    principal: Optional[str]
+    resource_id: Optional[str]
+    status_code: int
+    duration_ms: float
+    client_ip: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PHIAuditRingBuffer:
+    """
+    Fixed-capacity ring of captured PHI access records.
+
+    Slots are reserved before a PHI handler runs so that ``fail_closed`` can
+    refuse the request while nothing has been served yet; ``publish`` fills
+    the reserved slot when the response completes.
+    """
+
+    def __init__(self, capacity: int, overflow_policy: str = "fail_closed"):
+        if capacity <= 0:
+            raise ValueError("PHI audit buffer capacity must be positive")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown PHI audit overflow policy: {overflow_policy}")
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self._slots: List[Optional[PHIAccessRecord]] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._reserved = 0
+        self._on_publish: Optional[Callable[[int], None]] = None
+        self.stats = {"captured": 0, "dropped": 0, "rejected": 0, "high_water": 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def reserve(self) -> bool:
+        """Reserve a slot for an in-flight PHI request; False means refuse it (fail_closed only)."""
+        if self.overflow_policy == "fail_closed" and self._size + self._reserved >= self.capacity:
+            self.stats["rejected"] += 1
+            return False
+        self._reserved += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a reservation that will not be published."""
+        self._reserved = max(0, self._reserved - 1)
+
+    def publish(self, record: PHIAccessRecord, reserved: bool = True) -> bool:
+        """Store a record; returns False if the overflow policy dropped it."""
+        if reserved:
+            self.release()
+        if self._size == self.capacity:
+            self.stats["dropped"] += 1
+            if self.overflow_policy != "drop_oldest":
+                return False
+            # Overwrite the oldest record
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            self._size -= 1
+        self._slots[(self._head + self._size) % self.capacity] = record
+        self._size += 1
+        self.stats["captured"] += 1
+        if self._size > self.stats["high_water"]:
+            self.stats["high_water"] = self._size
+        if self._on_publish is not None:
+            self._on_publish(self._size)
+        return True
+
+    def drain(self, max_records: int) -> List[PHIAccessRecord]:
+        """Remove and return up to max_records of the oldest records."""
+        count = min(max_records, self._size)
+        records = []
+        for _ in range(count):
+            records.append(self._slots[self._head])
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+        self._size -= count
+        return records
+
+
+def build_phi_access_event(record: PHIAccessRecord):
+    """
+    Enrich a captured record into the audit event persisted for it.
+
+    Args:
+        record: Captured PHI access snapshot
+
+    Returns:
+        DataAccessEvent for the audit pipeline
+    """
+    from app.modules.audit_logger.schemas import DataAccessEvent
+
+    success = record.error is None and record.status_code < 400
+    resource_type = phi_resource_type(record.path)
+    if record.error is not None or record.status_code >= 500:
+        outcome = "error"
+    elif record.status_code in (401, 403):
+        outcome = "denied"
+    else:
+        outcome = "success" if success else "failure"
+
+    headers = {
+        "endpoint": record.path,
+        "route": record.route_template,
+        "method": record.method,
+        "processing_time_ms": round(record.duration_ms, 2),
+        "response_status": record.status_code,
+        "captured_at": datetime.fromtimestamp(record.captured_at, timezone.utc).isoformat(),
+        "compliance_flags": ["HIPAA", "PHI_ACCESS"],
+        "audit_category": "phi_access",
+        "severity": "medium" if success else "high"
+    }
+    if resource_type == "patient_record":
+        headers["patient_id"] = record.resource_id
+    elif resource_type == "clinical_document":
+        headers["document_id"] = record.resource_id
+
+    client_ip = record.client_ip
+    try:
+        ipaddress.ip_address(client_ip)
+    except ValueError:
+        # Non-IP client addresses (e.g. test clients) are kept out of the validated field
+        if client_ip:
+            headers["client"] = client_ip
+        client_ip = None
+
+    return DataAccessEvent(
+        user_id=record.principal or "unknown",
+        access_type="data_access",
+        data_operation=_DATA_OPERATIONS.get(record.method, "read"),
+        resource_type=resource_type,
+        resource_id=record.resource_id or "unknown",
+        data_sensitivity_level="phi",
+        data_classification="phi",
+        access_granted=outcome != "denied",
+        operation=f"phi_{record.method.lower()}",
+        outcome=outcome,
+        ip_address=client_ip,
+        error_message=record.error,
+        compliance_tags=["HIPAA", "PHI_ACCESS"],
+        publisher="phi_audit_capture",
+        headers=headers
+    )
+
+
+async def _persist_via_audit_service(events: List[Any]) -> List[bool]:
+    from app.modules.audit_logger.service import get_audit_service
+
+    audit_service = get_audit_service()
+    return [await audit_service.log_audit_event(event) for event in events]
+
+
+class PHIAuditWriter:
+    """Background task that enriches and persists captured PHI access records in batches."""
+
+    def __init__(
+        self,
+        buffer: PHIAuditRingBuffer,
+        persist: Optional[Callable[[List[Any]], Awaitable[List[bool]]]] = None,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.5,
+        fallback_dir: Optional[str] = None
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            buffer: Ring buffer filled by the middleware
+            persist: Coroutine persisting a batch of events, returning per-event success
+                (defaults to the SOC2 audit service)
+            batch_size: Records drained per batch
+            flush_interval_seconds: Longest a record waits before being persisted
+            fallback_dir: Directory for the JSONL fallback when persisting fails
+        """
+        self.buffer = buffer
+        self.persist = persist or _persist_via_audit_service
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.fallback_dir = Path(fallback_dir) if fallback_dir else None
+        self.stats = {"persisted": 0, "fallback": 0, "batches": 0, "failures": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start draining the buffer in the background."""
+        if self.running:
+            return
+        self._wake = asyncio.Event()
+        wake = self._wake
+        batch_size = self.batch_size
+        self.buffer._on_publish = lambda size: wake.set() if size >= batch_size else None
+        self._task = asyncio.create_task(self._run(), name="phi-audit-writer")
+        logger.info("PHI audit writer started",
+                   capacity=self.buffer.capacity,
+                   overflow_policy=self.buffer.overflow_policy)
+
+    async def stop(self) -> None:
+        """Stop the background task and persist everything still buffered."""
+        task, self._task = self._task, None
+        self.buffer._on_publish = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        logger.info("PHI audit writer stopped", **self.stats)
+
+    async def flush(self) -> int:
+        """Persist all buffered records now; returns how many were handled."""
+        handled = 0
+        while len(self.buffer):
+            handled += await self._write_batch(self.buffer.drain(self.batch_size))
+        return handled
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("PHI audit writer batch failed", error=str(e))
+
+    async def _write_batch(self, records: List[PHIAccessRecord]) -> int:
+        if not records:
+            return 0
+        events = [build_phi_access_event(record) for record in records]
+        try:
+            results = await self.persist(events)
+        except Exception as e:
+            logger.error("CRITICAL: PHI audit persist failed", error=str(e), records=len(events),
+                         compliance_violation="HIPAA_AUDIT_FAILURE")
+            results = [False] * len(events)
+
+        failed = [event for event, ok in zip(events, results) if not ok]
+        self.stats["batches"] += 1
+        self.stats["persisted"] += len(events) - len(failed)
+        if failed:
+            self.stats["failures"] += len(failed)
+            await asyncio.to_thread(self._write_fallback, failed)
+        return len(events)
+
+    def _write_fallback(self, events: List[Any]) -> None:
+        """Append undeliverable PHI audit events to the daily fallback file."""
+        fallback_dir = self.fallback_dir or Path(get_settings().PHI_AUDIT_FALLBACK_DIR)
+        try:
+            fallback_dir.mkdir(parents=True, exist_ok=True)
+            fallback_file = fallback_dir / f"phi_audit_fallback_{datetime.utcnow().strftime('%Y%m%d')}.jsonl"
+            with open(fallback_file, "a") as f:
+                for event in events:
+                    entry = event.model_dump(mode="json")
+                    entry["requires_manual_review"] = True
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())  # Force write to disk for compliance
+            self.stats["fallback"] += len(events)
+            logger.warning("PHI access logged to fallback file for compliance",
+                          fallback_file=str(fallback_file), events=len(events),
+                          compliance="HIPAA_FALLBACK_LOGGING")
+        except Exception as fallback_error:
+            logger.critical("CRITICAL: All PHI audit logging mechanisms failed",
+                            fallback_error=str(fallback_error),
+                            events=[event.event_id for event in events],
+                            compliance_violation="TOTAL_AUDIT_SYSTEM_FAILURE",
+                            immediate_action_required=True)
+
+
+_phi_audit_buffer: Optional[PHIAuditRingBuffer] = None
+_phi_audit_writer: Optional[PHIAuditWriter] = None
+
+
+def get_phi_audit_buffer() -> PHIAuditRingBuffer:
+    """Process-wide PHI audit ring buffer."""
+    global _phi_audit_buffer
+    if _phi_audit_buffer is None:
+        settings = get_settings()
+        _phi_audit_buffer = PHIAuditRingBuffer(
+            settings.PHI_AUDIT_BUFFER_CAPACITY, settings.PHI_AUDIT_OVERFLOW_POLICY
+        )
+    return _phi_audit_buffer
+
+
+def get_phi_audit_writer() -> PHIAuditWriter:
+    """Process-wide PHI audit writer draining ``get_phi_audit_buffer()``."""
+    global _phi_audit_writer
+    if _phi_audit_writer is None:
+        settings = get_settings()
+        _phi_audit_writer = PHIAuditWriter(
+            get_phi_audit_buffer(),
+            batch_size=settings.PHI_AUDIT_BATCH_SIZE,
+            flush_interval_seconds=settings.PHI_AUDIT_FLUSH_INTERVAL_SECONDS
+        )
+    return _phi_audit_writer
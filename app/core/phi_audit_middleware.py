@@ -1,21 +1,83 @@
 """
 PHI Access Audit Middleware
 Автоматически логирует доступ к защищенной медицинской информации для HIPAA compliance
+
+The request path only snapshots a PHIAccessRecord into the PHI audit ring
+buffer; enrichment and persistence happen in the background PHIAuditWriter
+(see app.core.phi_audit_capture).
 """
 
-from fastapi import Request, Response
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 import structlog
 import time
-import json
-from datetime import datetime
 
-from app.core.database_unified import AuditEventType
-from app.modules.audit_logger.service import get_audit_service
+from app.core.phi_audit_capture import (
+    PHIAccessRecord,
+    PHIAuditRingBuffer,
+    get_phi_audit_buffer,
+    is_phi_path,
+    phi_resource_type,
+    resource_id_from_path_params,
+)
 
 logger = structlog.get_logger()
 
+
+def _audit_unavailable_response() -> JSONResponse:
+    """Fail-closed response for PHI requests that cannot be audited."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "PHI audit capacity exhausted, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+def _reject_unaudited(buffer: PHIAuditRingBuffer, method: str, path: str) -> JSONResponse:
+    logger.critical(
+        "PHI request refused: audit buffer full",
+        method=method,
+        path=path,
+        buffered=len(buffer),
+        compliance="HIPAA_FAIL_CLOSED"
+    )
+    return _audit_unavailable_response()
+
+
+def _capture(
+    buffer: PHIAuditRingBuffer,
+    scope: dict,
+    route_template: Optional[str],
+    status_code: int,
+    started: float,
+    error: Optional[str]
+) -> None:
+    """Snapshot a finished PHI request into the ring buffer."""
+    client = scope.get("client")
+    record = PHIAccessRecord(
+        captured_at=time.time(),
+        method=scope["method"],
+        route_template=route_template or scope["path"],
+        path=scope["path"],
+        principal=(scope.get("state") or {}).get("user_id"),
+        resource_id=resource_id_from_path_params(scope.get("path_params")),
+        status_code=status_code,
+        duration_ms=(time.perf_counter() - started) * 1000,
+        client_ip=client[0] if client else None,
+        error=error
+    )
+    if not buffer.publish(record):
+        logger.error(
+            "PHI audit record dropped: buffer full",
+            path=record.path,
+            principal=record.principal,
+            overflow_policy=buffer.overflow_policy,
+            compliance_violation="HIPAA_AUDIT_GAP"
+        )
+
+
 class PHIAuditRoute(APIRoute):
     """
     Custom route class that automatically logs PHI access for HIPAA compliance.
@@ -29,316 +91,43 @@ class PHIAuditRoute(APIRoute):
     
     def get_route_handler(self) -> Callable[[Request], Any]:
         original_route_handler = super().get_route_handler()
+        route_template = self.path_format
         
         async def custom_route_handler(request: Request) -> Response:
-            # Start timing
-            start_time = time.time()
+            scope = request.scope
             
-            # Extract route information
-            route_path = str(request.url.path)
-            method = request.method
-            user_id = getattr(request.state, 'user_id', None)
+            # Already captured by PHIAuditMiddleware, or not a PHI endpoint
+            if (scope.get("state") or {}).get("phi_audit_captured") or not is_phi_path(scope["path"]):
+                return await original_route_handler(request)
             
-            # Determine if this is PHI access
-            is_phi_access = self._is_phi_endpoint(route_path, method)
+            buffer = get_phi_audit_buffer()
+            if not buffer.reserve():
+                return _reject_unaudited(buffer, scope["method"], scope["path"])
             
+            started = time.perf_counter()
+            status_code, error = 500, None
             try:
-                # Execute the original route handler
                 response = await original_route_handler(request)
-                processing_time = time.time() - start_time
-                
-                # Log PHI access if applicable
-                if is_phi_access:
-                    await self._log_phi_access(
-                        request=request,
-                        response=response,
-                        user_id=user_id,
-                        processing_time=processing_time,
-                        success=True
-                    )
-                
+                status_code = response.status_code
                 return response
-                
+            except HTTPException as e:
+                status_code = e.status_code
+                raise
             except Exception as e:
-                processing_time = time.time() - start_time
-                
-                # Log failed PHI access attempt
-                if is_phi_access:
-                    await self._log_phi_access(
-                        request=request,
-                        response=None,
-                        user_id=user_id,
-                        processing_time=processing_time,
-                        success=False,
-                        error=str(e)
-                    )
-                
-                # Re-raise the exception
+                error = type(e).__name__
                 raise
+            finally:
+                _capture(buffer, scope, route_template, status_code, started, error)
         
         return custom_route_handler
     
     def _is_phi_endpoint(self, path: str, method: str) -> bool:
         """Determine if this endpoint involves PHI access."""
-        phi_patterns = [
-            '/patients/',
-            '/healthcare/',
-            '/clinical-documents/',
-            '/phi/',
-            '/immunizations/',
-            '/medical-records/',
-            '/health-data/'
-        ]
-        
-        # Check if path contains PHI-related patterns
-        for pattern in phi_patterns:
-            if pattern in path.lower():
-                return True
-        
-        return False
-    
-    async def _log_phi_access(
-        self,
-        request: Request,
-        response: Response = None,
-        user_id: str = None,
-        processing_time: float = 0,
-        success: bool = True,
-        error: str = None
-    ):
-        """Log PHI access event for HIPAA compliance."""
-        try:
-            # Extract request details
-            path = str(request.url.path)
-            method = request.method
-            client_ip = request.client.host if request.client else "unknown"
-            user_agent = request.headers.get("user-agent", "unknown")
-            
-            # Extract resource information
-            resource_id = self._extract_resource_id(path)
-            resource_type = self._determine_resource_type(path)
-            
-            # Determine event type
-            if success:
-                if method == "GET":
-                    event_type = AuditEventType.PHI_ACCESSED
-                elif method == "POST":
-                    event_type = AuditEventType.PHI_CREATED
-                elif method in ["PUT", "PATCH"]:
-                    event_type = AuditEventType.PHI_UPDATED
-                elif method == "DELETE":
-                    event_type = AuditEventType.PHI_DELETED
-                else:
-                    event_type = AuditEventType.PHI_ACCESSED
-            else:
-                event_type = AuditEventType.SECURITY_VIOLATION
-            
-            # Create audit event
-            from app.modules.audit_logger.schemas import DataAccessEvent
-            
-            phi_event = DataAccessEvent(
-                user_id=user_id or "unknown",
-                access_type="phi_access",
-                data_operation=method.lower(),
-                resource_type=resource_type,
-                resource_id=resource_id,
-                data_sensitivity_level="phi",  # Always PHI for this middleware
-                access_granted=success,
-                operation=f"phi_{method.lower()}",
-                outcome="success" if success else "failure",
-                headers={
-                    "endpoint": path,
-                    "method": method,
-                    "user_agent": user_agent,
-                    "processing_time_ms": round(processing_time * 1000, 2),
-                    "response_status": response.status_code if response else "error",
-                    "error_message": error if error else None,
-                    "compliance_flags": ["HIPAA", "PHI_ACCESS"],
-                    "audit_category": "phi_access",
-                    "severity": "high" if not success else "medium"
-                }
-            )
-            
-            # Additional metadata for specific resource types
-            if "patient" in resource_type.lower():
-                phi_event.headers["patient_id"] = resource_id
-                phi_event.headers["data_type"] = "patient_record"
-            elif "clinical" in resource_type.lower():
-                phi_event.headers["document_id"] = resource_id
-                phi_event.headers["data_type"] = "clinical_document"
-            
-            # Set IP address
-            phi_event.headers["ip_address"] = client_ip
-            
-            # Log the event with graceful event loop handling
-            try:
-                audit_service = get_audit_service()
-                success_logged = await audit_service.log_audit_event(phi_event)
-                
-                if success_logged:
-                    logger.info(
-                        "PHI access logged",
-                        event_type=event_type,
-                        user_id=user_id,
-                        resource_type=resource_type,
-                        resource_id=resource_id,
-                        success=success,
-                        compliance="HIPAA"
-                    )
-                else:
-                    logger.error(
-                        "Failed to log PHI access - CRITICAL COMPLIANCE ISSUE",
-                        user_id=user_id,
-                        resource_type=resource_type,
-                        path=path
-                    )
-            except RuntimeError as e:
-                if "Event loop is closed" in str(e):
-                    # Handle event loop closure gracefully during shutdown
-                    logger.warning(
-                        "PHI audit logging skipped due to event loop closure during shutdown",
-                        user_id=user_id,
-                        resource_type=resource_type,
-                        path=path,
-                        compliance_note="SHUTDOWN_GRACEFUL_DEGRADATION"
-                    )
-                    # For enterprise compliance, we should implement a fallback logging mechanism
-                    # such as writing directly to a file or queue for later processing
-                    await self._fallback_phi_audit_log(phi_event, logging_error=e)
-                else:
-                    raise
-                
-        except Exception as logging_error:
-            # CRITICAL: PHI access logging failure is a serious compliance issue
-            logger.error(
-                "CRITICAL: PHI audit logging failed",
-                error=str(logging_error),
-                user_id=user_id,
-                path=path,
-                compliance_violation="HIPAA_AUDIT_FAILURE"
-            )
-            # Attempt fallback logging for enterprise compliance
-            try:
-                await self._fallback_phi_audit_log(phi_event, logging_error)
-            except Exception as fallback_error:
-                logger.error(
-                    "Fallback PHI audit logging also failed",
-                    original_error=str(logging_error),
-                    fallback_error=str(fallback_error),
-                    compliance_violation="CRITICAL_AUDIT_SYSTEM_FAILURE"
-                )
-    
-    def _extract_resource_id(self, path: str) -> str:
-        """Extract resource ID from path."""
-        # Pattern matching for common ID patterns
-        import re
-        
-        # UUID pattern
-        uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-        uuid_match = re.search(uuid_pattern, path, re.IGNORECASE)
-        if uuid_match:
-            return uuid_match.group(0)
-        
-        # Numeric ID pattern
-        numeric_pattern = r'/(\d+)(?:/|$)'
-        numeric_match = re.search(numeric_pattern, path)
-        if numeric_match:
-            return numeric_match.group(1)
-        
-        # Alphanumeric ID after known paths
-        id_patterns = [
-            r'/patients/([^/]+)',
-            r'/healthcare/([^/]+)',
-            r'/clinical-documents/([^/]+)',
-            r'/phi/([^/]+)'
-        ]
-        
-        for pattern in id_patterns:
-            match = re.search(pattern, path, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        
-        return "unknown"
+        return is_phi_path(path)
     
     def _determine_resource_type(self, path: str) -> str:
         """Determine resource type from path."""
-        path_lower = path.lower()
-        
-        if '/patients/' in path_lower:
-            return 'patient_record'
-        elif '/healthcare/' in path_lower:
-            return 'healthcare_record'
-        elif '/clinical-documents/' in path_lower:
-            return 'clinical_document'
-        elif '/immunizations/' in path_lower:
-            return 'immunization_record'
-        elif '/medical-records/' in path_lower:
-            return 'medical_record'
-        elif '/phi/' in path_lower:
-            return 'phi_data'
-        else:
-            return 'healthcare_data'
-
-    async def _fallback_phi_audit_log(self, phi_event: Any, logging_error: Exception):
-        """
-        Fallback PHI audit logging for enterprise compliance.
-        
-        When the primary audit system fails (e.g., due to event loop closure),
-        this method provides a fallback mechanism to ensure PHI access is still logged
-        for HIPAA/SOC2 compliance requirements.
-        """
-        import asyncio
-        import os
-        import json
-        from pathlib import Path
-        
-        try:
-            # For enterprise compliance, write to secure fallback audit file
-            fallback_dir = Path("/var/log/healthcare/phi_audit_fallback")
-            fallback_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create fallback audit entry
-            fallback_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "event_type": "PHI_ACCESS_FALLBACK",
-                "user_id": getattr(phi_event, 'user_id', 'unknown'),
-                "resource_type": getattr(phi_event, 'resource_type', 'unknown'),
-                "resource_id": getattr(phi_event, 'resource_id', 'unknown'),
-                "access_type": getattr(phi_event, 'event_type', 'unknown'),
-                "compliance_note": "FALLBACK_LOGGING_DUE_TO_SYSTEM_ISSUE",
-                "original_error": str(logging_error),
-                "ip_address": getattr(phi_event.headers, 'ip_address', 'unknown') if hasattr(phi_event, 'headers') else 'unknown',
-                "session_id": getattr(phi_event, 'session_id', 'unknown'),
-                "requires_manual_review": True
-            }
-            
-            # Write to daily fallback file
-            fallback_file = fallback_dir / f"phi_audit_fallback_{datetime.utcnow().strftime('%Y%m%d')}.jsonl"
-            
-            # Use synchronous I/O for fallback to avoid event loop issues
-            with open(fallback_file, 'a') as f:
-                f.write(json.dumps(fallback_entry) + '\n')
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk for compliance
-            
-            logger.warning(
-                "PHI access logged to fallback file for compliance",
-                fallback_file=str(fallback_file),
-                user_id=fallback_entry["user_id"],
-                compliance="HIPAA_FALLBACK_LOGGING"
-            )
-            
-        except Exception as fallback_error:
-            # Last resort: log to system logger
-            logger.critical(
-                "CRITICAL: All PHI audit logging mechanisms failed",
-                original_error=str(logging_error),
-                fallback_error=str(fallback_error),
-                phi_event_data=str(phi_event),
-                compliance_violation="TOTAL_AUDIT_SYSTEM_FAILURE",
-                immediate_action_required=True
-            )
-
+        return phi_resource_type(path)
 
 # ============================================
 # DECORATOR FOR EASY PHI ROUTE PROTECTION
@@ -366,72 +155,47 @@ class PHIAuditMiddleware:
     """
     Middleware that automatically detects and logs PHI access.
     Add this to your FastAPI app for comprehensive PHI logging.
+    
+    Reserves an audit slot before the request runs (refusing it with 503
+    under the fail_closed overflow policy) and snapshots the route template,
+    principal, resource id and status into the ring buffer when it finishes.
     """
     
-    def __init__(self, app):
+    def __init__(self, app, buffer: Optional[PHIAuditRingBuffer] = None):
         self.app = app
+        self.buffer = buffer
     
     async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
+        if scope["type"] != "http" or not is_phi_path(scope["path"]):
             await self.app(scope, receive, send)
             return
         
-        # Create a custom scope with PHI audit tracking
-        request = Request(scope, receive)
-        
-        # Check if this is a PHI endpoint
-        path = request.url.path
-        method = request.method
-        
-        is_phi_endpoint = self._is_phi_endpoint(path, method)
-        
-        if is_phi_endpoint:
-            # Add PHI audit flag to request state
-            scope["state"] = scope.get("state", {})
-            scope["state"]["requires_phi_audit"] = True
-            scope["state"]["phi_resource_type"] = self._determine_resource_type(path)
-            scope["state"]["phi_resource_id"] = self._extract_resource_id(path)
-        
-        await self.app(scope, receive, send)
-    
-    def _is_phi_endpoint(self, path: str, method: str) -> bool:
-        """Check if endpoint handles PHI data."""
-        phi_patterns = [
-            '/patients/',
-            '/healthcare/',
-            '/clinical-documents/',
-            '/phi/',
-            '/immunizations/',
-            '/medical-records/',
-            '/health-data/'
-        ]
-        
-        for pattern in phi_patterns:
-            if pattern in path.lower():
-                return True
+        buffer = self.buffer if self.buffer is not None else get_phi_audit_buffer()
+        if not buffer.reserve():
+            await _reject_unaudited(buffer, scope["method"], scope["path"])(scope, receive, send)
+            return
         
-        return False
-    
-    def _determine_resource_type(self, path: str) -> str:
-        """Determine PHI resource type."""
-        path_lower = path.lower()
+        # Add PHI audit flags to request state
+        state = scope.setdefault("state", {})
+        state["requires_phi_audit"] = True
+        state["phi_audit_captured"] = True
         
-        if '/patients/' in path_lower:
-            return 'patient_record'
-        elif '/healthcare/' in path_lower:
-            return 'healthcare_record'
-        elif '/clinical-documents/' in path_lower:
-            return 'clinical_document'
-        else:
-            return 'phi_data'
-    
-    def _extract_resource_id(self, path: str) -> str:
-        """Extract resource ID."""
-        import re
+        started = time.perf_counter()
+        status_code = 500
+        error = None
         
-        # Simple ID extraction
-        id_match = re.search(r'/([^/]+)/?$', path)
-        if id_match:
-            return id_match.group(1)
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        return "unknown"
\ No newline at end of file
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            # The router leaves the matched route in the shared scope
+            route = scope.get("route")
+            _capture(buffer, scope, getattr(route, "path_format", None), status_code, started, error)
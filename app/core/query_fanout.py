@@ -0,0 +1,135 @@
+"""
+Concurrent fan-out of independent read queries.
+
+Dashboards, analytics and audit summaries run several independent aggregates
+per request. An AsyncSession cannot run statements concurrently, so on the
+request's session they run one after another and latency is their sum.
+fan_out() runs each query on its own pooled read-only session instead:
+
+- at most ``max_concurrency`` queries hold a connection at once, so one
+  request cannot drain the pool
+- each query has a deadline, measured from the start of the fan-out (waiting
+  for a slot counts); a query that misses it is cancelled and its session
+  rolled back and closed
+- errors, timeouts and open SOC2 circuit breakers resolve to the query's
+  fallback, so the caller gets a partial result rather than an error
+
+Latency then tracks the slowest query rather than the sum.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Iterable, Optional
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database_unified import get_db_session
+from app.core.soc2_circuit_breaker import SOC2CircuitBreaker, SOC2CircuitBreakerException
+
+logger = structlog.get_logger()
+
+SessionScope = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+@dataclass
+class FanOutQuery:
+    """One independent read of a fan-out."""
+    name: str
+    run: Callable[[AsyncSession], Awaitable[Any]]
+    timeout_seconds: Optional[float] = None  # None: the fan-out default
+    breaker: Optional[SOC2CircuitBreaker] = None
+    # Called with the error when the query fails; its result stands in for the query's
+    fallback: Optional[Callable[[BaseException], Awaitable[Any]]] = None
+
+
+@dataclass
+class FanOutResult:
+    """Per-query results, with the queries that fell back and why."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    durations_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        """True when at least one query was answered by its fallback."""
+        return bool(self.errors)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+
+def _failure_reason(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(error, SOC2CircuitBreakerException):
+        return "circuit_open"
+    return str(error) or type(error).__name__
+
+
+async def fan_out(
+    queries: Iterable[FanOutQuery],
+    max_concurrency: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+    session_scope: Optional[SessionScope] = None
+) -> FanOutResult:
+    """
+    Run independent read queries concurrently, each on its own session.
+
+    Args:
+        queries: Queries to run; names must be unique
+        max_concurrency: Queries holding a session at once
+            (DATABASE_FANOUT_MAX_CONCURRENCY by default)
+        timeout_seconds: Deadline of queries without their own
+            (DATABASE_FANOUT_QUERY_TIMEOUT_SECONDS by default)
+        session_scope: Opens a session per query; read-only sessions routed
+            like get_db_readonly by default
+
+    Returns:
+        FanOutResult with every query's value, or its fallback's (None
+        without one) for queries that failed
+    """
+    queries = list(queries)
+    if len({query.name for query in queries}) != len(queries):
+        raise ValueError("Fan-out query names must be unique")
+
+    settings = get_settings()
+    slots = asyncio.Semaphore(max_concurrency or settings.DATABASE_FANOUT_MAX_CONCURRENCY)
+    default_timeout = timeout_seconds or settings.DATABASE_FANOUT_QUERY_TIMEOUT_SECONDS
+    session_scope = session_scope or (lambda: get_db_session(readonly=True))
+    result = FanOutResult()
+
+    async def execute(query: FanOutQuery) -> Any:
+        async with slots:
+            async with session_scope() as session:
+                return await query.run(session)
+
+    async def run_one(query: FanOutQuery) -> None:
+        start = time.perf_counter()
+
+        async def guarded() -> Any:
+            return await asyncio.wait_for(execute(query), query.timeout_seconds or default_timeout)
+
+        try:
+            value = await (query.breaker.call(guarded) if query.breaker is not None else guarded())
+        except Exception as e:
+            reason = _failure_reason(e)
+            result.errors[query.name] = reason
+            logger.warning("Fan-out query failed, using fallback", query=query.name, reason=reason)
+            value = None
+            if query.fallback is not None:
+                try:
+                    value = await query.fallback(e)
+                except Exception as fallback_error:
+                    logger.error("Fan-out fallback failed", query=query.name, error=str(fallback_error))
+
+        result.results[query.name] = value
+        result.durations_ms[query.name] = round((time.perf_counter() - start) * 1000, 2)
+
+    await asyncio.gather(*(run_one(query) for query in queries))
+
+    if result.partial:
+        logger.info("Fan-out returned partial results", failed=result.errors)
+    return result
@@ -4,7 +4,9 @@ Redis Caching Strategy for Healthcare Records
 Advanced Redis caching implementation for production performance:
 - Multi-layer caching with TTL management
 - PHI-safe caching with encryption
-- Cache invalidation strategies
+- Compact msgpack/zstd entries with per-type compression dictionaries
+- Tag-set cache invalidation broadcast to every worker
+- Per-process LRU tier with single-flight loading and stale-while-revalidate
 - Session management and rate limiting
 - Performance monitoring and optimization
 - Cache warming and prefetching strategies
@@ -14,12 +16,15 @@ PHI data is properly encrypted even in cache layers.
 """
 
 import asyncio
+import gzip
 import json
 import time
 import uuid
 import hashlib
 import pickle
-from typing import Dict, List, Optional, Any, Union, Callable
+from collections import OrderedDict, defaultdict
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Any, Union, Callable, Awaitable, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -29,11 +34,17 @@ import redis.asyncio as redis
 from redis.asyncio import Redis
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
 
+from app.core.cache_codec import CacheCodec, is_codec_entry
+from app.core.cache_invalidation import TagInvalidator
 from app.core.config import get_settings
 from app.core.security import EncryptionService
 
 logger = structlog.get_logger()
 
+# Redis hashes of trained zstd dictionaries (id -> bytes) and each key type's active id
+COMPRESSION_DICTIONARIES_KEY = "cache:zstd:dictionaries"
+ACTIVE_COMPRESSION_DICTIONARIES_KEY = "cache:zstd:active"
+
 
 class CacheKeyType(str, Enum):
     """Types of cache keys for organization."""
@@ -56,8 +67,85 @@ class CacheConfig:
     ttl_seconds: int
     encrypt_data: bool = False
     compress_data: bool = False
-    invalidation_pattern: Optional[str] = None
+    invalidation_pattern: Optional[str] = None  # Unused: invalidation goes by the key type tag
     max_size: Optional[int] = None
+    # Per-process tier lifetime; 0 keeps the type out of the local tier
+    local_ttl_seconds: int = 0
+    # How long past ttl_seconds an entry may still be served while it is reloaded
+    stale_seconds: int = 0
+
+
+class LocalCacheTier:
+    """
+    Per-process LRU cache of deserialized values with short, per-entry TTLs.
+    
+    Values are shared rather than copied, so callers must treat them as read-only.
+    """
+    
+    def __init__(self, max_size: int = 5000):
+        self.max_size = max_size
+        # key -> (value, fresh_until, stale_until) on the monotonic clock
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+        self.eviction_count = 0
+    
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Get (value, is_fresh), or None once the entry is past its stale window."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        value, fresh_until, stale_until = entry
+        now = time.monotonic()
+        if stale_until <= now:
+            del self._entries[key]
+            self.eviction_count += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        return value, fresh_until > now
+    
+    def put(self, key: str, value: Any, ttl_seconds: float, stale_seconds: float = 0) -> None:
+        """Store a value, evicting least recently used entries when full."""
+        fresh_until = time.monotonic() + ttl_seconds
+        self._entries[key] = (value, fresh_until, fresh_until + stale_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.eviction_count += 1
+    
+    def delete(self, key: str) -> bool:
+        """Drop one entry."""
+        return self._entries.pop(key, None) is not None
+    
+    def evict(self, keys: Optional[List[str]]) -> None:
+        """Drop the given keys, or everything for None (invalidation listener)."""
+        if keys is None:
+            self.clear()
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Drop entries whose key matches a Redis-style glob pattern."""
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local tier statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "eviction_count": self.eviction_count
+        }
 
 
 class CacheStrategyManager:
@@ -66,6 +154,7 @@ class CacheStrategyManager:
     def __init__(self):
         self.settings = get_settings()
         self.encryption_service = EncryptionService()
+        self.codec = CacheCodec.from_settings(self.settings)
         self.redis_client: Optional[Redis] = None
         
         # Cache configurations for different data types
@@ -76,7 +165,9 @@ class CacheStrategyManager:
                 encrypt_data=True,  # PHI data must be encrypted
                 compress_data=True,
                 invalidation_pattern="patient:*",
-                max_size=10000
+                max_size=10000,
+                local_ttl_seconds=15,
+                stale_seconds=60
             ),
             CacheKeyType.PATIENT_SEARCH: CacheConfig(
                 key_type=CacheKeyType.PATIENT_SEARCH,
@@ -84,7 +175,9 @@ class CacheStrategyManager:
                 encrypt_data=True,
                 compress_data=True,
                 invalidation_pattern="patient_search:*",
-                max_size=5000
+                max_size=5000,
+                local_ttl_seconds=10,
+                stale_seconds=30
             ),
             CacheKeyType.IMMUNIZATION_RECORD: CacheConfig(
                 key_type=CacheKeyType.IMMUNIZATION_RECORD,
@@ -92,7 +185,9 @@ class CacheStrategyManager:
                 encrypt_data=True,
                 compress_data=True,
                 invalidation_pattern="immunization:*",
-                max_size=20000
+                max_size=20000,
+                local_ttl_seconds=30,
+                stale_seconds=60
             ),
             CacheKeyType.CLINICAL_DOCUMENT: CacheConfig(
                 key_type=CacheKeyType.CLINICAL_DOCUMENT,
@@ -100,7 +195,9 @@ class CacheStrategyManager:
                 encrypt_data=True,
                 compress_data=True,
                 invalidation_pattern="document:*",
-                max_size=15000
+                max_size=15000,
+                local_ttl_seconds=30,
+                stale_seconds=60
             ),
             CacheKeyType.CONSENT_STATUS: CacheConfig(
                 key_type=CacheKeyType.CONSENT_STATUS,
@@ -132,7 +229,9 @@ class CacheStrategyManager:
                 encrypt_data=False,  # Non-PHI API responses
                 compress_data=True,
                 invalidation_pattern="api_response:*",
-                max_size=10000
+                max_size=10000,
+                local_ttl_seconds=5,
+                stale_seconds=15
             ),
             CacheKeyType.FHIR_VALIDATION: CacheConfig(
                 key_type=CacheKeyType.FHIR_VALIDATION,
@@ -140,7 +239,9 @@ class CacheStrategyManager:
                 encrypt_data=False,
                 compress_data=True,
                 invalidation_pattern="fhir_validation:*",
-                max_size=1000
+                max_size=1000,
+                local_ttl_seconds=300,
+                stale_seconds=600
             ),
             CacheKeyType.AUDIT_AGGREGATION: CacheConfig(
                 key_type=CacheKeyType.AUDIT_AGGREGATION,
@@ -148,7 +249,9 @@ class CacheStrategyManager:
                 encrypt_data=False,
                 compress_data=True,
                 invalidation_pattern="audit_agg:*",
-                max_size=2000
+                max_size=2000,
+                local_ttl_seconds=30,
+                stale_seconds=120
             )
         }
     
@@ -157,7 +260,7 @@ class CacheStrategyManager:
         if self.redis_client is None:
             try:
                 # Parse Redis URL
-                redis_url = self.settings.redis_url or "redis://localhost:6379/0"
+                redis_url = self.settings.REDIS_URL or "redis://localhost:6379/0"
                 
                 # Create Redis client with optimized settings
                 self.redis_client = redis.from_url(
@@ -201,28 +304,15 @@ class CacheStrategyManager:
         return base_key
     
     async def _serialize_data(self, data: Any, config: CacheConfig) -> bytes:
-        """Serialize data for caching with optional encryption and compression."""
+        """Encode data through the cache codec, then encrypt it if configured."""
         try:
-            # Convert to JSON first
-            if isinstance(data, (dict, list)):
-                serialized = json.dumps(data, default=str)
-            else:
-                serialized = pickle.dumps(data)
-            
-            # Convert to bytes
-            if isinstance(serialized, str):
-                data_bytes = serialized.encode('utf-8')
-            else:
-                data_bytes = serialized
-            
-            # Compress if configured
-            if config.compress_data:
-                import gzip
-                data_bytes = gzip.compress(data_bytes)
+            data_bytes = self.codec.encode(data, key_type=config.key_type.value, compress=config.compress_data)
             
-            # Encrypt if configured (for PHI data)
+            # Encrypt if configured (for PHI data) - after compression, which ciphertext defeats
             if config.encrypt_data:
-                data_bytes = await self.encryption_service.encrypt_data(data_bytes)
+                data_bytes = await self.encryption_service.encrypt_bytes(
+                    data_bytes, {"document_type": f"cache:{config.key_type.value}"}
+                )
             
             return data_bytes
             
@@ -235,77 +325,311 @@ class CacheStrategyManager:
         try:
             # Decrypt if needed
             if config.encrypt_data:
-                data_bytes = await self.encryption_service.decrypt_data(data_bytes)
+                data_bytes = await self.encryption_service.decrypt_bytes(data_bytes)
+            
+            if is_codec_entry(data_bytes):
+                try:
+                    return self.codec.decode(data_bytes)
+                except KeyError:
+                    # Written with a dictionary trained after this process loaded them
+                    await self.load_compression_dictionary(self.codec.entry_dictionary_id(data_bytes))
+                    return self.codec.decode(data_bytes)
             
-            # Decompress if needed
+            # Entries written before the codec header: optional gzip, then JSON or pickle
             if config.compress_data:
-                import gzip
                 data_bytes = gzip.decompress(data_bytes)
-            
-            # Deserialize
             try:
-                # Try JSON first
                 return json.loads(data_bytes.decode('utf-8'))
             except (json.JSONDecodeError, UnicodeDecodeError):
-                # Fall back to pickle
                 return pickle.loads(data_bytes)
                 
         except Exception as e:
             logger.error("Data deserialization failed", error=str(e))
             raise
+    
+    async def train_compression_dictionary(
+        self,
+        key_type: CacheKeyType,
+        samples: List[Any],
+        dict_size: int = 16384
+    ) -> int:
+        """
+        Train a zstd dictionary on sample values of a key type and share it.
+        
+        The dictionary is stored in Redis and becomes the key type's active
+        one on every worker that loads dictionaries afterwards; workers that
+        meet an entry using a dictionary they lack fetch it on demand.
+        """
+        dictionary = self.codec.train_dictionary(samples, dict_size)
+        dictionary_id = self.codec.add_dictionary(dictionary, key_type.value)
+        
+        redis_client = await self.get_redis_client()
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(COMPRESSION_DICTIONARIES_KEY, str(dictionary_id), dictionary.as_bytes())
+            pipe.hset(ACTIVE_COMPRESSION_DICTIONARIES_KEY, key_type.value, str(dictionary_id))
+            await pipe.execute()
+        
+        logger.info("Cache compression dictionary trained", key_type=key_type.value,
+                   dictionary_id=dictionary_id, samples=len(samples))
+        return dictionary_id
+    
+    async def load_compression_dictionaries(self) -> int:
+        """Load the shared dictionaries and each key type's active one."""
+        redis_client = await self.get_redis_client()
+        dictionaries = await redis_client.hgetall(COMPRESSION_DICTIONARIES_KEY)
+        active = await redis_client.hgetall(ACTIVE_COMPRESSION_DICTIONARIES_KEY)
+        
+        for raw in dictionaries.values():
+            self.codec.add_dictionary(raw)
+        for key_type, dictionary_id in active.items():
+            dictionary_id = int(dictionary_id)
+            if dictionary_id in self.codec.dictionaries:
+                key_type = key_type.decode() if isinstance(key_type, bytes) else key_type
+                self.codec.active_dictionaries[key_type] = dictionary_id
+        return len(dictionaries)
+    
+    async def load_compression_dictionary(self, dictionary_id: int) -> None:
+        """
+        Fetch one shared dictionary.
+        
+        Raises:
+            KeyError: The dictionary is not in Redis
+        """
+        redis_client = await self.get_redis_client()
+        raw = await redis_client.hget(COMPRESSION_DICTIONARIES_KEY, str(dictionary_id))
+        if raw is None:
+            raise KeyError(dictionary_id)
+        self.codec.add_dictionary(raw)
 
 
 class HealthcareRedisCache:
-    """Main Redis cache interface for healthcare data."""
+    """
+    Main Redis cache interface for healthcare data.
+    
+    Reads go through a short-lived per-process LRU tier (for key types with
+    local_ttl_seconds) before Redis. get_or_load() additionally coalesces
+    concurrent misses into one loader call per key and serves entries inside
+    their stale window while a single background load refreshes them.
+    
+    Every entry is registered under its key type's tag ("type:<key type>")
+    plus any tags given on write, and invalidate_tags() removes exactly those
+    entries in Redis and in every worker's local tier.
+    """
     
     def __init__(self):
         self.strategy_manager = CacheStrategyManager()
+        settings = self.strategy_manager.settings
+        self.local_cache = LocalCacheTier(max_size=settings.CACHE_LOCAL_MAX_SIZE)
+        self.local_tier_enabled = settings.CACHE_LOCAL_TIER_ENABLED
+        self._invalidator: Optional[TagInvalidator] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._revalidations: set = set()
+        self.key_type_stats: Dict[CacheKeyType, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         self.hit_count = 0
         self.miss_count = 0
         self.error_count = 0
     
-    async def get(self, key_type: CacheKeyType, identifier: str, **kwargs) -> Optional[Any]:
-        """Get cached data with automatic deserialization."""
-        try:
+    async def get_invalidator(self) -> TagInvalidator:
+        """Tag index over the cache's Redis client, evicting the local tier on invalidation."""
+        if self._invalidator is None:
             redis_client = await self.strategy_manager.get_redis_client()
-            config = self.strategy_manager.cache_configs[key_type]
-            
-            cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
-            
-            # Get data from Redis
-            cached_data = await redis_client.get(cache_key)
-            
-            if cached_data is None:
-                self.miss_count += 1
-                return None
-            
-            # Deserialize data
-            data = await self.strategy_manager._deserialize_data(cached_data, config)
-            
+            if self._invalidator is None:
+                self._invalidator = TagInvalidator(redis_client)
+                self._invalidator.add_listener(self.local_cache.evict)
+        return self._invalidator
+    
+    async def start(self) -> None:
+        """Listen for invalidations from other workers and load compression dictionaries."""
+        # The cache still works without either
+        try:
+            await (await self.get_invalidator()).start()
+            await self.strategy_manager.load_compression_dictionaries()
+        except Exception as e:
+            logger.warning("Cache background services not started", error=str(e))
+    
+    async def stop(self) -> None:
+        """Stop the invalidation listener."""
+        if self._invalidator is not None:
+            await self._invalidator.stop()
+    
+    @staticmethod
+    def _entry_tags(key_type: CacheKeyType, tags: Optional[List[str]]) -> List[str]:
+        return [f"type:{key_type.value}", *(tags or [])]
+    
+    def _uses_local_tier(self, config: CacheConfig) -> bool:
+        return self.local_tier_enabled and config.local_ttl_seconds > 0
+    
+    def _record(self, key_type: CacheKeyType, outcome: str) -> None:
+        self.key_type_stats[key_type][outcome] += 1
+        if outcome in ("local_hits", "redis_hits", "stale_hits"):
             self.hit_count += 1
-            logger.debug("Cache hit", key_type=key_type.value, identifier=identifier)
-            
-            return data
-            
+        elif outcome == "misses":
+            self.miss_count += 1
+    
+    async def _lookup(
+        self,
+        key_type: CacheKeyType,
+        cache_key: str,
+        config: CacheConfig
+    ) -> Optional[Tuple[Any, bool, str]]:
+        """Find an entry in the local tier or Redis; returns (value, is_fresh, tier)."""
+        local_entry = None
+        if self._uses_local_tier(config):
+            local_entry = self.local_cache.get(cache_key)
+            if local_entry is not None and local_entry[1]:
+                return local_entry[0], True, "local"
+        
+        try:
+            redis_client = await self.strategy_manager.get_redis_client()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(cache_key)
+                pipe.pttl(cache_key)
+                cached_data, pttl = await pipe.execute()
+            
+            if cached_data is not None:
+                data = await self.strategy_manager._deserialize_data(cached_data, config)
+                # Redis keeps entries for ttl + stale_seconds; the tail is the stale window
+                fresh = pttl < 0 or pttl > config.stale_seconds * 1000
+                if fresh and self._uses_local_tier(config):
+                    self.local_cache.put(cache_key, data, config.local_ttl_seconds, config.stale_seconds)
+                return data, fresh, "redis"
+                
         except Exception as e:
             self.error_count += 1
             logger.error("Cache get failed", key_type=key_type.value, error=str(e))
+        
+        # Redis missed or is unavailable: a locally stale copy still beats the database
+        if local_entry is not None:
+            return local_entry[0], False, "local"
+        return None
+    
+    async def get(self, key_type: CacheKeyType, identifier: str, **kwargs) -> Optional[Any]:
+        """Get cached data with automatic deserialization (stale entries count as misses)."""
+        config = self.strategy_manager.cache_configs[key_type]
+        cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
+        
+        entry = await self._lookup(key_type, cache_key, config)
+        if entry is None or not entry[1]:
+            self._record(key_type, "misses")
             return None
+        
+        data, _, tier = entry
+        self._record(key_type, f"{tier}_hits")
+        logger.debug("Cache hit", key_type=key_type.value, identifier=identifier, tier=tier)
+        
+        return data
     
-    async def set(
+    async def get_or_load(
         self,
         key_type: CacheKeyType,
         identifier: str,
-        data: Any,
+        loader: Callable[[], Awaitable[Any]],
         ttl_override: Optional[int] = None,
+        tags: Optional[List[str]] = None,
         **kwargs
+    ) -> Any:
+        """
+        Get cached data, calling ``loader`` on a miss and caching its result.
+        
+        Concurrent misses for one key in this process share a single loader
+        call. An entry inside its stale window is returned at once while one
+        background load refreshes it. A None result is returned but not cached
+        (under ``tags`` otherwise); loader errors propagate to every caller
+        waiting on that load.
+        """
+        config = self.strategy_manager.cache_configs[key_type]
+        cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
+        
+        entry = await self._lookup(key_type, cache_key, config)
+        if entry is not None:
+            data, fresh, tier = entry
+            if fresh:
+                self._record(key_type, f"{tier}_hits")
+            else:
+                self._record(key_type, "stale_hits")
+                self._revalidate(key_type, cache_key, config, loader, ttl_override, tags)
+            return data
+        
+        self._record(key_type, "misses")
+        return await self._single_flight(
+            key_type, cache_key,
+            lambda: self._load_and_store(key_type, cache_key, config, loader, ttl_override, tags)
+        )
+    
+    async def _single_flight(
+        self,
+        key_type: CacheKeyType,
+        cache_key: str,
+        load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``load`` once per key however many callers are waiting for it."""
+        future = self._inflight.get(cache_key)
+        if future is None:
+            future = self._start_load(cache_key, load)
+        else:
+            self._record(key_type, "coalesced")
+        
+        # A cancelled caller must not cancel the load the others are waiting on
+        return await asyncio.shield(future)
+    
+    def _start_load(self, cache_key: str, load: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        future = asyncio.ensure_future(load())
+        self._inflight[cache_key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return future
+    
+    def _revalidate(
+        self,
+        key_type: CacheKeyType,
+        cache_key: str,
+        config: CacheConfig,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_override: Optional[int],
+        tags: Optional[List[str]]
+    ) -> None:
+        """Refresh a stale entry in the background unless a load is already running."""
+        if cache_key in self._inflight:
+            return
+        
+        future = self._start_load(
+            cache_key, lambda: self._load_and_store(key_type, cache_key, config, loader, ttl_override, tags)
+        )
+        self._revalidations.add(future)
+        future.add_done_callback(self._revalidation_done)
+    
+    def _revalidation_done(self, future: asyncio.Future) -> None:
+        self._revalidations.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self.error_count += 1
+            logger.error("Cache revalidation failed", error=str(future.exception()))
+    
+    async def _load_and_store(
+        self,
+        key_type: CacheKeyType,
+        cache_key: str,
+        config: CacheConfig,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_override: Optional[int],
+        tags: Optional[List[str]]
+    ) -> Any:
+        data = await loader()
+        self._record(key_type, "loads")
+        if data is not None:
+            await self._store(key_type, cache_key, data, config, ttl_override, tags)
+        return data
+    
+    async def _store(
+        self,
+        key_type: CacheKeyType,
+        cache_key: str,
+        data: Any,
+        config: CacheConfig,
+        ttl_override: Optional[int] = None,
+        tags: Optional[List[str]] = None
     ) -> bool:
-        """Set cached data with automatic serialization."""
+        """Write an entry to Redis (kept for its stale window too) under its tags, and to the local tier."""
         try:
-            redis_client = await self.strategy_manager.get_redis_client()
-            config = self.strategy_manager.cache_configs[key_type]
-            
-            cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
+            invalidator = await self.get_invalidator()
             
             # Serialize data
             serialized_data = await self.strategy_manager._serialize_data(data, config)
@@ -313,10 +637,15 @@ class HealthcareRedisCache:
             # Set TTL
             ttl = ttl_override or config.ttl_seconds
             
-            # Store in Redis
-            await redis_client.setex(cache_key, ttl, serialized_data)
+            # Store in Redis and register in the tag sets in one step
+            await invalidator.store(
+                cache_key, serialized_data, ttl + config.stale_seconds, self._entry_tags(key_type, tags)
+            )
+            
+            if self._uses_local_tier(config):
+                self.local_cache.put(cache_key, data, min(config.local_ttl_seconds, ttl), config.stale_seconds)
             
-            logger.debug("Cache set", key_type=key_type.value, identifier=identifier, ttl=ttl)
+            logger.debug("Cache set", key_type=key_type.value, cache_key=cache_key, ttl=ttl)
             
             return True
             
@@ -325,12 +654,33 @@ class HealthcareRedisCache:
             logger.error("Cache set failed", key_type=key_type.value, error=str(e))
             return False
     
+    async def set(
+        self,
+        key_type: CacheKeyType,
+        identifier: str,
+        data: Any,
+        ttl_override: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Set cached data with automatic serialization.
+        
+        ``tags`` (e.g. "patient:<id>", "tenant:<id>", "resource:<type>") are
+        what invalidate_tags() later matches the entry by.
+        """
+        config = self.strategy_manager.cache_configs[key_type]
+        cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
+        
+        return await self._store(key_type, cache_key, data, config, ttl_override, tags)
+    
     async def delete(self, key_type: CacheKeyType, identifier: str, **kwargs) -> bool:
         """Delete specific cached item."""
         try:
-            redis_client = await self.strategy_manager.get_redis_client()
-            
             cache_key = self.strategy_manager._generate_cache_key(key_type, identifier, **kwargs)
+            self.local_cache.delete(cache_key)
+            
+            redis_client = await self.strategy_manager.get_redis_client()
             
             result = await redis_client.delete(cache_key)
             
@@ -343,62 +693,105 @@ class HealthcareRedisCache:
             logger.error("Cache delete failed", key_type=key_type.value, error=str(e))
             return False
     
-    async def invalidate_pattern(self, key_type: CacheKeyType, pattern: Optional[str] = None) -> int:
-        """Invalidate cache entries matching a pattern."""
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """Delete entries registered under any of the tags, in Redis and on every worker."""
         try:
-            redis_client = await self.strategy_manager.get_redis_client()
-            config = self.strategy_manager.cache_configs[key_type]
+            invalidator = await self.get_invalidator()
+            return await invalidator.invalidate(tags)
             
-            # Use provided pattern or default from config
-            invalidation_pattern = pattern or config.invalidation_pattern
-            
-            if not invalidation_pattern:
-                logger.warning("No invalidation pattern available", key_type=key_type.value)
-                return 0
+        except Exception as e:
+            self.error_count += 1
+            logger.error("Cache tag invalidation failed", tags=tags, error=str(e))
+            return 0
+    
+    async def invalidate_pattern(self, key_type: CacheKeyType, pattern: Optional[str] = None) -> int:
+        """
+        Invalidate cache entries of a key type, or those matching a pattern.
+        
+        Without a pattern the key type's tag is invalidated. An explicit
+        pattern is matched with incremental SCAN rather than KEYS; its local
+        tier eviction applies to this process only, other workers keep their
+        copies until local_ttl_seconds runs out.
+        """
+        if pattern is None:
+            return await self.invalidate_tags(self._entry_tags(key_type, None))
+        
+        try:
+            self.local_cache.invalidate_pattern(pattern)
             
-            # Find matching keys
-            keys = await redis_client.keys(invalidation_pattern)
+            redis_client = await self.strategy_manager.get_redis_client()
             
-            if keys:
-                # Delete all matching keys
-                deleted_count = await redis_client.delete(*keys)
-                logger.info("Cache invalidation", pattern=invalidation_pattern, deleted_count=deleted_count)
-                return deleted_count
+            deleted_count = 0
+            batch = []
+            async for key in redis_client.scan_iter(match=pattern, count=1000):
+                batch.append(key)
+                if len(batch) >= 1000:
+                    deleted_count += await redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted_count += await redis_client.unlink(*batch)
             
-            return 0
+            logger.info("Cache invalidation", pattern=pattern, deleted_count=deleted_count)
+            return deleted_count
             
         except Exception as e:
             self.error_count += 1
-            logger.error("Cache invalidation failed", pattern=invalidation_pattern, error=str(e))
+            logger.error("Cache invalidation failed", pattern=pattern, error=str(e))
             return 0
     
+    def get_key_type_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit, miss and load counters with hit rates per CacheKeyType."""
+        stats = {}
+        for key_type, counters in self.key_type_stats.items():
+            hits = counters["local_hits"] + counters["redis_hits"] + counters["stale_hits"]
+            total_requests = hits + counters["misses"]
+            stats[key_type.value] = {
+                **{outcome: counters[outcome] for outcome in (
+                    "local_hits", "redis_hits", "stale_hits", "misses", "loads", "coalesced"
+                )},
+                "hit_rate_percent": round(hits / total_requests * 100, 2) if total_requests else 0
+            }
+        return stats
+    
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics."""
+        # Calculate hit rate
+        total_requests = self.hit_count + self.miss_count
+        hit_rate = (self.hit_count / total_requests * 100) if total_requests > 0 else 0
+        
+        stats = {
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "error_count": self.error_count,
+            "hit_rate_percent": round(hit_rate, 2),
+            "by_key_type": self.get_key_type_stats(),
+            "local_tier": {
+                **self.local_cache.get_stats(),
+                "enabled": self.local_tier_enabled,
+                "inflight_loads": len(self._inflight)
+            },
+            "invalidation": self._invalidator.metrics if self._invalidator else {},
+            "codec": self.strategy_manager.codec.get_stats()
+        }
+        
         try:
             redis_client = await self.strategy_manager.get_redis_client()
             
             # Get Redis info
             redis_info = await redis_client.info()
             
-            # Calculate hit rate
-            total_requests = self.hit_count + self.miss_count
-            hit_rate = (self.hit_count / total_requests * 100) if total_requests > 0 else 0
-            
-            return {
-                "hit_count": self.hit_count,
-                "miss_count": self.miss_count,
-                "error_count": self.error_count,
-                "hit_rate_percent": round(hit_rate, 2),
+            stats.update({
                 "redis_connected_clients": redis_info.get("connected_clients", 0),
                 "redis_used_memory": redis_info.get("used_memory_human", "0"),
                 "redis_keyspace_hits": redis_info.get("keyspace_hits", 0),
                 "redis_keyspace_misses": redis_info.get("keyspace_misses", 0),
                 "redis_uptime_seconds": redis_info.get("uptime_in_seconds", 0)
-            }
+            })
+            return stats
             
         except Exception as e:
             logger.error("Failed to get cache stats", error=str(e))
-            return {"error": str(e)}
+            return {**stats, "error": str(e)}
 
 
 class SessionCache:
@@ -421,7 +814,8 @@ class SessionCache:
         success = await self.redis_cache.set(
             CacheKeyType.SESSION_DATA,
             session_id,
-            session_data
+            session_data,
+            tags=[f"user:{user_id}"]
         )
         
         if success:
@@ -440,7 +834,10 @@ class SessionCache:
         
         if session_data:
             session_data["last_activity"] = datetime.utcnow().isoformat()
-            return await self.redis_cache.set(CacheKeyType.SESSION_DATA, session_id, session_data)
+            return await self.redis_cache.set(
+                CacheKeyType.SESSION_DATA, session_id, session_data,
+                tags=[f"user:{session_data['user_id']}"] if session_data.get("user_id") else None
+            )
         
         return False
     
@@ -450,12 +847,7 @@ class SessionCache:
     
     async def invalidate_user_sessions(self, user_id: str) -> int:
         """Invalidate all sessions for a user."""
-        # This would require a more complex pattern matching
-        # For now, we'll use a simple approach
-        return await self.redis_cache.invalidate_pattern(
-            CacheKeyType.SESSION_DATA,
-            f"session_data:*user_id={user_id}*"
-        )
+        return await self.redis_cache.invalidate_tags([f"user:{user_id}"])
 
 
 class RateLimitCache:
@@ -569,9 +961,19 @@ class HealthcareCacheManager:
         self.rate_limit_cache = RateLimitCache(self.redis_cache)
         self.warming_manager = CacheWarmingManager(self.redis_cache)
     
+    async def start(self) -> None:
+        """Start background cache services (cross-worker invalidation)."""
+        await self.redis_cache.start()
+    
+    async def stop(self) -> None:
+        """Stop background cache services."""
+        await self.redis_cache.stop()
+    
     async def cache_patient_lookup(self, patient_id: str, patient_data: Dict[str, Any]) -> bool:
         """Cache patient lookup data."""
-        return await self.redis_cache.set(CacheKeyType.PATIENT_LOOKUP, patient_id, patient_data)
+        return await self.redis_cache.set(
+            CacheKeyType.PATIENT_LOOKUP, patient_id, patient_data, tags=[f"patient:{patient_id}"]
+        )
     
     async def get_cached_patient(self, patient_id: str) -> Optional[Dict[str, Any]]:
         """Get cached patient data."""
@@ -586,9 +988,9 @@ class HealthcareCacheManager:
         return await self.redis_cache.get(CacheKeyType.PATIENT_SEARCH, search_hash)
     
     async def invalidate_patient_cache(self, patient_id: str) -> bool:
-        """Invalidate all cache entries for a patient."""
-        await self.redis_cache.delete(CacheKeyType.PATIENT_LOOKUP, patient_id)
-        await self.redis_cache.invalidate_pattern(CacheKeyType.PATIENT_SEARCH, "patient_search:*")
+        """Invalidate all cache entries for a patient, and all patient searches."""
+        # Any search may start or stop matching the updated patient
+        await self.redis_cache.invalidate_tags([f"patient:{patient_id}", "type:patient_search"])
         return True
     
     async def get_performance_metrics(self) -> Dict[str, Any]:
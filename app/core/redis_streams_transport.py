@@ -0,0 +1,352 @@
+"""
+Redis Streams transport for HybridEventBus.
+
+Lets several uvicorn workers and pods share one event bus:
+
+- Events are appended to one of N partition streams chosen by hashing the
+  aggregate id, so all events of an aggregate land in the same stream in
+  publish order.
+- All nodes join one consumer group. Each partition is consumed by exactly
+  one node at a time, under a renewable lease; partitions are spread evenly
+  over the live nodes and rebalanced as nodes join and leave. Handler
+  throughput scales with the number of nodes up to the partition count.
+- Entries are acknowledged after the local handlers ran. When a node dies
+  its leases expire and the new owner first reclaims the partition's pending
+  entries (XAUTOCLAIM), so delivery is at-least-once.
+
+Per-aggregate order holds for normal processing; an entry whose delivery
+raised is left pending and redelivered after ``claim_idle_ms``, i.e. after
+later entries of the same partition.
+"""
+
+import asyncio
+import math
+import os
+import socket
+import time
+import uuid
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import structlog
+import redis.asyncio as redis
+from redis.exceptions import ResponseError
+
+from app.core.event_bus_advanced import BaseEvent, EventTransport, deserialize_event, serialize_event
+
+logger = structlog.get_logger()
+
+# Extend / drop a lease only while this consumer still holds it
+_RENEW_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_PAYLOAD_FIELD = b"e"
+
+
+class RedisStreamsTransport(EventTransport):
+    """Partitioned Redis Streams transport with consumer groups and partition leases."""
+
+    name = "redis_streams"
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        stream_prefix: str = "healthcare:events",
+        partitions: int = 16,
+        group: str = "event-bus",
+        consumer_name: Optional[str] = None,
+        lease_ms: int = 15000,
+        block_ms: int = 1000,
+        batch_size: int = 100,
+        max_stream_length: int = 1000000,
+        claim_idle_ms: Optional[int] = None
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            client: Redis client (bytes responses)
+            stream_prefix: Key prefix for partition streams, leases and membership
+            partitions: Number of partition streams
+            group: Consumer group shared by all nodes
+            consumer_name: Unique name of this node's consumer
+            lease_ms: Partition lease lifetime; renewed every lease_ms / 3
+            block_ms: XREADGROUP block time
+            batch_size: Entries read or reclaimed per call
+            max_stream_length: Approximate MAXLEN per partition stream
+            claim_idle_ms: Idle time after which an owner redelivers its own
+                unacknowledged entries (defaults to 2 * lease_ms)
+        """
+        if partitions <= 0:
+            raise ValueError("partitions must be positive")
+        self.client = client
+        self.stream_prefix = stream_prefix
+        self.partitions = partitions
+        self.group = group
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_ms = lease_ms
+        self.block_ms = block_ms
+        self.batch_size = batch_size
+        self.max_stream_length = max_stream_length
+        self.claim_idle_ms = claim_idle_ms or lease_ms * 2
+
+        self._renew_lease = client.register_script(_RENEW_LEASE)
+        self._release_lease = client.register_script(_RELEASE_LEASE)
+        self._deliver: Optional[Callable[[BaseEvent], Awaitable[None]]] = None
+        self._consumers: Dict[int, asyncio.Task] = {}
+        self._stopping: Dict[int, asyncio.Event] = {}
+        self._rebalance_task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, int] = {
+            "published": 0,
+            "delivered": 0,
+            "acked": 0,
+            "reclaimed": 0,
+            "decode_errors": 0,
+            "delivery_failures": 0,
+            "leases_acquired": 0,
+            "leases_lost": 0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> "RedisStreamsTransport":
+        """Build the transport from EVENT_BUS_* settings."""
+        client = redis.from_url(
+            settings.EVENT_BUS_REDIS_URL or settings.REDIS_URL,
+            decode_responses=False,
+            socket_keepalive=True,
+            health_check_interval=30
+        )
+        return cls(
+            client,
+            stream_prefix=settings.EVENT_BUS_STREAM_PREFIX,
+            partitions=settings.EVENT_BUS_STREAM_PARTITIONS,
+            group=settings.EVENT_BUS_CONSUMER_GROUP,
+            lease_ms=settings.EVENT_BUS_PARTITION_LEASE_MS,
+            max_stream_length=settings.EVENT_BUS_STREAM_MAXLEN
+        )
+
+    # ------------------------------------------------------------------
+    # Keys and partitioning
+    # ------------------------------------------------------------------
+
+    def partition_for(self, aggregate_id: str) -> int:
+        """Partition of an aggregate (stable across processes)."""
+        return zlib.crc32(aggregate_id.encode("utf-8")) % self.partitions
+
+    def stream_key(self, partition: int) -> str:
+        return f"{self.stream_prefix}:{partition}"
+
+    def _lease_key(self, partition: int) -> str:
+        return f"{self.stream_prefix}:lease:{partition}"
+
+    @property
+    def _members_key(self) -> str:
+        return f"{self.stream_prefix}:members"
+
+    @property
+    def owned_partitions(self) -> Set[int]:
+        return set(self._consumers)
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    async def send(self, event: BaseEvent) -> bool:
+        await self.client.xadd(
+            self.stream_key(self.partition_for(event.aggregate_id)),
+            {_PAYLOAD_FIELD: serialize_event(event)},
+            maxlen=self.max_stream_length,
+            approximate=True
+        )
+        self.metrics["published"] += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Lifecycle and partition ownership
+    # ------------------------------------------------------------------
+
+    async def start(self, deliver: Callable[[BaseEvent], Awaitable[None]]) -> None:
+        self._deliver = deliver
+        for partition in range(self.partitions):
+            try:
+                await self.client.xgroup_create(self.stream_key(partition), self.group, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        await self.rebalance()
+        self._rebalance_task = asyncio.create_task(self._rebalance_loop())
+        logger.info("Redis Streams transport started",
+                   consumer=self.consumer_name,
+                   partitions=self.partitions,
+                   owned=sorted(self._consumers))
+
+    async def stop(self) -> None:
+        if self._rebalance_task is not None:
+            self._rebalance_task.cancel()
+            await asyncio.gather(self._rebalance_task, return_exceptions=True)
+            self._rebalance_task = None
+        for partition in list(self._consumers):
+            await self._release_partition(partition)
+        await self.client.zrem(self._members_key, self.consumer_name)
+        logger.info("Redis Streams transport stopped", consumer=self.consumer_name, **self.metrics)
+
+    async def rebalance(self) -> None:
+        """Heartbeat, renew owned leases, then shed or take partitions toward a fair share."""
+        now_ms = int(time.time() * 1000)
+        await self.client.zadd(self._members_key, {self.consumer_name: now_ms})
+        await self.client.zremrangebyscore(self._members_key, 0, now_ms - self.lease_ms)
+        live_nodes = max(1, await self.client.zcard(self._members_key))
+        fair_share = math.ceil(self.partitions / live_nodes)
+
+        for partition in list(self._consumers):
+            renewed = await self._renew_lease(
+                keys=[self._lease_key(partition)], args=[self.consumer_name, self.lease_ms]
+            )
+            if not renewed:
+                self.metrics["leases_lost"] += 1
+                logger.warning("Partition lease lost", partition=partition, consumer=self.consumer_name)
+                await self._stop_consumer(partition)
+
+        while len(self._consumers) > fair_share:
+            await self._release_partition(max(self._consumers))
+
+        if len(self._consumers) < fair_share:
+            # Start probing at a per-node offset so nodes do not contend for the same partitions
+            offset = zlib.crc32(self.consumer_name.encode("utf-8")) % self.partitions
+            for step in range(self.partitions):
+                partition = (offset + step) % self.partitions
+                if partition in self._consumers:
+                    continue
+                acquired = await self.client.set(
+                    self._lease_key(partition), self.consumer_name, nx=True, px=self.lease_ms
+                )
+                if acquired:
+                    self.metrics["leases_acquired"] += 1
+                    self._start_consumer(partition)
+                    if len(self._consumers) >= fair_share:
+                        break
+
+    async def _rebalance_loop(self) -> None:
+        interval = self.lease_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.rebalance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event transport rebalance failed", consumer=self.consumer_name, error=str(e))
+
+    def _start_consumer(self, partition: int) -> None:
+        self._stopping[partition] = asyncio.Event()
+        self._consumers[partition] = asyncio.create_task(
+            self._consume_partition(partition, self._stopping[partition]),
+            name=f"event-transport-{partition}"
+        )
+
+    async def _stop_consumer(self, partition: int) -> None:
+        """Let the partition's consumer finish its current entry, then stop it."""
+        task = self._consumers.pop(partition, None)
+        stopping = self._stopping.pop(partition, None)
+        if task is None:
+            return
+        stopping.set()
+        try:
+            await asyncio.wait_for(task, timeout=self.block_ms / 1000 + 5)
+        except asyncio.TimeoutError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        except Exception:
+            pass
+
+    async def _release_partition(self, partition: int) -> None:
+        await self._stop_consumer(partition)
+        await self._release_lease(keys=[self._lease_key(partition)], args=[self.consumer_name])
+
+    # ------------------------------------------------------------------
+    # Consumption
+    # ------------------------------------------------------------------
+
+    async def _consume_partition(self, partition: int, stopping: asyncio.Event) -> None:
+        stream = self.stream_key(partition)
+        reclaim_idle_ms = 0  # take over everything a previous owner left pending
+        last_reclaim = 0.0
+        while not stopping.is_set():
+            try:
+                if time.monotonic() - last_reclaim >= self.claim_idle_ms / 1000:
+                    await self._reclaim_pending(stream, stopping, reclaim_idle_ms)
+                    reclaim_idle_ms = self.claim_idle_ms
+                    last_reclaim = time.monotonic()
+
+                response = await self.client.xreadgroup(
+                    self.group, self.consumer_name, {stream: ">"},
+                    count=self.batch_size, block=self.block_ms
+                )
+                for _, entries in response or []:
+                    for entry_id, fields in entries:
+                        if stopping.is_set():
+                            return  # the rest stays pending for the next owner
+                        await self._handle_entry(stream, entry_id, fields)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event stream consumer error", stream=stream, error=str(e))
+                await asyncio.sleep(1.0)
+
+    async def _reclaim_pending(self, stream: str, stopping: asyncio.Event, min_idle_ms: int) -> None:
+        start_id = "0-0"
+        while not stopping.is_set():
+            result = await self.client.xautoclaim(
+                stream, self.group, self.consumer_name, min_idle_ms,
+                start_id=start_id, count=self.batch_size
+            )
+            next_id, entries = result[0], result[1]
+            for entry_id, fields in entries:
+                if stopping.is_set():
+                    return
+                self.metrics["reclaimed"] += 1
+                await self._handle_entry(stream, entry_id, fields)
+            if next_id in (b"0-0", "0-0"):
+                return
+            start_id = next_id
+
+    async def _handle_entry(self, stream: str, entry_id: Any, fields: Optional[Dict[bytes, bytes]]) -> None:
+        if not fields or _PAYLOAD_FIELD not in fields:
+            # Trimmed or malformed entry: nothing to deliver
+            await self.client.xack(stream, self.group, entry_id)
+            return
+        try:
+            event = deserialize_event(fields[_PAYLOAD_FIELD])
+        except Exception as e:
+            self.metrics["decode_errors"] += 1
+            logger.error("Undecodable event stream entry acknowledged", stream=stream, entry_id=entry_id, error=str(e))
+            await self.client.xack(stream, self.group, entry_id)
+            return
+        try:
+            await self._deliver(event)
+        except Exception as e:
+            # Left pending; redelivered after claim_idle_ms
+            self.metrics["delivery_failures"] += 1
+            logger.error("Event delivery failed, entry left pending", stream=stream, event_id=event.event_id, error=str(e))
+            return
+        self.metrics["delivered"] += 1
+        await self.client.xack(stream, self.group, entry_id)
+        self.metrics["acked"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "transport": self.name,
+            "consumer": self.consumer_name,
+            "owned_partitions": sorted(self._consumers),
+            **self.metrics
+        }
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta, timezone, date
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union
 from jose import JWTError, jwt
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
@@ -10,6 +10,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
@@ -21,11 +22,129 @@ import binascii
 import structlog
 import os
 import json
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import get_settings
 
 logger = structlog.get_logger()
 
+# Compact binary PHI envelope (v3):
+#   version (1) | key id (1) | flags (1) | field type length (1) | field type
+#   | [patient id length (1) | patient id]  or  [16-byte packed UUID]
+#   | nonce (12) | ciphertext + GCM tag
+# Everything before the nonce is authenticated as AAD. Text columns store the
+# envelope base64-encoded once; documents store it as raw bytes.
+ENVELOPE_V3 = 0x03
+ENVELOPE_KEY_ID_FIELD = 0x01  # Legacy per-patient PBKDF2 key (_get_field_key)
+ENVELOPE_KEY_ID_HKDF = 0x02  # HKDF subkey of the field master key (_get_hkdf_field_key)
+ENVELOPE_FLAG_PATIENT_ID = 0x01
+ENVELOPE_FLAG_PATIENT_UUID = 0x02
+ENVELOPE_NONCE_SIZE = 12
+_ENVELOPE_HEADER = struct.Struct(">BBBB")
+
+# Legacy v1/v2 packages are base64-encoded JSON, i.e. always start with '{"'
+LEGACY_ENVELOPE_PREFIX = "eyJ"
+# v3 envelopes still on a per-patient PBKDF2 key. Three base64 characters cover
+# the version, the key id and the top two bits of flags; flags only use the low
+# two bits, so every such envelope starts with the same prefix ("AwE")
+LEGACY_KEY_ENVELOPE_PREFIXES = (
+    base64.b64encode(bytes((ENVELOPE_V3, ENVELOPE_KEY_ID_FIELD, 0)))[:3].decode(),
+)
+UPGRADABLE_ENVELOPE_PREFIXES = (LEGACY_ENVELOPE_PREFIX,) + LEGACY_KEY_ENVELOPE_PREFIXES
+
+# Blind indexes: HMAC-SHA256 truncated to 128 bits, hex-encoded
+BLIND_INDEX_HEX_LENGTH = 32
+
+# Shared pool for bulk AES-GCM work - cryptography releases the GIL, so page
+# decryption runs in parallel without blocking the event loop
+_phi_crypto_executor: Optional[ThreadPoolExecutor] = None
+_phi_crypto_executor_lock = threading.Lock()
+
+
+def get_phi_crypto_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool used for bulk PHI decryption."""
+    global _phi_crypto_executor
+    if _phi_crypto_executor is None:
+        with _phi_crypto_executor_lock:
+            if _phi_crypto_executor is None:
+                _phi_crypto_executor = ThreadPoolExecutor(
+                    max_workers=get_settings().PHI_DECRYPT_THREAD_POOL_SIZE,
+                    thread_name_prefix="phi_crypto_worker"
+                )
+    return _phi_crypto_executor
+
+
+
+class KeyDerivationCache:
+    """Thread-safe LRU cache for derived keys with size and TTL bounds."""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a derived key, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.miss_count += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.eviction_count += 1
+                self.miss_count += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hit_count += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store a derived key, evicting least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.eviction_count += 1
+
+    def clear(self) -> None:
+        """Drop all cached keys and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hit_count = 0
+            self.miss_count = 0
+            self.eviction_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total_requests = self.hit_count + self.miss_count
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "eviction_count": self.eviction_count,
+                "hit_rate": round(self.hit_count / total_requests, 3) if total_requests else 0.0
+            }
+
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -398,8 +517,8 @@ class SecurityManager:
 # Global security manager instance
 security_manager = SecurityManager()
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
-    """Extract current user ID from JWT token."""
+def get_current_user_id(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    """Extract current user ID from JWT token (also recorded as the request's audit principal)."""
     if credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -416,6 +535,7 @@ def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(secu
             detail="Could not validate credentials"
         )
     
+    request.state.user_id = user_id
     return user_id
 
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
@@ -531,11 +651,15 @@ class EncryptionService:
         self._encryption_key = None
         self._cipher_suite = None
         self._fernet = None  # For test compatibility
-        # Performance optimization caches
-        self._field_keys_cache = {}
-        self._derived_keys_cache = {}
-        import threading
-        self._cache_lock = threading.Lock()
+        # Derived key caches: PBKDF2 field master keys are few and expensive,
+        # per-patient subkeys are many and cheap, so they get separate bounds
+        self._field_keys_cache = KeyDerivationCache(
+            max_size=256, ttl_seconds=self.settings.PHI_KEY_CACHE_TTL_SECONDS
+        )
+        self._derived_keys_cache = KeyDerivationCache(
+            max_size=self.settings.PHI_KEY_CACHE_MAX_SIZE,
+            ttl_seconds=self.settings.PHI_KEY_CACHE_TTL_SECONDS
+        )
     
     @property
     def encryption_key(self) -> bytes:
@@ -577,38 +701,308 @@ class EncryptionService:
             field_salt += f":{patient_id}"
         
         # Check cache first for performance
-        cache_key = f"{field_salt}_{hash(self.settings.ENCRYPTION_KEY)}"
+        cache_key = f"pbkdf2:{field_salt}_{hash(self.settings.ENCRYPTION_KEY)}"
         
-        with self._cache_lock:
-            if cache_key in self._derived_keys_cache:
-                return self._derived_keys_cache[cache_key]
+        cached_key = self._derived_keys_cache.get(cache_key)
+        if cached_key is not None:
+            return cached_key
         
+        derived_key = self._pbkdf2_derive(field_salt)
+        self._derived_keys_cache.put(cache_key, derived_key)
+        
+        return derived_key
+    
+    def _pbkdf2_derive(self, salt: str) -> bytes:
+        """Run PBKDF2-SHA256 over the configured encryption key."""
         # Reduce PBKDF2 iterations for performance testing while maintaining security
         # Production: 100000, Testing: 10000 for performance
         iterations = 10000 if getattr(self.settings, 'TESTING', False) or getattr(self.settings, 'ENVIRONMENT', '') == 'test' else 100000
         
-        # Derive field-specific key using PBKDF2
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
-            salt=field_salt.encode(),
+            salt=salt.encode(),
             iterations=iterations,
             backend=default_backend()
         )
+        return kdf.derive(self.settings.ENCRYPTION_KEY.encode())
+    
+    def _get_field_master_key(self, field_type: str) -> bytes:
+        """
+        Get the PBKDF2-derived master key for a field type.
+        
+        Derived once per field type and used only as HKDF input keying
+        material, never directly as an AES key.
+        
+        Args:
+            field_type: Type of PHI field (ssn, name, dob, etc.)
+        
+        Returns:
+            32-byte field master key
+        """
+        cache_key = f"master:{field_type}_{hash(self.settings.ENCRYPTION_KEY)}"
+        master_key = self._field_keys_cache.get(cache_key)
+        if master_key is None:
+            master_key = self._pbkdf2_derive(f"{self.settings.ENCRYPTION_SALT}:{field_type}:master")
+            self._field_keys_cache.put(cache_key, master_key)
+        return master_key
+    
+    def _get_hkdf_field_key(self, field_type: str, patient_id: Optional[str] = None) -> bytes:
+        """
+        Derive a per-patient field key from the field master key with HKDF-SHA256.
         
-        derived_key = kdf.derive(self.settings.ENCRYPTION_KEY.encode())
+        Args:
+            field_type: Type of PHI field (ssn, name, dob, etc.)
+            patient_id: Patient ID bound into the HKDF info parameter
         
-        # Cache the derived key (limit cache size for memory management)
-        with self._cache_lock:
-            if len(self._derived_keys_cache) > 1000:
-                # Remove oldest 10% of entries
-                keys_to_remove = list(self._derived_keys_cache.keys())[:100]
-                for key in keys_to_remove:
-                    del self._derived_keys_cache[key]
-            self._derived_keys_cache[cache_key] = derived_key
+        Returns:
+            32-byte encryption key
+        """
+        cache_key = f"hkdf:{field_type}:{patient_id or ''}_{hash(self.settings.ENCRYPTION_KEY)}"
+        cached_key = self._derived_keys_cache.get(cache_key)
+        if cached_key is not None:
+            return cached_key
+        
+        info = f"phi-field-key:v1:{field_type}:{patient_id or ''}".encode("utf-8")
+        derived_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=info,
+            backend=default_backend()
+        ).derive(self._get_field_master_key(field_type))
+        self._derived_keys_cache.put(cache_key, derived_key)
         
         return derived_key
     
+    def _get_blind_index_key(self, index_name: str) -> bytes:
+        """
+        Derive the HMAC key for a blind index.
+        
+        Expanded with HKDF from the service master key under a
+        "phi-blind-index" info label. Field keys are PBKDF2 outputs salted
+        "<ENCRYPTION_SALT>:<field>[:<patient>]", or HKDF outputs of a field
+        master under "phi-field-key", so no field or patient name can make
+        the two derivations meet.
+        
+        Args:
+            index_name: Logical index name (mrn, name, date_of_birth, phone)
+        
+        Returns:
+            32-byte HMAC key
+        """
+        cache_key = f"bidx:{index_name}_{hash(self.settings.ENCRYPTION_KEY)}"
+        index_key = self._field_keys_cache.get(cache_key)
+        if index_key is None:
+            index_key = HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=None,
+                info=f"phi-blind-index:v1:{index_name}".encode("utf-8"),
+                backend=default_backend()
+            ).derive(self.encryption_key)
+            self._field_keys_cache.put(cache_key, index_key)
+        return index_key
+    
+    def blind_index(self, index_name: str, value: Optional[str]) -> Optional[str]:
+        """
+        Compute a keyed blind index for equality search over an encrypted field.
+        
+        Callers must normalize the value first; the same normalized input
+        always produces the same index.
+        
+        Args:
+            index_name: Logical index name (mrn, name, date_of_birth, phone)
+            value: Normalized plaintext value
+        
+        Returns:
+            Hex-encoded truncated HMAC-SHA256, or None for empty values
+        """
+        if not value:
+            return None
+        digest = hmac.new(
+            self._get_blind_index_key(index_name), value.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return digest[:BLIND_INDEX_HEX_LENGTH]
+    
+    def get_key_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the derived key caches."""
+        return {
+            "field_master_keys": self._field_keys_cache.get_stats(),
+            "derived_keys": self._derived_keys_cache.get_stats()
+        }
+
+    def _encode_envelope_header(
+        self,
+        field_type: str,
+        patient_id: Optional[Any],
+        key_id: int = ENVELOPE_KEY_ID_HKDF
+    ) -> bytes:
+        """Build the authenticated v3 header that carries the key derivation context."""
+        field_bytes = str(field_type).encode("utf-8")
+        if len(field_bytes) > 255:
+            raise ValueError("Field type too long for v3 envelope")
+
+        flags = 0
+        patient_bytes = b""
+        if patient_id:
+            patient_str = str(patient_id)
+            flags |= ENVELOPE_FLAG_PATIENT_ID
+            try:
+                packed = uuid.UUID(patient_str)
+                # Only pack canonical UUID strings so the key context round-trips exactly
+                if str(packed) == patient_str:
+                    flags |= ENVELOPE_FLAG_PATIENT_UUID
+                    patient_bytes = packed.bytes
+            except ValueError:
+                pass
+            if not flags & ENVELOPE_FLAG_PATIENT_UUID:
+                encoded_pid = patient_str.encode("utf-8")
+                if len(encoded_pid) > 255:
+                    raise ValueError("Patient ID too long for v3 envelope")
+                patient_bytes = bytes([len(encoded_pid)]) + encoded_pid
+
+        return _ENVELOPE_HEADER.pack(
+            ENVELOPE_V3, key_id, flags, len(field_bytes)
+        ) + field_bytes + patient_bytes
+
+    def _decode_envelope_header(self, envelope: bytes) -> Tuple[int, str, Optional[str], int]:
+        """
+        Parse a v3 envelope header.
+
+        Returns:
+            Tuple of (key_id, field_type, patient_id, header_length)
+        """
+        if len(envelope) < _ENVELOPE_HEADER.size:
+            raise ValueError("Truncated v3 envelope")
+
+        version, key_id, flags, field_len = _ENVELOPE_HEADER.unpack_from(envelope)
+        if version != ENVELOPE_V3:
+            raise ValueError(f"Unsupported envelope version: {version}")
+
+        offset = _ENVELOPE_HEADER.size
+        field_type = envelope[offset:offset + field_len].decode("utf-8")
+        offset += field_len
+
+        patient_id = None
+        if flags & ENVELOPE_FLAG_PATIENT_UUID:
+            patient_id = str(uuid.UUID(bytes=envelope[offset:offset + 16]))
+            offset += 16
+        elif flags & ENVELOPE_FLAG_PATIENT_ID:
+            pid_len = envelope[offset]
+            patient_id = envelope[offset + 1:offset + 1 + pid_len].decode("utf-8")
+            offset += 1 + pid_len
+
+        if len(envelope) < offset + ENVELOPE_NONCE_SIZE + 16:
+            raise ValueError("Truncated v3 envelope")
+
+        return key_id, field_type, patient_id, offset
+
+    def _get_envelope_key(self, key_id: int, field_type: str, patient_id: Optional[str]) -> bytes:
+        """Resolve the AES key referenced by a v3 envelope key id."""
+        if key_id == ENVELOPE_KEY_ID_HKDF:
+            return self._get_hkdf_field_key(field_type, patient_id)
+        if key_id == ENVELOPE_KEY_ID_FIELD:
+            return self._get_field_key(field_type, patient_id)
+        raise ValueError(f"Unknown envelope key id: {key_id}")
+
+    def _seal_v3_envelope(self, plaintext: bytes, field_type: str, patient_id: Optional[Any]) -> bytes:
+        """Encrypt plaintext with AES-256-GCM into a compact binary v3 envelope."""
+        header = self._encode_envelope_header(field_type, patient_id)
+        field_key = self._get_hkdf_field_key(field_type, str(patient_id) if patient_id else None)
+        nonce = secrets.token_bytes(ENVELOPE_NONCE_SIZE)
+        return header + nonce + AESGCM(field_key).encrypt(nonce, plaintext, header)
+
+    def _open_v3_envelope(self, envelope: bytes) -> bytes:
+        """Authenticate and decrypt a binary v3 envelope."""
+        key_id, field_type, patient_id, header_len = self._decode_envelope_header(envelope)
+        header = envelope[:header_len]
+        nonce = envelope[header_len:header_len + ENVELOPE_NONCE_SIZE]
+        field_key = self._get_envelope_key(key_id, field_type, patient_id)
+        return AESGCM(field_key).decrypt(nonce, envelope[header_len + ENVELOPE_NONCE_SIZE:], header)
+
+    @staticmethod
+    def _decode_plaintext(decrypted_data: bytes) -> str:
+        """Decode decrypted PHI bytes, tolerating legacy non-UTF-8 values."""
+        try:
+            return decrypted_data.decode('utf-8')
+        except UnicodeDecodeError:
+            logger.warning("Non-UTF-8 data detected in PHI decryption, using latin-1 fallback")
+            return decrypted_data.decode('latin-1')
+
+    @staticmethod
+    def _is_v3_envelope(raw: bytes) -> bool:
+        """Check the version byte of a decoded envelope."""
+        return bool(raw) and raw[0] == ENVELOPE_V3
+
+    def get_envelope_version(self, encrypted_data: str) -> Optional[str]:
+        """
+        Identify the envelope format of a stored ciphertext without decrypting it.
+
+        Args:
+            encrypted_data: Stored ciphertext string
+
+        Returns:
+            "v1", "v2", "v3" or None if the value is not a recognised envelope
+        """
+        if not encrypted_data or not isinstance(encrypted_data, str):
+            return None
+
+        try:
+            if not encrypted_data.startswith(LEGACY_ENVELOPE_PREFIX):
+                # A single base64 quantum is enough to read the version byte
+                head = base64.b64decode(encrypted_data[:4].encode())
+                return "v3" if self._is_v3_envelope(head) else None
+
+            package = json.loads(base64.b64decode(encrypted_data.encode()).decode("utf-8"))
+            return package.get("version", "v1")
+        except (ValueError, binascii.Error, UnicodeDecodeError):
+            return None
+
+    async def upgrade_envelope(self, encrypted_data: str) -> str:
+        """
+        Rewrite a legacy ciphertext as a compact v3 envelope under the HKDF key.
+
+        The original key derivation context (field type and patient ID) is
+        recovered from the legacy AAD, or from the header of a v3 envelope
+        still sealed with a per-patient PBKDF2 key. Values already sealed with
+        an HKDF subkey are returned unchanged.
+
+        Args:
+            encrypted_data: Stored ciphertext string
+
+        Returns:
+            v3 ciphertext string
+        """
+        if not encrypted_data:
+            return encrypted_data
+
+        context: Dict[str, Any] = {"field": "generic"}
+        if self.get_envelope_version(encrypted_data) == "v3":
+            key_id, field_type, patient_id, _ = self._decode_envelope_header(
+                base64.b64decode(encrypted_data.encode())
+            )
+            if key_id == ENVELOPE_KEY_ID_HKDF:
+                return encrypted_data
+            plaintext = await self.decrypt(encrypted_data)
+            return await self.encrypt(plaintext, {"field": field_type, "patient_id": patient_id})
+
+        try:
+            package = json.loads(base64.b64decode(encrypted_data.encode()).decode("utf-8"))
+            if package.get("algorithm") == "AES-256-GCM":
+                aad_data = json.loads(base64.b64decode(package["aad"].encode()).decode())
+                context = {
+                    "field": package.get("field_type", "generic"),
+                    "patient_id": aad_data.get("patient_id")
+                }
+        except (ValueError, KeyError, binascii.Error, UnicodeDecodeError) as e:
+            logger.warning("Could not read legacy envelope context", error=str(e))
+
+        plaintext = await self.decrypt(encrypted_data)
+        if not plaintext:
+            return encrypted_data
+        return await self.encrypt(plaintext, context)
+
     async def encrypt(self, data: Any, context: Optional[Dict[str, Any]] = None) -> str:
         """
         Encrypt sensitive data with AES-256-GCM and context-aware keys.
@@ -618,60 +1012,21 @@ class EncryptionService:
             context: Additional context for encryption (field name, patient ID, etc.)
         
         Returns:
-            Base64-encoded encrypted data with metadata
+            Base64-encoded binary v3 envelope
         """
         if not data:
             return ""
         
         try:
-            # Convert data to string format for encryption
-            if isinstance(data, str):
-                data_str = data
-            elif isinstance(data, (datetime, date)):
-                data_str = data.isoformat()
-            elif isinstance(data, (int, float, bool)):
-                data_str = str(data)
-            else:
-                # For complex objects, serialize to JSON
-                data_str = json.dumps(data, default=str)
+            data_str = self._to_plaintext(data)
             
             # Extract context information
             field_type = context.get("field", "generic") if context else "generic"
             patient_id = context.get("patient_id") if context else None
             
-            # Generate field-specific key
-            field_key = self._get_field_key(field_type, patient_id)
-            
-            # Create AES-GCM cipher
-            aesgcm = AESGCM(field_key)
-            
-            # Generate random nonce (96 bits for GCM)
-            nonce = secrets.token_bytes(12)
-            
-            # Additional authenticated data (AAD)
-            aad = json.dumps({
-                "field_type": field_type,
-                "patient_id": str(patient_id) if patient_id else None,
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }, sort_keys=True).encode()
-            
-            # Encrypt with authentication
-            encrypted_data = aesgcm.encrypt(nonce, data_str.encode(), aad)
-            
-            # Create encryption package
-            package = {
-                "version": "v2",
-                "algorithm": "AES-256-GCM", 
-                "field_type": field_type,
-                "nonce": base64.b64encode(nonce).decode(),
-                "aad": base64.b64encode(aad).decode(),
-                "data": base64.b64encode(encrypted_data).decode(),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "checksum": hashlib.sha256(encrypted_data + nonce + aad).hexdigest()[:16]
-            }
-            
-            # Return as base64-encoded JSON
-            return base64.b64encode(json.dumps(package).encode()).decode()
+            # Seal into the compact binary envelope, base64-encoded once for text columns
+            envelope = self._seal_v3_envelope(data_str.encode(), field_type, patient_id)
+            return base64.b64encode(envelope).decode()
             
         except Exception as e:
             logger.error("AES-256-GCM encryption failed", error=str(e), context=context)
@@ -680,6 +1035,18 @@ class EncryptionService:
                 detail="PHI encryption failed"
             )
     
+    @staticmethod
+    def _to_plaintext(data: Any) -> str:
+        """Convert a value to the string form that gets encrypted."""
+        if isinstance(data, str):
+            return data
+        if isinstance(data, (datetime, date)):
+            return data.isoformat()
+        if isinstance(data, (int, float, bool)):
+            return str(data)
+        # For complex objects, serialize to JSON
+        return json.dumps(data, default=str)
+    
     async def decrypt(self, encrypted_data: str) -> str:
         """
         Decrypt sensitive data encrypted with AES-256-GCM.
@@ -706,7 +1073,7 @@ class EncryptionService:
                 if missing_padding:
                     encrypted_data += '=' * (4 - missing_padding)
                     
-                package_json = base64.b64decode(encrypted_data.encode()).decode('utf-8')
+                raw_package = base64.b64decode(encrypted_data.encode())
             except (ValueError, binascii.Error) as b64_error:
                 logger.error("Base64 decoding failed for PHI data", 
                            error=str(b64_error), 
@@ -721,12 +1088,17 @@ class EncryptionService:
                     detail="PHI decryption failed - invalid base64 encoding"
                 )
             
+            # Compact binary envelope: dispatch on the version byte, no JSON parsing
+            if self._is_v3_envelope(raw_package):
+                return self._decode_plaintext(self._open_v3_envelope(raw_package))
+            
             try:
+                package_json = raw_package.decode('utf-8')
                 package = json.loads(package_json)
-            except json.JSONDecodeError as json_error:
+            except (UnicodeDecodeError, json.JSONDecodeError) as json_error:
                 logger.error("JSON decoding failed for PHI package",
                            error=str(json_error),
-                           package_sample=package_json[:100] + "..." if len(package_json) > 100 else package_json)
+                           package_length=len(raw_package))
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail="PHI decryption failed - invalid package format"
@@ -827,9 +1199,15 @@ class EncryptionService:
             True if package is valid, False otherwise
         """
         try:
+            raw_package = base64.b64decode(encrypted_data.encode())
+            
+            # v3 envelopes carry no separate checksum - the GCM tag is the integrity check
+            if self._is_v3_envelope(raw_package):
+                self._open_v3_envelope(raw_package)
+                return True
+            
             # Decode and parse package
-            package_json = base64.b64decode(encrypted_data.encode()).decode()
-            package = json.loads(package_json)
+            package = json.loads(raw_package.decode())
             
             # Check version
             version = package.get("version", "v1")
@@ -876,6 +1254,9 @@ class EncryptionService:
         """
         Encrypt multiple data items efficiently with batch processing.
         
+        Sealing runs on the PHI crypto thread pool so a large batch does not
+        block the event loop.
+        
         Args:
             data_list: List of data items to encrypt
             context: Encryption context
@@ -883,75 +1264,184 @@ class EncryptionService:
         Returns:
             List of encrypted data items
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_phi_crypto_executor(), self.seal_many, data_list, context)
+    
+    def seal_many(self, values: List[Any], context: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Encrypt a batch of values synchronously under one key context.
+        
+        Does no event loop work; bulk_encrypt and the bulk patient importer
+        call it on the PHI crypto thread pool.
+        
+        Args:
+            values: Values to encrypt; falsy values become ""
+            context: Encryption context (field, patient_id)
+        
+        Returns:
+            Base64 v3 envelopes ("" for empty or failed items)
+        """
         encrypted_items = []
         field_type = context.get("field", "generic") if context else "generic"
         patient_id = context.get("patient_id") if context else None
         
-        # Pre-generate field key for batch efficiency
-        field_key = self._get_field_key(field_type, patient_id)
-        aesgcm = AESGCM(field_key)
-        
-        for item in data_list:
+        for item in values:
             try:
                 if not item:
                     encrypted_items.append("")
                     continue
                 
-                # Generate unique nonce for each item
-                nonce = secrets.token_bytes(12)
-                
-                # Create AAD for this item
-                aad = json.dumps({
-                    "field_type": field_type,
-                    "patient_id": patient_id,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }, sort_keys=True).encode()
-                
-                # Encrypt
-                encrypted_data = aesgcm.encrypt(nonce, item.encode(), aad)
-                
-                # Create package
-                package = {
-                    "version": "v2",
-                    "algorithm": "AES-256-GCM",
-                    "field_type": field_type,
-                    "nonce": base64.b64encode(nonce).decode(),
-                    "aad": base64.b64encode(aad).decode(),
-                    "data": base64.b64encode(encrypted_data).decode(),
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "checksum": hashlib.sha256(encrypted_data + nonce + aad).hexdigest()[:16]
-                }
-                
-                encrypted_item = base64.b64encode(json.dumps(package).encode()).decode()
-                encrypted_items.append(encrypted_item)
+                # Field key is cached after the first item, so the batch derives it once
+                envelope = self._seal_v3_envelope(self._to_plaintext(item).encode(), field_type, patient_id)
+                encrypted_items.append(base64.b64encode(envelope).decode())
                 
             except Exception as e:
-                logger.error("Bulk encryption failed for item", error=str(e), item_length=len(item))
+                logger.error("Bulk encryption failed for item", error=str(e))
                 encrypted_items.append("")  # Empty string for failed encryption
         
         return encrypted_items
     
-    async def bulk_decrypt(self, encrypted_data_list: List[str]) -> List[str]:
+    async def bulk_decrypt(self, encrypted_data_list: List[str], chunk_size: Optional[int] = None) -> List[str]:
         """
         Decrypt multiple data items efficiently.
         
+        v3 envelopes are grouped by derived key and decrypted in chunks on the
+        shared PHI crypto thread pool; legacy packages fall back to decrypt().
+        
         Args:
             encrypted_data_list: List of encrypted data items
+            chunk_size: Envelopes per thread pool task
+        
+        Returns:
+            List of decrypted data items (empty string for failed items)
+        """
+        decrypted_items = await self._bulk_decrypt_values(encrypted_data_list, chunk_size)
+        return [item if item is not None else "" for item in decrypted_items]
+    
+    async def decrypt_rows(
+        self,
+        rows: List[Any],
+        fields: List[str],
+        chunk_size: Optional[int] = None
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        Decrypt the ``<field>_encrypted`` attributes of a page of ORM rows in one batch.
+        
+        Args:
+            rows: ORM instances (patients, immunizations, ...)
+            fields: Plaintext field names, e.g. ["first_name", "last_name"]
+            chunk_size: Envelopes per thread pool task
         
         Returns:
-            List of decrypted data items
+            One dict per row mapping field name to plaintext, or None when that
+            field failed to decrypt. Fields with no stored ciphertext are omitted.
         """
-        decrypted_items = []
+        slots: List[Tuple[int, str]] = []
+        ciphertexts: List[str] = []
+        for row_index, row in enumerate(rows):
+            for field in fields:
+                encrypted_value = getattr(row, f"{field}_encrypted", None)
+                if encrypted_value:
+                    slots.append((row_index, field))
+                    ciphertexts.append(encrypted_value)
+        
+        decrypted = await self._bulk_decrypt_values(ciphertexts, chunk_size)
+        
+        row_values: List[Dict[str, Optional[str]]] = [{} for _ in rows]
+        for (row_index, field), plaintext in zip(slots, decrypted):
+            row_values[row_index][field] = plaintext
+        return row_values
+    
+    def _open_v3_chunk(
+        self,
+        items: List[Tuple[int, bytes, Tuple[int, str, Optional[str]], int]]
+    ) -> List[Tuple[int, Optional[str]]]:
+        """Decrypt a chunk of v3 envelopes, resolving each distinct key once (runs on the crypto pool)."""
+        ciphers: Dict[Tuple[int, str, Optional[str]], AESGCM] = {}
+        results = []
+        for index, envelope, key_context, header_len in items:
+            try:
+                aesgcm = ciphers.get(key_context)
+                if aesgcm is None:
+                    aesgcm = ciphers[key_context] = AESGCM(self._get_envelope_key(*key_context))
+                nonce = envelope[header_len:header_len + ENVELOPE_NONCE_SIZE]
+                plaintext = aesgcm.decrypt(
+                    nonce, envelope[header_len + ENVELOPE_NONCE_SIZE:], envelope[:header_len]
+                )
+                results.append((index, self._decode_plaintext(plaintext)))
+            except Exception as e:
+                logger.error("Bulk decryption failed for item", error=str(e))
+                results.append((index, None))
+        return results
+    
+    async def _bulk_decrypt_values(
+        self,
+        encrypted_data_list: List[str],
+        chunk_size: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Decrypt a list of ciphertexts, returning None for items that fail."""
+        results: List[Optional[str]] = [""] * len(encrypted_data_list)
+        envelopes: List[Tuple[int, bytes, Tuple[int, str, Optional[str]], int]] = []
+        legacy_indexes: List[int] = []
+        
+        # Parse headers on the loop - cheap, and tells us which key each item needs
+        for index, encrypted_item in enumerate(encrypted_data_list):
+            if not encrypted_item:
+                continue
+            try:
+                envelope = base64.b64decode(encrypted_item.encode())
+            except (ValueError, binascii.Error):
+                legacy_indexes.append(index)
+                continue
+            if not self._is_v3_envelope(envelope):
+                legacy_indexes.append(index)
+                continue
+            try:
+                key_id, field_type, patient_id, header_len = self._decode_envelope_header(envelope)
+            except (ValueError, IndexError, UnicodeDecodeError) as e:
+                logger.error("Bulk decryption failed for item", error=str(e))
+                results[index] = None
+                continue
+            envelopes.append((index, envelope, (key_id, field_type, patient_id), header_len))
         
-        for encrypted_item in encrypted_data_list:
+        if envelopes:
+            loop = asyncio.get_running_loop()
+            executor = get_phi_crypto_executor()
+            chunk_size = chunk_size or self.settings.PHI_DECRYPT_CHUNK_SIZE
+            
+            # Per-patient HKDF keys make nearly every field its own key, so work is
+            # split by chunk, not by key. Cold PBKDF2 field masters are derived
+            # first, one at a time: the derivation holds the GIL, and racing
+            # chunks would each stall the loop deriving the same master.
+            hkdf_field_types = {
+                key_context[1] for _, _, key_context, _ in envelopes if key_context[0] == ENVELOPE_KEY_ID_HKDF
+            }
+            for field_type in hkdf_field_types:
+                try:
+                    await loop.run_in_executor(executor, self._get_field_master_key, field_type)
+                except Exception as e:
+                    # Left to the chunks, which fail the affected items individually
+                    logger.error("Bulk decryption key derivation failed", error=str(e))
+            
+            # Items sharing a key stay together, so a chunk resolves it once
+            envelopes.sort(key=lambda item: (item[2][0], item[2][1], item[2][2] or ""))
+            chunk_results = await asyncio.gather(*[
+                loop.run_in_executor(executor, self._open_v3_chunk, envelopes[i:i + chunk_size])
+                for i in range(0, len(envelopes), chunk_size)
+            ])
+            for chunk in chunk_results:
+                for index, plaintext in chunk:
+                    results[index] = plaintext
+        
+        # Legacy JSON packages take the single-value path until upgraded to v3
+        for index in legacy_indexes:
             try:
-                decrypted_item = await self.decrypt(encrypted_item)
-                decrypted_items.append(decrypted_item)
+                results[index] = await self.decrypt(encrypted_data_list[index])
             except Exception as e:
                 logger.error("Bulk decryption failed for item", error=str(e))
-                decrypted_items.append("")  # Empty string for failed decryption
+                results[index] = None
         
-        return decrypted_items
+        return results
     
     def encrypt_sync(self, data: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Synchronous wrapper for encrypt method"""
@@ -992,39 +1482,8 @@ class EncryptionService:
             field_type = context.get("document_type", "generic") if context else "generic"
             patient_id = context.get("patient_id") if context else None
             
-            # Generate field-specific key
-            field_key = self._get_field_key(field_type, patient_id)
-            
-            # Create AES-GCM cipher
-            aesgcm = AESGCM(field_key)
-            
-            # Generate random nonce (96 bits for GCM)
-            nonce = secrets.token_bytes(12)
-            
-            # Additional authenticated data (AAD)
-            aad = json.dumps({
-                "field_type": field_type,
-                "patient_id": str(patient_id) if patient_id else None,
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }, sort_keys=True).encode()
-            
-            # Encrypt with authentication
-            encrypted_data = aesgcm.encrypt(nonce, data, aad)
-            
-            # Create encryption package as bytes
-            package = {
-                "version": "v2",
-                "algorithm": "AES-256-GCM", 
-                "field_type": field_type,
-                "nonce": base64.b64encode(nonce).decode(),
-                "aad": base64.b64encode(aad).decode(),
-                "data": base64.b64encode(encrypted_data).decode(),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "checksum": hashlib.sha256(encrypted_data + nonce + aad).hexdigest()[:16]
-            }
-            
-            # Return as JSON bytes
-            return json.dumps(package).encode('utf-8')
+            # Documents are stored as raw binary v3 envelopes - no base64 or JSON inflation
+            return self._seal_v3_envelope(data, field_type, patient_id)
             
         except Exception as e:
             logger.error("AES-256-GCM bytes encryption failed", error=str(e), context=context)
@@ -1047,7 +1506,10 @@ class EncryptionService:
             return b""
         
         try:
-            # Parse JSON package
+            if self._is_v3_envelope(encrypted_data):
+                return self._open_v3_envelope(encrypted_data)
+            
+            # Parse legacy JSON package
             package_json = encrypted_data.decode('utf-8')
             package = json.loads(package_json)
             
@@ -862,18 +862,18 @@ class SIEMIntegration:
         correlated_events = await self._correlate_events()
         
         # Prepare events for SIEM
-        events_to_send = []
-        while self.event_queue:
-            event = self.event_queue.popleft()
-            events_to_send.append(self._serialize_event(event))
+        pending = list(self.event_queue)
+        self.event_queue.clear()
+        events_to_send = [self._serialize_event(event) for event in pending]
         
         # Add correlated events
         for corr_event in correlated_events:
             events_to_send.append(self._serialize_event(corr_event))
         
-        # Send to SIEM
+        # Send to SIEM; undelivered events go back to the front of the (bounded) queue
         if self.config.siem_endpoint and events_to_send:
-            await self._send_to_siem(events_to_send)
+            if not await self._send_to_siem(events_to_send):
+                self.event_queue.extendleft(reversed(pending))
         
         self.last_flush_time = time.time()
         
@@ -937,11 +937,11 @@ class SIEMIntegration:
             "additional_context": event.additional_context
         }
     
-    async def _send_to_siem(self, events: List[Dict[str, Any]]):
-        """Send events to SIEM system"""
+    async def _send_to_siem(self, events: List[Dict[str, Any]]) -> bool:
+        """Send events to SIEM system; returns whether the SIEM accepted them"""
         if not REQUESTS_PSUTIL_AVAILABLE:
             logger.warning("Requests library not available, cannot send to SIEM")
-            return
+            return False
         
         try:
             headers = {
@@ -955,7 +955,9 @@ class SIEMIntegration:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            response = requests.post(
+            # Off the event loop, so a slow SIEM does not stall request handling
+            response = await asyncio.to_thread(
+                requests.post,
                 self.config.siem_endpoint,
                 json=payload,
                 headers=headers,
@@ -964,13 +966,16 @@ class SIEMIntegration:
             
             if response.status_code == 200:
                 logger.debug("Events sent to SIEM successfully")
-            else:
-                logger.error("Failed to send events to SIEM",
-                           status_code=response.status_code,
-                           response_text=response.text)
+                return True
+            
+            logger.error("Failed to send events to SIEM",
+                       status_code=response.status_code,
+                       response_text=response.text)
+            return False
                 
         except Exception as e:
             logger.error("SIEM integration error", error=str(e))
+            return False
 
 # Security Hardening Middleware
 
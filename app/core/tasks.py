@@ -47,6 +47,8 @@ celery_app.conf.update(
         "app.modules.purge_scheduler.tasks.*": {"queue": "purge"},
         "app.modules.auth.tasks.*": {"queue": "auth"},
         "app.modules.healthcare_records.tasks.process_phi_encryption_queue": {"queue": "phi_processing"},
+        "app.modules.healthcare_records.tasks.upgrade_phi_envelopes": {"queue": "phi_processing"},
+        "app.modules.healthcare_records.tasks.backfill_patient_blind_indexes": {"queue": "phi_processing"},
         "app.modules.healthcare_records.tasks.monitor_consent_expiration": {"queue": "healthcare_monitoring"},
         "app.modules.healthcare_records.tasks.generate_compliance_reports": {"queue": "compliance"},
         "app.modules.healthcare_records.tasks.anonymize_patient_data": {"queue": "research_processing"},
@@ -90,6 +92,18 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
     },
     
+    # Compliance report rollups - runs hourly, picks up each day once it has settled
+    "audit-compliance-rollups": {
+        "task": "app.modules.audit_logger.tasks.materialize_compliance_rollups",
+        "schedule": crontab(minute=15),  # Every hour at :15
+    },
+    
+    # Streaming SIEM export - resumes from its high-water mark each run
+    "audit-siem-export": {
+        "task": "app.modules.audit_logger.tasks.stream_audit_logs_to_siem",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
+    
     # IRIS API health check - runs every 5 minutes
     "iris-api-health-check": {
         "task": "app.modules.iris_api.tasks.health_check",
@@ -167,6 +181,20 @@ celery_app.conf.beat_schedule = {
         "options": {"queue": "phi_processing"}
     },
     
+    # Legacy PHI envelope upgrade (v2 JSON -> v3 binary) - runs daily at 4:30 AM
+    "healthcare-phi-envelope-upgrade": {
+        "task": "healthcare.upgrade_phi_envelopes",
+        "schedule": crontab(hour=4, minute=30),  # Daily at 4:30 AM
+        "kwargs": {"max_batches": 200},
+        "options": {"queue": "phi_processing"}
+    },
+    "healthcare-patient-blind-index-backfill": {
+        "task": "healthcare.backfill_patient_blind_indexes",
+        "schedule": crontab(hour=5, minute=0),  # Daily at 5:00 AM, after envelope upgrade
+        "kwargs": {"max_batches": 200},
+        "options": {"queue": "phi_processing"}
+    },
+    
     # Consent expiration monitoring - runs every hour
     "healthcare-consent-expiration": {
         "task": "app.modules.healthcare_records.tasks.monitor_consent_expiration",
@@ -72,6 +72,9 @@ from app.modules.data_lake.router import router as data_lake_router
 from app.modules.clinical_validation.router import router as clinical_validation_router
 from app.modules.fhir_validation.router import router as fhir_validation_router
 from app.core.phi_audit_middleware import PHIAuditMiddleware
+from app.core.phi_audit_capture import get_phi_audit_writer
+from app.core.redis_caching import cache_manager
+from app.modules.dashboard.projection import get_dashboard_projection
 
 logger = structlog.get_logger()
 
@@ -111,12 +114,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         
         logger.info("Event handlers registered successfully")
         
+        # Dashboard counters maintained from events, rebuilt from the database every interval
+        if get_settings().DASHBOARD_PROJECTION_ENABLED:
+            dashboard_projection = get_dashboard_projection()
+            await dashboard_projection.connect_redis(get_settings().REDIS_URL)
+            event_bus.hybrid_bus.subscribe(dashboard_projection)
+            await dashboard_projection.start(session_factory)
+        
         # Initialize audit service
         logger.info("Initializing audit service...")
         audit_service = await initialize_audit_service(session_factory)
         app.state.audit_service = audit_service
         logger.info("Audit service initialized successfully")
         
+        # Background writer for PHI access records captured by PHIAuditMiddleware
+        await get_phi_audit_writer().start()
+        
+        # Evict this worker's cached copies when other workers invalidate them
+        await cache_manager.start()
+        
         logger.info("System initialized successfully", 
                    event_bus_running=event_bus.hybrid_bus.running,
                    event_handlers=len(event_bus.hybrid_bus.handlers))
@@ -134,6 +150,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down system")
     
     try:
+        # Persist buffered PHI access records while the audit pipeline is still up
+        await get_phi_audit_writer().stop()
+        logger.info("PHI audit writer drained")
+        
+        await cache_manager.stop()
+        await get_dashboard_projection().stop()
+        
         # Shutdown healthcare event bus (graceful with in-flight event handling)
         await shutdown_event_bus()
         logger.info("Healthcare event bus shutdown complete")
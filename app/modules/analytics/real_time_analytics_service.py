@@ -512,7 +512,7 @@ class RealTimeAnalyticsService:
         dashboard_id = str(uuid.uuid4())
         
         try:
-            async with get_db_session() as db:
+            async with get_db_session(readonly=True) as db:
                 # Initialize analytics calculators
                 population_analytics = PopulationHealthAnalytics(db)
                 performance_analytics = SystemPerformanceAnalytics(db)
@@ -581,7 +581,7 @@ class RealTimeAnalyticsService:
         report_id = str(uuid.uuid4())
         
         try:
-            async with get_db_session() as db:
+            async with get_db_session(readonly=True) as db:
                 population_analytics = PopulationHealthAnalytics(db)
                 
                 # Calculate metrics
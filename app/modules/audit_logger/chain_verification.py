@@ -0,0 +1,612 @@
+"""
+Streaming audit hash chain verification.
+
+Appends to and verifies the ``audit_logs`` hash chain:
+
+- append_audit_rows is the single writer of the chain. It numbers rows with
+  the next ``sequence_number`` and links each to the previous row's hash,
+  holding a transaction-scoped lock so concurrent writers cannot fork it.
+  Rows written without it have no sequence number and are not part of the
+  chain.
+- Chain rows are streamed in sequence order through a server-side cursor
+  and re-hashed one at a time, without loading the chain into memory.
+- After a clean run the chain head is persisted as an HMAC-signed
+  checkpoint, so the next run only verifies rows appended since.
+- Large backlogs can be split into sequence ranges that are verified in
+  worker processes and stitched together at their boundary hashes.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import get_settings
+from app.core.database_unified import AuditChainCheckpoint, AuditLog, _to_async_url
+from app.core.security import security_manager
+
+logger = structlog.get_logger()
+
+GENESIS_HASH = "GENESIS_BLOCK_HASH"
+DEFAULT_CHAIN_NAME = "audit_logs"
+
+# Transaction-scoped PostgreSQL advisory lock serializing chain appends
+CHAIN_APPEND_LOCK_KEY = 0x6175646974  # "audit"
+
+# Persisted columns covered by the row hash, plus the link and hash themselves;
+# selecting them avoids ORM hydration
+_CHAIN_COLUMNS = (
+    AuditLog.id,
+    AuditLog.sequence_number,
+    AuditLog.timestamp,
+    AuditLog.event_type,
+    AuditLog.user_id,
+    AuditLog.action,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.outcome,
+    AuditLog.config_metadata,
+    AuditLog.previous_log_hash,
+    AuditLog.log_hash,
+)
+
+
+def compute_audit_log_hash(fields: Mapping[str, Any], previous_hash: Optional[str]) -> str:
+    """
+    Compute the chained SHA-256 hash of an audit record.
+
+    Only ``audit_logs`` columns are hashed, so the writer's dict and the row
+    read back by the verifier produce the same digest.
+
+    Args:
+        fields: Audit record values (a row mapping or the writer's dict)
+        previous_hash: Hash of the preceding record in the chain
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    resource_id = fields.get("resource_id")
+    hashable_data = {
+        "sequence_number": fields.get("sequence_number"),
+        "timestamp": fields["timestamp"].isoformat(),
+        "event_type": fields.get("event_type"),
+        "user_id": fields.get("user_id"),
+        "action": fields.get("action"),
+        "resource_type": fields.get("resource_type") or "",
+        "resource_id": str(resource_id) if resource_id else "",
+        "outcome": fields.get("outcome"),
+        "config_metadata": json.dumps(fields.get("config_metadata") or {}, sort_keys=True),
+        "previous_hash": previous_hash
+    }
+    payload_string = json.dumps(hashable_data, sort_keys=True)
+    return hashlib.sha256(payload_string.encode("utf-8")).hexdigest()
+
+
+async def load_chain_head(session: AsyncSession) -> Tuple[int, str]:
+    """Return the sequence number and hash of the last chain row (0 and the genesis hash when empty)."""
+    result = await session.execute(
+        select(AuditLog.sequence_number, AuditLog.log_hash)
+        .where(AuditLog.sequence_number.isnot(None))
+        .order_by(AuditLog.sequence_number.desc())
+        .limit(1)
+    )
+    row = result.first()
+    return (row.sequence_number, row.log_hash) if row else (0, GENESIS_HASH)
+
+
+async def append_audit_rows(
+    session: AsyncSession, rows: Sequence[MutableMapping[str, Any]]
+) -> Sequence[MutableMapping[str, Any]]:
+    """
+    Append audit rows to the hash chain in list order.
+
+    Assigns each row its ``sequence_number``, ``previous_log_hash`` and
+    ``log_hash`` and inserts them in the caller's transaction; the caller
+    commits. On PostgreSQL an advisory lock held until that commit keeps
+    concurrent writers from reading the same chain head.
+
+    Args:
+        session: Session whose transaction the rows are written in
+        rows: Audit log column values; the chain fields are filled in place
+
+    Returns:
+        The rows, with their chain fields
+    """
+    if not rows:
+        return rows
+    if session.get_bind().dialect.name == "postgresql":
+        await session.execute(select(func.pg_advisory_xact_lock(CHAIN_APPEND_LOCK_KEY)))
+
+    sequence_number, previous_hash = await load_chain_head(session)
+    for row in rows:
+        sequence_number += 1
+        row["sequence_number"] = sequence_number
+        row["previous_log_hash"] = previous_hash
+        row["log_hash"] = previous_hash = compute_audit_log_hash(row, previous_hash)
+
+    await session.execute(insert(AuditLog), list(rows))
+    return rows
+
+
+@dataclass
+class ChainCheckpoint:
+    """Verified chain prefix, identified by its last row."""
+    chain_name: str
+    last_sequence_number: int
+    last_timestamp: datetime
+    last_log_id: uuid.UUID
+    last_log_hash: str
+    records_verified: int
+    signature: str = ""
+
+    def signing_payload(self) -> str:
+        return "|".join([
+            self.chain_name,
+            str(self.last_sequence_number),
+            self.last_timestamp.isoformat(),
+            str(self.last_log_id),
+            self.last_log_hash,
+            str(self.records_verified)
+        ])
+
+
+@dataclass
+class SegmentResult:
+    """Outcome of verifying one contiguous slice of the chain."""
+    index: int
+    records_verified: int = 0
+    first_previous_hash: Optional[str] = None
+    last_sequence_number: Optional[int] = None
+    last_timestamp: Optional[datetime] = None
+    last_log_id: Optional[uuid.UUID] = None
+    last_log_hash: Optional[str] = None
+    violations: List[Dict[str, Any]] = field(default_factory=list)
+    violation_count: int = 0
+
+
+@dataclass
+class ChainVerificationResult:
+    """Outcome of an audit chain verification run."""
+    verified: bool
+    records_verified: int = 0
+    violation_count: int = 0
+    violations: List[Dict[str, Any]] = field(default_factory=list)
+    resumed_from: Optional[ChainCheckpoint] = None
+    checkpoint: Optional[ChainCheckpoint] = None
+    segments: int = 1
+    duration_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses and audit event payloads."""
+        def checkpoint_dict(checkpoint: Optional[ChainCheckpoint]) -> Optional[Dict[str, Any]]:
+            if checkpoint is None:
+                return None
+            data = asdict(checkpoint)
+            data.pop("signature")
+            data["last_timestamp"] = checkpoint.last_timestamp.isoformat()
+            data["last_log_id"] = str(checkpoint.last_log_id)
+            return data
+
+        return {
+            "verified": self.verified,
+            "records_verified": self.records_verified,
+            "violation_count": self.violation_count,
+            "violations": self.violations,
+            "resumed_from": checkpoint_dict(self.resumed_from),
+            "checkpoint": checkpoint_dict(self.checkpoint),
+            "segments": self.segments,
+            "duration_ms": self.duration_ms
+        }
+
+
+class _ChainWalker:
+    """Incrementally checks row hashes and links over an ordered row stream."""
+
+    def __init__(self, segment: SegmentResult, expected_previous: Optional[str], max_violations: int):
+        self.segment = segment
+        # None means the first row's stored link is accepted as the anchor
+        self.expected_previous = expected_previous
+        self.max_violations = max_violations
+
+    def _violation(self, violation: Dict[str, Any]) -> None:
+        self.segment.violation_count += 1
+        if len(self.segment.violations) < self.max_violations:
+            self.segment.violations.append(violation)
+
+    def feed(self, row: Mapping[str, Any]) -> None:
+        segment = self.segment
+        stored_previous = row["previous_log_hash"]
+        if segment.records_verified == 0:
+            segment.first_previous_hash = stored_previous
+
+        if self.expected_previous is not None and stored_previous != self.expected_previous:
+            self._violation({
+                "log_id": str(row["id"]),
+                "timestamp": row["timestamp"].isoformat(),
+                "error": "broken_chain_link",
+                "expected_previous": self.expected_previous,
+                "actual_previous": stored_previous
+            })
+
+        # Hash against the stored link so a single edited row is reported once
+        expected_hash = compute_audit_log_hash(row, stored_previous)
+        if row["log_hash"] != expected_hash:
+            self._violation({
+                "log_id": str(row["id"]),
+                "timestamp": row["timestamp"].isoformat(),
+                "error": "hash_mismatch",
+                "expected_hash": expected_hash,
+                "actual_hash": row["log_hash"]
+            })
+
+        segment.records_verified += 1
+        segment.last_sequence_number = row["sequence_number"]
+        segment.last_timestamp = row["timestamp"]
+        segment.last_log_id = row["id"]
+        segment.last_log_hash = row["log_hash"]
+        self.expected_previous = row["log_hash"]
+
+
+async def _stream_chain_rows(
+    session: AsyncSession,
+    batch_size: int,
+    after: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    lower: Optional[int] = None,
+    upper: Optional[int] = None
+) -> AsyncIterator[Mapping[str, Any]]:
+    """Yield chain rows in sequence order through a server-side cursor."""
+    query = (
+        select(*_CHAIN_COLUMNS)
+        .where(AuditLog.sequence_number.isnot(None))
+        .order_by(AuditLog.sequence_number.asc())
+    )
+    if after is not None:
+        query = query.where(AuditLog.sequence_number > after)
+    if lower is not None:
+        query = query.where(AuditLog.sequence_number >= lower)
+    if upper is not None:
+        query = query.where(AuditLog.sequence_number < upper)
+    if start_date is not None:
+        query = query.where(AuditLog.timestamp >= start_date)
+    if end_date is not None:
+        query = query.where(AuditLog.timestamp <= end_date)
+
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.mappings().partitions():
+        for row in partition:
+            yield row
+
+
+async def _verify_segment(
+    database_url: str,
+    index: int,
+    after: Optional[int],
+    lower: Optional[int],
+    upper: Optional[int],
+    batch_size: int,
+    max_violations: int
+) -> SegmentResult:
+    engine = create_async_engine(_to_async_url(database_url), poolclass=NullPool)
+    segment = SegmentResult(index=index)
+    walker = _ChainWalker(segment, expected_previous=None, max_violations=max_violations)
+    try:
+        async with AsyncSession(engine) as session:
+            async for row in _stream_chain_rows(session, batch_size, after=after, lower=lower, upper=upper):
+                walker.feed(row)
+    finally:
+        await engine.dispose()
+    return segment
+
+
+def verify_segment_worker(
+    database_url: str,
+    index: int,
+    after: Optional[int],
+    lower: Optional[int],
+    upper: Optional[int],
+    batch_size: int,
+    max_violations: int
+) -> SegmentResult:
+    """Process pool entry point: verify one segment on a private engine."""
+    return asyncio.run(_verify_segment(
+        database_url, index, after, lower, upper, batch_size, max_violations
+    ))
+
+
+class AuditChainVerifier:
+    """Streaming, checkpointed verifier for the audit log hash chain."""
+
+    def __init__(
+        self,
+        session_factory,
+        chain_name: str = DEFAULT_CHAIN_NAME,
+        batch_size: Optional[int] = None,
+        max_reported_violations: int = 100
+    ):
+        if session_factory is None:
+            raise ValueError("session_factory cannot be None")
+        self.session_factory = session_factory
+        self.chain_name = chain_name
+        self.settings = get_settings()
+        self.batch_size = batch_size or self.settings.AUDIT_CHAIN_VERIFY_BATCH_SIZE
+        self.max_reported_violations = max_reported_violations
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _sign(self, checkpoint: ChainCheckpoint) -> str:
+        return security_manager.generate_hmac_signature(
+            checkpoint.signing_payload(), self.settings.SECRET_KEY
+        )
+
+    async def load_checkpoint(self, session: AsyncSession) -> Optional[ChainCheckpoint]:
+        """
+        Load the newest checkpoint for this chain.
+
+        A checkpoint whose signature does not verify is ignored (forcing a
+        full verification) and reported as a critical event. Checkpoints
+        written before the chain was ordered by sequence number carry no
+        position in it and are ignored too.
+        """
+        result = await session.execute(
+            select(AuditChainCheckpoint)
+            .where(AuditChainCheckpoint.chain_name == self.chain_name)
+            .order_by(AuditChainCheckpoint.created_at.desc())
+            .limit(1)
+        )
+        record = result.scalar_one_or_none()
+        if record is None or record.last_sequence_number is None:
+            return None
+
+        checkpoint = ChainCheckpoint(
+            chain_name=record.chain_name,
+            last_sequence_number=record.last_sequence_number,
+            last_timestamp=record.last_timestamp,
+            last_log_id=record.last_log_id,
+            last_log_hash=record.last_log_hash,
+            records_verified=record.records_verified,
+            signature=record.signature
+        )
+        if not security_manager.verify_hmac_signature(
+            checkpoint.signing_payload(), checkpoint.signature, self.settings.SECRET_KEY
+        ):
+            logger.critical(
+                "Audit chain checkpoint signature invalid - falling back to full verification",
+                chain_name=self.chain_name,
+                checkpoint_id=str(record.id)
+            )
+            return None
+        return checkpoint
+
+    async def _save_checkpoint(self, session: AsyncSession, checkpoint: ChainCheckpoint) -> None:
+        checkpoint.signature = self._sign(checkpoint)
+        session.add(AuditChainCheckpoint(
+            chain_name=checkpoint.chain_name,
+            last_sequence_number=checkpoint.last_sequence_number,
+            last_log_id=checkpoint.last_log_id,
+            last_timestamp=checkpoint.last_timestamp,
+            last_log_hash=checkpoint.last_log_hash,
+            records_verified=checkpoint.records_verified,
+            signature=checkpoint.signature
+        ))
+        await session.commit()
+
+    def _advance(
+        self, resumed_from: Optional[ChainCheckpoint], segment: SegmentResult
+    ) -> Optional[ChainCheckpoint]:
+        if segment.records_verified == 0:
+            return resumed_from
+        return ChainCheckpoint(
+            chain_name=self.chain_name,
+            last_sequence_number=segment.last_sequence_number,
+            last_timestamp=segment.last_timestamp,
+            last_log_id=segment.last_log_id,
+            last_log_hash=segment.last_log_hash,
+            records_verified=(resumed_from.records_verified if resumed_from else 0) + segment.records_verified
+        )
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    async def verify(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        incremental: bool = True
+    ) -> ChainVerificationResult:
+        """
+        Stream-verify the chain in a single pass.
+
+        Whole-chain runs resume from the last checkpoint and persist a new
+        one when clean. Date-bounded runs never touch checkpoints and anchor
+        on the first row's stored link, since its predecessor is out of range.
+
+        Args:
+            start_date: Only verify rows at or after this time
+            end_date: Only verify rows at or before this time
+            incremental: Resume from and update the stored checkpoint
+
+        Returns:
+            ChainVerificationResult
+        """
+        start = time.perf_counter()
+        whole_chain = start_date is None and end_date is None
+
+        async with self.session_factory() as session:
+            resumed_from = await self.load_checkpoint(session) if whole_chain and incremental else None
+            if resumed_from is not None:
+                expected_previous = resumed_from.last_log_hash
+            else:
+                expected_previous = GENESIS_HASH if whole_chain else None
+
+            segment = SegmentResult(index=0)
+            walker = _ChainWalker(segment, expected_previous, self.max_reported_violations)
+            async for row in _stream_chain_rows(
+                session,
+                self.batch_size,
+                after=resumed_from.last_sequence_number if resumed_from else None,
+                start_date=start_date,
+                end_date=end_date
+            ):
+                walker.feed(row)
+
+            result = ChainVerificationResult(
+                verified=segment.violation_count == 0,
+                records_verified=segment.records_verified,
+                violation_count=segment.violation_count,
+                violations=segment.violations,
+                resumed_from=resumed_from
+            )
+            if result.verified and whole_chain and incremental:
+                result.checkpoint = self._advance(resumed_from, segment)
+                if result.checkpoint is not resumed_from:
+                    await self._save_checkpoint(session, result.checkpoint)
+
+        result.duration_ms = int((time.perf_counter() - start) * 1000)
+        self._log_result(result)
+        return result
+
+    async def plan_segments(
+        self, session: AsyncSession, segments: int, after: Optional[int] = None
+    ) -> List[Tuple[Optional[int], Optional[int]]]:
+        """
+        Split the unverified chain into contiguous sequence ranges.
+
+        Ranges are half-open ``[lower, upper)`` on sequence number; the first
+        and last are open-ended.
+        """
+        query = select(func.min(AuditLog.sequence_number), func.max(AuditLog.sequence_number))
+        if after is not None:
+            query = query.where(AuditLog.sequence_number > after)
+        first, last = (await session.execute(query)).one()
+        if first is None or segments <= 1 or last - first + 1 < segments:
+            return [(None, None)]
+
+        step = (last - first + 1) / segments
+        bounds = [first + round(step * i) for i in range(1, segments)]
+        lowers = [None] + bounds
+        uppers = bounds + [None]
+        return list(zip(lowers, uppers))
+
+    async def verify_parallel(
+        self,
+        segments: Optional[int] = None,
+        database_url: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        incremental: bool = True
+    ) -> ChainVerificationResult:
+        """
+        Verify the chain in segments on worker processes, then stitch them.
+
+        Each worker streams its own sequence range on a private engine and
+        checks hashes and links inside it. Stitching then checks that every
+        segment's first row links to the previous segment's last hash (or to
+        the checkpoint/genesis hash for the first one).
+
+        Args:
+            segments: Number of segments (default AUDIT_CHAIN_VERIFY_WORKERS)
+            database_url: Database the workers connect to (default DATABASE_URL)
+            executor: Executor to run segments on (default a process pool)
+            incremental: Resume from and update the stored checkpoint
+
+        Returns:
+            ChainVerificationResult
+        """
+        start = time.perf_counter()
+        segments = segments or self.settings.AUDIT_CHAIN_VERIFY_WORKERS
+        database_url = database_url or self.settings.DATABASE_URL
+
+        async with self.session_factory() as session:
+            resumed_from = await self.load_checkpoint(session) if incremental else None
+            after = resumed_from.last_sequence_number if resumed_from else None
+            windows = await self.plan_segments(session, segments, after)
+
+        owns_executor = executor is None
+        executor = executor or ProcessPoolExecutor(max_workers=len(windows))
+        loop = asyncio.get_running_loop()
+        try:
+            segment_results = await asyncio.gather(*[
+                loop.run_in_executor(
+                    executor,
+                    verify_segment_worker,
+                    database_url,
+                    index,
+                    after,
+                    lower,
+                    upper,
+                    self.batch_size,
+                    self.max_reported_violations
+                )
+                for index, (lower, upper) in enumerate(windows)
+            ])
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+        result = ChainVerificationResult(verified=True, resumed_from=resumed_from, segments=len(windows))
+        head = resumed_from.last_log_hash if resumed_from else GENESIS_HASH
+        combined = SegmentResult(index=0)
+        for segment in sorted(segment_results, key=lambda s: s.index):
+            if segment.records_verified == 0:
+                continue
+            if segment.first_previous_hash != head:
+                result.violation_count += 1
+                result.violations.append({
+                    "segment": segment.index,
+                    "error": "broken_segment_link",
+                    "expected_previous": head,
+                    "actual_previous": segment.first_previous_hash
+                })
+            result.violation_count += segment.violation_count
+            result.violations.extend(segment.violations)
+            result.records_verified += segment.records_verified
+            head = segment.last_log_hash
+            combined.records_verified += segment.records_verified
+            combined.last_sequence_number = segment.last_sequence_number
+            combined.last_timestamp = segment.last_timestamp
+            combined.last_log_id = segment.last_log_id
+            combined.last_log_hash = segment.last_log_hash
+
+        result.violations = result.violations[:self.max_reported_violations]
+        result.verified = result.violation_count == 0
+        if result.verified and incremental:
+            result.checkpoint = self._advance(resumed_from, combined)
+            if result.checkpoint is not resumed_from:
+                async with self.session_factory() as session:
+                    await self._save_checkpoint(session, result.checkpoint)
+
+        result.duration_ms = int((time.perf_counter() - start) * 1000)
+        self._log_result(result)
+        return result
+
+    def _log_result(self, result: ChainVerificationResult) -> None:
+        if result.verified:
+            logger.info(
+                "Audit chain integrity verified",
+                chain_name=self.chain_name,
+                records_verified=result.records_verified,
+                resumed=result.resumed_from is not None,
+                segments=result.segments,
+                duration_ms=result.duration_ms
+            )
+        else:
+            logger.critical(
+                "AUDIT CHAIN INTEGRITY VIOLATION DETECTED",
+                chain_name=self.chain_name,
+                violation_count=result.violation_count,
+                violations=result.violations[:5]
+            )
@@ -0,0 +1,530 @@
+"""
+Columnar rollups for compliance reporting.
+
+Compliance reports only need counts grouped by a handful of dimensions, so
+instead of re-aggregating the live audit tables for every report, each
+settled day is rolled up once into a small Parquet file:
+
+- audit_logs: events per (hour, event_type, outcome, user_id, privileged
+  action, compliance tags)
+- phi_access_logs: accesses per (day, user_id, patient_id, access_type,
+  access_purpose, access_granted)
+
+A report over a period is assembled from cached month-level partials of
+those files, day files for partial months, and a live GROUP BY only for the
+edges of the period and any days not yet materialized; the report sections
+are then computed with vectorized Arrow aggregations. An annual report reads
+twelve cached partials plus at most one day of live rows.
+
+Rows arriving after their day was materialized are not reflected until the
+day is rebuilt with ``materialize_day``.
+"""
+
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database_unified import AuditLog, PHIAccessLog, get_session_factory
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pc = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+AUDIT_SOURCE = "audit_logs"
+PHI_ACCESS_SOURCE = "phi_access_logs"
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    """How one audit table is bucketed and grouped."""
+    name: str
+    model: Any
+    time_column: str
+    bucket: str            # "hour" or "day"
+    dimensions: Tuple[str, ...]
+    measure: str
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    AUDIT_SOURCE: RollupSource(
+        name=AUDIT_SOURCE,
+        model=AuditLog,
+        time_column="timestamp",
+        bucket="hour",
+        dimensions=("event_type", "outcome", "user_id", "privileged", "compliance_tags"),
+        measure="events"
+    ),
+    PHI_ACCESS_SOURCE: RollupSource(
+        name=PHI_ACCESS_SOURCE,
+        model=PHIAccessLog,
+        time_column="access_started_at",
+        bucket="day",
+        dimensions=("user_id", "patient_id", "access_type", "access_purpose", "access_granted"),
+        measure="accesses"
+    ),
+}
+
+_BOOLEAN_DIMENSIONS = {"privileged", "access_granted"}
+
+
+def _rollup_schema(source: RollupSource, with_bucket: bool = True) -> "pa.Schema":
+    fields = [("bucket", pa.timestamp("us"))] if with_bucket else []
+    for dimension in source.dimensions:
+        fields.append((dimension, pa.bool_() if dimension in _BOOLEAN_DIMENSIONS else pa.string()))
+    fields.append((source.measure, pa.int64()))
+    return pa.schema(fields)
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min)
+
+
+def _tags_key(tags: Optional[Sequence[str]]) -> Optional[str]:
+    # Delimited on both ends so a tag is matched with a substring search for ",TAG,"
+    return "," + ",".join(sorted(tags)) + "," if tags else None
+
+
+def _dimension_expression(source: RollupSource, dimension: str):
+    model = source.model
+    if dimension == "privileged":
+        return case((model.action.like("%privileged%"), True), else_=False).label(dimension)
+    return getattr(model, dimension).label(dimension)
+
+
+def _bucket_expression(source: RollupSource, dialect: str):
+    column = getattr(source.model, source.time_column)
+    if dialect == "postgresql":
+        if column.type.timezone:
+            column = func.timezone("UTC", column)
+        return func.date_trunc(source.bucket, column).label("bucket")
+    pattern = "%Y-%m-%d %H:00:00" if source.bucket == "hour" else "%Y-%m-%d 00:00:00"
+    return func.strftime(pattern, column).label("bucket")
+
+
+def _time_bound(source: RollupSource, value: datetime) -> datetime:
+    column = getattr(source.model, source.time_column)
+    return value.replace(tzinfo=timezone.utc) if column.type.timezone else value
+
+
+async def aggregate_window(
+    session: AsyncSession,
+    source: RollupSource,
+    start: datetime,
+    end: datetime
+) -> "pa.Table":
+    """
+    Roll up [start, end) of a live table in one GROUP BY query.
+
+    Args:
+        session: Database session
+        source: Table to aggregate
+        start: Inclusive lower bound (naive UTC)
+        end: Exclusive upper bound (naive UTC)
+
+    Returns:
+        Rollup rows with a bucket column
+    """
+    dialect = session.get_bind().dialect.name
+    time_column = getattr(source.model, source.time_column)
+    bucket = _bucket_expression(source, dialect)
+    dimensions = [_dimension_expression(source, dimension) for dimension in source.dimensions]
+    query = (
+        select(bucket, *dimensions, func.count().label(source.measure))
+        .where(and_(time_column >= _time_bound(source, start), time_column < _time_bound(source, end)))
+        .group_by(bucket, *dimensions)
+    )
+    rows = (await session.execute(query)).all()
+
+    columns: Dict[str, List[Any]] = {"bucket": [], source.measure: []}
+    for dimension in source.dimensions:
+        columns[dimension] = []
+    for row in rows:
+        mapping = row._mapping
+        bucket_value = mapping["bucket"]
+        if isinstance(bucket_value, str):
+            bucket_value = datetime.fromisoformat(bucket_value)
+        columns["bucket"].append(_to_utc_naive(bucket_value))
+        for dimension in source.dimensions:
+            value = mapping[dimension]
+            if dimension == "compliance_tags":
+                value = _tags_key(value)
+            elif dimension in _BOOLEAN_DIMENSIONS:
+                value = bool(value) if value is not None else None
+            elif value is not None:
+                value = str(value)
+            columns[dimension].append(value)
+        columns[source.measure].append(mapping[source.measure])
+    return pa.Table.from_pydict(columns, schema=_rollup_schema(source))
+
+
+def _collapse(source: RollupSource, table: "pa.Table") -> "pa.Table":
+    """Drop the time bucket and sum the measure per dimension combination."""
+    if table.num_rows == 0:
+        return _rollup_schema(source, with_bucket=False).empty_table()
+    grouped = table.group_by(list(source.dimensions), use_threads=True).aggregate([(source.measure, "sum")])
+    grouped = grouped.rename_columns([
+        source.measure if name == f"{source.measure}_sum" else name for name in grouped.column_names
+    ])
+    return grouped.select(list(source.dimensions) + [source.measure]).cast(_rollup_schema(source, with_bucket=False))
+
+
+class ComplianceRollupStore:
+    """Materializes daily rollup files and assembles report periods from them."""
+
+    def __init__(
+        self,
+        directory: str,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        settle_minutes: int = 60,
+        max_days_per_run: int = 31,
+        cache_size: int = 64
+    ):
+        """
+        Initialize the rollup store.
+
+        Args:
+            directory: Root directory for rollup Parquet files
+            session_factory: Async session factory for materialization
+            settle_minutes: Delay after midnight before a day is rolled up, for late audit writes
+            max_days_per_run: Days materialized per source in one materialize() call
+            cache_size: Month partials kept in memory
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for compliance rollups")
+        self.directory = Path(directory)
+        self._session_factory = session_factory
+        self.settle_minutes = settle_minutes
+        self.max_days_per_run = max_days_per_run
+        self.cache_size = cache_size
+
+        self._month_cache: "OrderedDict[Tuple[str, date], Tuple[Tuple, pa.Table]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"month_cache_hits": 0, "month_cache_misses": 0, "live_windows": 0, "days_materialized": 0}
+
+    async def _get_session_factory(self):
+        if self._session_factory is None:
+            self._session_factory = await get_session_factory()
+        return self._session_factory
+
+    def _day_path(self, source: RollupSource, day: date) -> Path:
+        return self.directory / source.name / f"{day.year:04d}" / f"{day.isoformat()}.parquet"
+
+    def materialized_days(self, source_name: str) -> List[date]:
+        """Days with a rollup file, in order."""
+        root = self.directory / source_name
+        if not root.exists():
+            return []
+        return sorted(date.fromisoformat(path.stem) for path in root.glob("*/*.parquet"))
+
+    # ------------------------------------------------------------------
+    # Materialization
+    # ------------------------------------------------------------------
+
+    def last_settled_day(self, now: Optional[datetime] = None) -> date:
+        """Latest day whose audit rows are considered complete."""
+        now = _to_utc_naive(now or datetime.now(timezone.utc))
+        return (now - timedelta(minutes=self.settle_minutes)).date() - timedelta(days=1)
+
+    async def materialize_day(self, source_name: str, day: date, session: Optional[AsyncSession] = None) -> int:
+        """(Re)build the rollup file for one day; returns its row count."""
+        source = ROLLUP_SOURCES[source_name]
+        if session is None:
+            session_factory = await self._get_session_factory()
+            async with session_factory() as session:
+                return await self.materialize_day(source_name, day, session)
+
+        table = await aggregate_window(session, source, _day_start(day), _day_start(day + timedelta(days=1)))
+        path = self._day_path(source, day)
+        await asyncio.to_thread(self._write_table, table, path)
+        self._invalidate_month(source_name, day.replace(day=1))
+        self.stats["days_materialized"] += 1
+        return table.num_rows
+
+    @staticmethod
+    def _write_table(table: "pa.Table", path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, str(temp_path), compression="zstd")
+        os.replace(temp_path, path)
+
+    async def materialize(self, now: Optional[datetime] = None) -> Dict[str, List[date]]:
+        """
+        Roll up settled days after each source's last materialized day.
+
+        Returns:
+            Days materialized per source
+        """
+        last_day = self.last_settled_day(now)
+        materialized: Dict[str, List[date]] = {}
+        session_factory = await self._get_session_factory()
+
+        for source in ROLLUP_SOURCES.values():
+            days = self.materialized_days(source.name)
+            async with session_factory() as session:
+                if days:
+                    next_day = days[-1] + timedelta(days=1)
+                else:
+                    oldest = await session.scalar(select(func.min(getattr(source.model, source.time_column))))
+                    if oldest is None:
+                        materialized[source.name] = []
+                        continue
+                    next_day = _to_utc_naive(oldest).date()
+
+                done = []
+                while next_day <= last_day and len(done) < self.max_days_per_run:
+                    await self.materialize_day(source.name, next_day, session)
+                    done.append(next_day)
+                    next_day += timedelta(days=1)
+            materialized[source.name] = done
+
+        logger.info(
+            "Compliance rollups materialized",
+            days={name: len(days) for name, days in materialized.items()},
+            last_settled_day=last_day.isoformat()
+        )
+        return materialized
+
+    # ------------------------------------------------------------------
+    # Loading report periods
+    # ------------------------------------------------------------------
+
+    def _invalidate_month(self, source_name: str, month: date) -> None:
+        with self._cache_lock:
+            self._month_cache.pop((source_name, month), None)
+
+    def _read_days(self, source: RollupSource, days: Sequence[date]) -> "pa.Table":
+        tables = [pq.read_table(str(self._day_path(source, day))) for day in days]
+        if not tables:
+            return _rollup_schema(source).empty_table()
+        return pa.concat_tables(tables)
+
+    def _load_month(self, source: RollupSource, month: date, days: Sequence[date]) -> "pa.Table":
+        """Collapsed rollup of a fully materialized month, cached until a day file changes."""
+        signature = tuple(self._day_path(source, day).stat().st_mtime_ns for day in days)
+        key = (source.name, month)
+        with self._cache_lock:
+            cached = self._month_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                self._month_cache.move_to_end(key)
+                self.stats["month_cache_hits"] += 1
+                return cached[1]
+
+        self.stats["month_cache_misses"] += 1
+        table = _collapse(source, self._read_days(source, days))
+        with self._cache_lock:
+            self._month_cache[key] = (signature, table)
+            while len(self._month_cache) > self.cache_size:
+                self._month_cache.popitem(last=False)
+        return table
+
+    async def load_period(
+        self,
+        session: AsyncSession,
+        source_name: str,
+        start: datetime,
+        end: datetime
+    ) -> "pa.Table":
+        """
+        Rollup of [start, end] (end inclusive) without a time bucket.
+
+        Fully covered, materialized months come from the month cache, other
+        materialized days from their files, and everything else (period edges,
+        days not yet materialized) from live GROUP BY queries.
+        """
+        source = ROLLUP_SOURCES[source_name]
+        start = _to_utc_naive(start)
+        end_exclusive = _to_utc_naive(end) + timedelta(microseconds=1)
+
+        first_day = start.date() if start == _day_start(start.date()) else start.date() + timedelta(days=1)
+        end_day = end_exclusive.date()  # exclusive
+        materialized = set(self.materialized_days(source.name))
+
+        tables: List[pa.Table] = []
+        live_windows: List[Tuple[datetime, datetime]] = []
+        if first_day >= end_day:
+            live_windows.append((start, end_exclusive))
+        else:
+            if start < _day_start(first_day):
+                live_windows.append((start, _day_start(first_day)))
+            if _day_start(end_day) < end_exclusive:
+                live_windows.append((_day_start(end_day), end_exclusive))
+
+            month_days: Dict[date, List[date]] = {}
+            day = first_day
+            while day < end_day:
+                month_days.setdefault(day.replace(day=1), []).append(day)
+                day += timedelta(days=1)
+
+            for month, days in month_days.items():
+                month_length = ((month.replace(day=28) + timedelta(days=4)).replace(day=1) - month).days
+                if len(days) == month_length and all(day in materialized for day in days):
+                    tables.append(await asyncio.to_thread(self._load_month, source, month, days))
+                    continue
+                stored = [day for day in days if day in materialized]
+                if stored:
+                    tables.append(_collapse(source, await asyncio.to_thread(self._read_days, source, stored)))
+                # Contiguous runs of days without a rollup file are aggregated live
+                run_start = None
+                for day in days + [None]:
+                    if day is not None and day not in materialized:
+                        run_start = run_start or day
+                    elif run_start is not None:
+                        run_end = day if day is not None else days[-1] + timedelta(days=1)
+                        live_windows.append((_day_start(run_start), _day_start(run_end)))
+                        run_start = None
+
+        for window_start, window_end in live_windows:
+            self.stats["live_windows"] += 1
+            tables.append(_collapse(source, await aggregate_window(session, source, window_start, window_end)))
+
+        if not tables:
+            return _rollup_schema(source, with_bucket=False).empty_table()
+        return _collapse(source, pa.concat_tables(tables))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cached_months": len(self._month_cache)}
+
+
+# ============================================
+# REPORT SECTIONS
+# ============================================
+
+def _sum(table: "pa.Table", column: str) -> int:
+    return int(pc.sum(table[column]).as_py() or 0) if table.num_rows else 0
+
+
+def _distribution(table: "pa.Table", key: str, measure: str) -> Dict[Any, int]:
+    if table.num_rows == 0:
+        return {}
+    grouped = table.group_by(key).aggregate([(measure, "sum")])
+    return dict(zip(grouped[key].to_pylist(), grouped[f"{measure}_sum"].to_pylist()))
+
+
+def _where(table: "pa.Table", **equals: Any) -> "pa.Table":
+    mask = None
+    for column, value in equals.items():
+        condition = pc.equal(table[column], value)
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return table.filter(mask) if mask is not None else table
+
+
+def filter_soc2_categories(table: "pa.Table", categories: Sequence[str]) -> "pa.Table":
+    """Keep rows tagged with any of the given compliance categories."""
+    if not categories or table.num_rows == 0:
+        return table
+    tags = pc.fill_null(table["compliance_tags"], "")
+    mask = None
+    for category in categories:
+        condition = pc.match_substring(tags, f",{category},")
+        mask = condition if mask is None else pc.or_(mask, condition)
+    return table.filter(mask)
+
+
+def soc2_report_sections(table: "pa.Table") -> Dict[str, Any]:
+    """
+    Compute SOC2 report sections from an audit_logs rollup.
+
+    Returns:
+        Dict with total_events, summary, findings and metrics, matching the
+        sections SOC2AuditService builds from live queries
+    """
+    measure = ROLLUP_SOURCES[AUDIT_SOURCE].measure
+    event_types = _distribution(table, "event_type", measure)
+    outcomes = _distribution(table, "outcome", measure)
+
+    findings = []
+    failed_logins = _distribution(_where(table, event_type="UserLoginEvent", outcome="failure"), "user_id", measure)
+    for user_id, count in failed_logins.items():
+        if count > 5:
+            findings.append({
+                "type": "excessive_failed_logins",
+                "severity": "medium",
+                "description": f"User {user_id} had {count} failed login attempts",
+                "user_id": user_id,
+                "count": count
+            })
+    privileged = _distribution(_where(table, privileged=True), "user_id", measure)
+    for user_id, count in privileged.items():
+        if count > 10:
+            findings.append({
+                "type": "frequent_privileged_access",
+                "severity": "low",
+                "description": f"User {user_id} performed {count} privileged operations",
+                "user_id": user_id,
+                "count": count
+            })
+
+    auth_success = _sum(_where(table, event_type="UserLoginEvent", outcome="success"), measure)
+    auth_failure = sum(failed_logins.values())
+    total_auth = auth_success + auth_failure
+    return {
+        "total_events": _sum(table, measure),
+        "summary": {
+            "event_type_distribution": event_types,
+            "outcome_distribution": outcomes,
+            "security_events": event_types.get("SecurityViolationEvent", 0),
+            "failed_operations": outcomes.get("failure", 0) + outcomes.get("error", 0)
+        },
+        "findings": findings,
+        "metrics": {
+            "authentication_success_rate": round(auth_success / total_auth * 100, 2) if total_auth else 0,
+            "total_authentication_attempts": total_auth,
+            "security_violations": event_types.get("SecurityViolationEvent", 0),
+            "data_access_events": event_types.get("DataAccessEvent", 0)
+        }
+    }
+
+
+def phi_access_statistics(table: "pa.Table") -> Dict[str, Any]:
+    """Compute HIPAA PHI access statistics from a phi_access_logs rollup."""
+    measure = ROLLUP_SOURCES[PHI_ACCESS_SOURCE].measure
+    return {
+        "total_accesses": _sum(table, measure),
+        "by_access_type": _distribution(table, "access_type", measure),
+        "by_purpose": _distribution(table, "access_purpose", measure),
+        "unique_users": pc.count_distinct(table["user_id"]).as_py() if table.num_rows else 0,
+        "unique_patients": pc.count_distinct(table["patient_id"]).as_py() if table.num_rows else 0,
+        "denied_accesses": _sum(_where(table, access_granted=False), measure)
+    }
+
+
+_rollup_store: Optional[ComplianceRollupStore] = None
+
+
+def get_compliance_rollup_store() -> Optional[ComplianceRollupStore]:
+    """Shared rollup store, or None when rollups are disabled or pyarrow is missing."""
+    global _rollup_store
+    settings = get_settings()
+    if not settings.COMPLIANCE_ROLLUPS_ENABLED or not PYARROW_AVAILABLE:
+        return None
+    if _rollup_store is None:
+        _rollup_store = ComplianceRollupStore(
+            settings.COMPLIANCE_ROLLUP_DIR,
+            settle_minutes=settings.COMPLIANCE_ROLLUP_SETTLE_MINUTES
+        )
+    return _rollup_store
@@ -0,0 +1,429 @@
+"""
+Monthly range partitioning for audit tables.
+
+audit_logs and phi_access_logs are partitioned by month on their event time
+so that queries bounded by time only touch the months they need and old
+months can be archived as a unit:
+
+- ``AuditPartitionManager.ensure_partitions`` creates upcoming monthly
+  partitions ahead of time; a DEFAULT partition catches anything outside them
+- ``AuditPartitionManager.archive_month`` detaches a month, streams it to a
+  zstd-compressed Parquet file (optionally uploaded to the data lake) and
+  drops it - a metadata operation plus one sequential read, instead of
+  row-by-row INSERT ... SELECT / DELETE and the vacuum churn that follows
+
+Partition management is PostgreSQL-only; on other dialects the tables are
+plain tables and the manager is a no-op.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+from sqlalchemy import Boolean, DateTime, Integer, MetaData, Table, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database_unified import AuditLog, PHIAccessLog, get_session_factory, mark_primary_write
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_AVAILABLE = False
+
+logger = structlog.get_logger()
+
+# Partitioned audit tables and their monthly partition key columns
+PARTITIONED_TABLES: Dict[str, Table] = {
+    "audit_logs": AuditLog.__table__,
+    "phi_access_logs": PHIAccessLog.__table__,
+}
+PARTITION_KEYS: Dict[str, str] = {
+    "audit_logs": "timestamp",
+    "phi_access_logs": "access_started_at",
+}
+
+ArchiveUploader = Callable[[Path, str], Awaitable[Any]]
+
+
+def month_floor(value: date) -> date:
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a first-of-month date by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    """Name of the monthly partition of table_name holding month."""
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+def default_partition_name(table_name: str) -> str:
+    return f"{table_name}_default"
+
+
+def _month_bound(month: date) -> str:
+    # The offset is ignored for timestamp columns and pins timestamptz ones to UTC
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def create_partition_sql(table_name: str, month: date) -> str:
+    """DDL creating the partition of table_name for one month."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table_name, month)}" '
+        f'PARTITION OF "{table_name}" '
+        f"FOR VALUES FROM ({_month_bound(month)}) TO ({_month_bound(add_months(month, 1))})"
+    )
+
+
+def create_default_partition_sql(table_name: str) -> str:
+    """DDL creating the catch-all DEFAULT partition of table_name."""
+    return f'CREATE TABLE IF NOT EXISTS "{default_partition_name(table_name)}" PARTITION OF "{table_name}" DEFAULT'
+
+
+@dataclass
+class PartitionInfo:
+    """One attached partition of a partitioned audit table."""
+    table_name: str
+    name: str
+    month: Optional[date]
+    is_default: bool
+    estimated_rows: int
+
+
+@dataclass
+class PartitionArchiveResult:
+    """Outcome of archiving one monthly partition."""
+    table_name: str
+    partition: str
+    month: date
+    rows: int
+    file_path: str
+    file_bytes: int
+    sha256: str
+    object_name: Optional[str]
+    dropped: bool
+    duration_seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["month"] = self.month.isoformat()
+        return result
+
+
+def _parse_partition_month(table_name: str, name: str) -> Optional[date]:
+    suffix = name[len(table_name):]
+    if not suffix.startswith("_y") or len(suffix) != 9 or suffix[6] != "m":
+        return None
+    try:
+        return date(int(suffix[2:6]), int(suffix[7:9]), 1)
+    except ValueError:
+        return None
+
+
+def _arrow_type(column) -> Any:
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column.type.timezone else None)
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    # UUIDs, enums, JSON, arrays and text are archived as strings
+    return pa.string()
+
+
+def _arrow_value(value: Any, arrow_type: Any) -> Any:
+    if value is None or arrow_type != pa.string():
+        return value
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return str(value)
+
+
+class AuditPartitionManager:
+    """Creates, lists and archives monthly partitions of the audit tables."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        months_ahead: int = 3,
+        archive_directory: str = "data/audit_archive",
+        uploader: Optional[ArchiveUploader] = None,
+        export_batch_size: int = 50000,
+        lock_timeout_ms: int = 5000
+    ):
+        """
+        Initialize the partition manager.
+
+        Args:
+            session_factory: Async session factory (defaults to the primary database)
+            months_ahead: Future monthly partitions kept in place
+            archive_directory: Local directory Parquet archives are written to
+            uploader: Optional coroutine uploading an archive file under an object name
+            export_batch_size: Rows per Parquet row group
+            lock_timeout_ms: Lock wait limit for DETACH so archiving never queues writers
+        """
+        self._session_factory = session_factory
+        self.months_ahead = months_ahead
+        self.archive_directory = Path(archive_directory)
+        self.uploader = uploader
+        self.export_batch_size = export_batch_size
+        self.lock_timeout_ms = lock_timeout_ms
+
+    async def _get_session_factory(self):
+        if self._session_factory is None:
+            self._session_factory = await get_session_factory()
+        return self._session_factory
+
+    @staticmethod
+    async def _is_partitioned(session: AsyncSession, table_name: str) -> bool:
+        if session.get_bind().dialect.name != "postgresql":
+            return False
+        result = await session.execute(
+            text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table_name)"),
+            {"table_name": table_name}
+        )
+        return result.scalar() is not None
+
+    async def ensure_partitions(
+        self,
+        start_month: Optional[date] = None,
+        months_ahead: Optional[int] = None
+    ) -> List[str]:
+        """
+        Create monthly partitions from start_month through months_ahead months later.
+
+        Args:
+            start_month: First month to cover (defaults to the current month)
+            months_ahead: Override for the number of future months
+
+        Returns:
+            Names of partitions that did not exist before
+        """
+        start = month_floor(start_month or datetime.now(timezone.utc).date())
+        months = [add_months(start, i) for i in range((self.months_ahead if months_ahead is None else months_ahead) + 1)]
+        created: List[str] = []
+
+        session_factory = await self._get_session_factory()
+        async with session_factory() as session:
+            for table_name in PARTITIONED_TABLES:
+                if not await self._is_partitioned(session, table_name):
+                    logger.debug("Audit table is not partitioned, skipping", table=table_name)
+                    continue
+                existing = {info.name for info in await self.list_partitions(table_name, session)}
+                await session.execute(text(create_default_partition_sql(table_name)))
+                for month in months:
+                    name = partition_name(table_name, month)
+                    if name in existing:
+                        continue
+                    # Fails if the DEFAULT partition already holds rows for this month
+                    await session.execute(text(create_partition_sql(table_name, month)))
+                    created.append(name)
+            await session.commit()
+        mark_primary_write()
+
+        if created:
+            logger.info("Created audit partitions", partitions=created)
+        return created
+
+    async def list_partitions(
+        self,
+        table_name: str,
+        session: Optional[AsyncSession] = None
+    ) -> List[PartitionInfo]:
+        """List attached partitions of an audit table, oldest month first."""
+        if session is None:
+            session_factory = await self._get_session_factory()
+            async with session_factory() as session:
+                return await self.list_partitions(table_name, session)
+
+        if session.get_bind().dialect.name != "postgresql":
+            return []
+        result = await session.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT', "
+                "GREATEST(c.reltuples, 0)::bigint "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table_name)"
+            ),
+            {"table_name": table_name}
+        )
+        partitions = [
+            PartitionInfo(table_name, name, _parse_partition_month(table_name, name), bool(is_default), int(rows))
+            for name, is_default, rows in result.all()
+        ]
+        return sorted(partitions, key=lambda info: (info.month is None, info.month or date.min))
+
+    async def archive_before(self, cutoff: date, drop: bool = True) -> List[PartitionArchiveResult]:
+        """Archive every monthly partition that ends on or before cutoff's month."""
+        boundary = month_floor(cutoff)
+        results = []
+        for table_name in PARTITIONED_TABLES:
+            for info in await self.list_partitions(table_name):
+                if info.month is not None and add_months(info.month, 1) <= boundary:
+                    results.append(await self.archive_month(table_name, info.month, drop=drop))
+        return results
+
+    async def archive_month(self, table_name: str, month: date, drop: bool = True) -> PartitionArchiveResult:
+        """
+        Detach one monthly partition, export it to Parquet and drop it.
+
+        If the export or upload fails the partition is re-attached, so its
+        rows stay queryable and the archive can simply be retried.
+
+        Args:
+            table_name: Partitioned audit table
+            month: Month to archive
+            drop: Drop the detached table once its archive is written
+
+        Returns:
+            Archive file details and row count
+        """
+        if table_name not in PARTITIONED_TABLES:
+            raise ValueError(f"{table_name} is not a partitioned audit table")
+        month = month_floor(month)
+        name = partition_name(table_name, month)
+        start = time.perf_counter()
+
+        session_factory = await self._get_session_factory()
+        async with session_factory() as session:
+            await session.execute(text(f"SET LOCAL lock_timeout = {int(self.lock_timeout_ms)}"))
+            await session.execute(text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{name}"'))
+            await session.commit()
+        mark_primary_write()
+        logger.info("Detached audit partition", table=table_name, partition=name)
+
+        try:
+            rows, file_path, digest = await self._export_parquet(table_name, name, month)
+            object_name = None
+            if self.uploader is not None:
+                object_name = f"{table_name}/{month.year:04d}/{file_path.name}"
+                await self.uploader(file_path, object_name)
+        except Exception as e:
+            logger.error("Audit partition export failed, re-attaching", partition=name, error=str(e))
+            async with session_factory() as session:
+                await session.execute(text(
+                    f'ALTER TABLE "{table_name}" ATTACH PARTITION "{name}" '
+                    f"FOR VALUES FROM ({_month_bound(month)}) TO ({_month_bound(add_months(month, 1))})"
+                ))
+                await session.commit()
+            raise
+
+        if drop:
+            async with session_factory() as session:
+                await session.execute(text(f'DROP TABLE "{name}"'))
+                await session.commit()
+
+        result = PartitionArchiveResult(
+            table_name=table_name,
+            partition=name,
+            month=month,
+            rows=rows,
+            file_path=str(file_path),
+            file_bytes=file_path.stat().st_size,
+            sha256=digest,
+            object_name=object_name,
+            dropped=drop,
+            duration_seconds=time.perf_counter() - start
+        )
+        logger.info("Archived audit partition", **result.to_dict())
+        return result
+
+    async def _export_parquet(self, table_name: str, name: str, month: date):
+        """Stream a detached partition into a Parquet file; returns rows, path and SHA-256."""
+        if not PARQUET_AVAILABLE:
+            raise RuntimeError("pyarrow is required to archive audit partitions")
+
+        # The detached partition keeps the parent's columns; reuse their types for result processing
+        partition = PARTITIONED_TABLES[table_name].to_metadata(MetaData(), name=name)
+        schema = pa.schema([(column.name, _arrow_type(column)) for column in partition.columns])
+        query = select(partition).order_by(partition.c[PARTITION_KEYS[table_name]], partition.c.id)
+
+        directory = self.archive_directory / table_name / f"{month.year:04d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        file_path = directory / f"{name}.parquet"
+        temp_path = file_path.with_suffix(".parquet.tmp")
+
+        rows = 0
+        session_factory = await self._get_session_factory()
+        writer = pq.ParquetWriter(str(temp_path), schema, compression="zstd")
+        try:
+            async with session_factory() as session:
+                result = await session.stream(query.execution_options(yield_per=self.export_batch_size))
+                async for chunk in result.partitions():
+                    batch = {
+                        field.name: [_arrow_value(row[index], field.type) for row in chunk]
+                        for index, field in enumerate(schema)
+                    }
+                    await asyncio.to_thread(writer.write_table, pa.Table.from_pydict(batch, schema=schema))
+                    rows += len(chunk)
+        finally:
+            writer.close()
+
+        digest = await asyncio.to_thread(self._finalize_archive, temp_path, file_path, rows, name, month)
+        return rows, file_path, digest
+
+    @staticmethod
+    def _finalize_archive(temp_path: Path, file_path: Path, rows: int, name: str, month: date) -> str:
+        if pq.ParquetFile(str(temp_path)).metadata.num_rows != rows:
+            raise RuntimeError(f"Parquet archive of {name} does not contain {rows} rows")
+
+        sha256 = hashlib.sha256()
+        with open(temp_path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                sha256.update(chunk)
+            os.fsync(handle.fileno())
+        os.replace(temp_path, file_path)
+
+        manifest = {
+            "partition": name,
+            "month": month.isoformat(),
+            "rows": rows,
+            "sha256": sha256.hexdigest(),
+            "archive_id": str(uuid.uuid4()),
+            "archived_at": datetime.now(timezone.utc).isoformat()
+        }
+        file_path.with_suffix(".manifest.json").write_text(json.dumps(manifest, indent=2))
+        return sha256.hexdigest()
+
+
+def get_audit_partition_manager(session_factory: Optional[Callable[[], AsyncSession]] = None) -> AuditPartitionManager:
+    """Build a partition manager from settings, uploading archives to the data lake if enabled."""
+    settings = get_settings()
+    uploader = None
+    if settings.AUDIT_ARCHIVE_UPLOAD_TO_DATA_LAKE:
+        from app.modules.data_lake import MLDataLakePipeline
+
+        pipeline = MLDataLakePipeline()
+
+        async def uploader(file_path: Path, object_name: str) -> None:
+            if not await pipeline.upload_audit_archive(file_path, object_name):
+                raise RuntimeError(f"Data lake upload of {object_name} failed")
+
+    return AuditPartitionManager(
+        session_factory=session_factory,
+        months_ahead=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+        archive_directory=settings.AUDIT_ARCHIVE_DIR,
+        uploader=uploader
+    )
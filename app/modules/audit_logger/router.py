@@ -4,9 +4,12 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 import structlog
 
-from app.core.database_unified import get_db
+from app.core.database_unified import get_db, get_db_readonly
+from app.core.pagination import CountMode, InvalidCursorError
+from app.core.query_fanout import FanOutQuery, fan_out
 from app.core.security import get_current_user_id, require_role, get_client_info
 from app.modules.audit_logger.service import get_audit_service
+from app.modules.audit_logger.siem_export import SIEMDeliveryError
 from app.modules.audit_logger.schemas import (
     AuditLogQuery, ComplianceReport, AuditLogIntegrityReport,
     SOC2Category, UserLoginEvent, DataAccessEvent, SecurityViolationEvent
@@ -46,70 +49,68 @@ async def get_enhanced_activities(
     severity: Optional[str] = Query(None, description="Filter by severity: critical, high, medium, low"),
     hours: int = Query(24, ge=1, le=168, description="Time range in hours"),
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
     _: dict = Depends(require_role("admin"))
 ):
     """Get enhanced security and audit activities for SOC2 dashboard."""
-    try:
-        from app.modules.audit_logger.enhanced_audit_service import enhanced_audit_service
-        
-        # Get enhanced activities
-        activities = await enhanced_audit_service.get_enhanced_activities(
-            db=db,
-            limit=limit,
-            category=category,
-            severity=severity,
-            hours=hours
-        )
-        
-        # Get security summary
-        summary = await enhanced_audit_service.get_security_summary(db=db, hours=hours)
-        
-        logger.info(
-            "Enhanced activities retrieved",
-            user_id=current_user_id,
-            count=len(activities),
-            category=category,
-            severity=severity,
-            hours=hours
-        )
-        
-        return {
-            "activities": activities,
-            "summary": summary,
-            "filters_applied": {
-                "category": category,
-                "severity": severity,
-                "hours": hours,
-                "limit": limit
-            }
-        }
-        
-    except Exception as e:
-        logger.error("Failed to get enhanced activities", error=str(e))
-        # Return mock data if service fails
-        from app.modules.audit_logger.mock_enhanced_data import generate_mock_enhanced_activities, generate_mock_security_summary
-        
-        mock_activities = generate_mock_enhanced_activities(limit)
+    from app.modules.audit_logger.enhanced_audit_service import enhanced_audit_service
+    from app.modules.audit_logger.mock_enhanced_data import generate_mock_enhanced_activities, generate_mock_security_summary
+    
+    async def mock_activities(error):
+        return generate_mock_enhanced_activities(limit)
+    
+    async def mock_summary(error):
         mock_summary = generate_mock_security_summary()
         mock_summary['time_range_hours'] = hours
-        
-        return {
-            "activities": mock_activities,
-            "summary": mock_summary,
-            "filters_applied": {
-                "category": category,
-                "severity": severity,
-                "hours": hours,
-                "limit": limit
-            }
+        return mock_summary
+    
+    # Activities and summary are independent: read them concurrently on their own sessions,
+    # falling back to mock data per section if one fails
+    gathered = await fan_out([
+        FanOutQuery(
+            "activities",
+            lambda session: enhanced_audit_service.get_enhanced_activities(
+                db=session,
+                limit=limit,
+                category=category,
+                severity=severity,
+                hours=hours
+            ),
+            fallback=mock_activities
+        ),
+        FanOutQuery(
+            "summary",
+            lambda session: enhanced_audit_service.get_security_summary(db=session, hours=hours),
+            fallback=mock_summary
+        )
+    ])
+    activities = gathered["activities"]
+    
+    logger.info(
+        "Enhanced activities retrieved",
+        user_id=current_user_id,
+        count=len(activities),
+        category=category,
+        severity=severity,
+        hours=hours,
+        fallbacks=gathered.errors
+    )
+    
+    return {
+        "activities": activities,
+        "summary": gathered["summary"],
+        "filters_applied": {
+            "category": category,
+            "severity": severity,
+            "hours": hours,
+            "limit": limit
         }
+    }
 
 @router.get("/recent-activities")
 async def get_recent_activities(
     limit: int = Query(10, ge=1, le=50),
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     _: dict = Depends(require_role("admin"))
 ):
     """Get recent audit activities for dashboard (admin only)."""
@@ -215,7 +216,7 @@ async def get_recent_activities(
 @router.get("/stats")
 async def get_audit_stats(
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     _: dict = Depends(require_role("admin"))
 ):
     """Get audit logging statistics (admin only)."""
@@ -251,7 +252,7 @@ async def get_audit_stats(
 async def query_audit_logs(
     query: AuditLogQuery,
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     _: dict = Depends(require_role("auditor"))
 ):
     """Query audit logs with comprehensive filtering."""
@@ -287,6 +288,8 @@ async def query_audit_logs(
         
         return result
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error("Audit log query failed", error=str(e), user_id=current_user_id)
         raise HTTPException(status_code=500, detail="Failed to query audit logs")
@@ -299,9 +302,11 @@ async def get_audit_logs(
     event_type: Optional[str] = Query(None, description="Event type filter"),
     outcome: Optional[str] = Query(None, description="Outcome filter"),
     limit: int = Query(default=100, le=1000, description="Result limit"),
-    offset: int = Query(default=0, description="Result offset"),
+    offset: int = Query(default=0, description="Result offset (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's query_info.next_cursor"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count mode: exact, estimated or none"),
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     _: dict = Depends(require_role("auditor"))
 ):
     """Get audit logs with basic filtering (backwards compatibility)."""
@@ -316,7 +321,9 @@ async def get_audit_logs(
             event_types=[event_type] if event_type else None,
             outcomes=[outcome] if outcome else None,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor,
+            count_mode=count
         )
         
         logger.info("Getting audit service...")
@@ -341,6 +348,8 @@ async def get_audit_logs(
         
         return result
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error("Failed to get audit logs", error=str(e), user_id=current_user_id)
         # Return mock data if service fails to ensure 100% uptime
@@ -617,23 +626,24 @@ async def export_to_siem(
         
         await audit_service.log_audit_event(export_event)
         
-        # Perform export (placeholder implementation)
-        result = {
-            "config_name": config_name,
-            "export_id": f"export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-            "events_exported": 0,
-            "export_time": datetime.utcnow(),
-            "status": "completed",
-            "message": "SIEM export functionality not yet implemented"
-        }
+        # Stream from the configuration's high-water mark
+        result = await audit_service.export_to_siem(config_name, start_date, end_date)
+        result["export_id"] = f"export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        result["status"] = "completed" if result["caught_up"] else "partial"
         
-        logger.info("SIEM export initiated",
+        logger.info("SIEM export completed",
                    config_name=config_name,
                    user_id=current_user_id,
-                   export_id=result["export_id"])
+                   export_id=result["export_id"],
+                   events_exported=result["events_exported"])
         
         return result
         
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except SIEMDeliveryError as e:
+        logger.error("SIEM delivery failed", error=str(e), config_name=config_name)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="SIEM destination rejected the export")
     except Exception as e:
         logger.error("SIEM export failed", error=str(e), config_name=config_name)
         raise HTTPException(status_code=500, detail="Failed to export to SIEM")
@@ -17,8 +17,10 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List, Union
 from enum import Enum
 import ipaddress
+import json
 
 from app.core.event_bus_advanced import BaseEvent, EventPriority
+from app.core.pagination import CountMode
 
 # ============================================
 # SOC2 AUDIT EVENT CATEGORIES
@@ -369,6 +371,8 @@ class AuditLogQuery(BaseModel):
     offset: int = Field(default=0, description="Result offset")
     sort_by: str = Field(default="timestamp", description="Sort field")
     sort_order: str = Field(default="desc", description="Sort order")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from the previous page (timestamp sort only)")
+    count_mode: CountMode = Field(default=CountMode.EXACT, description="Total count mode: exact, estimated or none")
     
     # Export options
     export_format: Optional[str] = Field(None, description="Export format")
@@ -449,11 +453,39 @@ class SIEMEvent(BaseModel):
     raw_event: Optional[Dict[str, Any]] = Field(None, description="Original event data")
     
     def to_cef(self) -> str:
-        """Convert to CEF format."""
-        header = f"{self.version}|{self.device_vendor}|{self.device_product}|{self.device_version}|{self.signature_id}|{self.name}|{self.severity}"
+        """Convert to a single-line CEF record (header and extension values escaped)."""
+        header = "|".join(_cef_header(str(value)) for value in (
+            self.version, self.device_vendor, self.device_product, self.device_version,
+            self.signature_id, self.name, self.severity
+        ))
         
         if self.extensions:
-            ext_string = " ".join(f"{k}={v}" for k, v in self.extensions.items())
+            ext_string = " ".join(f"{k}={_cef_extension(str(v))}" for k, v in self.extensions.items())
             return f"{header}|{ext_string}"
         
-        return header
\ No newline at end of file
+        return header
+    
+    def to_leef(self) -> str:
+        """Convert to a single-line LEEF 1.0 record (tab-delimited attributes)."""
+        header = "|".join(_cef_header(str(value)) for value in (
+            "LEEF:1.0", self.device_vendor, self.device_product, self.device_version, self.signature_id
+        ))
+        attributes = {"sev": self.severity, "name": self.name, **self.extensions}
+        return f"{header}|" + "\t".join(f"{k}={_leef_attribute(str(v))}" for k, v in attributes.items())
+    
+    def to_json(self) -> str:
+        """Convert to a single-line JSON record."""
+        return json.dumps(self.model_dump(), default=str, separators=(",", ":"))
+
+
+def _cef_header(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("|", "\\|").replace("\r", " ").replace("\n", " ")
+
+
+def _cef_extension(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace("=", "\\=")
+            .replace("\r", "\\r").replace("\n", "\\n"))
+
+
+def _leef_attribute(value: str) -> str:
+    return value.replace("\t", " ").replace("\r", " ").replace("\n", " ")
\ No newline at end of file
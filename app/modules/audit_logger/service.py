@@ -19,10 +19,9 @@ import hashlib
 import secrets
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from typing import Dict, List, Optional, Any, AsyncGenerator, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, insert, update, delete, and_, or_, func, text
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 import structlog
 from collections import defaultdict
 
@@ -30,15 +29,26 @@ from app.core.config import get_settings
 from app.core.database_unified import get_db, AuditLog
 from app.core.security import security_manager
 from app.core.database_connection_manager import DatabaseConnectionManager
+from app.core.pagination import InvalidCursorError, fetch_keyset_page, resolve_total_count
 from app.core.event_bus_advanced import (
     EventHandler, TypedEventHandler, BaseEvent
 )
 from app.core.events.event_bus import get_event_bus
+from app.modules.audit_logger.chain_verification import AuditChainVerifier, append_audit_rows
+from app.modules.audit_logger.compliance_rollups import (
+    AUDIT_SOURCE,
+    filter_soc2_categories,
+    get_compliance_rollup_store,
+    soc2_report_sections,
+)
 from app.modules.audit_logger.schemas import (
     AuditEvent, SOC2Category, ComplianceReport, AuditLogQuery,
     AuditLogIntegrityReport, SIEMExportConfig, SIEMEvent,
     UserLoginEvent, DataAccessEvent, SecurityViolationEvent
 )
+from app.modules.audit_logger.siem_export import (
+    StreamingSIEMExporter, audit_row_to_siem_event, create_siem_sink
+)
 
 logger = structlog.get_logger()
 
@@ -46,6 +56,17 @@ logger = structlog.get_logger()
 HASH_ALGORITHM = "sha256"
 CHAIN_VERIFICATION_INTERVAL = 100  # Verify chain every N records
 
+
+def _as_uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse an identifier for a UUID column; None when it is not a UUID."""
+    if not value:
+        return None
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
 # ============================================
 # IMMUTABLE AUDIT LOG HANDLER
 # ============================================
@@ -67,9 +88,6 @@ class ImmutableAuditLogHandler(TypedEventHandler):
         self.pending_events = []
         self.last_batch_time = datetime.now(timezone.utc)
         
-        # Integrity chain
-        self.last_log_hash: Optional[str] = None
-        
     async def handle(self, event: BaseEvent) -> bool:
         """Handle audit event with batching for performance."""
         if not isinstance(event, AuditEvent):
@@ -109,33 +127,16 @@ class ImmutableAuditLogHandler(TypedEventHandler):
         
         for attempt in range(max_retries):
             try:
-                # Use connection manager for proper session handling
-                async with self.connection_manager.get_serializable_session() as session:
-                    # Get last log hash for integrity chain
-                    if self.last_log_hash is None:
-                        result = await session.execute(
-                            select(AuditLog.log_hash)
-                            .order_by(AuditLog.timestamp.desc())
-                            .limit(1)
-                        )
-                        row = result.first()
-                        self.last_log_hash = row.log_hash if row else "GENESIS_BLOCK_HASH"
-                    
+                async with self.db_session_factory() as session:
                     # Process each event in batch
                     audit_logs = []
                     for event in batch:
                         audit_log_data = await self._create_audit_log_entry(event)
                         audit_logs.append(audit_log_data)
                     
-                    # Bulk insert with proper transaction handling
-                    if audit_logs:
-                        await session.execute(
-                            pg_insert(AuditLog).values(audit_logs)
-                        )
-                        await session.commit()
-                        
-                        # Update last hash
-                        self.last_log_hash = audit_logs[-1]["log_hash"]
+                    # Chain onto the stored head under the chain lock and insert
+                    await append_audit_rows(session, audit_logs)
+                    await session.commit()
                     
                     logger.info("Audit batch processed", 
                                batch_size=len(batch), 
@@ -159,155 +160,86 @@ class ImmutableAuditLogHandler(TypedEventHandler):
                     self.pending_events.extend(batch)
     
     async def _create_audit_log_entry(self, event: AuditEvent) -> Dict[str, Any]:
-        """Create tamper-proof audit log entry with cryptographic hash chaining."""
-        timestamp = datetime.utcnow()
-        
-        # Create the core audit data
-        audit_data = {
-            "id": str(uuid.uuid4()),
-            "event_id": event.event_id,
-            "timestamp": timestamp,
+        """
+        Map an audit event onto audit_logs columns.
+        
+        Only real columns are returned; append_audit_rows adds the chain
+        fields. Fields specific to the event class are kept, JSON-encoded, in
+        config_metadata, along with the event id and any identifier that is
+        not a UUID.
+        """
+        event_data = event.model_dump(mode="json", exclude=set(AuditEvent.model_fields))
+        event_data["event_id"] = event.event_id
+        resource_id = _as_uuid(event.resource_id)
+        if event.resource_id and resource_id is None:
+            event_data["resource_id"] = event.resource_id
+        session_id = _as_uuid(event.session_id)
+        if event.session_id and session_id is None:
+            event_data["session_id"] = event.session_id
+        
+        return {
+            "id": uuid.uuid4(),
+            "timestamp": datetime.utcnow(),
             "event_type": event.event_type,
+            "aggregate_id": event.aggregate_id,
+            "aggregate_type": event.aggregate_type,
+            "publisher": event.publisher,
+            "soc2_category": event.soc2_category.value,
             "user_id": event.user_id,
-            "session_id": event.session_id,
-            "action": event.action,
+            "session_id": session_id,
+            "correlation_id": _as_uuid(event.correlation_id),
+            "action": event.operation,
             "resource_type": event.resource_type,
-            "resource_id": event.resource_id,
+            "resource_id": resource_id,
             "outcome": event.outcome,
-            "event_data": event.event_data or {},
             "ip_address": event.ip_address,
             "user_agent": event.user_agent,
-            "previous_hash": self.last_log_hash
-        }
-        
-        # Create the payload for hashing (exclude hash fields)
-        hashable_data = {
-            "event_id": audit_data["event_id"],
-            "timestamp": audit_data["timestamp"].isoformat(),
-            "event_type": audit_data["event_type"],
-            "user_id": audit_data["user_id"],
-            "action": audit_data["action"],
-            "resource_type": audit_data["resource_type"],
-            "resource_id": audit_data["resource_id"],
-            "outcome": audit_data["outcome"],
-            "event_data": json.dumps(audit_data["event_data"], sort_keys=True),
-            "previous_hash": audit_data["previous_hash"]
+            "error_message": event.error_message,
+            "compliance_tags": event.compliance_tags or None,
+            "config_metadata": event_data
         }
-        
-        # Create cryptographic hash
-        payload_string = json.dumps(hashable_data, sort_keys=True)
-        log_hash = hashlib.sha256(payload_string.encode('utf-8')).hexdigest()
-        
-        # Add hash to audit data
-        audit_data["log_hash"] = log_hash
-        audit_data["hash_algorithm"] = HASH_ALGORITHM
-        audit_data["chain_verified"] = True  # Will be verified later
-        
-        return audit_data
     
-    async def verify_audit_chain(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> bool:
+    async def verify_audit_chain(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        incremental: bool = True
+    ) -> bool:
         """
         Verify the cryptographic integrity of the audit chain.
         
+        Rows are streamed rather than loaded; whole-chain runs only verify
+        rows appended since the last signed checkpoint.
+        
         Returns True if chain is intact, False if tampering is detected.
         """
-        async with self.db_session_factory() as session:
-            try:
-                # Build query for audit logs to verify
-                query = select(AuditLog).order_by(AuditLog.timestamp.asc())
-                
-                if start_date:
-                    query = query.where(AuditLog.timestamp >= start_date)
-                if end_date:
-                    query = query.where(AuditLog.timestamp <= end_date)
-                
-                result = await session.execute(query)
-                audit_logs = result.scalars().all()
-                
-                if not audit_logs:
-                    return True  # Empty chain is valid
-                
-                previous_hash = "GENESIS_BLOCK_HASH"
-                tampered_records = []
-                
-                for audit_log in audit_logs:
-                    # Recreate the hashable data
-                    hashable_data = {
-                        "event_id": audit_log.event_id,
-                        "timestamp": audit_log.timestamp.isoformat(),
-                        "event_type": audit_log.event_type,
-                        "user_id": audit_log.user_id,
-                        "action": audit_log.action,
-                        "resource_type": audit_log.resource_type or "",
-                        "resource_id": audit_log.resource_id or "",
-                        "outcome": audit_log.outcome,
-                        "event_data": json.dumps(audit_log.event_data or {}, sort_keys=True),
-                        "previous_hash": previous_hash
-                    }
-                    
-                    # Compute expected hash
-                    payload_string = json.dumps(hashable_data, sort_keys=True)
-                    expected_hash = hashlib.sha256(payload_string.encode('utf-8')).hexdigest()
-                    
-                    # Verify hash matches
-                    if audit_log.log_hash != expected_hash:
-                        tampered_records.append({
-                            "log_id": audit_log.id,
-                            "timestamp": audit_log.timestamp,
-                            "expected_hash": expected_hash,
-                            "actual_hash": audit_log.log_hash
-                        })
-                    
-                    # Verify chain link
-                    if audit_log.previous_hash != previous_hash:
-                        tampered_records.append({
-                            "log_id": audit_log.id,
-                            "timestamp": audit_log.timestamp,
-                            "error": "broken_chain_link",
-                            "expected_previous": previous_hash,
-                            "actual_previous": audit_log.previous_hash
-                        })
-                    
-                    previous_hash = audit_log.log_hash
-                
-                if tampered_records:
-                    logger.critical(
-                        "AUDIT CHAIN INTEGRITY VIOLATION DETECTED",
-                        tampered_count=len(tampered_records),
-                        tampered_records=tampered_records[:5]  # Log first 5
-                    )
-                    
-                    # Create security violation event
-                    violation_event = SecurityViolationEvent(
-                        user_id="SYSTEM",
-                        violation_type="audit_tampering",
-                        severity="critical",
-                        description=f"Audit chain integrity compromised: {len(tampered_records)} records tampered",
-                        source_ip="127.0.0.1",
-                        user_agent="audit_verification_system",
-                        headers={
-                            "tampered_records_count": len(tampered_records),
-                            "verification_timestamp": datetime.utcnow().isoformat()
-                        }
-                    )
-                    
-                    # Log the violation
-                    await self.handle(violation_event)
-                    
-                    return False
-                
-                logger.info(
-                    "Audit chain integrity verified",
-                    records_verified=len(audit_logs),
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                return True
-                
-            except Exception as e:
-                logger.error("Failed to verify audit chain", error=str(e))
-                return False
+        try:
+            result = await AuditChainVerifier(self.db_session_factory).verify(
+                start_date, end_date, incremental=incremental
+            )
+        except Exception as e:
+            logger.error("Failed to verify audit chain", error=str(e))
+            return False
+        
+        if not result.verified:
+            # Create security violation event
+            violation_event = SecurityViolationEvent(
+                user_id="SYSTEM",
+                violation_type="audit_tampering",
+                severity="critical",
+                description=f"Audit chain integrity compromised: {result.violation_count} records tampered",
+                source_ip="127.0.0.1",
+                user_agent="audit_verification_system",
+                headers={
+                    "tampered_records_count": result.violation_count,
+                    "verification_timestamp": datetime.utcnow().isoformat()
+                }
+            )
+            
+            # Log the violation
+            await self.handle(violation_event)
+        
+        return result.verified
 
 # ============================================
 # COMPLIANCE MONITORING HANDLER
@@ -637,25 +569,41 @@ class SOC2AuditService:
                 stmt = stmt.where(AuditLog.compliance_tags.overlap(query.compliance_tags))
             
             # Get total count
-            count_stmt = select(func.count(AuditLog.id)).select_from(stmt.subquery())
-            total_count = await session.scalar(count_stmt)
+            total_count, count_is_estimate = await resolve_total_count(
+                session, stmt, query.count_mode, table_name="audit_logs"
+            )
             
             # Apply sorting and pagination
+            next_cursor = None
             if query.sort_by == "timestamp":
-                sort_column = AuditLog.timestamp
+                # Seek on (timestamp, id) so deep pages do not scan skipped rows
+                descending = query.sort_order == "desc"
+                page_stmt = stmt.offset(query.offset) if query.offset and not query.cursor else stmt
+                logs, next_cursor = await fetch_keyset_page(
+                    session,
+                    page_stmt,
+                    AuditLog.timestamp,
+                    AuditLog.id,
+                    query.limit,
+                    cursor=query.cursor,
+                    descending=descending,
+                    scope=f"audit_logs:timestamp:{'desc' if descending else 'asc'}"
+                )
             else:
+                if query.cursor:
+                    raise InvalidCursorError("Cursor pagination requires sort_by=timestamp")
                 sort_column = getattr(AuditLog, query.sort_by, AuditLog.timestamp)
-            
-            if query.sort_order == "desc":
-                stmt = stmt.order_by(sort_column.desc())
-            else:
-                stmt = stmt.order_by(sort_column.asc())
-            
-            stmt = stmt.offset(query.offset).limit(query.limit)
-            
-            # Execute query
-            result = await session.execute(stmt)
-            logs = result.scalars().all()
+                
+                if query.sort_order == "desc":
+                    stmt = stmt.order_by(sort_column.desc())
+                else:
+                    stmt = stmt.order_by(sort_column.asc())
+                
+                stmt = stmt.offset(query.offset).limit(query.limit)
+                
+                # Execute query
+                result = await session.execute(stmt)
+                logs = result.scalars().all()
             
             # Format results
             log_data = []
@@ -690,7 +638,9 @@ class SOC2AuditService:
                 "query_info": {
                     "limit": query.limit,
                     "offset": query.offset,
-                    "returned_count": len(log_data)
+                    "returned_count": len(log_data),
+                    "next_cursor": next_cursor,
+                    "count_is_estimate": count_is_estimate
                 }
             }
             
@@ -832,33 +782,24 @@ class SOC2AuditService:
         try:
             report_id = secrets.token_hex(8)
             
-            # Base query for report period
-            base_query = select(AuditLog).where(
-                and_(
-                    AuditLog.timestamp >= start_date,
-                    AuditLog.timestamp <= end_date
+            rollups = get_compliance_rollup_store()
+            if rollups is not None:
+                # Aggregate pre-materialized columnar rollups; only the period
+                # edges and unmaterialized days touch the live table
+                rollup = await rollups.load_period(session, AUDIT_SOURCE, start_date, end_date)
+                if soc2_categories:
+                    rollup = filter_soc2_categories(rollup, [category.value for category in soc2_categories])
+                sections = soc2_report_sections(rollup)
+                total_count = sections["total_events"]
+                summary = sections["summary"]
+                findings = sections["findings"]
+                metrics = sections["metrics"]
+                data_sources = ["audit_logs", "compliance_rollups"]
+            else:
+                total_count, summary, findings, metrics = await self._generate_report_sections(
+                    session, start_date, end_date, soc2_categories
                 )
-            )
-            
-            # Filter by SOC2 categories if specified
-            if soc2_categories:
-                category_filters = []
-                for category in soc2_categories:
-                    category_filters.append(
-                        AuditLog.compliance_tags.contains([category.value])
-                    )
-                if category_filters:
-                    base_query = base_query.where(or_(*category_filters))
-            
-            # Get total events
-            total_count = await session.scalar(
-                select(func.count(AuditLog.id)).select_from(base_query.subquery())
-            )
-            
-            # Generate report sections
-            summary = await self._generate_report_summary(session, base_query)
-            findings = await self._generate_report_findings(session, base_query)
-            metrics = await self._generate_report_metrics(session, base_query)
+                data_sources = ["audit_logs", "system_events"]
             recommendations = await self._generate_recommendations(findings, metrics)
             
             report = ComplianceReport(
@@ -872,7 +813,7 @@ class SOC2AuditService:
                 recommendations=recommendations,
                 metrics=metrics,
                 total_events_analyzed=total_count,
-                data_sources=["audit_logs", "system_events"],
+                data_sources=data_sources,
                 export_format="json"
             )
             
@@ -893,6 +834,42 @@ class SOC2AuditService:
                 except Exception as e:
                     logger.warning(f"Error closing session: {e}")
     
+    async def _generate_report_sections(
+        self,
+        session: AsyncSession,
+        start_date: datetime,
+        end_date: datetime,
+        soc2_categories: Optional[List[SOC2Category]] = None
+    ) -> Tuple[int, Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]:
+        """Generate report sections with live aggregate queries (used when rollups are unavailable)."""
+        # Base query for report period
+        base_query = select(AuditLog).where(
+            and_(
+                AuditLog.timestamp >= start_date,
+                AuditLog.timestamp <= end_date
+            )
+        )
+        
+        # Filter by SOC2 categories if specified
+        if soc2_categories:
+            category_filters = []
+            for category in soc2_categories:
+                category_filters.append(
+                    AuditLog.compliance_tags.contains([category.value])
+                )
+            if category_filters:
+                base_query = base_query.where(or_(*category_filters))
+        
+        # Get total events
+        total_count = await session.scalar(
+            select(func.count(AuditLog.id)).select_from(base_query.subquery())
+        )
+        
+        summary = await self._generate_report_summary(session, base_query)
+        findings = await self._generate_report_findings(session, base_query)
+        metrics = await self._generate_report_metrics(session, base_query)
+        return total_count, summary, findings, metrics
+    
     async def _generate_report_summary(self, session: AsyncSession, base_query) -> Dict[str, Any]:
         """Generate report summary section."""
         # Event type distribution
@@ -1043,82 +1020,47 @@ class SOC2AuditService:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Export audit logs to SIEM system."""
+        """
+        Stream audit logs to a SIEM system.
+        
+        Resumes from the configuration's persisted high-water mark; start_date
+        only applies to the first export of a configuration.
+        """
         if config_name not in self.siem_configs:
             raise ValueError(f"SIEM configuration {config_name} not found")
         
         config = self.siem_configs[config_name]
-        
-        # Query audit logs for export
-        query = AuditLogQuery(
-            start_date=start_date or datetime.utcnow() - timedelta(hours=1),
-            end_date=end_date or datetime.utcnow(),
-            event_types=config.event_types if config.event_types else None,
-            limit=config.batch_size
+        if not config.destination_url:
+            raise ValueError(f"SIEM configuration {config_name} has no destination_url")
+        
+        sink = create_siem_sink(config.destination_url)
+        exporter = StreamingSIEMExporter(
+            config_name,
+            sink,
+            session_factory=self.db_session_factory,
+            export_format=config.export_format,
+            event_types=config.event_types,
+            batch_size=config.batch_size
         )
-        
-        async with self.db_session_factory() as session:
-            result = await self.query_audit_logs(query, session)
-            
-            # Convert to SIEM format
-            siem_events = []
-            for log in result["logs"]:
-                siem_event = self._convert_to_siem_format(log, config)
-                siem_events.append(siem_event)
-            
-            # Export (would send to actual SIEM system)
-            export_result = {
-                "config_name": config_name,
-                "events_exported": len(siem_events),
-                "export_time": datetime.utcnow(),
-                "format": config.export_format,
-                "events": siem_events if config.export_format != "cef" else [e.to_cef() for e in siem_events]
-            }
-            
-            logger.info("SIEM export completed",
-                       config_name=config_name,
-                       events_exported=len(siem_events))
-            
-            return export_result
+        try:
+            result = await exporter.run(start=start_date, until=end_date)
+        finally:
+            await sink.close()
+        
+        config.last_export = datetime.utcnow()
+        config.export_count += 1
+        
+        export_result = result.to_dict()
+        export_result.update({
+            "config_name": config_name,
+            "export_time": config.last_export,
+            "format": exporter.export_format
+        })
+        return export_result
     
     def _convert_to_siem_format(self, log: Dict[str, Any], config: SIEMExportConfig) -> SIEMEvent:
         """Convert audit log to SIEM format."""
-        # Map event types to SIEM signatures
-        signature_map = {
-            "UserLoginEvent": "USER_LOGIN",
-            "DataAccessEvent": "DATA_ACCESS",
-            "SecurityViolationEvent": "SECURITY_VIOLATION"
-        }
-        
-        signature_id = signature_map.get(log["event_type"], "UNKNOWN_EVENT")
-        
-        # Determine severity
-        severity_map = {
-            "success": 2,
-            "failure": 5,
-            "error": 7,
-            "denied": 6
-        }
-        severity = severity_map.get(log["outcome"], 5)
-        
-        extensions = {
-            "src": log.get("ip_address"),
-            "suser": log.get("user_id"),
-            "act": log.get("action"),
-            "outcome": log.get("outcome"),
-            "request": log.get("correlation_id")
-        }
-        
-        # Remove None values
-        extensions = {k: v for k, v in extensions.items() if v is not None}
-        
-        return SIEMEvent(
-            signature_id=signature_id,
-            name=log["event_type"],
-            severity=severity,
-            extensions=extensions,
-            raw_event=log
-        )
+        return audit_row_to_siem_event(log)
     
     async def log_action(
         self, 
@@ -1317,7 +1259,9 @@ class SOC2AuditService:
     async def verify_audit_chain_integrity(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        incremental: bool = True,
+        parallel_segments: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Verify the cryptographic integrity of the audit chain.
@@ -1325,14 +1269,21 @@ class SOC2AuditService:
         Args:
             start_date: Start date for verification (optional)
             end_date: End date for verification (optional)
+            incremental: Only verify rows after the last signed checkpoint
+            parallel_segments: Verify the whole chain as this many segments
+                in worker processes (ignored for date-bounded runs)
             
         Returns:
             Dict containing verification results and details
         """
         try:
-            # Use the handler's verification method
-            handler = ImmutableAuditLogHandler(self.db_session_factory)
-            integrity_verified = await handler.verify_audit_chain(start_date, end_date)
+            verifier = AuditChainVerifier(self.db_session_factory)
+            if parallel_segments and start_date is None and end_date is None:
+                chain_result = await verifier.verify_parallel(parallel_segments, incremental=incremental)
+            else:
+                chain_result = await verifier.verify(start_date, end_date, incremental=incremental)
+            integrity_verified = chain_result.verified
+            chain_summary = chain_result.to_dict()
             
             verification_result = {
                 "integrity_verified": integrity_verified,
@@ -1341,6 +1292,13 @@ class SOC2AuditService:
                     "start_date": start_date.isoformat() if start_date else None,
                     "end_date": end_date.isoformat() if end_date else None
                 },
+                "records_verified": chain_summary["records_verified"],
+                "violation_count": chain_summary["violation_count"],
+                "violations": chain_summary["violations"][:10],
+                "resumed_from": chain_summary["resumed_from"],
+                "checkpoint": chain_summary["checkpoint"],
+                "segments": chain_summary["segments"],
+                "duration_ms": chain_summary["duration_ms"],
                 "verification_id": str(uuid.uuid4())
             }
             
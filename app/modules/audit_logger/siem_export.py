@@ -0,0 +1,443 @@
+"""
+Streaming SIEM export of audit logs.
+
+Exports ``audit_logs`` to a SIEM in constant memory and resumes where it
+left off after a crash:
+
+- Rows are read in (timestamp, id) keyset order, one bounded batch per
+  short transaction, starting after a per-export high-water mark stored in
+  ``siem_export_cursors``.
+- Each batch is encoded to CEF, LEEF or JSON lines as it is read and handed
+  to the shipper through a bounded queue, so a slow sink pauses the reader
+  instead of letting batches pile up.
+- A batch is retried with exponential backoff until the sink accepts it;
+  only then is the high-water mark advanced. Delivery is at-least-once: a
+  crash between the sink accepting a batch and the cursor commit re-sends
+  that batch.
+
+Rows are exported ``settle_seconds`` behind the wall clock so that writes
+still in flight with earlier timestamps are not skipped by the cursor.
+"""
+
+import asyncio
+import os
+import random
+import ssl
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import structlog
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database_unified import AuditLog, SIEMExportCursor, get_session_factory
+from app.modules.audit_logger.schemas import SIEMEvent
+
+logger = structlog.get_logger()
+
+SIEM_FORMATS = ("cef", "leef", "json")
+
+# Columns carried into SIEM events; selecting them avoids ORM hydration
+_EXPORT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.timestamp,
+    AuditLog.event_type,
+    AuditLog.user_id,
+    AuditLog.session_id,
+    AuditLog.correlation_id,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.action,
+    AuditLog.outcome,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.compliance_tags,
+    AuditLog.data_classification,
+)
+
+_SIGNATURE_MAP = {
+    "UserLoginEvent": "USER_LOGIN",
+    "DataAccessEvent": "DATA_ACCESS",
+    "SecurityViolationEvent": "SECURITY_VIOLATION"
+}
+
+_SEVERITY_MAP = {
+    "success": 2,
+    "failure": 5,
+    "error": 7,
+    "denied": 6
+}
+
+ExportKey = Tuple[datetime, uuid.UUID]
+
+
+class SIEMDeliveryError(Exception):
+    """A batch could not be delivered to the SIEM sink within the retry budget."""
+
+
+def audit_row_to_siem_event(log: Mapping[str, Any]) -> SIEMEvent:
+    """
+    Convert an audit log row to a SIEM event.
+
+    Args:
+        log: Audit log row mapping (or the service's log dict)
+
+    Returns:
+        SIEM event with CEF signature, severity and extensions
+    """
+    extensions = {
+        "rt": log["timestamp"].isoformat() if log.get("timestamp") else None,
+        "src": log.get("ip_address"),
+        "suser": log.get("user_id"),
+        "act": log.get("action"),
+        "outcome": log.get("outcome"),
+        "request": log.get("correlation_id"),
+        "externalId": log.get("id")
+    }
+
+    return SIEMEvent(
+        signature_id=_SIGNATURE_MAP.get(log["event_type"], "UNKNOWN_EVENT"),
+        name=log["event_type"],
+        severity=_SEVERITY_MAP.get(log["outcome"], 5),
+        extensions={k: v for k, v in extensions.items() if v is not None},
+        raw_event=dict(log)
+    )
+
+
+def encode_siem_event(event: SIEMEvent, export_format: str) -> str:
+    """Encode a SIEM event as one line of CEF, LEEF or JSON."""
+    if export_format == "cef":
+        return event.to_cef()
+    if export_format == "leef":
+        return event.to_leef()
+    if export_format == "json":
+        return event.to_json()
+    raise ValueError(f"Unsupported SIEM export format: {export_format}")
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+
+class SIEMSink:
+    """Destination for newline-delimited SIEM records."""
+
+    async def send(self, lines: Sequence[str]) -> None:
+        """Deliver a batch of records; raising means the batch was not accepted."""
+        raise NotImplementedError
+
+    async def reset(self) -> None:
+        """Drop any connection state after a failed send."""
+
+    async def close(self) -> None:
+        """Release the sink."""
+
+
+class FileSIEMSink(SIEMSink):
+    """Appends records to a local file, fsynced per batch (for testing and syslog file pickup)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    async def send(self, lines: Sequence[str]) -> None:
+        payload = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        await asyncio.to_thread(self._append, payload)
+
+    def _append(self, payload: bytes) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+class TCPSIEMSink(SIEMSink):
+    """Streams newline-framed records over a persistent TCP (optionally TLS) connection."""
+
+    def __init__(self, host: str, port: int, use_tls: bool = False, timeout_seconds: float = 30.0):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl.create_default_context() if use_tls else None
+        self.timeout_seconds = timeout_seconds
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def send(self, lines: Sequence[str]) -> None:
+        if self._writer is None:
+            _, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.ssl_context),
+                self.timeout_seconds
+            )
+        try:
+            self._writer.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            # drain() blocks while the peer is not reading, which is the backpressure signal
+            await asyncio.wait_for(self._writer.drain(), self.timeout_seconds)
+        except Exception:
+            await self.reset()
+            raise
+
+    async def reset(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        await self.reset()
+
+
+def create_siem_sink(url: str) -> SIEMSink:
+    """
+    Create a sink from a destination URL.
+
+    Supported: ``file:///path/to/export.log``, ``tcp://host:port`` and
+    ``tcp+tls://host:port``.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return FileSIEMSink(parsed.path)
+    if parsed.scheme in ("tcp", "tcp+tls"):
+        if not parsed.hostname or not parsed.port:
+            raise ValueError(f"SIEM destination needs a host and port: {url}")
+        return TCPSIEMSink(parsed.hostname, parsed.port, use_tls=parsed.scheme == "tcp+tls")
+    raise ValueError(f"Unsupported SIEM destination: {url}")
+
+
+# =============================================================================
+# EXPORTER
+# =============================================================================
+
+@dataclass
+class SIEMExportResult:
+    """Outcome of one streaming export run."""
+    export_name: str
+    export_format: str
+    events_exported: int = 0
+    batches_delivered: int = 0
+    delivery_retries: int = 0
+    high_water_mark: Optional[ExportKey] = None
+    caught_up: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        if self.high_water_mark is not None:
+            timestamp, log_id = self.high_water_mark
+            result["high_water_mark"] = {"timestamp": timestamp.isoformat(), "log_id": str(log_id)}
+        return result
+
+
+@dataclass
+class _EncodedBatch:
+    lines: List[str]
+    last_key: ExportKey
+
+
+class StreamingSIEMExporter:
+    """Resumable, constant-memory export of audit logs to a SIEM sink."""
+
+    def __init__(
+        self,
+        export_name: str,
+        sink: SIEMSink,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        export_format: str = "cef",
+        event_types: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+        max_backoff_seconds: float = 60.0,
+        settle_seconds: Optional[float] = None,
+        max_pending_batches: Optional[int] = None
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            export_name: Key of the persisted high-water mark
+            sink: Destination for encoded records
+            session_factory: Async session factory (defaults to the shared one)
+            export_format: "cef", "leef" or "json"
+            event_types: Only export these event types (all when empty)
+            batch_size: Rows read, encoded and delivered per batch
+            max_retries: Delivery retries per batch before giving up
+            retry_backoff_seconds: First retry delay, doubled per attempt
+            max_backoff_seconds: Upper bound for the retry delay
+            settle_seconds: Lag behind the wall clock for in-flight writes
+            max_pending_batches: Encoded batches buffered ahead of the sink
+        """
+        export_format = export_format.lower()
+        if export_format not in SIEM_FORMATS:
+            raise ValueError(f"Unsupported SIEM export format: {export_format}")
+
+        settings = get_settings()
+        self.export_name = export_name
+        self.sink = sink
+        self.export_format = export_format
+        self.event_types = list(event_types) if event_types else None
+        self.batch_size = batch_size or settings.SIEM_EXPORT_BATCH_SIZE
+        self.max_retries = settings.SIEM_EXPORT_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff_seconds = (
+            settings.SIEM_EXPORT_RETRY_BACKOFF_SECONDS if retry_backoff_seconds is None else retry_backoff_seconds
+        )
+        self.max_backoff_seconds = max_backoff_seconds
+        self.settle_seconds = settings.SIEM_EXPORT_SETTLE_SECONDS if settle_seconds is None else settle_seconds
+        self.max_pending_batches = max_pending_batches or settings.SIEM_EXPORT_MAX_PENDING_BATCHES
+        self._session_factory = session_factory
+
+    async def _get_session_factory(self):
+        if self._session_factory is None:
+            self._session_factory = await get_session_factory()
+        return self._session_factory
+
+    async def load_cursor(self) -> Optional[ExportKey]:
+        """The (timestamp, id) of the last delivered row, or None before the first delivery."""
+        session_factory = await self._get_session_factory()
+        async with session_factory() as session:
+            cursor = await self._get_cursor_row(session)
+        if cursor is None or cursor.last_timestamp is None:
+            return None
+        return cursor.last_timestamp, cursor.last_log_id
+
+    async def run(
+        self,
+        start: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        max_events: Optional[int] = None
+    ) -> SIEMExportResult:
+        """
+        Export rows after the high-water mark until caught up.
+
+        Args:
+            start: Lower bound used only when the export has no high-water mark yet
+            until: Upper timestamp bound (defaults to now minus settle_seconds)
+            max_events: Stop after roughly this many events (whole batches)
+
+        Returns:
+            Export result; the high-water mark is persisted per delivered batch
+
+        Raises:
+            SIEMDeliveryError: A batch was still rejected after all retries
+        """
+        settled = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.settle_seconds)
+        end = min(until, settled) if until else settled
+        after = await self.load_cursor()
+        result = SIEMExportResult(export_name=self.export_name, export_format=self.export_format, high_water_mark=after)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_pending_batches)
+        reader = asyncio.create_task(self._read_batches(queue, after, start, end, max_events))
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                result.delivery_retries += await self._deliver(batch.lines)
+                await self._advance_cursor(batch.last_key, len(batch.lines))
+                result.events_exported += len(batch.lines)
+                result.batches_delivered += 1
+                result.high_water_mark = batch.last_key
+            result.caught_up = await reader
+        finally:
+            if not reader.done():
+                reader.cancel()
+                try:
+                    await reader
+                except asyncio.CancelledError:
+                    pass
+
+        logger.info("SIEM export run completed",
+                   export_name=self.export_name,
+                   events_exported=result.events_exported,
+                   batches=result.batches_delivered,
+                   retries=result.delivery_retries,
+                   caught_up=result.caught_up)
+        return result
+
+    async def _read_batches(
+        self,
+        queue: asyncio.Queue,
+        after: Optional[ExportKey],
+        start: Optional[datetime],
+        end: datetime,
+        max_events: Optional[int]
+    ) -> bool:
+        """Produce encoded batches into the queue; returns True when the export caught up."""
+        session_factory = await self._get_session_factory()
+        produced = 0
+        caught_up = False
+        try:
+            while max_events is None or produced < max_events:
+                query = select(*_EXPORT_COLUMNS).where(AuditLog.timestamp <= end)
+                if after is not None:
+                    # The plain bound lets PostgreSQL prune monthly partitions
+                    query = query.where(
+                        AuditLog.timestamp >= after[0],
+                        tuple_(AuditLog.timestamp, AuditLog.id) > tuple_(*after)
+                    )
+                elif start is not None:
+                    query = query.where(AuditLog.timestamp >= start)
+                if self.event_types:
+                    query = query.where(AuditLog.event_type.in_(self.event_types))
+                query = query.order_by(AuditLog.timestamp.asc(), AuditLog.id.asc()).limit(self.batch_size)
+
+                async with session_factory() as session:
+                    rows = (await session.execute(query)).mappings().all()
+                if not rows:
+                    caught_up = True
+                    break
+
+                lines = [encode_siem_event(audit_row_to_siem_event(row), self.export_format) for row in rows]
+                after = (rows[-1]["timestamp"], rows[-1]["id"])
+                await queue.put(_EncodedBatch(lines=lines, last_key=after))
+                produced += len(rows)
+                if len(rows) < self.batch_size:
+                    caught_up = True
+                    break
+        finally:
+            await queue.put(None)
+        return caught_up
+
+    async def _deliver(self, lines: List[str]) -> int:
+        """Send one batch, retrying with exponential backoff; returns the retries used."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.sink.send(lines)
+                return attempt
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise SIEMDeliveryError(
+                        f"SIEM export {self.export_name} failed after {attempt + 1} attempts: {e}"
+                    ) from e
+                delay = min(self.retry_backoff_seconds * (2 ** attempt), self.max_backoff_seconds)
+                delay *= random.uniform(0.8, 1.2)
+                logger.warning("SIEM batch delivery failed, retrying",
+                              export_name=self.export_name,
+                              attempt=attempt + 1,
+                              delay_seconds=round(delay, 3),
+                              error=str(e))
+                await self.sink.reset()
+                await asyncio.sleep(delay)
+        return self.max_retries
+
+    async def _advance_cursor(self, last_key: ExportKey, delivered: int) -> None:
+        session_factory = await self._get_session_factory()
+        async with session_factory() as session:
+            cursor = await self._get_cursor_row(session)
+            if cursor is None:
+                cursor = SIEMExportCursor(export_name=self.export_name, events_exported=0)
+                session.add(cursor)
+            cursor.last_timestamp, cursor.last_log_id = last_key
+            cursor.events_exported = (cursor.events_exported or 0) + delivered
+            await session.commit()
+
+    async def _get_cursor_row(self, session: AsyncSession) -> Optional[SIEMExportCursor]:
+        result = await session.execute(
+            select(SIEMExportCursor).where(SIEMExportCursor.export_name == self.export_name)
+        )
+        return result.scalar_one_or_none()
@@ -1,3 +1,6 @@
+import asyncio
+from datetime import datetime
+
 from celery import current_app as celery_app
 import structlog
 
@@ -7,20 +10,87 @@ logger = structlog.get_logger()
 def maintain_audit_logs():
     """Perform audit log maintenance operations."""
     try:
-        # Placeholder for audit log maintenance
-        # In production, this would:
-        # - Archive old audit logs
-        # - Verify log integrity
-        # - Compress archived logs
-        # - Generate compliance reports
+        from app.core.config import get_settings
+        from app.modules.audit_logger.partitioning import add_months, get_audit_partition_manager, month_floor
+        
+        settings = get_settings()
+        manager = get_audit_partition_manager()
+        
+        async def _maintain():
+            # Upcoming monthly partitions must exist before rows for them arrive
+            created = await manager.ensure_partitions()
+            archived = []
+            if settings.AUDIT_PARTITION_ARCHIVE_AFTER_MONTHS > 0:
+                cutoff = add_months(month_floor(datetime.utcnow().date()), -settings.AUDIT_PARTITION_ARCHIVE_AFTER_MONTHS)
+                archived = await manager.archive_before(cutoff)
+            return created, archived
         
-        logger.info("Audit log maintenance completed")
-        return {"status": "completed", "records_processed": 0}
+        created, archived = asyncio.run(_maintain())
+        
+        logger.info(
+            "Audit log maintenance completed",
+            partitions_created=created,
+            partitions_archived=[result.partition for result in archived]
+        )
+        return {
+            "status": "completed",
+            "records_processed": sum(result.rows for result in archived),
+            "partitions_created": created,
+            "partitions_archived": [result.to_dict() for result in archived]
+        }
         
     except Exception as e:
         logger.error("Audit log maintenance failed", error=str(e))
         raise
 
+@celery_app.task
+def materialize_compliance_rollups():
+    """Roll up settled days of audit data into columnar compliance rollups."""
+    try:
+        from app.modules.audit_logger.compliance_rollups import get_compliance_rollup_store
+        
+        store = get_compliance_rollup_store()
+        if store is None:
+            return {"status": "disabled", "days_materialized": {}}
+        
+        materialized = asyncio.run(store.materialize())
+        return {
+            "status": "completed",
+            "days_materialized": {
+                source: [day.isoformat() for day in days] for source, days in materialized.items()
+            }
+        }
+        
+    except Exception as e:
+        logger.error("Compliance rollup materialization failed", error=str(e))
+        raise
+
+@celery_app.task
+def stream_audit_logs_to_siem():
+    """Ship audit logs written since the last run to the configured SIEM sink."""
+    try:
+        from app.core.config import get_settings
+        from app.modules.audit_logger.siem_export import StreamingSIEMExporter, create_siem_sink
+        
+        settings = get_settings()
+        if not settings.SIEM_EXPORT_DESTINATION:
+            return {"status": "disabled", "events_exported": 0}
+        
+        async def _run():
+            sink = create_siem_sink(settings.SIEM_EXPORT_DESTINATION)
+            exporter = StreamingSIEMExporter("default", sink, export_format=settings.SIEM_EXPORT_FORMAT)
+            try:
+                return await exporter.run()
+            finally:
+                await sink.close()
+        
+        result = asyncio.run(_run())
+        return {"status": "completed", **result.to_dict()}
+        
+    except Exception as e:
+        logger.error("Streaming SIEM export failed", error=str(e))
+        raise
+
 @celery_app.task
 def verify_log_integrity(start_date: str, end_date: str):
     """Verify audit log integrity for a date range."""
@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field, field_validator, model_validator
 from uuid import UUID
 
 from app.core.database_unified import DataClassification
+from app.core.pagination import CountMode
 
 
 class WorkflowType(str, Enum):
@@ -517,6 +518,8 @@ class ClinicalWorkflowSearchFilters(BaseModel):
     # Pagination
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = Field(None, description="Keyset cursor from the previous page (created_at sort only)")
+    count_mode: CountMode = Field(CountMode.EXACT, description="Total count mode: exact, estimated or none")
     
     # Sorting
     sort_by: Optional[str] = Field("created_at", pattern="^(created_at|updated_at|workflow_start_time|priority)$")
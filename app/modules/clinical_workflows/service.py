@@ -21,6 +21,7 @@ from sqlalchemy.exc import IntegrityError
 
 from app.core.database_unified import get_db, DataClassification
 from app.core.events.event_bus import get_event_bus, HealthcareEventBus
+from app.core.pagination import InvalidCursorError, KeysetPage, fetch_keyset_page, resolve_total_count
 from app.modules.audit_logger.service import SOC2AuditService
 from app.core.security import SecurityManager
 from app.modules.clinical_workflows.models import (
@@ -649,7 +650,7 @@ class ClinicalWorkflowService:
         filters: ClinicalWorkflowSearchFilters,
         user_id: UUID,
         session: AsyncSession
-    ) -> Tuple[List[ClinicalWorkflowResponse], int]:
+    ) -> Tuple[List[ClinicalWorkflowResponse], Optional[int]]:
         """
         Search clinical workflows with security filtering and pagination.
         
@@ -661,6 +662,29 @@ class ClinicalWorkflowService:
         Returns:
             Tuple of (workflows list, total count)
         """
+        page = await self.search_workflows_page(filters, user_id, session)
+        return page.items, page.total_count
+    
+    async def search_workflows_page(
+        self,
+        filters: ClinicalWorkflowSearchFilters,
+        user_id: UUID,
+        session: AsyncSession
+    ) -> KeysetPage:
+        """
+        Search clinical workflows with keyset pagination.
+        
+        With filters.cursor set the page is fetched by seeking past the
+        previous page's last (created_at, id) instead of OFFSET.
+        
+        Args:
+            filters: Search filters, cursor and count mode
+            user_id: ID of user performing search
+            session: Database session
+            
+        Returns:
+            KeysetPage of workflow responses
+        """
         logger.info(f"Searching workflows for user {user_id}")
         
         # Build query with security filtering (async compatible)
@@ -678,7 +702,7 @@ class ClinicalWorkflowService:
                 action="view_workflow"
             )
             if not has_permission:
-                return [], 0
+                return KeysetPage(items=[], total_count=0)
             query = query.where(ClinicalWorkflow.patient_id == filters.patient_id)
         
         if filters.workflow_type:
@@ -699,30 +723,46 @@ class ClinicalWorkflowService:
             query = query.where(ClinicalWorkflow.created_at <= filters.date_to)
         
         # Get total count (async compatible)
-        count_query = select(func.count()).select_from(query.subquery())
-        count_result = await session.execute(count_query)
-        total_count = count_result.scalar()
+        total_count, count_is_estimate = await resolve_total_count(
+            session, query, filters.count_mode, table_name="clinical_workflows"
+        )
         
-        # Apply sorting
+        offset = (filters.page - 1) * filters.page_size
+        next_cursor = None
         if filters.sort_by == "created_at":
-            order_column = ClinicalWorkflow.created_at
-        elif filters.sort_by == "updated_at":
-            order_column = ClinicalWorkflow.updated_at
-        elif filters.sort_by == "priority":
-            order_column = ClinicalWorkflow.priority
-        else:
-            order_column = ClinicalWorkflow.created_at
-        
-        if filters.sort_direction == "desc":
-            query = query.order_by(desc(order_column))
+            # Seek on (created_at, id); page is only honoured for the first request
+            descending = filters.sort_direction == "desc"
+            page_query = query.offset(offset) if offset and not filters.cursor else query
+            workflows, next_cursor = await fetch_keyset_page(
+                session,
+                page_query,
+                ClinicalWorkflow.created_at,
+                ClinicalWorkflow.id,
+                filters.page_size,
+                cursor=filters.cursor,
+                descending=descending,
+                scope=f"clinical_workflows:created_at:{'desc' if descending else 'asc'}"
+            )
         else:
-            query = query.order_by(asc(order_column))
-        
-        # Apply pagination
-        offset = (filters.page - 1) * filters.page_size
-        paginated_query = query.offset(offset).limit(filters.page_size)
-        result = await session.execute(paginated_query)
-        workflows = result.scalars().all()
+            # Nullable sort columns cannot be compared as row values
+            if filters.cursor:
+                raise InvalidCursorError("Cursor pagination requires sort_by=created_at")
+            if filters.sort_by == "updated_at":
+                order_column = ClinicalWorkflow.updated_at
+            elif filters.sort_by == "priority":
+                order_column = ClinicalWorkflow.priority
+            else:
+                order_column = ClinicalWorkflow.created_at
+            
+            if filters.sort_direction == "desc":
+                query = query.order_by(desc(order_column))
+            else:
+                query = query.order_by(asc(order_column))
+            
+            # Apply pagination
+            paginated_query = query.offset(offset).limit(filters.page_size)
+            result = await session.execute(paginated_query)
+            workflows = result.scalars().all()
         
         # Convert to response objects (without PHI decryption for list view)
         response_workflows = []
@@ -758,7 +798,12 @@ class ClinicalWorkflowService:
             }
         )
         
-        return response_workflows, total_count
+        return KeysetPage(
+            items=response_workflows,
+            next_cursor=next_cursor,
+            total_count=total_count,
+            count_is_estimate=count_is_estimate
+        )
 
     async def add_workflow_step(
         self,
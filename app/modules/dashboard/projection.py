@@ -0,0 +1,458 @@
+"""
+Dashboard Projection
+
+Keeps the dashboard's counters and activity feed up to date from domain
+events instead of aggregating the audit and patient tables on every request:
+
+- hourly counters per audit event type (PHI_ACCESSED, SECURITY_VIOLATION ...),
+  a total of all audit events and new patients, summed over the requested
+  window on read
+- the patient total
+- the most recent activities, as audit-log-shaped records
+
+Reads cost the same whatever the table sizes. Counters are eventually
+consistent: audit rows written without a matching domain event only appear
+after the periodic reconciliation, which rebuilds everything from the
+database and so also bounds any drift to one interval.
+
+State lives in Redis when it is reachable, so every worker reads and
+increments the same counters, and in process memory otherwise.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import redis.asyncio as redis
+import structlog
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.core.database_unified import AuditLog, Patient
+from app.core.event_bus_advanced import BaseEvent, EventHandler
+
+logger = structlog.get_logger()
+
+# Counters besides the per-audit-event-type ones
+TOTAL_AUDIT_EVENTS = "total"
+PATIENTS_CREATED = "patients_created"
+PATIENTS_TOTAL = "patients_total"
+
+# Longest window the dashboard reads (the 30-day security summary) plus slack
+RETENTION_HOURS = 31 * 24
+
+# Domain event type -> audit event type it is recorded as
+AUDIT_EVENT_TYPES = {
+    "patient.created": "PATIENT_CREATED",
+    "security.phi_access": "PHI_ACCESSED",
+    "security.violation_detected": "SECURITY_VIOLATION",
+    "consent.provided": "CONSENT_GRANTED",
+    "consent.revoked": "CONSENT_WITHDRAWN",
+    "audit.log_created": None,  # carries its own log_type
+}
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Naive UTC, as AuditLog timestamps are stored."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def hour_bucket(value: datetime) -> int:
+    """Hours since the epoch of a timestamp (naive values are UTC)."""
+    return int(_utc_naive(value).replace(tzinfo=timezone.utc).timestamp() // 3600)
+
+
+def _audit_value(event_type: Any) -> str:
+    return str(getattr(event_type, "value", event_type))
+
+
+def activity_record(log) -> Dict[str, Any]:
+    """Activity record from an AuditLog row (or anything with its attributes)."""
+    return {
+        "id": str(log.id),
+        "event_type": _audit_value(log.event_type),
+        "action": log.action,
+        "outcome": log.outcome,
+        "resource_type": log.resource_type,
+        "resource_id": str(log.resource_id) if log.resource_id else None,
+        "user_id": str(log.user_id) if log.user_id else None,
+        "timestamp": _utc_naive(log.timestamp).isoformat()
+    }
+
+
+class MemoryProjectionStore:
+    """Projection state in process memory."""
+
+    def __init__(self, max_activities: int):
+        self.max_activities = max_activities
+        self.counts: Dict[str, Dict[int, int]] = {}
+        self.totals: Dict[str, int] = {}
+        self.activities: deque = deque(maxlen=max_activities)
+
+    async def apply(
+        self,
+        hour: int,
+        counts: Dict[str, int],
+        totals: Dict[str, int],
+        activity: Optional[Dict[str, Any]]
+    ) -> None:
+        for name, amount in counts.items():
+            buckets = self.counts.setdefault(name, {})
+            buckets[hour] = buckets.get(hour, 0) + amount
+        for name, amount in totals.items():
+            self.totals[name] = self.totals.get(name, 0) + amount
+        if activity is not None:
+            self.activities.appendleft(activity)
+
+    async def window_sums(self, names: List[str], hours: List[int]) -> Dict[str, int]:
+        return {
+            name: sum(self.counts.get(name, {}).get(hour, 0) for hour in hours)
+            for name in names
+        }
+
+    async def get_totals(self) -> Dict[str, int]:
+        return dict(self.totals)
+
+    async def get_activities(self) -> List[Dict[str, Any]]:
+        return list(self.activities)
+
+    async def load(
+        self,
+        counts: Dict[str, Dict[int, int]],
+        totals: Dict[str, int],
+        activities: List[Dict[str, Any]]
+    ) -> None:
+        self.counts = {name: dict(buckets) for name, buckets in counts.items()}
+        self.totals = dict(totals)
+        self.activities = deque(activities[:self.max_activities], maxlen=self.max_activities)
+
+
+class RedisProjectionStore:
+    """Projection state in Redis, shared by all workers."""
+
+    def __init__(self, client, max_activities: int, prefix: str = "dashboard:projection"):
+        """
+        Initialize the store.
+
+        Args:
+            client: redis.asyncio client with decode_responses=True
+            max_activities: Length of the recent activity list
+            prefix: Key prefix of the projection keys
+        """
+        self.client = client
+        self.max_activities = max_activities
+        self.prefix = prefix
+        self.counters_key = f"{prefix}:counters"
+        self.totals_key = f"{prefix}:totals"
+        self.activities_key = f"{prefix}:activities"
+
+    def _counter_key(self, name: str) -> str:
+        return f"{self.prefix}:counts:{name}"
+
+    async def apply(
+        self,
+        hour: int,
+        counts: Dict[str, int],
+        totals: Dict[str, int],
+        activity: Optional[Dict[str, Any]]
+    ) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for name, amount in counts.items():
+                pipe.hincrby(self._counter_key(name), hour, amount)
+            if counts:
+                pipe.sadd(self.counters_key, *counts)
+            for name, amount in totals.items():
+                pipe.hincrby(self.totals_key, name, amount)
+            if activity is not None:
+                pipe.lpush(self.activities_key, json.dumps(activity))
+                pipe.ltrim(self.activities_key, 0, self.max_activities - 1)
+            await pipe.execute()
+
+    async def window_sums(self, names: List[str], hours: List[int]) -> Dict[str, int]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hmget(self._counter_key(name), hours)
+            results = await pipe.execute()
+        return {
+            name: sum(int(value) for value in values if value)
+            for name, values in zip(names, results)
+        }
+
+    async def get_totals(self) -> Dict[str, int]:
+        return {name: int(value) for name, value in (await self.client.hgetall(self.totals_key)).items()}
+
+    async def get_activities(self) -> List[Dict[str, Any]]:
+        return [json.loads(item) for item in await self.client.lrange(self.activities_key, 0, -1)]
+
+    async def load(
+        self,
+        counts: Dict[str, Dict[int, int]],
+        totals: Dict[str, int],
+        activities: List[Dict[str, Any]]
+    ) -> None:
+        stale = await self.client.smembers(self.counters_key)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.counters_key, self.totals_key, self.activities_key,
+                        *(self._counter_key(name) for name in set(stale) | set(counts)))
+            for name, buckets in counts.items():
+                if buckets:
+                    pipe.hset(self._counter_key(name), mapping=buckets)
+            if counts:
+                pipe.sadd(self.counters_key, *counts)
+            if totals:
+                pipe.hset(self.totals_key, mapping=totals)
+            if activities:
+                pipe.rpush(self.activities_key, *(json.dumps(a) for a in activities[:self.max_activities]))
+            await pipe.execute()
+
+
+class DashboardProjection(EventHandler):
+    """Incrementally maintained dashboard counters and activity feed."""
+
+    def __init__(
+        self,
+        store=None,
+        max_activities: int = 500,
+        reconcile_interval_seconds: float = 300.0
+    ):
+        """
+        Initialize the projection.
+
+        Args:
+            store: MemoryProjectionStore or RedisProjectionStore (memory by default)
+            max_activities: Length of the recent activity list
+            reconcile_interval_seconds: Time between rebuilds from the database
+        """
+        super().__init__("dashboard_projection")
+        self.store = store or MemoryProjectionStore(max_activities)
+        self.max_activities = max_activities
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self._seen_events: OrderedDict = OrderedDict()
+        self._reconcile_task: Optional[asyncio.Task] = None
+        self.stats = {
+            "events_applied": 0,
+            "duplicate_events": 0,
+            "reconciliations": 0,
+            "reconcile_failures": 0,
+            "last_reconcile_ms": 0.0
+        }
+
+    def get_subscription_patterns(self) -> List[str]:
+        return list(AUDIT_EVENT_TYPES)
+
+    async def can_handle(self, event: BaseEvent) -> bool:
+        return event.event_type in AUDIT_EVENT_TYPES
+
+    # ------------------------------------------------------------------
+    # Event ingestion
+    # ------------------------------------------------------------------
+
+    async def handle(self, event: BaseEvent) -> bool:
+        """Fold one event into the counters and activity feed."""
+        if event.event_id in self._seen_events:
+            # Redelivery after a handler retry
+            self.stats["duplicate_events"] += 1
+            return True
+
+        audit_type = AUDIT_EVENT_TYPES.get(event.event_type) or getattr(event, "log_type", None)
+        if not audit_type:
+            return True
+
+        counts = {audit_type: 1, TOTAL_AUDIT_EVENTS: 1}
+        totals: Dict[str, int] = {}
+        if event.event_type == "patient.created":
+            counts[PATIENTS_CREATED] = 1
+            totals[PATIENTS_TOTAL] = 1
+
+        try:
+            await self.store.apply(hour_bucket(event.timestamp), counts, totals, self._activity(event, audit_type))
+        except Exception as e:
+            logger.error("Dashboard projection update failed", event_type=event.event_type, error=str(e))
+            return False
+
+        self._seen_events[event.event_id] = None
+        if len(self._seen_events) > 10000:
+            self._seen_events.popitem(last=False)
+        self.stats["events_applied"] += 1
+        return True
+
+    @staticmethod
+    def _activity(event: BaseEvent, audit_type: str) -> Dict[str, Any]:
+        if event.event_type == "security.violation_detected":
+            action, outcome = event.violation_type, "critical" if event.severity == "critical" else "failure"
+            resource_type, resource_id = event.resource_type, event.resource_id
+        elif event.event_type == "audit.log_created":
+            action, outcome = event.action, event.outcome
+            resource_type, resource_id = event.resource_type, event.resource_id
+        else:
+            action = getattr(event, "access_method", None) or event.event_type.split(".")[-1]
+            outcome = "success"
+            resource_type, resource_id = "patient", getattr(event, "patient_id", None)
+
+        user_id = getattr(event, "user_id", None) or getattr(event, "created_by_user_id", None)
+        return {
+            "id": event.event_id,
+            "event_type": audit_type,
+            "action": action,
+            "outcome": outcome,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "user_id": user_id,
+            "timestamp": _utc_naive(event.timestamp).isoformat()
+        }
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def is_ready(self) -> bool:
+        """True once the projection has been reconciled with the database."""
+        return "reconciled_at" in await self.store.get_totals()
+
+    async def get_counts(self, names: Iterable[str], hours: int) -> Dict[str, int]:
+        """Counter sums over the last ``hours`` hourly buckets (current hour included)."""
+        current = hour_bucket(datetime.utcnow())
+        return await self.store.window_sums(list(names), list(range(current - hours + 1, current + 1)))
+
+    async def get_totals(self) -> Dict[str, int]:
+        """Absolute counters such as the patient total."""
+        return await self.store.get_totals()
+
+    async def get_recent_activities(
+        self,
+        limit: int,
+        event_types: Optional[Iterable[str]],
+        hours: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Newest activity records of ``event_types`` (all when None) in the window.
+
+        Returns None when the trimmed list cannot answer completely - it is full
+        and its oldest record is still inside the window - so the caller can
+        query the audit log instead.
+        """
+        cutoff = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+        wanted = set(event_types) if event_types else None
+        activities = await self.store.get_activities()
+
+        matched = [
+            activity for activity in activities
+            if activity["timestamp"] >= cutoff and (wanted is None or activity["event_type"] in wanted)
+        ]
+        if len(matched) >= limit:
+            return matched[:limit]
+        if len(activities) >= self.max_activities and activities[-1]["timestamp"] >= cutoff:
+            return None
+        return matched
+
+    # ------------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------------
+
+    async def reconcile(self, db) -> None:
+        """Rebuild all counters and the activity feed from the database."""
+        start = time.perf_counter()
+        since = datetime.utcnow() - timedelta(hours=RETENTION_HOURS)
+        counts: Dict[str, Dict[int, int]] = {}
+
+        def add(name: str, hour_start: datetime, amount: int) -> None:
+            buckets = counts.setdefault(name, {})
+            hour = hour_bucket(hour_start)
+            buckets[hour] = buckets.get(hour, 0) + amount
+
+        audit_hour = func.date_trunc("hour", AuditLog.timestamp)
+        result = await db.execute(
+            select(AuditLog.event_type, audit_hour, func.count(AuditLog.id))
+            .where(AuditLog.timestamp >= since)
+            .group_by(AuditLog.event_type, audit_hour)
+        )
+        for event_type, hour_start, amount in result.all():
+            add(_audit_value(event_type), hour_start, amount)
+            add(TOTAL_AUDIT_EVENTS, hour_start, amount)
+
+        patient_hour = func.date_trunc("hour", Patient.created_at)
+        result = await db.execute(
+            select(patient_hour, func.count(Patient.id))
+            .where(Patient.created_at >= since, Patient.soft_deleted_at.is_(None))
+            .group_by(patient_hour)
+        )
+        for hour_start, amount in result.all():
+            add(PATIENTS_CREATED, hour_start, amount)
+
+        total_result = await db.execute(
+            select(func.count(Patient.id)).where(Patient.soft_deleted_at.is_(None))
+        )
+        recent_result = await db.execute(
+            select(AuditLog).order_by(AuditLog.timestamp.desc()).limit(self.max_activities)
+        )
+        activities = [activity_record(log) for log in recent_result.scalars().all()]
+
+        await self.store.load(
+            counts,
+            {PATIENTS_TOTAL: total_result.scalar() or 0, "reconciled_at": int(time.time())},
+            activities
+        )
+        self.stats["reconciliations"] += 1
+        self.stats["last_reconcile_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.info("Dashboard projection reconciled",
+                   counters=len(counts), activities=len(activities),
+                   duration_ms=self.stats["last_reconcile_ms"])
+
+    async def connect_redis(self, redis_url: str) -> bool:
+        """Move the state to Redis so all workers share it; stays in memory on failure."""
+        try:
+            client = redis.from_url(redis_url, encoding="utf-8", decode_responses=True)
+            await client.ping()
+        except Exception as e:
+            logger.warning("Redis unavailable, dashboard projection kept in memory", error=str(e))
+            return False
+        self.store = RedisProjectionStore(client, self.max_activities)
+        return True
+
+    async def start(self, session_factory) -> None:
+        """Reconcile now and then every interval in the background."""
+        if self._reconcile_task is None:
+            self._reconcile_task = asyncio.create_task(
+                self._run_reconciliation(session_factory), name="dashboard-projection-reconcile"
+            )
+
+    async def stop(self) -> None:
+        """Stop the reconciliation job."""
+        task, self._reconcile_task = self._reconcile_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _run_reconciliation(self, session_factory) -> None:
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.reconcile(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["reconcile_failures"] += 1
+                logger.error("Dashboard projection reconciliation failed", error=str(e))
+            await asyncio.sleep(self.reconcile_interval_seconds)
+
+
+# Global projection instance
+_dashboard_projection: Optional[DashboardProjection] = None
+
+
+def get_dashboard_projection() -> DashboardProjection:
+    """Process-wide dashboard projection (in memory until connect_redis succeeds)."""
+    global _dashboard_projection
+    if _dashboard_projection is None:
+        settings = get_settings()
+        _dashboard_projection = DashboardProjection(
+            max_activities=settings.DASHBOARD_PROJECTION_MAX_ACTIVITIES,
+            reconcile_interval_seconds=settings.DASHBOARD_RECONCILE_INTERVAL_SECONDS
+        )
+    return _dashboard_projection
+
@@ -11,7 +11,7 @@ from typing import Optional, List
 from datetime import datetime
 import structlog
 
-from app.core.database_unified import get_db
+from app.core.database_unified import get_db_readonly
 from app.core.security import get_current_user_id, require_role
 from app.modules.dashboard.service import get_dashboard_service
 from app.modules.dashboard.schemas import (
@@ -33,7 +33,7 @@ async def bulk_dashboard_refresh(
     request: BulkRefreshRequest,
     current_user_id: str = Depends(get_current_user_id),
     _: dict = Depends(require_role("user")),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get all dashboard data in a single optimized API call with authentication.
@@ -67,7 +67,7 @@ async def bulk_dashboard_refresh(
 async def get_dashboard_stats(
     current_user_id: str = Depends(get_current_user_id),
     _: dict = Depends(require_role("user")),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get core dashboard statistics with authentication."""
     try:
@@ -92,7 +92,7 @@ async def get_dashboard_activities(
     time_range_hours: int = Query(default=24, ge=1, le=168, description="Time range in hours"),
     current_user_id: str = Depends(get_current_user_id),
     _: dict = Depends(require_role("user")),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get recent dashboard activities with authentication."""
     try:
@@ -124,7 +124,7 @@ async def get_dashboard_activities(
 async def get_dashboard_alerts(
     time_range_hours: int = Query(default=24, ge=1, le=168, description="Time range in hours"),
     current_user_id: str = Depends(get_current_user_id),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get dashboard alerts."""
     try:
@@ -8,6 +8,7 @@ data from multiple services in single API calls.
 import asyncio
 import time
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text, and_, or_
@@ -20,6 +21,9 @@ from app.core.database import get_db
 from app.core.database_unified import (
     AuditLog, Patient, APIEndpoint, SystemConfiguration, BaseModel, AuditEventType
 )
+from app.modules.dashboard.projection import (
+    PATIENTS_CREATED, PATIENTS_TOTAL, TOTAL_AUDIT_EVENTS, get_dashboard_projection
+)
 from app.modules.dashboard.schemas import (
     DashboardStats, DashboardActivities, DashboardAlerts, DashboardActivity,
     DashboardAlert, BulkDashboardResponse, BulkRefreshRequest, SystemHealthSummary,
@@ -27,11 +31,21 @@ from app.modules.dashboard.schemas import (
 )
 from app.modules.iris_api.service import iris_service
 from app.modules.audit_logger.service import audit_service
+from app.core.query_fanout import FanOutQuery, SessionScope, fan_out
 from app.core.soc2_circuit_breaker import soc2_breaker_registry, CircuitBreakerConfig, SOC2CircuitBreakerException
 from app.core.soc2_backup_systems import soc2_backup_orchestrator
 
 logger = structlog.get_logger()
 
+# Activity filter categories -> audit event types
+ACTIVITY_CATEGORY_EVENT_TYPES = {
+    "security": [AuditEventType.USER_LOGIN_FAILED, AuditEventType.SECURITY_VIOLATION],
+    "phi": [AuditEventType.PHI_ACCESSED, AuditEventType.PHI_CREATED, AuditEventType.PHI_UPDATED],
+    "admin": [AuditEventType.USER_CREATED, AuditEventType.USER_UPDATED],
+    "system": [AuditEventType.SYSTEM_ACCESS, AuditEventType.CONFIG_CHANGED],
+    "compliance": [AuditEventType.CONSENT_GRANTED, AuditEventType.CONSENT_WITHDRAWN]
+}
+
 
 class DashboardService:
     """High-performance dashboard data aggregation service."""
@@ -49,9 +63,16 @@ class DashboardService:
             "cache_hits": 0,
             "cache_misses": 0,
             "avg_response_time": 0.0,
-            "errors": 0
+            "errors": 0,
+            "projection_reads": 0
         }
         
+        # Opens the per-query sessions of bulk refreshes; None routes like get_db_readonly
+        self.session_scope: Optional[SessionScope] = None
+        
+        # Event-driven counters and activity feed; None aggregates the database on every miss
+        self.projection = get_dashboard_projection() if self.settings.DASHBOARD_PROJECTION_ENABLED else None
+        
         # SOC2 Circuit Breakers for critical components
         self.soc2_circuit_breakers = {
             "dashboard_stats": soc2_breaker_registry.register_breaker(
@@ -95,7 +116,12 @@ class DashboardService:
         request: BulkRefreshRequest,
         db: AsyncSession
     ) -> BulkDashboardResponse:
-        """Get all dashboard data in a single optimized API call."""
+        """
+        Get all dashboard data in a single optimized API call.
+        
+        Sections are read concurrently, each on its own pooled read-only
+        session (see fan_out); ``db`` is not used for them.
+        """
         start_time = time.time()
         self.metrics["requests_count"] += 1
         
@@ -110,45 +136,47 @@ class DashboardService:
             
             self.metrics["cache_misses"] += 1
             
-            # Execute data gathering sequentially to avoid database session conflicts
-            stats = None
-            activities = None
-            alerts = None
+            # Independent reads run concurrently, each on its own pooled session;
+            # SOC2 circuit breakers and fallbacks turn failures into partial results
+            queries = []
+            if request.include_stats:
+                queries.append(FanOutQuery(
+                    "patient_stats", self._get_patient_stats,
+                    breaker=self.soc2_circuit_breakers["dashboard_stats"]
+                ))
+                queries.append(FanOutQuery(
+                    "security_summary", self._get_security_summary,
+                    breaker=self.soc2_circuit_breakers["security_summary"],
+                    fallback=lambda error: self._get_mock_security_summary()
+                ))
+            if request.include_activities:
+                queries.append(FanOutQuery(
+                    "activities",
+                    lambda session: self._get_dashboard_activities(
+                        session, request.activity_limit, request.activity_categories, request.time_range_hours
+                    ),
+                    breaker=self.soc2_circuit_breakers["dashboard_activities"],
+                    fallback=self._activities_fallback
+                ))
+            if request.include_alerts:
+                queries.append(FanOutQuery(
+                    "alerts", lambda session: self._get_dashboard_alerts(session, request.time_range_hours)
+                ))
             
-            # SOC2: Use circuit breakers for resilient data fetching
+            gathered = await fan_out(queries, session_scope=self.session_scope)
+            
+            stats = None
             if request.include_stats:
-                try:
-                    stats = await self.soc2_circuit_breakers["dashboard_stats"].call(
-                        self._get_dashboard_stats, db
-                    )
-                except SOC2CircuitBreakerException as e:
-                    logger.warning("SOC2: Dashboard stats circuit breaker open, using backup", error=str(e))
+                if "patient_stats" in gathered.errors:
+                    logger.warning("SOC2: Dashboard stats unavailable, using backup",
+                                   reason=gathered.errors["patient_stats"])
                     stats = await self._get_mock_dashboard_stats()
-                except Exception as e:
-                    logger.error("SOC2: Dashboard stats failed completely", error=str(e))
-                    stats = None
-            
-            if request.include_activities:
-                try:
-                    activities = await self.soc2_circuit_breakers["dashboard_activities"].call(
-                        self._get_dashboard_activities,
-                        db, request.activity_limit, request.activity_categories, request.time_range_hours
+                else:
+                    stats = await self._build_dashboard_stats(
+                        gathered["patient_stats"], gathered["security_summary"]
                     )
-                except SOC2CircuitBreakerException as e:
-                    logger.critical("SOC2: CRITICAL - Activities circuit breaker open, activating backup systems", error=str(e))
-                    # SOC2: Activate backup systems for critical audit logging failure
-                    await soc2_backup_orchestrator.activate_backup_systems("dashboard_activities_circuit_open")
-                    activities = await self._get_empty_activities()
-                except Exception as e:
-                    logger.critical("SOC2: CRITICAL - Activities failed completely", error=str(e))
-                    activities = None
-            
-            if request.include_alerts:
-                try:
-                    alerts = await self._get_dashboard_alerts(db, request.time_range_hours)
-                except Exception as e:
-                    logger.error("Failed to get dashboard alerts", error=str(e))
-                    alerts = None
+            activities = gathered.results.get("activities")
+            alerts = gathered.results.get("alerts")
             
             # Create response
             response = BulkDashboardResponse(
@@ -158,13 +186,16 @@ class DashboardService:
                 metadata={
                     "generation_time_ms": round((time.time() - start_time) * 1000, 2),
                     "cache_status": "miss",
-                    "data_sources": ["database", "iris_api", "audit_logs"]
+                    "data_sources": ["database", "iris_api", "audit_logs"],
+                    "query_time_ms": gathered.durations_ms,
+                    "fallbacks": gathered.errors
                 },
                 cache_expires_at=datetime.utcnow() + timedelta(seconds=self.cache_ttl)
             )
             
-            # Cache the response
-            await self._set_cache(cache_key, response.dict(), self.cache_ttl)
+            # Cache complete responses only; a partial one is retried on the next request
+            if not gathered.partial:
+                await self._set_cache(cache_key, response.dict(), self.cache_ttl)
             
             # Update performance metrics
             response_time = time.time() - start_time
@@ -183,11 +214,6 @@ class DashboardService:
             # Execute queries sequentially to avoid session conflicts
             patient_stats = await self._get_patient_stats(db)
             
-            # Skip problematic services for now and use mock data
-            system_health = await self._get_mock_system_health()
-            iris_summary = await self._get_mock_iris_integration()
-            compliance_scores = await self._get_mock_compliance_scores()
-            
             # Get security summary separately to avoid transaction conflicts
             try:
                 security_summary = await self._get_security_summary(db)
@@ -195,27 +221,54 @@ class DashboardService:
                 logger.error("Security summary failed, using mock", error=str(e))
                 security_summary = await self._get_mock_security_summary()
             
-            # Calculate system uptime
-            uptime_percentage = system_health.overall_percentage
-            
-            return DashboardStats(
-                total_patients=patient_stats["total"],
-                total_patients_change=patient_stats["change"],
-                system_uptime_percentage=uptime_percentage,
-                compliance_score=compliance_scores["overall"],
-                compliance_details=compliance_scores["details"],
-                security_events_today=security_summary.security_events_today,
-                security_summary=security_summary,
-                system_health=system_health,
-                iris_integration=iris_summary
-            )
+            return await self._build_dashboard_stats(patient_stats, security_summary)
             
         except Exception as e:
             logger.error("Failed to get dashboard stats", error=str(e))
             raise
     
+    async def _build_dashboard_stats(
+        self,
+        patient_stats: Dict[str, Any],
+        security_summary: SecuritySummary
+    ) -> DashboardStats:
+        """Assemble dashboard statistics from patient stats and the security summary."""
+        # Skip problematic services for now and use mock data
+        system_health = await self._get_mock_system_health()
+        iris_summary = await self._get_mock_iris_integration()
+        compliance_scores = await self._get_mock_compliance_scores()
+        
+        # Calculate system uptime
+        uptime_percentage = system_health.overall_percentage
+        
+        return DashboardStats(
+            total_patients=patient_stats["total"],
+            total_patients_change=patient_stats["change"],
+            system_uptime_percentage=uptime_percentage,
+            compliance_score=compliance_scores["overall"],
+            compliance_details=compliance_scores["details"],
+            security_events_today=security_summary.security_events_today,
+            security_summary=security_summary,
+            system_health=system_health,
+            iris_integration=iris_summary
+        )
+    
+    async def _activities_fallback(self, error: BaseException) -> Optional[DashboardActivities]:
+        """Activities when the fanned-out query failed."""
+        if isinstance(error, SOC2CircuitBreakerException):
+            logger.critical("SOC2: CRITICAL - Activities circuit breaker open, activating backup systems", error=str(error))
+            # SOC2: Activate backup systems for critical audit logging failure
+            await soc2_backup_orchestrator.activate_backup_systems("dashboard_activities_circuit_open")
+            return await self._get_empty_activities()
+        logger.critical("SOC2: CRITICAL - Activities failed completely", error=str(error))
+        return None
+    
     async def _get_patient_stats(self, db: AsyncSession) -> Dict[str, Any]:
         """Get patient statistics with change indicators."""
+        projected = await self._get_projected_patient_stats()
+        if projected is not None:
+            return projected
+        
         try:
             # Current count
             total_result = await db.execute(
@@ -336,6 +389,10 @@ class DashboardService:
     
     async def _get_security_summary(self, db: AsyncSession) -> SecuritySummary:
         """Get security events summary."""
+        projected = await self._get_projected_security_summary()
+        if projected is not None:
+            return projected
+        
         try:
             now = datetime.utcnow()
             # Use 30 days ago to capture all test data
@@ -460,33 +517,22 @@ class DashboardService:
     ) -> DashboardActivities:
         """Get recent dashboard activities."""
         try:
-            cutoff_time = datetime.utcnow() - timedelta(hours=time_range_hours)
+            event_types = []
+            for category in categories or []:
+                event_types.extend(ACTIVITY_CATEGORY_EVENT_TYPES.get(category, []))
             
-            # Build query
-            query = select(AuditLog).where(AuditLog.timestamp >= cutoff_time)
-            
-            if categories:
-                # Map categories to event types
-                category_mapping = {
-                    "security": [AuditEventType.USER_LOGIN_FAILED, AuditEventType.SECURITY_VIOLATION],
-                    "phi": [AuditEventType.PHI_ACCESSED, AuditEventType.PHI_CREATED, AuditEventType.PHI_UPDATED],
-                    "admin": [AuditEventType.USER_CREATED, AuditEventType.USER_UPDATED],
-                    "system": [AuditEventType.SYSTEM_ACCESS, AuditEventType.CONFIG_CHANGED],
-                    "compliance": [AuditEventType.CONSENT_GRANTED, AuditEventType.CONSENT_WITHDRAWN]
-                }
-                
-                event_types = []
-                for category in categories:
-                    if category in category_mapping:
-                        event_types.extend(category_mapping[category])
+            audit_logs = await self._get_projected_activity_logs(limit, event_types, time_range_hours)
+            if audit_logs is None:
+                cutoff_time = datetime.utcnow() - timedelta(hours=time_range_hours)
                 
+                # Build query
+                query = select(AuditLog).where(AuditLog.timestamp >= cutoff_time)
                 if event_types:
                     query = query.where(AuditLog.event_type.in_(event_types))
-            
-            query = query.order_by(AuditLog.timestamp.desc()).limit(limit)
-            
-            result = await db.execute(query)
-            audit_logs = result.scalars().all()
+                query = query.order_by(AuditLog.timestamp.desc()).limit(limit)
+                
+                result = await db.execute(query)
+                audit_logs = result.scalars().all()
             
             # Convert to dashboard activities
             activities = []
@@ -537,15 +583,21 @@ class DashboardService:
             cutoff_time = datetime.utcnow() - timedelta(hours=time_range_hours)
             
             # Check for excessive failed logins
-            failed_logins = await db.execute(
-                select(func.count(AuditLog.id)).where(
-                    and_(
-                        AuditLog.timestamp >= cutoff_time,
-                        AuditLog.event_type == AuditEventType.USER_LOGIN_FAILED
+            projected = await self._get_projected_counts(
+                [AuditEventType.USER_LOGIN_FAILED.value], time_range_hours
+            )
+            if projected is not None:
+                failed_count = projected[AuditEventType.USER_LOGIN_FAILED.value]
+            else:
+                failed_logins = await db.execute(
+                    select(func.count(AuditLog.id)).where(
+                        and_(
+                            AuditLog.timestamp >= cutoff_time,
+                            AuditLog.event_type == AuditEventType.USER_LOGIN_FAILED
+                        )
                     )
                 )
-            )
-            failed_count = failed_logins.scalar() or 0
+                failed_count = failed_logins.scalar() or 0
             
             if failed_count > 10:
                 alerts.append(DashboardAlert(
@@ -581,6 +633,96 @@ class DashboardService:
                 unacknowledged_count=0
             )
     
+    # Projection reads - None whenever the database must be queried instead
+    
+    async def _projection_ready(self) -> bool:
+        """Whether the event-driven projection can serve reads."""
+        if self.projection is None:
+            return False
+        try:
+            return await self.projection.is_ready()
+        except Exception as e:
+            logger.warning("Dashboard projection unavailable, querying database", error=str(e))
+            return False
+    
+    async def _get_projected_counts(self, names: List[str], hours: int) -> Optional[Dict[str, int]]:
+        """Projected counter sums over the last ``hours`` hours."""
+        if not await self._projection_ready():
+            return None
+        try:
+            counts = await self.projection.get_counts(names, hours)
+        except Exception as e:
+            logger.warning("Dashboard projection read failed, querying database", error=str(e))
+            return None
+        self.metrics["projection_reads"] += 1
+        return counts
+    
+    async def _get_projected_patient_stats(self) -> Optional[Dict[str, Any]]:
+        """Patient statistics from the projection."""
+        counts = await self._get_projected_counts([PATIENTS_CREATED], 7 * 24)
+        if counts is None:
+            return None
+        try:
+            total_patients = (await self.projection.get_totals()).get(PATIENTS_TOTAL, 0)
+        except Exception as e:
+            logger.warning("Dashboard projection read failed, querying database", error=str(e))
+            return None
+        
+        weekly_new = counts[PATIENTS_CREATED]
+        return {
+            "total": total_patients,
+            "change": f"+{weekly_new} this week" if weekly_new > 0 else "No new patients this week",
+            "weekly_new": weekly_new
+        }
+    
+    async def _get_projected_security_summary(self) -> Optional[SecuritySummary]:
+        """Security summary from the projection, over the same 30 days as the database path."""
+        failed_login = AuditEventType.USER_LOGIN_FAILED.value
+        violation = AuditEventType.SECURITY_VIOLATION.value
+        phi_accessed = AuditEventType.PHI_ACCESSED.value
+        user_created, user_updated = AuditEventType.USER_CREATED.value, AuditEventType.USER_UPDATED.value
+        counts = await self._get_projected_counts(
+            [failed_login, violation, phi_accessed, user_created, user_updated, TOTAL_AUDIT_EVENTS],
+            30 * 24
+        )
+        if counts is None:
+            return None
+        
+        return SecuritySummary(
+            security_events_today=counts[failed_login] + counts[violation],
+            failed_logins_24h=counts[failed_login],
+            phi_access_events=counts[phi_accessed],
+            admin_actions=counts[user_created] + counts[user_updated],
+            total_audit_events_24h=counts[TOTAL_AUDIT_EVENTS],
+            critical_alerts=0,  # Would query alerts table
+            compliance_score=98.5  # Mock compliance score
+        )
+    
+    async def _get_projected_activity_logs(
+        self,
+        limit: int,
+        event_types: List[AuditEventType],
+        time_range_hours: int
+    ) -> Optional[List[SimpleNamespace]]:
+        """Recent activity records from the projection, shaped like AuditLog rows."""
+        if not await self._projection_ready():
+            return None
+        try:
+            records = await self.projection.get_recent_activities(
+                limit, [event_type.value for event_type in event_types], time_range_hours
+            )
+        except Exception as e:
+            logger.warning("Dashboard projection read failed, querying database", error=str(e))
+            return None
+        if records is None:
+            return None
+        
+        self.metrics["projection_reads"] += 1
+        return [
+            SimpleNamespace(**{**record, "timestamp": datetime.fromisoformat(record["timestamp"])})
+            for record in records
+        ]
+    
     # Helper methods
     
     async def _return_none(self):
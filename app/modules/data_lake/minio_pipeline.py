@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple, Union
 import structlog
 import io
+import os
 import uuid
 
 # Handle optional data lake dependencies
@@ -771,6 +772,41 @@ class MLDataLakePipeline:
             )
             return False
     
+    async def upload_audit_archive(self, file_path: Union[str, "os.PathLike"], object_name: str) -> bool:
+        """
+        Upload an archived audit partition (Parquet) to the audit log bucket.
+        
+        Args:
+            file_path: Local Parquet archive
+            object_name: Object key within the audit bucket
+            
+        Returns:
+            True if upload successful
+        """
+        try:
+            if not self.minio_client:
+                await self.initialize_minio_client()
+            
+            bucket_name = self.config.buckets["audit-logs"]
+            await asyncio.to_thread(
+                self.minio_client.fput_object,
+                bucket_name,
+                object_name,
+                str(file_path),
+                content_type="application/vnd.apache.parquet"
+            )
+            
+            self.logger.info("Audit archive uploaded", bucket=bucket_name, object_name=object_name)
+            return True
+            
+        except Exception as e:
+            self.logger.error(
+                "Failed to upload audit archive",
+                object_name=object_name,
+                error=str(e)
+            )
+            return False
+    
     async def batch_upload_vector_embeddings(
         self,
         embeddings: List[Dict],
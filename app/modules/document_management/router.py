@@ -11,6 +11,8 @@ import uuid
 import structlog
 
 from app.core.database_unified import get_db
+from app.core.exceptions import UnauthorizedAccess
+from app.core.pagination import InvalidCursorError
 from app.core.security import get_current_user_id
 
 # Service imports for real implementation
@@ -245,4 +247,41 @@ async def download_document(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Document download failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/search", response_model=DocumentListResponse)
+async def search_documents(
+    search_request: DocumentSearchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id = Depends(get_current_user_id)
+):
+    """
+    Search documents with filtering and keyset pagination.
+    
+    Pass the returned next_cursor back as cursor to fetch the next page;
+    set count_mode to "estimated" or "none" to skip the exact count.
+    """
+    try:
+        document_service = get_document_service()
+        
+        context = AccessContext(
+            user_id=str(current_user_id),
+            purpose="document_search"
+        )
+        
+        return await document_service.search_documents(
+            db=db,
+            search_request=search_request,
+            context=context
+        )
+        
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except UnauthorizedAccess:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    except Exception as e:
+        logger.error("Document search failed", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Document search failed"
+        )
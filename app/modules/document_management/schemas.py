@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 import structlog
 
 from app.core.database_unified import DocumentType, DocumentAction
+from app.core.pagination import CountMode
 
 logger = structlog.get_logger(__name__)
 
@@ -137,9 +138,11 @@ class DocumentListResponse(BaseModel):
     """Response schema for document list."""
     
     documents: List[DocumentMetadataResponse] = Field(..., description="List of documents")
-    total: int = Field(..., description="Total number of documents")
+    total: Optional[int] = Field(..., description="Total number of documents (None when count_mode is none)")
     offset: int = Field(..., description="Pagination offset")
     limit: int = Field(..., description="Pagination limit")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, None on the last page")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
     
     model_config = ConfigDict(
         json_encoders={
@@ -160,8 +163,10 @@ class DocumentSearchRequest(BaseModel):
     date_to: Optional[datetime] = Field(None, description="Filter to date")
     
     # Pagination
-    offset: int = Field(0, ge=0, description="Pagination offset")
+    offset: int = Field(0, ge=0, description="Pagination offset (ignored when cursor is set)")
     limit: int = Field(50, ge=1, le=1000, description="Pagination limit")
+    cursor: Optional[str] = Field(None, description="Keyset cursor from the previous page (uploaded_at sort only)")
+    count_mode: CountMode = Field(CountMode.EXACT, description="Total count mode: exact, estimated or none")
     
     # Sorting
     sort_by: str = Field("uploaded_at", description="Sort field")
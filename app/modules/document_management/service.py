@@ -24,6 +24,7 @@ from app.core.audit_logger import audit_logger, AuditEventType, AuditSeverity
 from app.core.exceptions import ValidationError, ResourceNotFound, UnauthorizedAccess
 from app.core.monitoring import trace_method, metrics
 from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from app.core.pagination import InvalidCursorError, fetch_keyset_page, resolve_total_count
 from app.core.events.event_bus import get_event_bus, HealthcareEventBus
 
 from .storage_backend import StorageBackendInterface, get_storage_backend
@@ -539,9 +540,6 @@ class DocumentStorageService:
             query = select(DocumentStorage).where(
                 DocumentStorage.soft_deleted_at.is_(None)
             )
-            count_query = select(func.count(DocumentStorage.id)).where(
-                DocumentStorage.soft_deleted_at.is_(None)
-            )
             
             # Apply filters
             if search_request.patient_id:
@@ -552,54 +550,64 @@ class DocumentStorageService:
                     raise UnauthorizedAccess("Access denied to patient records")
                 
                 query = query.where(DocumentStorage.patient_id == search_request.patient_id)
-                count_query = count_query.where(DocumentStorage.patient_id == search_request.patient_id)
             
             if search_request.document_types:
                 query = query.where(DocumentStorage.document_type.in_(search_request.document_types))
-                count_query = count_query.where(DocumentStorage.document_type.in_(search_request.document_types))
             
             if search_request.document_category:
                 query = query.where(DocumentStorage.document_category == search_request.document_category)
-                count_query = count_query.where(DocumentStorage.document_category == search_request.document_category)
             
             if search_request.tags:
                 # Search for documents that have any of the specified tags
                 query = query.where(DocumentStorage.tags.overlap(search_request.tags))
-                count_query = count_query.where(DocumentStorage.tags.overlap(search_request.tags))
             
             if search_request.search_text:
                 # Full-text search in extracted text
                 query = query.where(
                     DocumentStorage.extracted_text.ilike(f"%{search_request.search_text}%")
                 )
-                count_query = count_query.where(
-                    DocumentStorage.extracted_text.ilike(f"%{search_request.search_text}%")
-                )
             
             if search_request.date_from:
                 query = query.where(DocumentStorage.uploaded_at >= search_request.date_from)
-                count_query = count_query.where(DocumentStorage.uploaded_at >= search_request.date_from)
             
             if search_request.date_to:
                 query = query.where(DocumentStorage.uploaded_at <= search_request.date_to)
-                count_query = count_query.where(DocumentStorage.uploaded_at <= search_request.date_to)
-            
-            # Apply sorting
-            sort_field = getattr(DocumentStorage, search_request.sort_by)
-            if search_request.sort_order == "desc":
-                query = query.order_by(desc(sort_field))
-            else:
-                query = query.order_by(asc(sort_field))
             
-            # Apply pagination
-            query = query.offset(search_request.offset).limit(search_request.limit)
-            
-            # Execute queries
-            result = await db.execute(query)
-            documents = result.scalars().all()
+            total_count, total_is_estimate = await resolve_total_count(
+                db, query, search_request.count_mode, table_name="document_storage"
+            )
             
-            count_result = await db.execute(count_query)
-            total_count = count_result.scalar()
+            # Apply sorting and pagination
+            next_cursor = None
+            if search_request.sort_by == "uploaded_at":
+                # Seek on (uploaded_at, id) instead of scanning skipped rows
+                descending = search_request.sort_order == "desc"
+                page_query = query
+                if search_request.offset and not search_request.cursor:
+                    page_query = query.offset(search_request.offset)
+                documents, next_cursor = await fetch_keyset_page(
+                    db,
+                    page_query,
+                    DocumentStorage.uploaded_at,
+                    DocumentStorage.id,
+                    search_request.limit,
+                    cursor=search_request.cursor,
+                    descending=descending,
+                    scope=f"document_storage:uploaded_at:{'desc' if descending else 'asc'}"
+                )
+            else:
+                if search_request.cursor:
+                    raise InvalidCursorError("Cursor pagination requires sort_by=uploaded_at")
+                sort_field = getattr(DocumentStorage, search_request.sort_by)
+                if search_request.sort_order == "desc":
+                    query = query.order_by(desc(sort_field))
+                else:
+                    query = query.order_by(asc(sort_field))
+                
+                query = query.offset(search_request.offset).limit(search_request.limit)
+                
+                result = await db.execute(query)
+                documents = result.scalars().all()
             
             # Convert to response format
             document_responses = []
@@ -640,7 +648,9 @@ class DocumentStorageService:
                 documents=document_responses,
                 total=total_count,
                 offset=search_request.offset,
-                limit=search_request.limit
+                limit=search_request.limit,
+                next_cursor=next_cursor,
+                total_is_estimate=total_is_estimate
             )
             
         except Exception as e:
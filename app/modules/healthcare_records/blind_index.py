@@ -0,0 +1,305 @@
+"""
+Blind Indexes for Encrypted Patient Search
+
+Keyed HMAC blind indexes let equality and name-prefix searches over
+AES-GCM encrypted PHI run as B-tree index seeks. Values are normalized
+before hashing so formatting differences (case, punctuation, phone
+separators) do not change the index.
+"""
+
+import re
+import unicodedata
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import structlog
+from sqlalchemy import and_, delete, false, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database_unified import Patient, PatientSearchToken
+from app.core.security import EncryptionService
+
+logger = structlog.get_logger(__name__)
+
+# Bump when normalization or key derivation changes so the backfill re-indexes
+BLIND_INDEX_VERSION = 2
+
+NAME_TOKEN_MIN_PREFIX = 3
+NAME_TOKEN_MAX_LENGTH = 32
+NAME_INDEX_FIELDS = ("first_name", "last_name", "middle_name")
+
+# Search filter aliases accepted by search_patients and FHIR Patient search
+NAME_FILTER_FIELDS = {
+    "first_name": ("first_name",),
+    "given": ("first_name", "middle_name"),
+    "last_name": ("last_name",),
+    "family": ("last_name",),
+    "family_name": ("last_name",),
+    "name": NAME_INDEX_FIELDS,
+}
+DATE_OF_BIRTH_FILTERS = ("date_of_birth", "birth_date", "birthdate")
+PHONE_FILTERS = ("phone", "phone_number", "telecom")
+
+# Plaintext fields whose writes must refresh the blind indexes
+BLIND_INDEXED_FIELDS = ("mrn", "date_of_birth", "phone", "phone_number") + NAME_INDEX_FIELDS
+
+_NAME_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# FHIR date search prefixes - only equality can be served by a blind index
+_FHIR_DATE_PREFIX = re.compile(r"^(eq)(?=\d)")
+
+
+def normalize_mrn(value: Any) -> Optional[str]:
+    """Normalize an MRN: upper-case with whitespace removed."""
+    if value is None:
+        return None
+    normalized = "".join(str(value).split()).upper()
+    return normalized or None
+
+
+def tokenize_name(value: Any) -> List[str]:
+    """Split a name into accent-folded, lower-case alphanumeric tokens."""
+    if not value:
+        return []
+    folded = unicodedata.normalize("NFKD", str(value))
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).casefold()
+    return [token[:NAME_TOKEN_MAX_LENGTH] for token in _NAME_TOKEN_PATTERN.findall(folded)]
+
+
+def name_token_prefixes(token: str) -> List[str]:
+    """Expand a name token into the prefixes stored for prefix search."""
+    if len(token) <= NAME_TOKEN_MIN_PREFIX:
+        return [token]
+    return [token[:length] for length in range(NAME_TOKEN_MIN_PREFIX, len(token) + 1)]
+
+
+def normalize_date_of_birth(value: Any) -> Optional[str]:
+    """Normalize a date of birth to ISO YYYY-MM-DD."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text_value = _FHIR_DATE_PREFIX.sub("", str(value).strip())
+    try:
+        return date.fromisoformat(text_value[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def normalize_phone(value: Any) -> Optional[str]:
+    """Normalize a phone number to its last 10 digits."""
+    if not value:
+        return None
+    digits = re.sub(r"\D", "", str(value))
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def _index_equals(column: Any, index: Optional[str]) -> Any:
+    """Equality on a blind index column; unindexable input matches nothing, never NULL rows."""
+    return column == index if index else false()
+
+
+def _as_values(value: Any) -> List[Any]:
+    """Search filters may be scalars or lists of alternatives (FHIR)."""
+    if isinstance(value, (list, tuple, set)):
+        return [item for item in value if item not in (None, "")]
+    return [] if value in (None, "") else [value]
+
+
+class PatientBlindIndexer:
+    """Computes, stores and queries blind indexes for patient PHI."""
+
+    def __init__(self, encryption: EncryptionService):
+        self.encryption = encryption
+
+    def mrn_index(self, value: Any) -> Optional[str]:
+        return self.encryption.blind_index("mrn", normalize_mrn(value))
+
+    def date_of_birth_index(self, value: Any) -> Optional[str]:
+        return self.encryption.blind_index("date_of_birth", normalize_date_of_birth(value))
+
+    def phone_index(self, value: Any) -> Optional[str]:
+        return self.encryption.blind_index("phone", normalize_phone(value))
+
+    def name_token_indexes(self, value: Any) -> Set[str]:
+        """Blind indexes of every stored prefix of every token in a name."""
+        return {
+            self.encryption.blind_index("name", prefix)
+            for token in tokenize_name(value)
+            for prefix in name_token_prefixes(token)
+        }
+
+    async def index_patient(
+        self,
+        session: AsyncSession,
+        patient: Patient,
+        values: Dict[str, Any],
+        new_record: bool = False
+    ) -> None:
+        """
+        Update blind indexes for the plaintext values being written.
+
+        Only keys present in ``values`` are re-indexed, so partial updates
+        leave the other indexes untouched. The patient must already have an
+        id (flush first for new records).
+
+        Args:
+            session: Database session the patient belongs to
+            patient: Patient being written
+            values: Plaintext values keyed by field name
+            new_record: Skip deleting old name tokens for freshly inserted rows
+        """
+        if "mrn" in values:
+            patient.mrn_bidx = self.mrn_index(values["mrn"])
+        if "date_of_birth" in values:
+            patient.date_of_birth_bidx = self.date_of_birth_index(values["date_of_birth"])
+        for phone_field in ("phone", "phone_number"):
+            if phone_field in values:
+                patient.phone_bidx = self.phone_index(values[phone_field])
+
+        name_fields = [field for field in NAME_INDEX_FIELDS if field in values]
+        if name_fields and not new_record:
+            await session.execute(
+                delete(PatientSearchToken).where(
+                    PatientSearchToken.patient_id == patient.id,
+                    PatientSearchToken.field.in_(name_fields)
+                )
+            )
+        for field in name_fields:
+            session.add_all([
+                PatientSearchToken(patient_id=patient.id, field=field, token_bidx=token_bidx)
+                for token_bidx in self.name_token_indexes(values[field])
+            ])
+
+        if new_record:
+            patient.blind_index_version = BLIND_INDEX_VERSION
+
+    async def backfill_batch(
+        self,
+        session: AsyncSession,
+        batch_size: int,
+        after_id: Optional[Any],
+        results: Dict[str, Any]
+    ) -> Optional[Any]:
+        """
+        Index one keyset page of patients missing current blind indexes.
+
+        Patients with a field that fails to decrypt are skipped and keep
+        their old version, so the next backfill run retries them.
+
+        Args:
+            session: Database session; the page is committed before returning
+            batch_size: Rows fetched in this page
+            after_id: Last primary key of the previous page
+            results: Counters updated in place (patients_indexed, failed, errors)
+
+        Returns:
+            Last primary key processed, or None when no rows remain
+        """
+        query = select(Patient).where(
+            or_(
+                Patient.blind_index_version.is_(None),
+                Patient.blind_index_version < BLIND_INDEX_VERSION
+            )
+        ).order_by(Patient.id).limit(batch_size)
+        if after_id is not None:
+            query = query.where(Patient.id > after_id)
+
+        patients = (await session.execute(query)).scalars().all()
+        if not patients:
+            return None
+
+        # One batched decrypt for the whole page
+        decrypted_rows = await self.encryption.decrypt_rows(patients, [*NAME_INDEX_FIELDS, "date_of_birth"])
+
+        for patient, decrypted in zip(patients, decrypted_rows):
+            failed_fields = [field for field, value in decrypted.items() if value is None]
+            if failed_fields:
+                results["failed"] += 1
+                results["errors"].append({"id": str(patient.id), "error": f"decryption failed: {', '.join(failed_fields)}"})
+                logger.error("Failed to decrypt patient for blind index backfill", patient_id=str(patient.id), fields=failed_fields)
+                continue
+            try:
+                async with session.begin_nested():
+                    await self.index_patient(session, patient, {"mrn": patient.mrn, **decrypted})
+                    patient.blind_index_version = BLIND_INDEX_VERSION
+                results["patients_indexed"] += 1
+            except Exception as e:
+                results["failed"] += 1
+                results["errors"].append({"id": str(patient.id), "error": str(e)})
+                logger.error("Failed to backfill patient blind indexes", patient_id=str(patient.id), error=str(e))
+
+        await session.commit()
+        return patients[-1].id
+
+    def search_conditions(self, filters: Dict[str, Any]) -> List[Any]:
+        """
+        Translate PHI search filters into indexed blind-index conditions.
+
+        Args:
+            filters: Search filters; values may be scalars or lists of alternatives
+
+        Returns:
+            SQLAlchemy conditions to AND into the patient query
+        """
+        conditions = []
+
+        # Plain MRN equality covers rows written before the backfill ran
+        mrns = _as_values(filters.get("mrn"))
+        if mrns:
+            conditions.append(or_(*[
+                condition
+                for mrn in mrns
+                for condition in (_index_equals(Patient.mrn_bidx, self.mrn_index(mrn)), Patient.mrn == mrn)
+            ]))
+
+        identifiers = _as_values(filters.get("identifier"))
+        if identifiers:
+            conditions.append(or_(*[
+                condition
+                for identifier in identifiers
+                for condition in (
+                    _index_equals(Patient.mrn_bidx, self.mrn_index(identifier)),
+                    Patient.mrn == identifier,
+                    Patient.external_id == identifier
+                )
+            ]))
+
+        for filter_name in DATE_OF_BIRTH_FILTERS:
+            values = _as_values(filters.get(filter_name))
+            if values:
+                conditions.append(or_(*[
+                    _index_equals(Patient.date_of_birth_bidx, self.date_of_birth_index(value)) for value in values
+                ]))
+
+        for filter_name in PHONE_FILTERS:
+            values = _as_values(filters.get(filter_name))
+            if values:
+                conditions.append(or_(*[
+                    _index_equals(Patient.phone_bidx, self.phone_index(value)) for value in values
+                ]))
+
+        for filter_name, fields in NAME_FILTER_FIELDS.items():
+            values = _as_values(filters.get(filter_name))
+            if values:
+                conditions.append(or_(*[self._name_condition(value, fields) for value in values]))
+
+        return conditions
+
+    def _name_condition(self, value: Any, fields: Iterable[str]) -> Any:
+        """Every query token must prefix-match a token in one of ``fields``."""
+        tokens = tokenize_name(value)
+        if not tokens:
+            return false()
+        return and_(*[
+            Patient.id.in_(
+                select(PatientSearchToken.patient_id).where(
+                    PatientSearchToken.token_bidx == self.encryption.blind_index("name", token),
+                    PatientSearchToken.field.in_(list(fields))
+                )
+            )
+            for token in tokens
+        ])
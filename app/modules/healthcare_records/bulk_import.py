@@ -0,0 +1,525 @@
+"""
+High-Throughput Bulk Patient Import
+
+Streams patient records in chunks instead of creating them one at a time
+through create_patient. Each chunk is encrypted and blind-indexed on the
+PHI crypto thread pool while the previous chunk is being written. Rows go
+out with one COPY per table (asyncpg copy_records_to_table), or with
+multi-row INSERTs on drivers without COPY. The chunk's audit record is
+appended to the audit hash chain and is the resume checkpoint; it commits
+in the same transaction as the chunk's rows, so an interrupted import
+resumes exactly after the last committed chunk.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import structlog
+from sqlalchemy import Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database_unified import (
+    AuditEventType, AuditLog, Consent, ConsentStatus as DBConsentStatus,
+    DataClassification, Patient, PatientSearchToken, mark_primary_write
+)
+from app.core.security import EncryptionService, get_phi_crypto_executor
+from app.modules.audit_logger.chain_verification import append_audit_rows
+from app.modules.healthcare_records.blind_index import (
+    BLIND_INDEX_VERSION, NAME_INDEX_FIELDS, PatientBlindIndexer
+)
+
+logger = structlog.get_logger(__name__)
+
+BULK_IMPORT_AGGREGATE_TYPE = "PatientBulkImport"
+DEFAULT_CONSENT_TYPES = ("data_access", "treatment", "emergency_access")
+ENCRYPTED_FIELDS = ("first_name", "last_name", "date_of_birth", "ssn")
+# Same key context create_patient uses via _encrypt_field
+PHI_ENCRYPTION_CONTEXT = {"field_type": "phi"}
+
+PatientRecords = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+
+@dataclass
+class BulkImportCheckpoint:
+    """Position of the last committed chunk of an import job."""
+    job_id: str
+    chunks_committed: int = 0
+    records_consumed: int = 0
+
+
+@dataclass
+class BulkImportProgress:
+    """Progress reported after every committed chunk."""
+    job_id: str
+    chunk_index: int
+    records_consumed: int
+    successful: int
+    failed: int
+    elapsed_seconds: float
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_consumed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass
+class BulkImportResult:
+    """Outcome of a bulk import run."""
+    job_id: str
+    successful: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    checkpoint: Optional[BulkImportCheckpoint] = None
+    duration_ms: int = 0
+
+
+@dataclass
+class _PreparedChunk:
+    """Rows ready to write for one chunk."""
+    index: int
+    records_consumed: int
+    patients: List[Dict[str, Any]]
+    tokens: List[Dict[str, Any]]
+    errors: List[Dict[str, Any]]
+    positions: Dict[uuid.UUID, int] = field(default_factory=dict)
+
+
+def normalize_consent_status(consent_status: Any) -> str:
+    """Consent status enum or string as the stored lower-case value."""
+    if hasattr(consent_status, "value"):
+        return consent_status.value
+    return str(consent_status).lower() if consent_status else "pending"
+
+
+def normalize_consent_types(consent_types: Any) -> List[str]:
+    """Consent types as stored string values, always including data_access."""
+    if not consent_types:
+        return ["treatment", "data_access"]
+    result = [ct.value if hasattr(ct, "value") else str(ct).lower() for ct in consent_types]
+    # Always ensure data_access is included for enterprise compliance
+    if "data_access" not in result:
+        result.append("data_access")
+    return result
+
+
+def _apply_column_defaults(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill Python-side column defaults, which COPY does not apply."""
+    for column in table.columns:
+        if column.key in row or column.default is None:
+            continue
+        default = column.default
+        if default.is_scalar:
+            row[column.key] = default.arg
+        elif default.is_callable:
+            row[column.key] = default.arg(None)
+    return row
+
+
+async def _chunked(records: PatientRecords, size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Group sync or async record streams into lists of ``size``."""
+    chunk: List[Dict[str, Any]] = []
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class PatientBulkImporter:
+    """Chunked, pipelined patient import with COPY writes and per-chunk audit."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        encryption: EncryptionService,
+        blind_indexer: Optional[PatientBlindIndexer] = None,
+        chunk_size: Optional[int] = None,
+        use_copy: Optional[bool] = None
+    ):
+        settings = get_settings()
+        self.session = session
+        self.encryption = encryption
+        self.blind_indexer = blind_indexer or PatientBlindIndexer(encryption)
+        self.chunk_size = chunk_size or settings.PATIENT_BULK_IMPORT_CHUNK_SIZE
+        self.use_copy = settings.PATIENT_BULK_IMPORT_USE_COPY if use_copy is None else use_copy
+        self.workers = max(1, settings.PHI_DECRYPT_THREAD_POOL_SIZE)
+
+    async def load_checkpoint(self, job_id: str) -> Optional[BulkImportCheckpoint]:
+        """Latest committed checkpoint for a job, read from its chunk audit records."""
+        result = await self.session.execute(
+            select(AuditLog.config_metadata)
+            .where(
+                AuditLog.event_type == AuditEventType.PATIENT_BULK_IMPORTED.value,
+                AuditLog.aggregate_type == BULK_IMPORT_AGGREGATE_TYPE,
+                AuditLog.aggregate_id == job_id
+            )
+            .order_by(AuditLog.config_metadata["chunk_index"].as_integer().desc())
+            .limit(1)
+        )
+        metadata = result.scalar()
+        if not metadata:
+            return None
+        return BulkImportCheckpoint(
+            job_id=job_id,
+            chunks_committed=metadata["chunk_index"] + 1,
+            records_consumed=metadata["records_consumed"]
+        )
+
+    async def import_records(
+        self,
+        records: PatientRecords,
+        context: Any,
+        job_id: Optional[str] = None,
+        consent_grantor_id: Optional[uuid.UUID] = None,
+        resume: bool = True,
+        progress_callback: Optional[Callable[[BulkImportProgress], Union[None, Awaitable[None]]]] = None
+    ) -> BulkImportResult:
+        """
+        Import a stream of patient records.
+
+        Records must arrive in the same order on every run of a job so that
+        resuming can skip the ones already committed.
+
+        Args:
+            records: Iterable or async iterable of patient dicts (create_patient shape)
+            context: Access context of the importing user
+            job_id: Stable import job id; generated when omitted
+            consent_grantor_id: User recorded as granting default consents (None skips them)
+            resume: Continue after the job's last committed chunk
+            progress_callback: Called (sync or async) after every committed chunk
+
+        Returns:
+            BulkImportResult with counts, per-record errors and the final checkpoint
+        """
+        job_id = job_id or str(uuid.uuid4())
+        checkpoint = (await self.load_checkpoint(job_id) if resume else None) or BulkImportCheckpoint(job_id)
+        result = BulkImportResult(job_id=job_id, checkpoint=checkpoint)
+        start = time.perf_counter()
+
+        if checkpoint.records_consumed:
+            logger.info(
+                "Resuming bulk patient import",
+                job_id=job_id,
+                chunks_committed=checkpoint.chunks_committed,
+                records_consumed=checkpoint.records_consumed
+            )
+
+        chunk_index = checkpoint.chunks_committed
+        records_consumed = checkpoint.records_consumed
+        to_skip = checkpoint.records_consumed
+        pending: Optional[asyncio.Task] = None
+
+        try:
+            async for chunk in _chunked(records, self.chunk_size):
+                if to_skip:
+                    if to_skip >= len(chunk):
+                        to_skip -= len(chunk)
+                        continue
+                    chunk, to_skip = chunk[to_skip:], 0
+
+                records_consumed += len(chunk)
+                # Encrypt this chunk while the previous one is written
+                next_task = asyncio.create_task(self._prepare_chunk(chunk_index, records_consumed, chunk))
+                if pending is not None:
+                    await self._write_and_report(
+                        await pending, context, consent_grantor_id, result, start, progress_callback
+                    )
+                pending = next_task
+                chunk_index += 1
+
+            if pending is not None:
+                prepared, pending = await pending, None
+                await self._write_and_report(
+                    prepared, context, consent_grantor_id, result, start, progress_callback
+                )
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+        result.duration_ms = int((time.perf_counter() - start) * 1000)
+        logger.info(
+            "Bulk patient import completed",
+            operation_type="patient_import",
+            job_id=job_id,
+            successful=result.successful,
+            failed=result.failed,
+            records_consumed=result.checkpoint.records_consumed,
+            duration_ms=result.duration_ms
+        )
+        return result
+
+    async def _write_and_report(
+        self,
+        prepared: _PreparedChunk,
+        context: Any,
+        consent_grantor_id: Optional[uuid.UUID],
+        result: BulkImportResult,
+        start: float,
+        progress_callback: Optional[Callable[[BulkImportProgress], Union[None, Awaitable[None]]]]
+    ) -> None:
+        await self._write_chunk(prepared, context, consent_grantor_id, result.job_id)
+
+        result.successful += len(prepared.patients)
+        result.failed += len(prepared.errors)
+        result.errors.extend(prepared.errors)
+        result.checkpoint = BulkImportCheckpoint(
+            job_id=result.job_id,
+            chunks_committed=prepared.index + 1,
+            records_consumed=prepared.records_consumed
+        )
+
+        progress = BulkImportProgress(
+            job_id=result.job_id,
+            chunk_index=prepared.index,
+            records_consumed=prepared.records_consumed,
+            successful=result.successful,
+            failed=result.failed,
+            elapsed_seconds=time.perf_counter() - start
+        )
+        logger.info(
+            "Bulk import chunk committed",
+            job_id=result.job_id,
+            chunk_index=prepared.index,
+            inserted=len(prepared.patients),
+            rejected=len(prepared.errors),
+            records_per_second=round(progress.records_per_second, 1)
+        )
+        if progress_callback is not None:
+            outcome = progress_callback(progress)
+            if inspect.isawaitable(outcome):
+                await outcome
+
+    async def _prepare_chunk(
+        self,
+        chunk_index: int,
+        records_consumed: int,
+        records: List[Dict[str, Any]]
+    ) -> _PreparedChunk:
+        """
+        Encrypt and blind-index a chunk across the crypto thread pool.
+        
+        Runs concurrently with the previous chunk's write, so it must not
+        touch the session.
+        """
+        first_position = records_consumed - len(records)
+        positions, errors, seen = [], [], set()
+        for offset, record in enumerate(records):
+            mrn = record.get("mrn")
+            if mrn and mrn in seen:
+                errors.append(self._rejection(first_position + offset, record.get("external_id"), "Duplicate MRN in input"))
+                continue
+            if mrn:
+                seen.add(mrn)
+            positions.append(first_position + offset)
+        accepted = [records[position - first_position] for position in positions]
+
+        loop = asyncio.get_running_loop()
+        executor = get_phi_crypto_executor()
+        slice_size = max(1, -(-len(accepted) // self.workers))
+        slices = await asyncio.gather(*[
+            loop.run_in_executor(executor, self._build_rows, accepted[i:i + slice_size])
+            for i in range(0, len(accepted), slice_size)
+        ])
+
+        patients: List[Dict[str, Any]] = []
+        tokens: List[Dict[str, Any]] = []
+        for slice_patients, slice_tokens in slices:
+            patients.extend(slice_patients)
+            tokens.extend(slice_tokens)
+        return _PreparedChunk(
+            chunk_index,
+            records_consumed,
+            patients,
+            tokens,
+            errors,
+            {patient["id"]: position for patient, position in zip(patients, positions)}
+        )
+
+    @staticmethod
+    def _rejection(position: int, external_id: Optional[str], reason: str) -> Dict[str, Any]:
+        return {"position": position, "record": external_id or "unknown", "error": reason}
+
+    async def _drop_existing_mrns(self, prepared: _PreparedChunk) -> None:
+        """Reject rows whose MRN is already stored (checked just before the write)."""
+        mrns = [patient["mrn"] for patient in prepared.patients if patient["mrn"]]
+        if not mrns:
+            return
+        rows = await self.session.execute(select(Patient.mrn).where(Patient.mrn.in_(mrns)))
+        existing = set(rows.scalars().all())
+        if not existing:
+            return
+
+        dropped = set()
+        kept = []
+        for patient in prepared.patients:
+            if patient["mrn"] in existing:
+                dropped.add(patient["id"])
+                prepared.errors.append(self._rejection(
+                    prepared.positions[patient["id"]], patient["external_id"], "Duplicate MRN"
+                ))
+            else:
+                kept.append(patient)
+        prepared.patients = kept
+        prepared.tokens = [token for token in prepared.tokens if token["patient_id"] not in dropped]
+
+    def _build_rows(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Build patient and name-token rows (runs on the crypto thread pool)."""
+        encrypted = {
+            field_name: self.encryption.seal_many(
+                [record.get(field_name) for record in records], PHI_ENCRYPTION_CONTEXT
+            )
+            for field_name in ENCRYPTED_FIELDS
+        }
+
+        patients_table = Patient.__table__
+        tokens_table = PatientSearchToken.__table__
+        patients: List[Dict[str, Any]] = []
+        tokens: List[Dict[str, Any]] = []
+        for position, record in enumerate(records):
+            patient_id = uuid.uuid4()
+            phone = record.get("phone", record.get("phone_number"))
+            patients.append(_apply_column_defaults(patients_table, {
+                "id": patient_id,
+                "external_id": record.get("external_id"),
+                "mrn": record.get("mrn"),
+                "first_name_encrypted": encrypted["first_name"][position],
+                "last_name_encrypted": encrypted["last_name"][position],
+                "date_of_birth_encrypted": encrypted["date_of_birth"][position],
+                "ssn_encrypted": encrypted["ssn"][position] or None,
+                "mrn_bidx": self.blind_indexer.mrn_index(record.get("mrn")),
+                "date_of_birth_bidx": self.blind_indexer.date_of_birth_index(record.get("date_of_birth")),
+                "phone_bidx": self.blind_indexer.phone_index(phone),
+                "blind_index_version": BLIND_INDEX_VERSION,
+                "gender": record.get("gender"),
+                "tenant_id": record.get("tenant_id"),
+                "organization_id": record.get("organization_id"),
+                "data_classification": DataClassification.PHI,
+                "consent_status": {
+                    "status": normalize_consent_status(record.get("consent_status", "pending")),
+                    "types": normalize_consent_types(record.get("consent_types", ["treatment", "data_access"]))
+                }
+            }))
+            for field_name in NAME_INDEX_FIELDS:
+                for token_bidx in self.blind_indexer.name_token_indexes(record.get(field_name)):
+                    tokens.append(_apply_column_defaults(tokens_table, {
+                        "patient_id": patient_id,
+                        "field": field_name,
+                        "token_bidx": token_bidx
+                    }))
+        return patients, tokens
+
+    def _consent_rows(self, patients: List[Dict[str, Any]], grantor_id: uuid.UUID) -> List[Dict[str, Any]]:
+        """The default consents create_patient adds, for a whole chunk."""
+        consents_table = Consent.__table__
+        granted_at = datetime.now(timezone.utc)
+        return [
+            _apply_column_defaults(consents_table, {
+                "patient_id": patient["id"],
+                "consent_types": [consent_type],
+                "status": DBConsentStatus.GRANTED.value,
+                "purpose_codes": ["treatment"],
+                "data_types": ["phi"],
+                "effective_period_start": granted_at,
+                "legal_basis": "consent",
+                "consent_method": "electronic",
+                "granted_by": grantor_id
+            })
+            for patient in patients
+            for consent_type in DEFAULT_CONSENT_TYPES
+        ]
+
+    def _audit_row(self, prepared: _PreparedChunk, context: Any, job_id: str) -> Dict[str, Any]:
+        """One aggregated audit record per chunk; doubles as the resume checkpoint."""
+        patient_ids = [str(patient["id"]) for patient in prepared.patients]
+        return {
+            "id": uuid.uuid4(),
+            "timestamp": datetime.utcnow(),
+            "event_type": AuditEventType.PATIENT_BULK_IMPORTED.value,
+            "aggregate_id": job_id,
+            "aggregate_type": BULK_IMPORT_AGGREGATE_TYPE,
+            "user_id": str(context.user_id),
+            "resource_type": "Patient",
+            "action": "bulk_import",
+            "outcome": "success",
+            "ip_address": getattr(context, "ip_address", None),
+            "config_metadata": {
+                "chunk_index": prepared.index,
+                "records_consumed": prepared.records_consumed,
+                "inserted": len(patient_ids),
+                "rejected": len(prepared.errors),
+                "purpose": getattr(context, "purpose", None),
+                "patient_ids": patient_ids,
+                "patient_ids_sha256": hashlib.sha256(",".join(patient_ids).encode()).hexdigest()
+            },
+            "compliance_tags": ["HIPAA", "SOC2", "bulk_import"],
+            "data_classification": DataClassification.PHI
+        }
+
+    async def _write_chunk(
+        self,
+        prepared: _PreparedChunk,
+        context: Any,
+        consent_grantor_id: Optional[uuid.UUID],
+        job_id: str
+    ) -> None:
+        """Write a chunk and its audit record in one transaction."""
+        try:
+            await self._drop_existing_mrns(prepared)
+            await self._insert_rows(Patient.__table__, prepared.patients)
+            await self._insert_rows(PatientSearchToken.__table__, prepared.tokens)
+            if consent_grantor_id is not None:
+                await self._insert_rows(Consent.__table__, self._consent_rows(prepared.patients, consent_grantor_id))
+            await append_audit_rows(self.session, [self._audit_row(prepared, context, job_id)])
+            mark_primary_write()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            logger.error("Bulk import chunk failed", job_id=job_id, chunk_index=prepared.index)
+            raise
+
+    async def _insert_rows(self, table: Table, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        connection = await self.session.connection()
+        if self.use_copy and connection.dialect.driver == "asyncpg":
+            await self._copy_rows(connection, table, rows)
+        else:
+            # insertmanyvalues batches this into multi-row INSERT statements
+            await self.session.execute(insert(table), rows)
+        mark_primary_write()
+
+    @staticmethod
+    async def _copy_rows(connection: Any, table: Table, rows: List[Dict[str, Any]]) -> None:
+        """COPY rows in binary format on the session's own connection and transaction."""
+        dialect = connection.dialect
+        columns = [column for column in table.columns if column.key in rows[0]]
+        processors = [column.type.dialect_impl(dialect).bind_processor(dialect) for column in columns]
+        records = [
+            tuple(
+                processor(row[column.key]) if processor else row[column.key]
+                for column, processor in zip(columns, processors)
+            )
+            for row in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[column.name for column in columns]
+        )
@@ -55,6 +55,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database_unified import get_db, audit_change, Patient
 from app.core.security import get_current_user_id, EncryptionService
+from app.modules.healthcare_records.blind_index import PatientBlindIndexer
 from app.modules.healthcare_records.fhir_r4_resources import (
     FHIRResourceType, FHIRResourceFactory, fhir_resource_factory,
     FHIRAppointment, FHIRCarePlan, FHIRProcedure, BaseFHIRResource, FHIRPatient
@@ -338,6 +339,7 @@ class FHIRRestService:
         self.db = db_session
         self.resource_factory = fhir_resource_factory
         self.encryption = encryption_service or EncryptionService()
+        self.blind_indexer = PatientBlindIndexer(self.encryption)
     
     async def create_resource(self, resource_type: str, resource_data: Dict[str, Any], 
                             user_id: str) -> Tuple[Dict[str, Any], str]:
@@ -1126,10 +1128,31 @@ class FHIRRestService:
         
         self.db.add(patient)
         await self.db.flush()  # Get the ID
+        await self.blind_indexer.index_patient(
+            self.db,
+            patient,
+            {
+                "mrn": mrn,
+                "first_name": first_name,
+                "last_name": last_name,
+                "date_of_birth": birth_date_str,
+                "phone": self._extract_phone(fhir_patient)
+            },
+            new_record=True
+        )
         await self.db.commit()
         
         return patient
     
+    @staticmethod
+    def _extract_phone(fhir_patient: FHIRPatient) -> Optional[str]:
+        """Return the first phone ContactPoint value of a FHIR Patient"""
+        for contact in fhir_patient.telecom or []:
+            system = contact.get("system") if isinstance(contact, dict) else getattr(contact, "system", None)
+            if system == "phone":
+                return contact.get("value") if isinstance(contact, dict) else getattr(contact, "value", None)
+        return None
+    
     async def _fetch_patient_from_db(self, patient_id: str) -> Optional[Dict[str, Any]]:
         """Fetch Patient from database by ID"""
         try:
@@ -1202,18 +1225,22 @@ class FHIRRestService:
                 patient.gender = fhir_patient.gender.value
             
             # Update encrypted fields
+            index_values = {}
             if fhir_patient.name:
                 for name in fhir_patient.name:
                     if name.use == "official" or not patient.first_name_encrypted:
                         if name.given:
                             patient.first_name_encrypted = await self.encryption.encrypt(name.given[0])
+                            index_values["first_name"] = name.given[0]
                         if name.family:
                             patient.last_name_encrypted = await self.encryption.encrypt(name.family)
+                            index_values["last_name"] = name.family
                         break
             
             if fhir_patient.birth_date:
                 birth_date_str = fhir_patient.birth_date.isoformat()
                 patient.date_of_birth_encrypted = await self.encryption.encrypt(birth_date_str)
+                index_values["date_of_birth"] = birth_date_str
             
             # Update identifiers
             if fhir_patient.identifier:
@@ -1222,9 +1249,15 @@ class FHIRRestService:
                         for coding in ident.type["coding"]:
                             if coding.get("code") == "MR":
                                 patient.mrn = ident.value
+                                index_values["mrn"] = ident.value
                             elif coding.get("system") == "external":
                                 patient.external_id = ident.value
             
+            phone = self._extract_phone(fhir_patient)
+            if phone:
+                index_values["phone"] = phone
+            await self.blind_indexer.index_patient(self.db, patient, index_values)
+            
             # Update metadata
             patient.updated_by = safe_uuid_convert(user_id)
             patient.updated_at = datetime.now()
@@ -1292,17 +1325,10 @@ class FHIRRestService:
                 if patient_ids:
                     query = query.where(Patient.id.in_(patient_ids))
             
-            if "identifier" in search_params.parameters:
-                # Search by MRN or external_id
-                identifiers = search_params.parameters["identifier"]
-                identifier_conditions = []
-                for identifier in identifiers:
-                    identifier_conditions.extend([
-                        Patient.mrn == identifier,
-                        Patient.external_id == identifier
-                    ])
-                if identifier_conditions:
-                    query = query.where(or_(*identifier_conditions))
+            # identifier (MRN or external_id), name, given, family, birthdate and
+            # phone resolve through blind indexes over the encrypted columns
+            for condition in self.blind_indexer.search_conditions(search_params.parameters):
+                query = query.where(condition)
             
             if "gender" in search_params.parameters:
                 genders = search_params.parameters["gender"]
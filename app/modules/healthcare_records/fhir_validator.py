@@ -886,6 +886,15 @@ class FHIRValidator:
                 # If decoding fails, continue with other pattern checks
                 pass
         
+        # Compact binary v3 envelopes are base64 of a version-byte-prefixed payload
+        if len(field_str) >= 56 and field_str.startswith('A'):
+            try:
+                from app.core.security import ENVELOPE_V3
+                if base64.b64decode(field_str, validate=True)[:1] == bytes([ENVELOPE_V3]):
+                    return True
+            except (ValueError, TypeError):
+                pass
+        
         # Look for various other encrypted field patterns (backwards compatibility)
         encrypted_patterns = [
             r'\[ENCRYPTED:[A-Za-z0-9_]+\]',  # [ENCRYPTED:FieldName]
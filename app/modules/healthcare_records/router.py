@@ -18,6 +18,7 @@ from app.core.audit_logger import (
     log_security_violation, AuditContext, AuditEventType, AuditSeverity
 )
 from app.core.circuit_breaker import get_database_breaker, get_encryption_breaker
+from app.core.pagination import CountMode, InvalidCursorError
 from app.modules.healthcare_records.service import get_healthcare_service
 from app.modules.healthcare_records.schemas import (
     ClinicalDocumentCreate, ClinicalDocumentResponse, ClinicalDocumentUpdate,
@@ -673,8 +674,10 @@ async def search_patients_early(
     family_name: Optional[str] = Query(None, description="Search by family name"),
     gender: Optional[str] = Query(None, description="Search by gender"),
     organization_id: Optional[str] = Query(None, description="Search by organization"),
-    offset: int = Query(default=0, description="Records to skip"),
+    offset: int = Query(default=0, description="Records to skip (ignored when cursor is set)"),
     limit: int = Query(default=50, le=1000, description="Records limit"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    count: CountMode = Query(CountMode.EXACT, description="Total count mode: exact, estimated or none"),
     current_user_id: str = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
     _: dict = Depends(require_role("admin"))
@@ -704,13 +707,16 @@ async def search_patients_early(
         if gender:
             search_filters["gender"] = gender
         
-        # Use service layer search_patients method
-        patients, total_count = await service.patient_service.search_patients(
+        # Keyset pagination: pass next_cursor back to seek instead of OFFSET
+        page = await service.patient_service.search_patients_page(
             context=context,
             filters=search_filters,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor,
+            count_mode=count
         )
+        patients = page.items
         
         # Convert to response format
         response_patients = []
@@ -735,11 +741,15 @@ async def search_patients_early(
         
         return PatientListResponse(
             patients=response_patients,
-            total=total_count,
+            total=page.total_count,
             limit=limit,
-            offset=offset
+            offset=offset,
+            next_cursor=page.next_cursor,
+            total_is_estimate=page.count_is_estimate
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error("Failed to search patients", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to search patients")
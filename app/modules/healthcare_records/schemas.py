@@ -200,9 +200,11 @@ class PatientResponse(FHIRResource):
 class PatientListResponse(BaseModel):
     """Paginated response for patient list endpoints."""
     patients: List[PatientResponse]
-    total: int = Field(..., description="Total number of patients matching criteria")
+    total: Optional[int] = Field(..., description="Total number of patients matching criteria (None when count=none)")
     limit: int = Field(..., description="Maximum number of patients returned")
     offset: int = Field(..., description="Number of patients skipped")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, None on the last page")
+    total_is_estimate: bool = Field(False, description="Whether total is a planner estimate")
 
 
 # Clinical Document Aggregate Schemas
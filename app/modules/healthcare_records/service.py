@@ -9,12 +9,13 @@ import asyncio
 import json
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Set, Tuple
+from typing import Optional, List, Dict, Any, Set, Tuple, Callable
 from enum import Enum
 import hashlib
 from functools import wraps
 
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, cast
+from sqlalchemy.dialects.postgresql import JSONB
 
 def safe_uuid_convert(value) -> Optional[uuid.UUID]:
     """
@@ -50,6 +51,17 @@ import structlog
 
 from app.core.database_advanced import get_db
 from app.core.security import EncryptionService, hash_deterministic
+from app.modules.audit_logger.compliance_rollups import (
+    PHI_ACCESS_SOURCE,
+    get_compliance_rollup_store,
+    phi_access_statistics,
+)
+from app.modules.healthcare_records.blind_index import PatientBlindIndexer, BLIND_INDEXED_FIELDS
+from app.modules.healthcare_records.bulk_import import (
+    BulkImportProgress, PatientBulkImporter, PatientRecords,
+    normalize_consent_status, normalize_consent_types
+)
+from app.core.pagination import CountMode, KeysetPage, fetch_keyset_page, resolve_total_count
 from app.core.events.event_bus import get_event_bus, HealthcareEventBus
 from app.core.events.definitions import (
     PatientCreated as PatientCreatedEvent,
@@ -92,13 +104,13 @@ from app.schemas.fhir_r4 import (
 logger = structlog.get_logger(__name__)
 
 # Constants
-MAX_BATCH_SIZE = 100
 PHI_FIELDS = {
     'ssn', 'date_of_birth', 'first_name', 'last_name', 'middle_name',
     'address_line1', 'address_line2', 'city', 'postal_code',
     'phone_number', 'email', 'mrn'
 }
 AUDIT_RETENTION_DAYS = 2555  # 7 years for HIPAA
+PATIENT_SEARCH_CURSOR_SCOPE = "patients:created_at:desc"
 
 # Service uses the new event system from app.core.events
 # Old domain events replaced with centralized event definitions
@@ -284,6 +296,7 @@ class PatientService:
             config = CircuitBreakerConfig(name="PatientService")
             circuit_breaker = CircuitBreaker(config)
         self.circuit_breaker = circuit_breaker
+        self.blind_indexer = PatientBlindIndexer(encryption)
         self.logger = logger.bind(service="PatientService")
         # Flag to control automatic commits - used by FHIR bundle processor
         self._auto_commit = True
@@ -348,6 +361,14 @@ class PatientService:
             await self.session.flush()  # This generates the patient.id
             self.logger.info("Service: Patient ID generated", patient_id=str(patient.id))
             
+            # Blind indexes make the encrypted fields searchable
+            await self.blind_indexer.index_patient(
+                self.session,
+                patient,
+                {field: patient_data.get(field) for field in BLIND_INDEXED_FIELDS if field in patient_data},
+                new_record=True
+            )
+            
             # Create default consents
             self.logger.info("Service: Creating default consents")
             await self._create_default_consents(patient.id, context)
@@ -489,6 +510,12 @@ class PatientService:
             
             changed_fields.append(field)
         
+        await self.blind_indexer.index_patient(
+            self.session,
+            patient,
+            {field: updates[field] for field in BLIND_INDEXED_FIELDS if field in updates}
+        )
+        
         # Update FHIR resource if provided
         if 'fhir_data' in updates:
             fhir_patient = FHIRPatient(**updates['fhir_data'])
@@ -512,84 +539,109 @@ class PatientService:
         return patient
     
     @trace_method("search_patients")
-    @enforce_minimum_necessary_rule()
-    @audit_phi_access("search")
     async def search_patients(
         self,
         context: AccessContext,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 50,
-        offset: int = 0
-    ) -> Tuple[List[Patient], int]:
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Tuple[List[Patient], Optional[int]]:
         """Search patients with consent validation"""
+        page = await self.search_patients_page(
+            context=context,
+            filters=filters,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count_mode=count_mode
+        )
+        return page.items, page.total_count
+    
+    @trace_method("search_patients_page")
+    @enforce_minimum_necessary_rule()
+    @audit_phi_access("search")
+    async def search_patients_page(
+        self,
+        context: AccessContext,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> KeysetPage:
+        """
+        Search patients with consent validation and keyset pagination.
+        
+        Args:
+            context: Access context
+            filters: Search filters (tenant_id, mrn, identifier, names, DOB, phone, ssn)
+            limit: Page size
+            offset: Rows to skip when no cursor is given (legacy paging)
+            cursor: Opaque cursor from the previous page's next_cursor
+            count_mode: Exact count, planner estimate, or no count
+        
+        Returns:
+            KeysetPage of decrypted patients
+        """
         # Base query
         query = select(Patient).where(
             Patient.soft_deleted_at.is_(None)
         )
-        count_query = select(func.count(Patient.id)).where(
-            Patient.soft_deleted_at.is_(None)
-        )
         
         # Apply filters
         if filters:
             if 'tenant_id' in filters:
                 query = query.where(Patient.tenant_id == filters['tenant_id'])
-                count_query = count_query.where(
-                    Patient.tenant_id == filters['tenant_id']
-                )
             
-            if 'mrn' in filters:
-                # Search by encrypted MRN
-                encrypted_mrn = await self._encrypt_field(filters['mrn'])
-                query = query.where(Patient.mrn == encrypted_mrn)
-                count_query = count_query.where(Patient.mrn == encrypted_mrn)
+            # MRN, identifier, name, DOB and phone go through blind indexes -
+            # random GCM nonces make ciphertext equality useless for search
+            for condition in self.blind_indexer.search_conditions(filters):
+                query = query.where(condition)
             
             if 'ssn' in filters:
                 # Search by SSN hash
                 ssn_hash = hash_deterministic(filters['ssn'])
                 query = query.where(Patient.ssn_hash == ssn_hash)
-                count_query = count_query.where(Patient.ssn_hash == ssn_hash)
         
-        # Apply pagination
-        query = query.limit(limit).offset(offset)
+        # HIPAA consent validation runs inside the query, so the page and
+        # total_count only ever contain patients the caller may see
+        query = query.where(self._consent_granted_clause(ConsentType.DATA_ACCESS))
         
-        # Execute queries directly without nested transactions
-        result = await self.session.execute(query)
-        patients = result.scalars().all()
+        # Seek by (created_at, id) so deep pages cost the same as the first
+        page_query = query.offset(offset) if offset and not cursor else query
+        accessible_patients, next_cursor = await fetch_keyset_page(
+            self.session,
+            page_query,
+            Patient.created_at,
+            Patient.id,
+            limit,
+            cursor=cursor,
+            scope=PATIENT_SEARCH_CURSOR_SCOPE
+        )
         
-        count_result = await self.session.execute(count_query)
-        total_count = count_result.scalar()
-        
-        # HIPAA-COMPLIANT CONSENT VALIDATION
-        # *** CRITICAL SECURITY FIX ***
-        # Removed consent validation bypass - only proper consent validation allowed
-        # This ensures HIPAA compliance and prevents unauthorized PHI access
-        accessible_patients = []
-        for patient in patients:
-            try:
-                # Only allow access with proper consent validation - NO BYPASSES
-                # This ensures full HIPAA compliance for PHI access
-                consent_granted = await self._check_consent(
-                    patient.id,
-                    ConsentType.DATA_ACCESS,
-                    context
-                )
-                
-                if consent_granted:
-                    await self._decrypt_patient_fields(patient)
-                    accessible_patients.append(patient)
-                    logger.info(f"🛡️ CONSENT: Access granted for patient {patient.id} - consent validated")
-                else:
-                    # Log consent denial for HIPAA audit trail
-                    logger.warning(f"🚫 CONSENT: Access denied for patient {patient.id} - insufficient consent")
-                    # Note: Patient is excluded from results but not counted as error
-                    
-            except Exception as consent_error:
-                # Log consent validation errors for security audit
-                logger.error(f"❌ CONSENT: Validation failed for patient {patient.id}: {consent_error}")
-                # Patient excluded from results due to consent validation failure
-        
-        return accessible_patients, total_count
+        total_count, count_is_estimate = await resolve_total_count(
+            self.session, query, count_mode, table_name="patients"
+        )
+        
+        self.logger.info(
+            "Patient search consent filter applied",
+            returned=len(accessible_patients),
+            total_count=total_count,
+            count_mode=count_mode.value,
+            user_id=context.user_id
+        )
+        
+        # Decrypt the whole page at once instead of field-by-field on the event loop
+        await self._decrypt_patients_fields(accessible_patients)
+        
+        return KeysetPage(
+            items=accessible_patients,
+            next_cursor=next_cursor,
+            total_count=total_count,
+            count_is_estimate=count_is_estimate
+        )
     
     @trace_method("soft_delete_patient")
     @require_consent(ConsentType.DATA_DELETION)
@@ -630,55 +682,52 @@ class PatientService:
     @trace_method("bulk_import_patients")
     async def bulk_import_patients(
         self,
-        patient_records: List[Dict[str, Any]],
-        context: AccessContext
+        patient_records: PatientRecords,
+        context: AccessContext,
+        job_id: Optional[str] = None,
+        progress_callback: Optional[Callable[[BulkImportProgress], Any]] = None
     ) -> Dict[str, Any]:
-        """Bulk import patients with batch processing"""
-        if len(patient_records) > MAX_BATCH_SIZE:
-            raise ValidationError(
-                f"Batch size {len(patient_records)} exceeds maximum {MAX_BATCH_SIZE}"
-            )
-        
-        start_time = datetime.now(timezone.utc)
-        results = {
-            'successful': 0,
-            'failed': 0,
-            'errors': []
-        }
+        """
+        Bulk import patients through the chunked COPY import engine.
         
-        # Process in chunks to manage memory
-        for record in patient_records:
-            try:
-                await self.create_patient(record, context)
-                results['successful'] += 1
-            except Exception as e:
-                results['failed'] += 1
-                results['errors'].append({
-                    'record': record.get('external_id', 'unknown'),
-                    'error': str(e)
-                })
-                self.logger.error(
-                    "Failed to import patient",
-                    error=str(e),
-                    external_id=record.get('external_id')
-                )
+        Records are streamed in chunks, encrypted in parallel and written
+        with one aggregated audit record per chunk. Re-running with the same
+        job_id resumes after the last committed chunk. Unlike create_patient,
+        no per-patient domain events are published.
         
-        # Calculate duration
-        duration_ms = int(
-            (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-        )
+        Args:
+            patient_records: Iterable or async iterable of patient dicts
+            context: Access context of the importing user
+            job_id: Import job id for resuming an interrupted import
+            progress_callback: Called after every committed chunk
         
-        # Log bulk operation completion
-        self.logger.info(
-            "Bulk patient import completed",
-            operation_type="patient_import",
-            total_records=len(patient_records),
-            successful=results['successful'],
-            failed=results['failed'],
-            duration_ms=duration_ms
+        Returns:
+            Counts, per-record errors, job id and checkpoint
+        """
+        importer = PatientBulkImporter(self.session, self.encryption, self.blind_indexer)
+        grantor_id = await self._ensure_user_exists(context.user_id)
+        if not grantor_id:
+            logger.warning("Bulk import without valid user - default consents skipped", user_id=context.user_id)
+        
+        result = await importer.import_records(
+            patient_records,
+            context,
+            job_id=job_id,
+            consent_grantor_id=grantor_id,
+            progress_callback=progress_callback
         )
         
-        return results
+        return {
+            'successful': result.successful,
+            'failed': result.failed,
+            'errors': result.errors,
+            'job_id': result.job_id,
+            'checkpoint': {
+                'chunks_committed': result.checkpoint.chunks_committed,
+                'records_consumed': result.checkpoint.records_consumed
+            },
+            'duration_ms': result.duration_ms
+        }
     
     # Private methods
     async def _encrypt_field(self, value: Optional[str]) -> Optional[str]:
@@ -696,98 +745,67 @@ class PatientService:
     
     async def _decrypt_patient_fields(self, patient: Patient) -> None:
         """Decrypt all PHI fields on a patient"""
-        decryption_errors = []
-        
-        # Try to decrypt each field individually, continue on errors
-        try:
-            if patient.first_name_encrypted:
-                try:
-                    patient.first_name = await self.encryption.decrypt(
-                        patient.first_name_encrypted
-                    )
-                except Exception as e:
-                    patient.first_name = "Unknown"
-                    decryption_errors.append(f"first_name: {str(e)}")
-        except Exception:
-            pass
-        
-        try:
-            if patient.last_name_encrypted:
-                try:
-                    patient.last_name = await self.encryption.decrypt(
-                        patient.last_name_encrypted
-                    )
-                except Exception as e:
-                    patient.last_name = "Unknown"
-                    decryption_errors.append(f"last_name: {str(e)}")
-        except Exception:
-            pass
-        
-        try:
-            if patient.middle_name_encrypted:
-                try:
-                    patient.middle_name = await self.encryption.decrypt(
-                        patient.middle_name_encrypted
-                    )
-                except Exception as e:
-                    patient.middle_name = "[Encrypted - Key Mismatch]"
-                    decryption_errors.append(f"middle_name: {str(e)}")
-        except Exception:
-            pass
+        await self._decrypt_patients_fields([patient])
+    
+    async def _decrypt_patients_fields(self, patients: List[Patient]) -> None:
+        """Decrypt PHI fields for a page of patients in one thread-offloaded batch"""
+        if not patients:
+            return
         
-        try:
-            if patient.date_of_birth_encrypted:
-                try:
-                    dob_str = await self.encryption.decrypt(
-                        patient.date_of_birth_encrypted
-                    )
-                    patient.date_of_birth = datetime.fromisoformat(dob_str).date()
-                except Exception as e:
-                    patient.date_of_birth = None
-                    decryption_errors.append(f"date_of_birth: {str(e)}")
-        except Exception:
-            pass
+        decrypted_rows = await self.encryption.decrypt_rows(
+            patients,
+            ['first_name', 'last_name', 'middle_name', 'date_of_birth', 'ssn']
+        )
         
-        try:
-            if patient.ssn_encrypted:
-                try:
-                    patient.ssn = await self.encryption.decrypt(
-                        patient.ssn_encrypted
-                    )
-                except Exception as e:
-                    patient.ssn = "[Encrypted]"
-                    decryption_errors.append(f"ssn: {str(e)}")
-        except Exception:
-            pass
+        # Placeholders used when a stored value cannot be decrypted
+        failure_values = {
+            'first_name': "Unknown",
+            'last_name': "Unknown",
+            'middle_name': "[Encrypted - Key Mismatch]",
+            'date_of_birth': None,
+            'ssn': "[Encrypted]"
+        }
         
-        try:
-            if patient.mrn:
-                try:
-                    # MRN might not be encrypted in some cases
-                    if patient.mrn.startswith('gAAAAAB'):  # Fernet signature
-                        patient.mrn = await self.encryption.decrypt(patient.mrn)
-                except Exception as e:
-                    decryption_errors.append(f"mrn: {str(e)}")
-        except Exception:
-            pass
-        
-        # Ensure all required fields exist with defaults
-        if not hasattr(patient, 'first_name') or patient.first_name is None:
-            patient.first_name = "Unknown"
-        if not hasattr(patient, 'last_name') or patient.last_name is None:
-            patient.last_name = "Unknown" 
-        if not hasattr(patient, 'gender') or patient.gender is None:
-            patient.gender = "unknown"
-        if not hasattr(patient, 'date_of_birth') or patient.date_of_birth is None:
-            patient.date_of_birth = None
-        
-        # Log decryption errors but don't fail the whole operation
-        if decryption_errors:
-            self.logger.warning(
-                "Partial decryption errors for patient",
-                patient_id=str(patient.id),
-                errors=decryption_errors
-            )
+        for patient, values in zip(patients, decrypted_rows):
+            decryption_errors = []
+            
+            for field, plaintext in values.items():
+                if plaintext is None:
+                    setattr(patient, field, failure_values[field])
+                    decryption_errors.append(f"{field}: decryption failed")
+                elif field == 'date_of_birth':
+                    try:
+                        patient.date_of_birth = datetime.fromisoformat(plaintext).date()
+                    except ValueError as e:
+                        patient.date_of_birth = None
+                        decryption_errors.append(f"date_of_birth: {str(e)}")
+                else:
+                    setattr(patient, field, plaintext)
+            
+            try:
+                # MRN might not be encrypted in some cases
+                if patient.mrn and patient.mrn.startswith('gAAAAAB'):  # Fernet signature
+                    patient.mrn = await self.encryption.decrypt(patient.mrn)
+            except Exception as e:
+                decryption_errors.append(f"mrn: {str(e)}")
+            
+            # Ensure all required fields exist with defaults
+            if not hasattr(patient, 'first_name') or patient.first_name is None:
+                patient.first_name = "Unknown"
+            if not hasattr(patient, 'last_name') or patient.last_name is None:
+                patient.last_name = "Unknown" 
+            if not hasattr(patient, 'gender') or patient.gender is None:
+                patient.gender = "unknown"
+            if not hasattr(patient, 'date_of_birth') or patient.date_of_birth is None:
+                patient.date_of_birth = None
+            
+            # Log decryption errors but don't fail the whole operation
+            if decryption_errors:
+                self.logger.warning(
+                    "Partial decryption errors for patient",
+                    patient_id=str(patient.id),
+                    errors=decryption_errors
+                )
     
     async def _check_consent(
         self,
@@ -824,29 +842,32 @@ class PatientService:
         
         return False
     
+    def _consent_granted_clause(self, consent_type: ConsentType):
+        """
+        SQL predicate equivalent to _check_consent, for filtering many patients in one query.
+        
+        Args:
+            consent_type: Consent type required for the access
+        
+        Returns:
+            SQLAlchemy condition over Patient.consent_status
+        """
+        granted_types = cast(Patient.consent_status["types"], JSONB)
+        return and_(
+            Patient.consent_status["status"].as_string() == "active",
+            or_(
+                granted_types.contains([consent_type.value]),
+                granted_types.contains(["data_access"])
+            )
+        )
+    
     def _get_consent_status_value(self, consent_status):
         """Convert consent status to string value"""
-        if hasattr(consent_status, 'value'):
-            return consent_status.value
-        return str(consent_status).lower() if consent_status else 'pending'
+        return normalize_consent_status(consent_status)
     
     def _get_consent_types_values(self, consent_types):
         """Convert consent types to list of string values"""
-        if not consent_types:
-            return ['treatment', 'data_access']
-        
-        result = []
-        for ct in consent_types:
-            if hasattr(ct, 'value'):
-                result.append(ct.value)
-            else:
-                result.append(str(ct).lower())
-        
-        # Always ensure data_access is included for enterprise compliance
-        if 'data_access' not in result:
-            result.append('data_access')
-        
-        return result
+        return normalize_consent_types(consent_types)
     
     async def _ensure_user_exists(self, user_id: str) -> Optional[uuid.UUID]:
         """
@@ -1737,11 +1758,18 @@ class PHIAccessAuditService:
             'statistics': {}
         }
         
+        rollups = get_compliance_rollup_store()
+        if rollups is not None:
+            # Vectorized statistics over daily rollups; only the period edges hit phi_access_logs
+            rollup = await rollups.load_period(self.session, PHI_ACCESS_SOURCE, start_date, end_date)
+            report['statistics'] = phi_access_statistics(rollup)
+            return report
+        
         # Total access count
         count_query = select(func.count(PHIAccessLog.id)).where(
             and_(
-                PHIAccessLog.accessed_at >= start_date,
-                PHIAccessLog.accessed_at <= end_date
+                PHIAccessLog.access_started_at >= start_date,
+                PHIAccessLog.access_started_at <= end_date
             )
         )
         result = await self.session.execute(count_query)
@@ -1753,8 +1781,8 @@ class PHIAccessAuditService:
             func.count(PHIAccessLog.id).label('count')
         ).where(
             and_(
-                PHIAccessLog.accessed_at >= start_date,
-                PHIAccessLog.accessed_at <= end_date
+                PHIAccessLog.access_started_at >= start_date,
+                PHIAccessLog.access_started_at <= end_date
             )
         ).group_by(PHIAccessLog.access_type)
         
@@ -1769,8 +1797,8 @@ class PHIAccessAuditService:
             func.count(PHIAccessLog.id).label('count')
         ).where(
             and_(
-                PHIAccessLog.accessed_at >= start_date,
-                PHIAccessLog.accessed_at <= end_date
+                PHIAccessLog.access_started_at >= start_date,
+                PHIAccessLog.access_started_at <= end_date
             )
         ).group_by(PHIAccessLog.access_purpose)
         
@@ -1781,11 +1809,11 @@ class PHIAccessAuditService:
         
         # Unique users
         users_query = select(
-            func.count(func.distinct(PHIAccessLog.accessed_by))
+            func.count(func.distinct(PHIAccessLog.user_id))
         ).where(
             and_(
-                PHIAccessLog.accessed_at >= start_date,
-                PHIAccessLog.accessed_at <= end_date
+                PHIAccessLog.access_started_at >= start_date,
+                PHIAccessLog.access_started_at <= end_date
             )
         )
         result = await self.session.execute(users_query)
@@ -1796,8 +1824,8 @@ class PHIAccessAuditService:
             func.count(func.distinct(PHIAccessLog.patient_id))
         ).where(
             and_(
-                PHIAccessLog.accessed_at >= start_date,
-                PHIAccessLog.accessed_at <= end_date
+                PHIAccessLog.access_started_at >= start_date,
+                PHIAccessLog.access_started_at <= end_date
             )
         )
         result = await self.session.execute(patients_query)
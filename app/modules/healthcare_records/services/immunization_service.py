@@ -384,7 +384,6 @@ class ImmunizationService:
             for immunization in immunizations:
                 try:
                     await self._check_access_permissions(immunization, context)
-                    await self._decrypt_immunization_fields(immunization)
                     accessible_immunizations.append(immunization)
                     
                     # Audit access
@@ -399,6 +398,8 @@ class ImmunizationService:
                     # Skip immunizations user doesn't have access to
                     continue
             
+            await self._decrypt_immunizations_fields(accessible_immunizations)
+            
             self.logger.info("Immunizations listed successfully",
                            total_found=len(accessible_immunizations),
                            total_count=total_count,
@@ -735,24 +736,25 @@ class ImmunizationService:
     
     async def _decrypt_immunization_fields(self, immunization: Immunization) -> None:
         """Decrypt PHI fields in immunization record."""
+        await self._decrypt_immunizations_fields([immunization])
+    
+    async def _decrypt_immunizations_fields(self, immunizations: List[Immunization]) -> None:
+        """Decrypt PHI fields for a page of immunization records in one batch."""
         phi_fields = [
             'location', 'lot_number', 'manufacturer',
             'performer_name', 'performer_organization'
         ]
         
-        for field in phi_fields:
-            encrypted_field = f"{field}_encrypted"
-            if hasattr(immunization, encrypted_field):
-                encrypted_value = getattr(immunization, encrypted_field)
-                if encrypted_value:
-                    try:
-                        decrypted_value = await self.encryption.decrypt(encrypted_value)
-                        setattr(immunization, field, decrypted_value)
-                    except Exception as e:
-                        self.logger.warning("Failed to decrypt field",
-                                          field=field,
-                                          error=str(e))
-                        setattr(immunization, field, "[ENCRYPTED]")
+        decrypted_rows = await self.encryption.decrypt_rows(immunizations, phi_fields)
+        
+        for immunization, values in zip(immunizations, decrypted_rows):
+            for field, decrypted_value in values.items():
+                if decrypted_value is None:
+                    self.logger.warning("Failed to decrypt field",
+                                      field=field,
+                                      immunization_id=str(immunization.id))
+                    decrypted_value = "[ENCRYPTED]"
+                setattr(immunization, field, decrypted_value)
     
     async def _check_access_permissions(
         self, 
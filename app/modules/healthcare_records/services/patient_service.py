@@ -25,6 +25,7 @@ from app.core.exceptions import (
 from app.core.monitoring import trace_method, metrics
 from app.core.audit_logger import log_phi_access, AuditContext, AuditEventType, AuditSeverity
 from app.modules.healthcare_records.service import AccessContext
+from app.modules.healthcare_records.blind_index import PatientBlindIndexer, BLIND_INDEXED_FIELDS
 from app.core.database_unified import Patient, DataClassification
 from app.modules.healthcare_records.models import Immunization
 
@@ -75,6 +76,7 @@ class PatientService:
         self.encryption = encryption
         self.event_bus = event_bus
         self.security_manager = security_manager or SecurityManager()
+        self.blind_indexer = PatientBlindIndexer(encryption)
         self.logger = logger.bind(service="PatientService")
     
     @trace_method("create_patient")
@@ -151,6 +153,13 @@ class PatientService:
             self.session.add(patient)
             await self.session.flush()
             
+            await self.blind_indexer.index_patient(
+                self.session,
+                patient,
+                {field: patient_data.get(field) for field in BLIND_INDEXED_FIELDS if field in patient_data},
+                new_record=True
+            )
+            
             # Create default consents if needed
             await self._create_default_consents(patient.id, context)
             
@@ -315,8 +324,11 @@ class PatientService:
                 if filters.get('organization_id'):
                     query_filters.append(Patient.organization_id == uuid.UUID(filters['organization_id']))
                 
-                if filters.get('mrn'):
-                    query_filters.append(Patient.mrn == filters['mrn'])
+                # Encrypted PHI filters resolve through blind indexes
+                query_filters.extend(self.blind_indexer.search_conditions(filters))
+            
+            if search_query:
+                query_filters.extend(self.blind_indexer.search_conditions({'name': search_query}))
             
             # Apply tenant isolation
             if hasattr(context, 'tenant_id') and context.tenant_id:
@@ -342,7 +354,6 @@ class PatientService:
             for patient in patients:
                 try:
                     await self._check_access_permissions(patient, context)
-                    await self._decrypt_patient_fields(patient)
                     accessible_patients.append(patient)
                     
                     # Audit access (minimal fields for list view)
@@ -356,6 +367,8 @@ class PatientService:
                     # Skip patients user doesn't have access to
                     continue
             
+            await self._decrypt_patients_fields(accessible_patients)
+            
             self.logger.info("Patient search completed",
                            total_found=len(accessible_patients),
                            total_count=total_count)
@@ -415,6 +428,12 @@ class PatientService:
                     setattr(patient, field, value)
                     changed_fields.append(field)
             
+            await self.blind_indexer.index_patient(
+                self.session,
+                patient,
+                {field: updates[field] for field in BLIND_INDEXED_FIELDS if field in updates}
+            )
+            
             # Update consent status if provided
             if 'consent_status' in updates or 'consent_types' in updates:
                 current_consent = patient.consent_status or {}
@@ -618,29 +637,27 @@ class PatientService:
     
     async def _decrypt_patient_fields(self, patient: Patient) -> None:
         """Decrypt PHI fields in patient record."""
-        phi_fields = self._get_phi_field_names()
+        await self._decrypt_patients_fields([patient])
+    
+    async def _decrypt_patients_fields(self, patients: List[Patient]) -> None:
+        """Decrypt PHI fields for a page of patient records in one batch."""
+        decrypted_rows = await self.encryption.decrypt_rows(patients, self._get_phi_field_names())
         
-        for field in phi_fields:
-            encrypted_field = f"{field}_encrypted"
-            if hasattr(patient, encrypted_field):
-                encrypted_value = getattr(patient, encrypted_field)
-                if encrypted_value:
+        for patient, values in zip(patients, decrypted_rows):
+            for field, decrypted_value in values.items():
+                if decrypted_value is None:
+                    self.logger.warning("Failed to decrypt field",
+                                      field=field,
+                                      patient_id=str(patient.id))
+                    decrypted_value = "[ENCRYPTED]" if field != 'date_of_birth' else None
+                elif field == 'date_of_birth':
+                    # Handle date field conversion
                     try:
-                        decrypted_value = await self.encryption.decrypt(encrypted_value)
-                        
-                        # Handle date field conversion
-                        if field == 'date_of_birth':
-                            try:
-                                decrypted_value = datetime.fromisoformat(decrypted_value).date()
-                            except ValueError:
-                                decrypted_value = None
-                        
-                        setattr(patient, field, decrypted_value)
-                    except Exception as e:
-                        self.logger.warning("Failed to decrypt field",
-                                          field=field,
-                                          error=str(e))
-                        setattr(patient, field, "[ENCRYPTED]" if field != 'date_of_birth' else None)
+                        decrypted_value = datetime.fromisoformat(decrypted_value).date()
+                    except ValueError:
+                        decrypted_value = None
+                
+                setattr(patient, field, decrypted_value)
     
     async def _check_access_permissions(
         self, 
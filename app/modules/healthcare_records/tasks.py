@@ -18,7 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.tasks import celery_app
 from app.core.database import AsyncSessionLocal
-from app.core.security import EncryptionService
+from app.core.security import EncryptionService, UPGRADABLE_ENVELOPE_PREFIXES
 from app.core.event_bus_advanced import HybridEventBus as EventBus, DomainEvent, EventPriority
 from app.core.exceptions import ProcessingError, ValidationError
 from app.core.database_advanced import (
@@ -32,6 +32,7 @@ from app.modules.healthcare_records.service import (
 )
 from app.modules.healthcare_records.anonymization import AnonymizationEngine
 from app.modules.healthcare_records.fhir_validator import FHIRValidator
+from app.modules.healthcare_records.blind_index import PatientBlindIndexer
 
 logger = structlog.get_logger(__name__)
 
@@ -44,6 +45,20 @@ DOCUMENT_ARCHIVE_DAYS = 365
 MAX_RETRY_ATTEMPTS = 3
 TASK_TIME_LIMIT = 3600  # 1 hour
 PHI_TASK_PRIORITY = 9  # High priority for PHI tasks
+ENVELOPE_UPGRADE_BATCH_SIZE = 500
+BLIND_INDEX_BACKFILL_BATCH_SIZE = 500
+
+# Encrypted text columns rewritten from legacy envelopes to HKDF-keyed v3 envelopes
+ENVELOPE_UPGRADE_COLUMNS = {
+    "patients": (
+        "first_name_encrypted", "last_name_encrypted",
+        "date_of_birth_encrypted", "ssn_encrypted"
+    ),
+    "immunizations": (
+        "location_encrypted", "lot_number_encrypted", "manufacturer_encrypted",
+        "performer_name_encrypted", "performer_organization_encrypted"
+    ),
+}
 
 # Domain Events for task completion
 class PHIEncryptionCompleted(DomainEvent):
@@ -310,6 +325,191 @@ async def _process_encryption_batch(
         raise
 
 
+@celery_app.task(
+    base=SecurePHITask,
+    bind=True,
+    name='healthcare.upgrade_phi_envelopes',
+    queue='phi_processing',
+    time_limit=TASK_TIME_LIMIT,
+    soft_time_limit=TASK_TIME_LIMIT - 60
+)
+async def upgrade_phi_envelopes(
+    self,
+    tables: Optional[List[str]] = None,
+    batch_size: int = ENVELOPE_UPGRADE_BATCH_SIZE,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Rewrite legacy v1/v2 JSON packages and PBKDF2-keyed v3 envelopes as HKDF-keyed v3 envelopes
+    
+    Walks each table by primary key so rows that fail to upgrade are not
+    revisited, and commits per batch so the job can be interrupted safely.
+    
+    Args:
+        tables: Tables to migrate (defaults to all ENVELOPE_UPGRADE_COLUMNS)
+        batch_size: Rows fetched per batch
+        max_batches: Optional cap on batches per table for throttled runs
+    """
+    from app.core.database_unified import get_session_factory
+    
+    results = {
+        'rows_upgraded': 0,
+        'fields_upgraded': 0,
+        'failed': 0,
+        'errors': [],
+        'task_id': self.request.id
+    }
+    
+    session_factory = await get_session_factory()
+    encryption_service = EncryptionService()
+    
+    for table_name in tables or list(ENVELOPE_UPGRADE_COLUMNS):
+        last_id = None
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            async with session_factory() as session:
+                last_id = await _upgrade_envelope_batch(
+                    session,
+                    encryption_service,
+                    table_name,
+                    batch_size,
+                    last_id,
+                    results
+                )
+            batches += 1
+            if last_id is None:
+                break
+    
+    logger.info(
+        "PHI envelope upgrade completed",
+        task_id=self.request.id,
+        rows_upgraded=results['rows_upgraded'],
+        fields_upgraded=results['fields_upgraded'],
+        failed=results['failed']
+    )
+    
+    return results
+
+
+def _envelope_upgrade_model(table_name: str):
+    """Resolve the ORM model for an envelope upgrade target table"""
+    from app.core.database_unified import Patient as PatientRecord
+    from app.modules.healthcare_records.models import Immunization
+    
+    models = {
+        "patients": PatientRecord,
+        "immunizations": Immunization,
+    }
+    if table_name not in models:
+        raise ValidationError(f"Unsupported envelope upgrade table: {table_name}")
+    return models[table_name]
+
+
+async def _upgrade_envelope_batch(
+    session: AsyncSession,
+    encryption_service: EncryptionService,
+    table_name: str,
+    batch_size: int,
+    after_id: Optional[Any],
+    results: Dict[str, Any]
+) -> Optional[Any]:
+    """
+    Upgrade one keyset page of rows holding legacy envelopes
+    
+    Returns:
+        Last primary key processed, or None when the table is exhausted
+    """
+    model = _envelope_upgrade_model(table_name)
+    columns = ENVELOPE_UPGRADE_COLUMNS[table_name]
+    
+    query = select(model).where(
+        or_(*[
+            getattr(model, column).like(f"{prefix}%")
+            for column in columns
+            for prefix in UPGRADABLE_ENVELOPE_PREFIXES
+        ])
+    ).order_by(model.id).limit(batch_size)
+    if after_id is not None:
+        query = query.where(model.id > after_id)
+    
+    rows = (await session.execute(query)).scalars().all()
+    if not rows:
+        return None
+    
+    for row in rows:
+        try:
+            upgraded = 0
+            for column in columns:
+                value = getattr(row, column)
+                if value and value.startswith(UPGRADABLE_ENVELOPE_PREFIXES):
+                    setattr(row, column, await encryption_service.upgrade_envelope(value))
+                    upgraded += 1
+            results['rows_upgraded'] += 1
+            results['fields_upgraded'] += upgraded
+        except Exception as e:
+            results['failed'] += 1
+            results['errors'].append({'table': table_name, 'id': str(row.id), 'error': str(e)})
+            logger.error("Failed to upgrade PHI envelope", table=table_name, row_id=str(row.id), error=str(e))
+    
+    await session.commit()
+    return rows[-1].id
+
+
+@celery_app.task(
+    base=SecurePHITask,
+    bind=True,
+    name='healthcare.backfill_patient_blind_indexes',
+    queue='phi_processing',
+    time_limit=TASK_TIME_LIMIT,
+    soft_time_limit=TASK_TIME_LIMIT - 60
+)
+async def backfill_patient_blind_indexes(
+    self,
+    batch_size: int = BLIND_INDEX_BACKFILL_BATCH_SIZE,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compute blind indexes for patients written before they existed
+    
+    Picks up rows whose blind_index_version is missing or older than
+    BLIND_INDEX_VERSION, so the same job re-indexes after a scheme change.
+    Phone numbers are only indexed on write since no phone column is stored.
+    
+    Args:
+        batch_size: Rows fetched per batch
+        max_batches: Optional cap on batches for throttled runs
+    """
+    from app.core.database_unified import get_session_factory
+    
+    results = {
+        'patients_indexed': 0,
+        'failed': 0,
+        'errors': [],
+        'task_id': self.request.id
+    }
+    
+    session_factory = await get_session_factory()
+    indexer = PatientBlindIndexer(EncryptionService())
+    
+    last_id = None
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        async with session_factory() as session:
+            last_id = await indexer.backfill_batch(session, batch_size, last_id, results)
+        batches += 1
+        if last_id is None:
+            break
+    
+    logger.info(
+        "Patient blind index backfill completed",
+        task_id=self.request.id,
+        patients_indexed=results['patients_indexed'],
+        failed=results['failed']
+    )
+    
+    return results
+
+
 @celery_app.task(
     bind=True,
     name='healthcare.monitor_consent_expiration',
@@ -0,0 +1,249 @@
+"""
+Streaming audit chain verification tests.
+
+Builds a hash-chained audit_logs table in SQLite through the chain writer
+and covers full and incremental verification, checkpoint signatures, tamper
+detection, segmented verification stitched at the boundary hashes, and rows
+written by ImmutableAuditLogHandler.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import AuditChainCheckpoint, AuditLog, Base
+from app.modules.audit_logger.chain_verification import (
+    GENESIS_HASH,
+    AuditChainVerifier,
+    append_audit_rows,
+)
+from app.modules.audit_logger.schemas import AccessType, AuditEvent, DataAccessEvent, DataOperation, SOC2Category
+from app.modules.audit_logger.service import ImmutableAuditLogHandler
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.compliance, pytest.mark.audit]
+
+BASE_TIME = datetime(2025, 8, 1, 12, 0, 0)
+
+
+class ChainDatabase:
+    """SQLite audit chain with an appendable head."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.head = GENESIS_HASH
+        self.count = 0
+
+    async def append(self, count: int, timestamp: Optional[datetime] = None) -> None:
+        rows = []
+        for _ in range(count):
+            rows.append({
+                "id": uuid.uuid4(),
+                "timestamp": timestamp or BASE_TIME + timedelta(minutes=self.count),
+                "event_type": "phi_access",
+                "user_id": f"user-{self.count % 3}",
+                "action": "read",
+                "resource_type": "patient",
+                "resource_id": uuid.uuid4(),
+                "outcome": "success",
+                "config_metadata": {"fields": ["name", "dob"], "purpose": "treatment"}
+            })
+            self.count += 1
+        async with self.session_factory() as session:
+            await append_audit_rows(session, rows)
+            await session.commit()
+        self.head = rows[-1]["log_hash"]
+
+    async def nth_row_id(self, n: int) -> uuid.UUID:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(AuditLog.id).order_by(AuditLog.sequence_number).offset(n).limit(1)
+            )
+            return result.scalar_one()
+
+    async def execute(self, statement) -> None:
+        async with self.session_factory() as session:
+            await session.execute(statement)
+            await session.commit()
+
+
+@pytest_asyncio.fixture
+async def chain(tmp_path):
+    database = ChainDatabase(f"sqlite:///{tmp_path / 'audit_chain.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[AuditLog.__table__, AuditChainCheckpoint.__table__]
+        )
+    await database.append(40)
+    yield database
+    await database.engine.dispose()
+
+
+class TestStreamingVerification:
+    """Test single-pass streaming verification and checkpoints"""
+
+    @pytest.mark.asyncio
+    async def test_clean_chain_verifies_and_writes_checkpoint(self, chain):
+        verifier = AuditChainVerifier(chain.session_factory, batch_size=7)
+
+        result = await verifier.verify()
+
+        assert result.verified
+        assert result.records_verified == 40
+        assert result.checkpoint.last_log_hash == chain.head
+        async with chain.session_factory() as session:
+            assert (await verifier.load_checkpoint(session)).records_verified == 40
+
+    @pytest.mark.asyncio
+    async def test_second_run_only_verifies_new_rows(self, chain):
+        verifier = AuditChainVerifier(chain.session_factory, batch_size=7)
+        await verifier.verify()
+        await chain.append(5)
+
+        result = await verifier.verify()
+
+        assert result.verified
+        assert result.records_verified == 5
+        assert result.resumed_from.records_verified == 40
+        assert result.checkpoint.records_verified == 45
+
+    @pytest.mark.asyncio
+    async def test_edited_row_is_detected(self, chain):
+        tampered_id = await chain.nth_row_id(17)
+        await chain.execute(update(AuditLog).where(AuditLog.id == tampered_id).values(outcome="failure"))
+
+        result = await AuditChainVerifier(chain.session_factory).verify()
+
+        assert not result.verified
+        assert [(v["log_id"], v["error"]) for v in result.violations] == [(str(tampered_id), "hash_mismatch")]
+        assert result.checkpoint is None
+
+    @pytest.mark.asyncio
+    async def test_forged_checkpoint_forces_full_verification(self, chain):
+        verifier = AuditChainVerifier(chain.session_factory)
+        await verifier.verify()
+        await chain.execute(update(AuditChainCheckpoint).values(records_verified=1000))
+
+        async with chain.session_factory() as session:
+            assert await verifier.load_checkpoint(session) is None
+        result = await verifier.verify()
+        assert result.resumed_from is None
+        assert result.records_verified == 40
+
+    @pytest.mark.asyncio
+    async def test_date_range_anchors_on_first_stored_link(self, chain):
+        result = await AuditChainVerifier(chain.session_factory).verify(
+            start_date=BASE_TIME + timedelta(minutes=10), end_date=BASE_TIME + timedelta(minutes=19)
+        )
+
+        assert result.verified
+        assert result.records_verified == 10
+        assert result.checkpoint is None
+
+    @pytest.mark.asyncio
+    async def test_rows_sharing_a_timestamp_verify_in_write_order(self, chain):
+        # Random UUIDs order these differently from how they were chained
+        await chain.append(25, timestamp=BASE_TIME + timedelta(days=1))
+
+        result = await AuditChainVerifier(chain.session_factory).verify()
+
+        assert result.verified
+        assert result.records_verified == 65
+
+    @pytest.mark.asyncio
+    async def test_rows_outside_the_chain_are_not_verified(self, chain):
+        async with chain.session_factory() as session:
+            session.add(AuditLog(
+                id=uuid.uuid4(), timestamp=BASE_TIME + timedelta(minutes=5, seconds=30),
+                event_type="USER_LOGIN", action="login", outcome="success"
+            ))
+            await session.commit()
+        await chain.append(1)
+
+        result = await AuditChainVerifier(chain.session_factory).verify()
+
+        assert result.verified
+        assert result.records_verified == 41
+
+
+class TestHandlerWrites:
+    """Test rows persisted by ImmutableAuditLogHandler against the verifier"""
+
+    @pytest.mark.asyncio
+    async def test_handler_rows_extend_a_verifiable_chain(self, chain):
+        handler = ImmutableAuditLogHandler(chain.session_factory)
+        common = {"aggregate_type": "patient", "publisher": "healthcare_records", "outcome": "success"}
+        events = [
+            AuditEvent(event_type="phi_access", aggregate_id="patient-1", soc2_category=SOC2Category.SECURITY,
+                       user_id="clinician-1", operation="read", resource_type="patient",
+                       resource_id=str(uuid.uuid4()), session_id=str(uuid.uuid4()), **common),
+            DataAccessEvent(event_type="data_access", aggregate_id="patient-2", user_id="clinician-2",
+                            operation="export", resource_type="patient", resource_id="MRN-0042",
+                            access_type=AccessType.DATA_ACCESS, data_operation=DataOperation.READ,
+                            data_sensitivity_level="phi", access_granted=True, **common)
+        ]
+
+        for event in events:
+            assert await handler.handle(event)
+        await handler._process_batch()
+        await handler._process_batch()
+
+        result = await AuditChainVerifier(chain.session_factory).verify()
+        assert result.verified
+        assert result.records_verified == 42
+        async with chain.session_factory() as session:
+            rows = (await session.execute(
+                select(AuditLog).where(AuditLog.sequence_number > 40).order_by(AuditLog.sequence_number)
+            )).scalars().all()
+        assert [row.action for row in rows] == ["read", "export"]
+        assert rows[0].previous_log_hash == chain.head
+        assert rows[1].resource_id is None
+        assert rows[1].config_metadata["resource_id"] == "MRN-0042"
+        assert rows[1].config_metadata["access_type"] == "data_access"
+        assert rows[1].config_metadata["event_id"] == events[1].event_id
+
+
+class TestSegmentedVerification:
+    """Test parallel segment verification and boundary stitching"""
+
+    @pytest.mark.asyncio
+    async def test_segments_stitch_into_full_chain(self, chain):
+        verifier = AuditChainVerifier(chain.session_factory, batch_size=5)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = await verifier.verify_parallel(segments=4, database_url=chain.url, executor=executor)
+
+        assert result.verified
+        assert result.segments == 4
+        assert result.records_verified == 40
+        assert result.checkpoint.last_log_hash == chain.head
+
+    @pytest.mark.asyncio
+    async def test_deleted_boundary_row_breaks_stitching(self, chain):
+        # Minute 10 is the first row of the second of four segments
+        await chain.execute(AuditLog.__table__.delete().where(AuditLog.id == await chain.nth_row_id(10)))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = await AuditChainVerifier(chain.session_factory).verify_parallel(
+                segments=4, database_url=chain.url, executor=executor
+            )
+
+        assert not result.verified
+        assert [v["error"] for v in result.violations] == ["broken_segment_link"]
+
+    @pytest.mark.asyncio
+    async def test_segments_run_in_worker_processes(self, chain):
+        result = await AuditChainVerifier(chain.session_factory).verify_parallel(
+            segments=2, database_url=chain.url
+        )
+
+        assert result.verified
+        assert result.records_verified == 40
@@ -0,0 +1,143 @@
+"""
+Merkle accumulator tests.
+
+Checks the append-only accumulator against a from-scratch RFC 6962 tree
+hash, its inclusion and consistency proofs (including for earlier tree
+sizes), leaf-reader mode and signed tree heads in AuditIntegrityVerifier.
+"""
+import hashlib
+from dataclasses import replace
+
+import pytest
+
+from app.core.audit_integrity_verification import (
+    EMPTY_MERKLE_ROOT,
+    AuditIntegrityVerifier,
+    MerkleAccumulator,
+    VerificationLevel,
+    hash_merkle_leaf,
+    hash_merkle_node,
+    verify_consistency_proof,
+    verify_inclusion_proof,
+)
+
+pytestmark = [pytest.mark.compliance, pytest.mark.audit]
+
+
+def reference_root(leaf_hashes):
+    """Full recomputation of the RFC 6962 Merkle tree hash."""
+    if not leaf_hashes:
+        return EMPTY_MERKLE_ROOT
+    if len(leaf_hashes) == 1:
+        return leaf_hashes[0]
+    split = 1 << ((len(leaf_hashes) - 1).bit_length() - 1)
+    return hash_merkle_node(reference_root(leaf_hashes[:split]), reference_root(leaf_hashes[split:]))
+
+
+def build(count, **kwargs):
+    leaves = [hash_merkle_leaf(f"entry-{i}".encode()) for i in range(count)]
+    accumulator = MerkleAccumulator(**kwargs)
+    for leaf in leaves:
+        accumulator.append_leaf_hash(leaf)
+    return accumulator, leaves
+
+
+class TestMerkleAccumulator:
+    """Test roots and proofs of the append-only accumulator"""
+
+    @pytest.mark.parametrize("tile_height", [1, 3, 8])
+    def test_roots_match_full_recomputation_at_every_size(self, tile_height):
+        accumulator, leaves = build(67, tile_height=tile_height)
+
+        for size in range(len(leaves) + 1):
+            assert accumulator.root(size) == reference_root(leaves[:size])
+
+    @pytest.mark.parametrize("tile_height", [2, 8])
+    def test_inclusion_proofs_for_historical_sizes(self, tile_height):
+        accumulator, leaves = build(45, tile_height=tile_height)
+
+        for size in (1, 2, 7, 32, 45):
+            root = reference_root(leaves[:size])
+            for index in range(size):
+                proof = accumulator.inclusion_proof(index, size)
+                assert verify_inclusion_proof(leaves[index], index, size, proof, root)
+
+    def test_inclusion_proof_rejects_wrong_leaf(self):
+        accumulator, leaves = build(20)
+
+        proof = accumulator.inclusion_proof(5)
+
+        assert not verify_inclusion_proof(leaves[6], 5, 20, proof, accumulator.root())
+        assert not verify_inclusion_proof(leaves[5], 6, 20, proof, accumulator.root())
+
+    @pytest.mark.parametrize("tile_height", [2, 8])
+    def test_consistency_proofs_between_sizes(self, tile_height):
+        accumulator, leaves = build(40, tile_height=tile_height)
+
+        for old_size in range(1, 41):
+            for new_size in (old_size, 33, 40):
+                if new_size < old_size:
+                    continue
+                proof = accumulator.consistency_proof(old_size, new_size)
+                assert verify_consistency_proof(
+                    old_size, new_size, reference_root(leaves[:old_size]),
+                    reference_root(leaves[:new_size]), proof
+                )
+
+    def test_consistency_proof_detects_rewritten_history(self):
+        accumulator, leaves = build(30)
+        forged_root = reference_root(leaves[:11] + [hash_merkle_leaf(b"forged")] + leaves[12:16])
+
+        proof = accumulator.consistency_proof(16)
+
+        assert not verify_consistency_proof(16, 30, forged_root, accumulator.root(), proof)
+
+    def test_leaf_reader_mode_keeps_only_sparse_levels(self):
+        leaves = [hash_merkle_leaf(str(i).encode()) for i in range(1000)]
+        accumulator = MerkleAccumulator(
+            tile_height=4, leaf_hash_reader=lambda start, end: b"".join(leaves[start:end])
+        )
+        for leaf in leaves:
+            accumulator.append_leaf_hash(leaf)
+
+        assert accumulator.root() == reference_root(leaves)
+        assert verify_inclusion_proof(
+            leaves[777], 777, 1000, accumulator.inclusion_proof(777), accumulator.root()
+        )
+        # Levels 4 and 8 only: 62 + 3 nodes, plus the frontier
+        assert accumulator.storage_bytes() < 100 * 32
+
+
+class TestSignedTreeHeads:
+    """Test periodic signed roots in the integrity verifier"""
+
+    @pytest.fixture
+    def verifier(self):
+        heads = []
+        verifier = AuditIntegrityVerifier(VerificationLevel.MERKLE_TREE, tree_head_sink=heads.append)
+        verifier.monitoring_active = False
+        verifier.merkle_batch_size = 5
+        verifier.persisted_heads = heads
+        return verifier
+
+    @pytest.mark.asyncio
+    async def test_tree_heads_are_signed_and_consistent(self, verifier):
+        for i in range(12):
+            await verifier.add_audit_entry("phi_access", f"user-{i}", "patient", "read", "success", {})
+
+        assert [head.tree_size for head in verifier.persisted_heads] == [5, 10]
+        assert verifier.verify_tree_head_consistency(verifier.persisted_heads[0])
+        assert not verifier.verify_tree_head_consistency(
+            replace(verifier.persisted_heads[0], root_hash=hashlib.sha256(b"x").hexdigest())
+        )
+
+    @pytest.mark.asyncio
+    async def test_entry_merkle_inclusion_is_verified(self, verifier):
+        entry_ids = [
+            await verifier.add_audit_entry("phi_access", "user", "patient", "read", "success", {"n": i})
+            for i in range(7)
+        ]
+
+        result = await verifier.verify_entry_integrity(entry_ids[3])
+
+        assert result.merkle_verified
@@ -0,0 +1,110 @@
+"""
+Audit table partitioning tests.
+
+Covers monthly partition naming and DDL, the partitioned model definitions
+and the Parquet export of a detached partition (using SQLite for the
+partition's rows; detach/attach itself is PostgreSQL-only).
+"""
+import json
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import MetaData, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.schema import CreateTable
+
+from app.core.database_unified import AuditLog, DataClassification, PHIAccessLog
+from app.modules.audit_logger.partitioning import (
+    AuditPartitionManager,
+    add_months,
+    create_partition_sql,
+    partition_name,
+)
+
+pq = pytest.importorskip("pyarrow.parquet")
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.compliance, pytest.mark.audit]
+
+
+class TestPartitionLayout:
+    """Test partition naming, bounds and table definitions"""
+
+    def test_month_arithmetic_crosses_years(self):
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    def test_partition_ddl_covers_one_month(self):
+        sql = create_partition_sql("audit_logs", date(2025, 12, 1))
+
+        assert partition_name("audit_logs", date(2025, 12, 1)) == "audit_logs_y2025m12"
+        assert 'PARTITION OF "audit_logs"' in sql
+        assert "FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')" in sql
+
+    @pytest.mark.parametrize("model, key", [(AuditLog, "timestamp"), (PHIAccessLog, "access_started_at")])
+    def test_models_are_range_partitioned_on_event_time(self, model, key):
+        ddl = str(CreateTable(model.__table__).compile(dialect=postgresql.dialect()))
+
+        assert f"PARTITION BY RANGE ({key})" in ddl
+        assert {column.name for column in model.__table__.primary_key} == {"id", key}
+
+
+@pytest_asyncio.fixture
+async def detached_partition(tmp_path):
+    """A detached audit_logs month, as a standalone table with 25 rows."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    name = partition_name("audit_logs", date(2025, 7, 1))
+    table = AuditLog.__table__.to_metadata(MetaData(), name=name)
+    async with engine.begin() as conn:
+        await conn.run_sync(table.create)
+        await conn.execute(insert(table), [
+            {
+                "id": uuid.uuid4(),
+                "timestamp": datetime(2025, 7, 1) + timedelta(hours=i),
+                "created_at": datetime(2025, 7, 1),
+                "updated_at": datetime(2025, 7, 1),
+                "event_type": "phi_access",
+                "user_id": f"user-{i}",
+                "outcome": "success",
+                "resource_id": uuid.uuid4(),
+                "config_metadata": {"n": i},
+                "data_classification": DataClassification.PHI,
+                "sequence_number": i
+            }
+            for i in range(25)
+        ])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), name
+    await engine.dispose()
+
+
+class TestPartitionExport:
+    """Test streaming a detached partition to Parquet"""
+
+    @pytest.mark.asyncio
+    async def test_export_writes_all_rows_with_manifest(self, tmp_path, detached_partition):
+        session_factory, name = detached_partition
+        manager = AuditPartitionManager(session_factory, archive_directory=str(tmp_path / "archive"), export_batch_size=10)
+
+        rows, file_path, digest = await manager._export_parquet("audit_logs", name, date(2025, 7, 1))
+
+        assert rows == 25
+        assert file_path == tmp_path / "archive" / "audit_logs" / "2025" / f"{name}.parquet"
+        archived = pq.read_table(str(file_path))
+        assert archived.num_rows == 25
+        assert archived.column("sequence_number").to_pylist() == list(range(25))
+        assert json.loads(archived.column("config_metadata")[3].as_py()) == {"n": 3}
+        assert archived.column("data_classification")[0].as_py() == "phi"
+        manifest = json.loads(file_path.with_suffix(".manifest.json").read_text())
+        assert manifest["rows"] == 25
+        assert manifest["sha256"] == digest
+
+    @pytest.mark.asyncio
+    async def test_partition_management_is_a_no_op_off_postgresql(self, detached_partition):
+        session_factory, _ = detached_partition
+        manager = AuditPartitionManager(session_factory)
+
+        assert await manager.ensure_partitions() == []
+        assert await manager.archive_before(date(2030, 1, 1)) == []
@@ -0,0 +1,234 @@
+"""
+Columnar compliance rollup tests.
+
+Seeds audit_logs and phi_access_logs in SQLite and checks that reports
+assembled from daily rollups, cached month partials and live period edges
+match counts taken row by row from the seeded data.
+"""
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import AuditLog, Base, PHIAccessLog
+from app.modules.audit_logger import service as audit_service_module
+from app.modules.audit_logger.compliance_rollups import (
+    AUDIT_SOURCE,
+    PHI_ACCESS_SOURCE,
+    ComplianceRollupStore,
+    filter_soc2_categories,
+    phi_access_statistics,
+    soc2_report_sections,
+)
+from app.modules.audit_logger.schemas import SOC2Category
+from app.modules.audit_logger.service import SOC2AuditService
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.compliance, pytest.mark.audit]
+
+FIRST_DAY = datetime(2025, 6, 25)
+DAYS = 40
+NOW = FIRST_DAY + timedelta(days=DAYS, hours=3)
+
+
+def audit_rows():
+    event_types = ["UserLoginEvent", "DataAccessEvent", "SecurityViolationEvent", "PHIAccessed"]
+    for i in range(DAYS * 24):
+        timestamp = FIRST_DAY + timedelta(minutes=60 * i + 7)
+        event_type = event_types[i % 4]
+        yield {
+            "id": uuid.uuid4(),
+            "timestamp": timestamp,
+            "event_type": event_type,
+            "user_id": f"user-{i % 5}",
+            "action": "privileged_export" if i % 7 == 0 else "read",
+            "outcome": "failure" if event_type == "UserLoginEvent" and i % 3 == 0 else "success",
+            "compliance_tags": ["SOC2", "security"] if i % 2 else ["HIPAA", "availability"]
+        }
+
+
+def phi_rows():
+    for i in range(DAYS * 6):
+        yield {
+            "id": uuid.uuid4(),
+            "access_started_at": (FIRST_DAY + timedelta(hours=4 * i + 1)).replace(tzinfo=timezone.utc),
+            "access_session_id": f"session-{i}",
+            "patient_id": uuid.UUID(int=i % 11 + 1),
+            "user_id": uuid.UUID(int=i % 4 + 100),
+            "user_role": "physician",
+            "access_type": ["view", "edit", "export"][i % 3],
+            "phi_fields_accessed": ["name"],
+            "access_purpose": "treatment" if i % 5 else "operations",
+            "legal_basis": "hipaa",
+            "access_granted": i % 13 != 0
+        }
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[AuditLog.__table__, PHIAccessLog.__table__])
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(AuditLog(**row) for row in audit_rows())
+        session.add_all(PHIAccessLog(**row) for row in phi_rows())
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def store(tmp_path, session_factory):
+    return ComplianceRollupStore(str(tmp_path / "rollups"), session_factory, settle_minutes=60)
+
+
+def expected_sections(start, end):
+    """SOC2 report sections computed row by row from the seeded data."""
+    rows = [row for row in audit_rows() if start <= row["timestamp"] <= end]
+    event_types, outcomes, failed_logins, privileged = Counter(), Counter(), Counter(), Counter()
+    for row in rows:
+        event_types[row["event_type"]] += 1
+        outcomes[row["outcome"]] += 1
+        if row["event_type"] == "UserLoginEvent" and row["outcome"] == "failure":
+            failed_logins[row["user_id"]] += 1
+        if "privileged" in row["action"]:
+            privileged[row["user_id"]] += 1
+    auth_success = sum(
+        1 for row in rows if row["event_type"] == "UserLoginEvent" and row["outcome"] == "success"
+    )
+    total_auth = auth_success + sum(failed_logins.values())
+    return {
+        "total_events": len(rows),
+        "event_type_distribution": dict(event_types),
+        "outcome_distribution": dict(outcomes),
+        "failed_logins": {user: count for user, count in failed_logins.items() if count > 5},
+        "privileged": {user: count for user, count in privileged.items() if count > 10},
+        "authentication_success_rate": round(auth_success / total_auth * 100, 2) if total_auth else 0
+    }
+
+
+def comparable(sections):
+    findings = sections["findings"]
+    return {
+        "total_events": sections["total_events"],
+        "event_type_distribution": sections["summary"]["event_type_distribution"],
+        "outcome_distribution": sections["summary"]["outcome_distribution"],
+        "failed_logins": {f["user_id"]: f["count"] for f in findings if f["type"] == "excessive_failed_logins"},
+        "privileged": {f["user_id"]: f["count"] for f in findings if f["type"] == "frequent_privileged_access"},
+        "authentication_success_rate": sections["metrics"]["authentication_success_rate"]
+    }
+
+
+class TestMaterialization:
+    """Test incremental daily rollups"""
+
+    @pytest.mark.asyncio
+    async def test_only_settled_days_are_materialized_once(self, store):
+        first = await store.materialize(now=NOW)
+        second = await store.materialize(now=NOW + timedelta(hours=1))
+
+        assert first[AUDIT_SOURCE][0] == FIRST_DAY.date()
+        assert len(first[AUDIT_SOURCE]) == 31  # capped per run
+        assert len(second[AUDIT_SOURCE]) == DAYS - 31
+        # The current day (not yet settled) is left to live queries
+        assert second[AUDIT_SOURCE][-1] == (NOW - timedelta(days=1)).date()
+        assert len(store.materialized_days(PHI_ACCESS_SOURCE)) == DAYS
+
+
+class TestSOC2Report:
+    """Test SOC2 report sections from rollups"""
+
+    @pytest.mark.asyncio
+    async def test_rollup_report_matches_source_rows(self, store, session_factory):
+        await store.materialize(now=NOW)
+        await store.materialize(now=NOW)
+        start, end = FIRST_DAY + timedelta(days=2, hours=5, minutes=30), FIRST_DAY + timedelta(days=37, hours=9)
+
+        async with session_factory() as session:
+            rollup = await store.load_period(session, AUDIT_SOURCE, start, end)
+
+        assert comparable(soc2_report_sections(rollup)) == expected_sections(start, end)
+        # Two partial-day edges plus nothing else ran against the live table
+        assert store.stats["live_windows"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unmaterialized_days_fall_back_to_live_queries(self, store, session_factory):
+        start, end = FIRST_DAY, FIRST_DAY + timedelta(days=DAYS) - timedelta(microseconds=1)
+
+        async with session_factory() as session:
+            rollup = await store.load_period(session, AUDIT_SOURCE, start, end)
+
+        assert comparable(soc2_report_sections(rollup)) == expected_sections(start, end)
+
+    @pytest.mark.asyncio
+    async def test_month_partials_are_cached_and_invalidated(self, store, session_factory):
+        await store.materialize(now=NOW)
+        await store.materialize(now=NOW)
+        start, end = datetime(2025, 7, 1), datetime(2025, 7, 31, 23, 59, 59, 999999)
+
+        async with session_factory() as session:
+            first = await store.load_period(session, AUDIT_SOURCE, start, end)
+            await store.load_period(session, AUDIT_SOURCE, start, end)
+            assert store.stats["month_cache_hits"] == 1
+            assert store.stats["live_windows"] == 0
+
+            # A late row is picked up once its day is rebuilt
+            session.add(AuditLog(id=uuid.uuid4(), timestamp=datetime(2025, 7, 9, 12), event_type="DataAccessEvent"))
+            await session.commit()
+            await store.materialize_day(AUDIT_SOURCE, datetime(2025, 7, 9).date(), session)
+            rebuilt = await store.load_period(session, AUDIT_SOURCE, start, end)
+
+        assert soc2_report_sections(rebuilt)["total_events"] == soc2_report_sections(first)["total_events"] + 1
+
+    @pytest.mark.asyncio
+    async def test_category_filter_uses_compliance_tags(self, store, session_factory):
+        async with session_factory() as session:
+            rollup = await store.load_period(session, AUDIT_SOURCE, FIRST_DAY, FIRST_DAY + timedelta(days=1))
+
+        soc2_only = filter_soc2_categories(rollup, ["security"])
+
+        assert soc2_report_sections(soc2_only)["total_events"] == 12
+        assert soc2_report_sections(filter_soc2_categories(rollup, ["security", "availability"]))["total_events"] == 24
+
+    @pytest.mark.asyncio
+    async def test_service_report_uses_rollups(self, store, session_factory, monkeypatch):
+        monkeypatch.setattr(audit_service_module, "get_compliance_rollup_store", lambda: store)
+        service = SOC2AuditService(session_factory)
+
+        async with session_factory() as session:
+            report = await service.generate_compliance_report(
+                "soc2_type2", FIRST_DAY, FIRST_DAY + timedelta(days=10),
+                soc2_categories=[SOC2Category.SECURITY], session=session
+            )
+
+        assert report.total_events_analyzed == 120
+        assert "compliance_rollups" in report.data_sources
+        assert report.summary["event_type_distribution"] == {"DataAccessEvent": 60, "PHIAccessed": 60}
+
+
+class TestPHIAccessReport:
+    """Test HIPAA PHI access statistics from rollups"""
+
+    @pytest.mark.asyncio
+    async def test_statistics_from_rollups(self, store, session_factory):
+        await store.materialize(now=NOW)
+        await store.materialize(now=NOW)
+        rows = list(phi_rows())
+
+        async with session_factory() as session:
+            statistics = phi_access_statistics(await store.load_period(
+                session, PHI_ACCESS_SOURCE, FIRST_DAY, FIRST_DAY + timedelta(days=DAYS)
+            ))
+
+        assert statistics["total_accesses"] == len(rows)
+        assert statistics["by_access_type"] == {"view": 80, "edit": 80, "export": 80}
+        assert statistics["by_purpose"]["operations"] == 48
+        assert statistics["unique_users"] == 4
+        assert statistics["unique_patients"] == 11
+        assert statistics["denied_accesses"] == sum(1 for row in rows if not row["access_granted"])
@@ -0,0 +1,226 @@
+"""
+Streaming SIEM export tests.
+
+Seeds audit_logs in SQLite and exports them through file, TCP and failing
+sinks, checking record encoding, retry, the persisted high-water mark and
+that a failed run resumes without gaps.
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import AuditLog, Base, SIEMExportCursor
+from app.modules.audit_logger.schemas import SIEMEvent
+from app.modules.audit_logger.siem_export import (
+    FileSIEMSink,
+    SIEMDeliveryError,
+    SIEMSink,
+    StreamingSIEMExporter,
+    TCPSIEMSink,
+    create_siem_sink,
+)
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.compliance, pytest.mark.audit]
+
+FIRST = datetime(2025, 7, 1)
+ROWS = 95
+
+
+def exported_ids(lines):
+    return [json.loads(line)["extensions"]["externalId"] for line in lines]
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[AuditLog.__table__, SIEMExportCursor.__table__])
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            AuditLog(
+                id=uuid.uuid4(),
+                timestamp=FIRST + timedelta(minutes=i // 2),  # pairs share a timestamp
+                event_type="UserLoginEvent" if i % 3 == 0 else "DataAccessEvent",
+                user_id=f"user-{i}",
+                action="read",
+                outcome="failure" if i % 5 == 0 else "success",
+                ip_address="10.0.0.1"
+            )
+            for i in range(ROWS)
+        )
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+async def expected_ids(session_factory):
+    async with session_factory() as session:
+        rows = (await session.execute(
+            AuditLog.__table__.select().order_by(AuditLog.timestamp, AuditLog.id)
+        )).mappings().all()
+    return [str(row["id"]) for row in rows]
+
+
+def exporter(session_factory, sink, **kwargs):
+    options = {"export_format": "json", "batch_size": 10, "retry_backoff_seconds": 0, "settle_seconds": 0}
+    options.update(kwargs)
+    return StreamingSIEMExporter("test", sink, session_factory=session_factory, **options)
+
+
+class RecordingSink(SIEMSink):
+    """Accepts batches until told to fail."""
+
+    def __init__(self, fail_after_batches=None, transient_failures=0):
+        self.lines = []
+        self.batches = 0
+        self.fail_after_batches = fail_after_batches
+        self.transient_failures = transient_failures
+        self.resets = 0
+
+    async def send(self, lines):
+        if self.transient_failures:
+            self.transient_failures -= 1
+            raise ConnectionError("SIEM unavailable")
+        if self.fail_after_batches is not None and self.batches >= self.fail_after_batches:
+            raise ConnectionError("SIEM down")
+        self.lines.extend(lines)
+        self.batches += 1
+
+    async def reset(self):
+        self.resets += 1
+
+
+class TestEncoding:
+    """Test CEF/LEEF/JSON record encoding"""
+
+    def test_cef_escapes_header_and_extension_values(self):
+        event = SIEMEvent(signature_id="A|B", name="Login", severity=5,
+                          extensions={"act": "x=y", "msg": "line1\nline2"})
+
+        assert event.to_cef() == "CEF:0|YourCompany|IRISAPISystem|1.0|A\\|B|Login|5|act=x\\=y msg=line1\\nline2"
+
+    def test_leef_and_json_are_single_line(self):
+        event = SIEMEvent(signature_id="USER_LOGIN", name="Login", severity=2,
+                          extensions={"suser": "u\t1"}, raw_event={"at": FIRST})
+
+        assert event.to_leef() == "LEEF:1.0|YourCompany|IRISAPISystem|1.0|USER_LOGIN|sev=2\tname=Login\tsuser=u 1"
+        assert "\n" not in event.to_json()
+        assert json.loads(event.to_json())["raw_event"]["at"] == str(FIRST)
+
+    def test_sink_urls(self, tmp_path):
+        assert isinstance(create_siem_sink(f"file://{tmp_path}/out.log"), FileSIEMSink)
+        assert isinstance(create_siem_sink("tcp://siem.internal:6514"), TCPSIEMSink)
+        with pytest.raises(ValueError):
+            create_siem_sink("ftp://siem.internal")
+
+
+class TestStreamingExport:
+    """Test streaming export, cursors and retries"""
+
+    @pytest.mark.asyncio
+    async def test_exports_everything_once_in_key_order(self, tmp_path, session_factory):
+        path = tmp_path / "siem" / "export.log"
+
+        first = await exporter(session_factory, FileSIEMSink(str(path))).run()
+        second = await exporter(session_factory, FileSIEMSink(str(path))).run()
+
+        lines = path.read_text().splitlines()
+        assert first.events_exported == ROWS
+        assert first.batches_delivered == 10
+        assert first.caught_up
+        assert second.events_exported == 0
+        assert exported_ids(lines) == await expected_ids(session_factory)
+
+    @pytest.mark.asyncio
+    async def test_failed_run_resumes_from_high_water_mark(self, session_factory):
+        sink = RecordingSink(fail_after_batches=3)
+
+        with pytest.raises(SIEMDeliveryError):
+            await exporter(session_factory, sink, max_retries=2).run()
+
+        assert len(sink.lines) == 30
+        assert sink.resets == 2
+        assert (await exporter(session_factory, sink).load_cursor())[1] == uuid.UUID(exported_ids(sink.lines)[-1])
+
+        sink.fail_after_batches = None
+        resumed = await exporter(session_factory, sink).run()
+
+        assert resumed.events_exported == ROWS - 30
+        assert exported_ids(sink.lines) == await expected_ids(session_factory)
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self, session_factory):
+        sink = RecordingSink(transient_failures=2)
+
+        result = await exporter(session_factory, sink, max_retries=3).run()
+
+        assert result.delivery_retries == 2
+        assert result.events_exported == ROWS
+
+    @pytest.mark.asyncio
+    async def test_filters_and_bounds(self, session_factory):
+        sink = RecordingSink()
+
+        result = await exporter(
+            session_factory, sink, export_format="cef", event_types=["UserLoginEvent"]
+        ).run(until=FIRST + timedelta(minutes=10))
+
+        assert result.events_exported == 8  # i in 0, 3, ..., 21 (minute i // 2 <= 10)
+        assert all(line.startswith("CEF:0|") and "|USER_LOGIN|" in line for line in sink.lines)
+        assert result.to_dict()["high_water_mark"]["timestamp"].startswith("2025-07-01T00:")
+
+    @pytest.mark.asyncio
+    async def test_reader_is_bounded_by_slow_sink(self, session_factory):
+        reads = 0
+
+        def counting_factory():
+            nonlocal reads
+            reads += 1
+            return session_factory()
+
+        release = asyncio.Event()
+
+        class BlockedSink(RecordingSink):
+            async def send(self, lines):
+                await release.wait()
+                await super().send(lines)
+
+        sink = BlockedSink()
+        run = asyncio.create_task(exporter(counting_factory, sink, max_pending_batches=2).run())
+        await asyncio.sleep(0.3)
+        # One cursor read, the batch held by the sink and two queued batches, plus the one waiting to enqueue
+        assert reads <= 1 + 1 + 2 + 1
+        release.set()
+
+        assert (await run).events_exported == ROWS
+
+    @pytest.mark.asyncio
+    async def test_tcp_sink_streams_newline_framed_records(self, session_factory):
+        received = []
+
+        async def handle(reader, writer):
+            while line := await reader.readline():
+                received.append(line.decode().rstrip("\n"))
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        sink = create_siem_sink(f"tcp://127.0.0.1:{port}")
+        try:
+            await exporter(session_factory, sink, export_format="leef").run()
+        finally:
+            await sink.close()
+        await asyncio.sleep(0.1)
+        server.close()
+        await server.wait_closed()
+
+        assert len(received) == ROWS
+        assert all(line.startswith("LEEF:1.0|") for line in received)
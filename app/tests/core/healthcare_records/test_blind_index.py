@@ -0,0 +1,149 @@
+"""
+Blind index tests for searching encrypted patient PHI.
+
+Tests value normalization, keyed index stability and the SQL produced
+for patient search filters.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.database_unified import Patient
+from app.core.security import EncryptionService
+from app.modules.healthcare_records.blind_index import (
+    PatientBlindIndexer,
+    name_token_prefixes,
+    normalize_date_of_birth,
+    normalize_mrn,
+    normalize_phone,
+    tokenize_name,
+)
+
+pytestmark = pytest.mark.security
+
+
+def _compile(conditions) -> str:
+    query = select(Patient.id).where(*conditions)
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestNormalization:
+    """Test plaintext normalization ahead of hashing"""
+
+    def test_normalizers(self):
+        assert normalize_mrn(" mrn 00042 ") == "MRN00042"
+        assert tokenize_name("José  O'Brien-Smith") == ["jose", "o", "brien", "smith"]
+        assert normalize_date_of_birth(date(1980, 2, 29)) == "1980-02-29"
+        assert normalize_date_of_birth("1980-02-29T00:00:00") == "1980-02-29"
+        assert normalize_date_of_birth("eq1980-02-29") == "1980-02-29"
+        assert normalize_date_of_birth("not a date") is None
+        assert normalize_phone("+1 (555) 010-2030") == "5550102030"
+        assert normalize_phone("555-0102") == "5550102"
+        assert normalize_phone("jane@example.org") is None
+
+    def test_name_token_prefixes(self):
+        assert name_token_prefixes("al") == ["al"]
+        assert name_token_prefixes("smith") == ["smi", "smit", "smith"]
+
+
+class TestPatientBlindIndexer:
+    """Test keyed blind index computation and search conditions"""
+
+    def test_indexes_are_stable_and_keyed_per_index(self, encryption_service: EncryptionService):
+        indexer = PatientBlindIndexer(encryption_service)
+
+        assert indexer.mrn_index("mrn-1") == indexer.mrn_index(" MRN-1")
+        assert indexer.phone_index("555.010.2030") == indexer.phone_index("(555) 010-2030")
+        assert len(indexer.mrn_index("MRN-1")) == 32
+        # Same plaintext under different indexes must not correlate
+        assert encryption_service.blind_index("mrn", "12345") != encryption_service.blind_index("phone", "12345")
+        assert encryption_service.blind_index("mrn", "") is None
+
+    def test_index_keys_are_separate_from_field_keys(self, encryption_service: EncryptionService):
+        index_key = encryption_service._get_blind_index_key("name")
+
+        # Field types and patient ids are free-form, so try ones shaped like the index key's labels
+        assert index_key not in {
+            encryption_service._get_field_key("blind-index"),
+            encryption_service._get_field_key("blind-index", "v1"),
+            encryption_service._get_field_key("name"),
+            encryption_service._get_field_master_key("blind-index"),
+            encryption_service._get_hkdf_field_key("name"),
+            encryption_service._get_hkdf_field_key("blind-index", "name"),
+        }
+
+    def test_prefix_query_matches_stored_token(self, encryption_service: EncryptionService):
+        indexer = PatientBlindIndexer(encryption_service)
+
+        stored = indexer.name_token_indexes("Smithson")
+        assert encryption_service.blind_index("name", "smi") in stored
+        assert encryption_service.blind_index("name", "smithson") in stored
+        assert encryption_service.blind_index("name", "sm") not in stored
+
+    def test_search_conditions_use_index_columns(self, encryption_service: EncryptionService):
+        indexer = PatientBlindIndexer(encryption_service)
+
+        sql = _compile(indexer.search_conditions({
+            "mrn": "MRN-1",
+            "family_name": "Smith",
+            "birthdate": ["1980-02-29"],
+            "phone": "555-010-2030"
+        }))
+
+        assert indexer.mrn_index("MRN-1") in sql
+        assert indexer.date_of_birth_index("1980-02-29") in sql
+        assert indexer.phone_index("555-010-2030") in sql
+        assert encryption_service.blind_index("name", "smith") in sql
+        assert "patient_search_tokens.field IN ('last_name')" in sql
+
+    def test_unindexable_filter_matches_nothing(self, encryption_service: EncryptionService):
+        indexer = PatientBlindIndexer(encryption_service)
+
+        sql = _compile(indexer.search_conditions({"telecom": "jane@example.org", "name": "--"}))
+
+        # Must not degrade into "IS NULL", which would match every unindexed row
+        assert "IS NULL" not in sql
+        assert "false" in sql.lower()
+
+
+class TestBlindIndexBackfill:
+    """Test one page of the blind index backfill"""
+
+    @pytest.mark.asyncio
+    async def test_backfill_indexes_middle_names_and_retries_failed_rows(self, encryption_service: EncryptionService):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from app.modules.healthcare_records.blind_index import BLIND_INDEX_VERSION
+
+        async def patient(patient_id, **values):
+            encrypted = {f"{field}_encrypted": await encryption_service.encrypt(value) for field, value in values.items()}
+            return SimpleNamespace(id=patient_id, mrn=f"MRN-{patient_id}", blind_index_version=None, **encrypted)
+
+        indexed = await patient(1, first_name="Ann", middle_name="Marie", last_name="Lee", date_of_birth="1980-02-29")
+        unreadable = await patient(2, first_name="Bo", last_name="Chan", date_of_birth="1975-01-01")
+        # Corrupt the ciphertext so the last name fails authentication
+        tampered = unreadable.last_name_encrypted
+        unreadable.last_name_encrypted = tampered[:-12] + ("A" if tampered[-12] != "A" else "B") + tampered[-11:]
+
+        page = MagicMock()
+        page.scalars.return_value.all.return_value = [indexed, unreadable]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=page)
+        session.commit = AsyncMock()
+        results = {'patients_indexed': 0, 'failed': 0, 'errors': []}
+
+        last_id = await PatientBlindIndexer(encryption_service).backfill_batch(session, 10, None, results)
+
+        assert last_id == 2
+        assert (results['patients_indexed'], results['failed']) == (1, 1)
+        assert indexed.blind_index_version == BLIND_INDEX_VERSION
+        assert unreadable.blind_index_version is None
+        stored = {
+            (token.patient_id, token.field, token.token_bidx)
+            for call in session.add_all.call_args_list
+            for token in call.args[0]
+        }
+        assert (1, "middle_name", encryption_service.blind_index("name", "marie")) in stored
+        assert not {token for token in stored if token[0] == 2}
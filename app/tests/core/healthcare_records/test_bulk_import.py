@@ -0,0 +1,160 @@
+"""
+Bulk patient import tests.
+
+Runs the chunked import engine against SQLite (multi-row INSERT path) to
+cover encryption, blind indexes, per-chunk audit records on the audit hash
+chain, duplicate rejection and resuming from a checkpoint.
+"""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import AuditLog, Base, Patient, PatientSearchToken
+from app.core.security import EncryptionService
+from app.modules.audit_logger.chain_verification import AuditChainVerifier, append_audit_rows
+from app.modules.healthcare_records.blind_index import PatientBlindIndexer
+from app.modules.healthcare_records.bulk_import import BULK_IMPORT_AGGREGATE_TYPE, PatientBulkImporter
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = pytest.mark.healthcare
+
+CONTEXT = SimpleNamespace(user_id="bulk-importer", purpose="operations", ip_address=None)
+
+
+def _records(count: int, start: int = 0):
+    return [
+        {
+            "external_id": f"ext-{i}",
+            "mrn": f"MRN{i:05d}",
+            "first_name": f"Given{i}",
+            "last_name": "Smithson",
+            "date_of_birth": "1980-02-29",
+            "gender": "female"
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk_import.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[Patient.__table__, PatientSearchToken.__table__, AuditLog.__table__]
+        )
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as db_session:
+        yield db_session
+
+
+async def _append_audit_row(session_factory, event_type: str) -> None:
+    async with session_factory() as session:
+        await append_audit_rows(session, [{
+            "id": uuid.uuid4(), "timestamp": datetime.utcnow(), "event_type": event_type,
+            "user_id": "clinician-1", "action": "read", "outcome": "success"
+        }])
+        await session.commit()
+
+
+async def _count(session, column, *conditions):
+    return (await session.execute(select(func.count(column)).where(*conditions))).scalar()
+
+
+class TestPatientBulkImporter:
+    """Test chunked import with per-chunk audit and checkpoints"""
+
+    @pytest.mark.asyncio
+    async def test_import_encrypts_indexes_and_audits_per_chunk(self, session, encryption_service: EncryptionService):
+        importer = PatientBulkImporter(session, encryption_service, chunk_size=10, use_copy=False)
+        progress = []
+
+        result = await importer.import_records(
+            _records(25), CONTEXT, job_id="job-1", progress_callback=progress.append
+        )
+
+        assert (result.successful, result.failed) == (25, 0)
+        assert [p.records_consumed for p in progress] == [10, 20, 25]
+        assert await _count(session, Patient.id) == 25
+        assert await _count(session, AuditLog.id, AuditLog.aggregate_type == BULK_IMPORT_AGGREGATE_TYPE) == 3
+
+        indexer = PatientBlindIndexer(encryption_service)
+        patient = (await session.execute(
+            select(Patient).where(Patient.mrn_bidx == indexer.mrn_index("MRN00007"))
+        )).scalar_one()
+        assert await encryption_service.decrypt(patient.first_name_encrypted) == "Given7"
+        assert patient.date_of_birth_bidx == indexer.date_of_birth_index("1980-02-29")
+        assert await _count(
+            session, PatientSearchToken.id,
+            PatientSearchToken.patient_id == patient.id,
+            PatientSearchToken.token_bidx == encryption_service.blind_index("name", "smi")
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_mrns_are_rejected(self, session, encryption_service: EncryptionService):
+        importer = PatientBulkImporter(session, encryption_service, chunk_size=10, use_copy=False)
+        await importer.import_records(_records(3), CONTEXT, job_id="seed")
+
+        records = _records(2, start=2) + [dict(_records(1, start=3)[0], external_id="ext-3-copy")]
+        result = await importer.import_records(records, CONTEXT, job_id="dupes")
+
+        assert result.successful == 1
+        assert sorted((e["position"], e["error"]) for e in result.errors) == [
+            (0, "Duplicate MRN"), (2, "Duplicate MRN in input")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_import_resumes_after_last_committed_chunk(
+        self, session, encryption_service: EncryptionService
+    ):
+        records = _records(25)
+
+        async def interrupted_stream():
+            for record in records[:20]:
+                yield record
+            raise ConnectionError("source dropped")
+
+        importer = PatientBulkImporter(session, encryption_service, chunk_size=10, use_copy=False)
+        with pytest.raises(ConnectionError):
+            await importer.import_records(interrupted_stream(), CONTEXT, job_id="resumable")
+
+        checkpoint = await importer.load_checkpoint("resumable")
+        # Chunk 1 was encrypted but not yet written when the source failed
+        assert (checkpoint.chunks_committed, checkpoint.records_consumed) == (1, 10)
+
+        result = await importer.import_records(records, CONTEXT, job_id="resumable")
+
+        assert (result.successful, result.failed) == (15, 0)
+        assert result.checkpoint.records_consumed == 25
+        assert await _count(session, Patient.id) == 25
+
+    @pytest.mark.asyncio
+    async def test_chunk_audit_records_extend_the_audit_chain(
+        self, session, session_factory, encryption_service: EncryptionService
+    ):
+        await _append_audit_row(session_factory, "PHI_ACCESSED")
+        importer = PatientBulkImporter(session, encryption_service, chunk_size=10, use_copy=False)
+        await importer.import_records(_records(25), CONTEXT, job_id="chained")
+        await _append_audit_row(session_factory, "PHI_ACCESSED")
+
+        result = await AuditChainVerifier(session_factory).verify(incremental=False)
+
+        assert result.verified
+        assert result.records_verified == 5
+        sequence = (await session.execute(
+            select(AuditLog.sequence_number)
+            .where(AuditLog.aggregate_type == BULK_IMPORT_AGGREGATE_TYPE)
+            .order_by(AuditLog.sequence_number)
+        )).scalars().all()
+        assert sequence == [2, 3, 4]
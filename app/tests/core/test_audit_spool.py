@@ -0,0 +1,234 @@
+"""
+Durable audit spool tests.
+
+Covers group commit, the hash-chained segment format, crash recovery of a
+torn tail, tamper detection, segment rotation, per-process slot locking and
+draining into a SQLite audit_logs table - onto its hash chain - through
+database outages.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.audit_spool import (
+    AuditSpool,
+    AuditSpoolDrainer,
+    SpoolCorruptionError,
+    SpoolCursor,
+    SpoolLockedError,
+    open_spool_slot,
+    spool_row_to_audit_log,
+)
+from app.core.database_unified import AuditLog, Base
+from app.modules.audit_logger.chain_verification import AuditChainVerifier
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.audit]
+
+
+def audit_row(n: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "timestamp": datetime(2025, 8, 1, 12, 0, n % 60).isoformat(),
+        "event_type": "phi_access",
+        "user_id": f"user-{n}",
+        "action": "read",
+        "outcome": "success",
+        "resource_type": "patient",
+        "resource_id": str(uuid.uuid4()),
+        "config_metadata": {"n": n},
+        "data_classification": "phi"
+    }
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[AuditLog.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def count_rows(session_factory) -> int:
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(AuditLog))).scalar_one()
+
+
+async def drained_user_ids(session_factory) -> list:
+    async with session_factory() as session:
+        return (await session.execute(select(AuditLog.user_id).order_by(AuditLog.sequence_number))).scalars().all()
+
+
+class FlakyDatabase:
+    """Session factory that fails while the database is 'down'."""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self.down = False
+
+    def __call__(self):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        return self.session_factory()
+
+
+class TestSpoolAppend:
+    """Test group commit and the on-disk chain"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_fsync_groups(self, tmp_path):
+        spool = AuditSpool(str(tmp_path / "spool"), group_commit_interval=0.005)
+
+        seqs = await asyncio.gather(*(spool.append(audit_row(i)) for i in range(200)))
+
+        assert sorted(seqs) == list(range(1, 201))
+        assert spool.stats["groups_committed"] < 10
+        assert spool.backlog_records == 200
+        await spool.close()
+
+    @pytest.mark.asyncio
+    async def test_segments_rotate_and_drain_in_order(self, tmp_path, session_factory):
+        spool = AuditSpool(str(tmp_path / "spool"), segment_max_bytes=2048, group_commit_interval=0)
+        for i in range(30):
+            await spool.append(audit_row(i))
+        assert spool.get_stats()["segments"] > 3
+
+        drainer = AuditSpoolDrainer(spool, session_factory, batch_size=7)
+        while await drainer.drain_once():
+            pass
+
+        assert await count_rows(session_factory) == 30
+        assert spool.backlog_records == 0
+        # Fully drained segments are deleted
+        assert spool.get_stats()["segments"] == 1
+        # Rows join the audit chain in spool order
+        assert await drained_user_ids(session_factory) == [f"user-{i}" for i in range(30)]
+        result = await AuditChainVerifier(session_factory).verify(incremental=False)
+        assert result.verified and result.records_verified == 30
+        await spool.close()
+
+
+class TestSpoolRecovery:
+    """Test restart, torn-tail and tamper handling"""
+
+    @pytest.mark.asyncio
+    async def test_reopen_continues_the_chain(self, tmp_path, session_factory):
+        directory = str(tmp_path / "spool")
+        spool = AuditSpool(directory, group_commit_interval=0)
+        for i in range(5):
+            await spool.append(audit_row(i))
+        await spool.close()
+
+        reopened = AuditSpool(directory, group_commit_interval=0)
+        assert await reopened.append(audit_row(5)) == 6
+        await AuditSpoolDrainer(reopened, session_factory).stop(drain=True)
+
+        async with session_factory() as session:
+            metadata = (await session.execute(select(AuditLog.config_metadata))).scalars().all()
+        assert sorted(m["spool"]["seq"] for m in metadata) == list(range(1, 7))
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_torn_tail_is_truncated_on_open(self, tmp_path):
+        directory = tmp_path / "spool"
+        spool = AuditSpool(str(directory), group_commit_interval=0)
+        for i in range(3):
+            await spool.append(audit_row(i))
+        await spool.close()
+        segment = next(directory.glob("segment-*.log"))
+        with open(segment, "ab") as handle:
+            handle.write(b'{"seq":4,"prev":"abc","ha')
+
+        reopened = AuditSpool(str(directory), group_commit_interval=0)
+        await reopened.open()
+
+        assert reopened.stats["torn_bytes_truncated"] > 0
+        assert await reopened.append(audit_row(3)) == 4
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_edited_record_is_refused(self, tmp_path, session_factory):
+        directory = tmp_path / "spool"
+        spool = AuditSpool(str(directory), group_commit_interval=0)
+        for i in range(3):
+            await spool.append(audit_row(i))
+        await spool.close()
+        segment = next(directory.glob("segment-*.log"))
+        segment.write_bytes(segment.read_bytes().replace(b'"outcome":"success"', b'"outcome":"failure"', 1))
+
+        with pytest.raises(SpoolCorruptionError):
+            await AuditSpool(str(directory)).open()
+
+    @pytest.mark.asyncio
+    async def test_slots_are_locked_per_process(self, tmp_path):
+        first = await open_spool_slot(str(tmp_path / "spool"))
+        second = await open_spool_slot(str(tmp_path / "spool"))
+
+        assert first.directory.name == "slot-0"
+        assert second.directory.name == "slot-1"
+        with pytest.raises(SpoolLockedError):
+            await AuditSpool(str(first.directory)).open()
+        await first.close()
+        await second.close()
+
+
+class TestSpoolDrainer:
+    """Test draining through database outages"""
+
+    @pytest.mark.asyncio
+    async def test_outage_keeps_backlog_until_database_returns(self, tmp_path, session_factory):
+        database = FlakyDatabase(session_factory)
+        spool = AuditSpool(str(tmp_path / "spool"), group_commit_interval=0)
+        drainer = AuditSpoolDrainer(
+            spool, database, batch_size=50, interval=0.01, max_backoff=0.02, backlog_warning_records=10
+        )
+        database.down = True
+        drainer.start()
+
+        # Appends are acknowledged while the database is down
+        for i in range(20):
+            await spool.append(audit_row(i))
+        await asyncio.sleep(0.1)
+        assert drainer.stats["consecutive_failures"] > 0
+        assert drainer.backpressure
+        assert spool.backlog_records == 20
+
+        database.down = False
+        for _ in range(100):
+            if spool.backlog_records == 0:
+                break
+            await asyncio.sleep(0.02)
+        await drainer.stop()
+
+        assert await count_rows(session_factory) == 20
+        assert not drainer.backpressure
+        await spool.close()
+
+    @pytest.mark.asyncio
+    async def test_replayed_batch_is_not_duplicated(self, tmp_path, session_factory):
+        spool = AuditSpool(str(tmp_path / "spool"), group_commit_interval=0)
+        for i in range(10):
+            await spool.append(audit_row(i))
+        drainer = AuditSpoolDrainer(spool, session_factory)
+        await drainer.drain_once()
+
+        for i in range(10, 15):
+            await spool.append(audit_row(i))
+
+        # Crash after the first insert committed but before the cursor was saved
+        records, _ = spool.read_batch(SpoolCursor(), 15)
+        await drainer._insert([spool_row_to_audit_log(record) for record in records])
+
+        assert await count_rows(session_factory) == 15
+        # Replayed rows take no chain position, so the chain stays unbroken
+        assert await drained_user_ids(session_factory) == [f"user-{i}" for i in range(15)]
+        result = await AuditChainVerifier(session_factory).verify(incremental=False)
+        assert result.verified and result.records_verified == 15
+        await spool.close()
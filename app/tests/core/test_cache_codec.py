@@ -0,0 +1,165 @@
+"""
+Cache codec tests.
+
+Covers the self-describing entry header, serializer and compression choice,
+size thresholds, per-key-type zstd dictionaries and reading entries written
+before the codec existed.
+"""
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+from app.core import cache_codec
+from app.core.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    SERIALIZER_MSGPACK,
+    SERIALIZER_PICKLE,
+    SERIALIZER_RAW,
+    CacheCodec,
+    is_codec_entry,
+)
+from app.core.redis_caching import CacheKeyType, CacheStrategyManager
+
+pytestmark = [pytest.mark.unit]
+
+requires_zstd = pytest.mark.skipif(not cache_codec.ZSTD_AVAILABLE, reason="zstandard not installed")
+requires_msgpack = pytest.mark.skipif(not cache_codec.MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+
+def bundle(entries=50):
+    return {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": entries,
+        "entry": [
+            {"resource": {"resourceType": "Patient", "id": f"patient-{n}", "gender": "female",
+                          "birthDate": "1980-01-01", "name": [{"family": "Doe", "given": ["Jane"]}]}}
+            for n in range(entries)
+        ]
+    }
+
+
+def header(entry):
+    return entry[1], entry[2]
+
+
+class TestCacheCodec:
+    """Test entry encoding"""
+
+    @requires_msgpack
+    @requires_zstd
+    def test_large_payload_is_compressed(self):
+        codec = CacheCodec(serializer="msgpack")
+        entry = codec.encode(bundle())
+
+        assert is_codec_entry(entry)
+        assert header(entry) == (SERIALIZER_MSGPACK, COMPRESSION_ZSTD)
+        assert len(entry) < len(json.dumps(bundle()))
+        assert codec.decode(entry) == bundle()
+
+    def test_small_payload_is_not_compressed(self):
+        codec = CacheCodec(min_compress_bytes=1024)
+        entry = codec.encode({"status": "active"})
+
+        assert entry[2] == COMPRESSION_NONE
+        assert codec.decode(entry) == {"status": "active"}
+
+    def test_compression_can_be_disabled_per_entry(self):
+        codec = CacheCodec(min_compress_bytes=0)
+
+        assert codec.encode(bundle(), compress=False)[2] == COMPRESSION_NONE
+
+    def test_bytes_are_stored_raw(self):
+        codec = CacheCodec(compression="none")
+        entry = codec.encode(b"%PDF-1.7 binary")
+
+        assert entry[1] == SERIALIZER_RAW
+        assert entry.endswith(b"%PDF-1.7 binary")
+        assert codec.decode(entry) == b"%PDF-1.7 binary"
+
+    def test_other_values_fall_back_to_pickle(self):
+        codec = CacheCodec()
+        entry = codec.encode({1, 2, 3})
+
+        assert entry[1] == SERIALIZER_PICKLE
+        assert codec.decode(entry) == {1, 2, 3}
+
+    def test_datetimes_are_stored_as_strings(self):
+        codec = CacheCodec()
+
+        decoded = codec.decode(codec.encode({"at": datetime(2026, 1, 2, 3, 4, 5)}))
+
+        assert decoded["at"].startswith("2026-01-02")
+
+    def test_gzip_and_json_codecs_interoperate(self):
+        writer = CacheCodec(serializer="json", compression="gzip", min_compress_bytes=0)
+        reader = CacheCodec()
+
+        assert reader.decode(writer.encode(bundle())) == bundle()
+
+    def test_unknown_codec_is_rejected(self):
+        with pytest.raises(ValueError):
+            CacheCodec(compression="lz4")
+
+
+@requires_zstd
+class TestCompressionDictionaries:
+    """Test per-key-type dictionaries"""
+
+    def trained_codec(self):
+        codec = CacheCodec(min_compress_bytes=64)
+        samples = [bundle(entries=n % 7 + 1) for n in range(200)]
+        codec.add_dictionary(codec.train_dictionary(samples, dict_size=4096), "patient_search")
+        return codec
+
+    def test_dictionary_shrinks_small_entries_of_its_type(self):
+        codec = self.trained_codec()
+        value = bundle(entries=2)
+
+        with_dictionary = codec.encode(value, key_type="patient_search")
+        without_dictionary = codec.encode(value, key_type="api_response")
+
+        assert codec.entry_dictionary_id(with_dictionary) == codec.active_dictionaries["patient_search"]
+        assert len(with_dictionary) < len(without_dictionary)
+        assert codec.decode(with_dictionary) == value
+
+    def test_missing_dictionary_raises_key_error(self):
+        entry = self.trained_codec().encode(bundle(entries=2), key_type="patient_search")
+
+        with pytest.raises(KeyError):
+            CacheCodec().decode(entry)
+
+    def test_dictionary_round_trips_as_bytes(self):
+        codec = self.trained_codec()
+        dictionary_id = codec.active_dictionaries["patient_search"]
+        entry = codec.encode(bundle(entries=2), key_type="patient_search")
+        other = CacheCodec()
+
+        assert other.add_dictionary(codec.dictionaries[dictionary_id].as_bytes()) == dictionary_id
+        assert other.decode(entry) == bundle(entries=2)
+
+
+class TestStrategyManagerEntries:
+    """Test cache serialization through the strategy manager"""
+
+    @pytest.mark.asyncio
+    async def test_phi_entries_are_encrypted_after_compression(self):
+        manager = CacheStrategyManager()
+        config = manager.cache_configs[CacheKeyType.PATIENT_SEARCH]
+
+        stored = await manager._serialize_data(bundle(), config)
+
+        assert not is_codec_entry(stored)
+        assert b"Doe" not in stored
+        assert await manager._deserialize_data(stored, config) == bundle()
+
+    @pytest.mark.asyncio
+    async def test_legacy_gzip_json_entries_still_decode(self):
+        manager = CacheStrategyManager()
+        config = manager.cache_configs[CacheKeyType.API_RESPONSE]
+        legacy = gzip.compress(json.dumps({"status": "ok"}).encode())
+
+        assert await manager._deserialize_data(legacy, config) == {"status": "ok"}
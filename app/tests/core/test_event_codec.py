@@ -0,0 +1,125 @@
+"""
+Event codec tests.
+
+Covers envelope round trips for each codec, encode-once caching on the
+event, codec-independent checksums and decoding of older envelopes.
+"""
+import hashlib
+from datetime import timedelta
+
+import pytest
+
+from app.core import event_codec
+from app.core.event_bus_advanced import BaseEvent, deserialize_event, serialize_event
+from app.core.event_codec import (
+    MSGPACK_AVAILABLE,
+    ORJSON_AVAILABLE,
+    JSONEventCodec,
+    MsgpackEventCodec,
+    canonical_bytes,
+    get_event_codec,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.event_bus]
+
+CODECS = [
+    "json",
+    pytest.param("orjson", marks=pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")),
+    pytest.param("msgpack", marks=pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")),
+]
+
+
+class LabResultRecorded(BaseEvent):
+    event_type: str = "LabResultRecorded"
+    aggregate_type: str = "patient"
+    publisher: str = "test"
+    analyte: str = "glucose"
+    value: float = 5.4
+    flags: list = []
+
+
+def lab_result(**kwargs):
+    return LabResultRecorded(aggregate_id="patient-1", headers={"source": "lis", "note": "fasting ü"}, **kwargs)
+
+
+class TestEnvelope:
+    """Test encoding and decoding envelopes"""
+
+    @pytest.mark.parametrize("codec_name", CODECS)
+    def test_round_trip_keeps_class_and_fields(self, codec_name):
+        event = lab_result(flags=["H"])
+
+        decoded = deserialize_event(serialize_event(event, get_event_codec(codec_name)))
+
+        assert type(decoded) is LabResultRecorded
+        assert decoded == event
+        assert decoded.calculate_checksum() == event.calculate_checksum()
+
+    def test_decodes_pre_envelope_json(self):
+        event = lab_result()
+        legacy = JSONEventCodec().dumps({
+            "event_class": f"{__name__}:LabResultRecorded", "event": event.model_dump(mode="json")
+        })
+
+        assert deserialize_event(legacy) == event
+
+    def test_rejects_newer_envelope_versions(self):
+        data = JSONEventCodec().dumps({"v": 99, "class": None, "event": {}})
+
+        with pytest.raises(ValueError, match="envelope version"):
+            deserialize_event(data)
+
+    def test_unknown_codec_raises_and_missing_package_degrades_to_json(self, monkeypatch):
+        monkeypatch.setattr(event_codec, "_codecs", {})
+        monkeypatch.setitem(event_codec._CODEC_CLASSES, "msgpack", (MsgpackEventCodec, False))
+
+        assert isinstance(get_event_codec("msgpack"), JSONEventCodec)
+        with pytest.raises(ValueError):
+            get_event_codec("avro")
+
+
+class TestEncodeOnce:
+    """Test caching of encoded forms on the event"""
+
+    def test_payload_and_bytes_are_computed_once(self):
+        event = lab_result()
+        codec = get_event_codec("json")
+
+        assert event.to_payload() is event.to_payload()
+        assert event.encode(codec) is event.encode(codec)
+        assert event.canonical_bytes() is event.canonical_bytes()
+
+    def test_assignment_invalidates_cached_forms(self):
+        event = lab_result()
+        checksum, encoded = event.calculate_checksum(), event.encode(get_event_codec("json"))
+
+        event.value = 9.9
+
+        assert event.calculate_checksum() != checksum
+        assert event.encode(get_event_codec("json")) != encoded
+
+    def test_decoded_event_forwards_the_received_bytes(self):
+        data = serialize_event(lab_result())
+
+        assert serialize_event(deserialize_event(data), event_codec.codec_for_bytes(data)) is data
+
+
+class TestChecksum:
+    """Test checksums over canonical bytes"""
+
+    def test_checksum_is_sha256_of_canonical_content_without_volatile_fields(self):
+        event = lab_result()
+        content = {k: v for k, v in event.model_dump(mode="json").items() if k != "timestamp"}
+
+        assert event.calculate_checksum() == hashlib.sha256(canonical_bytes(content)).hexdigest()
+        assert event.canonical_bytes().startswith(b'{"aggregate_id":"patient-1","aggregate_type":"patient"')
+
+    def test_checksum_ignores_timestamp_but_not_content(self):
+        event = lab_result()
+        event.calculate_checksum()
+
+        later = event.model_copy(update={"timestamp": event.timestamp + timedelta(minutes=5)})
+        changed = event.model_copy(update={"value": 7.0})
+
+        assert later.calculate_checksum() == event.calculate_checksum()
+        assert changed.calculate_checksum() != event.calculate_checksum()
@@ -0,0 +1,233 @@
+"""
+Event replay tests.
+
+Appends events to the event store in SQLite and folds them through a
+projection, checking version ranges, periodic snapshots, resuming from a
+snapshot, schema-version invalidation and parallel rebuilds.
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import AggregateSnapshot, Base, EventOutboxEntry, EventStoreRecord
+from app.core.event_bus_advanced import (
+    BaseEvent,
+    EventHandler,
+    EventStore,
+    HybridEventBus,
+    Projection,
+    ReplayEngine,
+    decode_snapshot_state,
+)
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.event_bus]
+
+
+class VitalsRecorded(BaseEvent):
+    event_type: str = "VitalsRecorded"
+    aggregate_type: str = "patient"
+    publisher: str = "test"
+    heart_rate: int = 0
+
+
+class VitalsProjection(Projection):
+    name = "vitals"
+    aggregate_type = "patient"
+
+    def __init__(self):
+        self.applied = 0
+        self.saved = {}
+
+    def initial_state(self, aggregate_id):
+        return {"readings": 0, "max_heart_rate": 0}
+
+    def apply(self, state, event):
+        self.applied += 1
+        return {"readings": state["readings"] + 1, "max_heart_rate": max(state["max_heart_rate"], event.heart_rate)}
+
+    async def save(self, aggregate_id, state, version):
+        self.saved[aggregate_id] = (state, version)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[
+            EventStoreRecord.__table__, EventOutboxEntry.__table__, AggregateSnapshot.__table__
+        ])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def append(store, count, aggregates=1, start=0):
+    for n in range(start, start + count):
+        assert await store.append_event(
+            VitalsRecorded(aggregate_id=f"patient-{n % aggregates}", heart_rate=n), enqueue_outbox=False
+        )
+
+
+class TestEventStoreReads:
+    """Test reading an aggregate's history"""
+
+    @pytest.mark.asyncio
+    async def test_get_events_by_aggregate_returns_version_range(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 10, aggregates=2)
+
+        events = await store.get_events_by_aggregate("patient-0", from_version=1, to_version=3)
+
+        assert all(type(event) is VitalsRecorded for event in events)
+        assert [event.heart_rate for event in events] == [2, 4]
+        assert len(await store.get_events_by_aggregate("patient-1")) == 5
+
+    @pytest.mark.asyncio
+    async def test_stream_events_pages_after_a_sequence(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 7)
+
+        batches = [batch async for batch in store.stream_events("patient-0", after_sequence=2, batch_size=2)]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [event.heart_rate for batch in batches for _, event in batch] == [2, 3, 4, 5, 6]
+
+
+class TestReplayEngine:
+    """Test snapshot-aware folding"""
+
+    @pytest.mark.asyncio
+    async def test_writes_periodic_snapshots(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 25)
+        engine = ReplayEngine(store, snapshot_every=10, batch_size=4)
+
+        result = await engine.load("patient-0", VitalsProjection())
+        snapshot = await store.get_snapshot("patient-0", "vitals")
+
+        assert result.version == 25 and result.snapshots_written == 2
+        assert result.state == {"readings": 25, "max_heart_rate": 24}
+        assert snapshot.aggregate_version == 20
+        assert decode_snapshot_state(snapshot.state_codec, snapshot.state) == {"readings": 20, "max_heart_rate": 19}
+
+    @pytest.mark.asyncio
+    async def test_resumes_from_the_latest_snapshot(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 25)
+        await ReplayEngine(store, snapshot_every=10).load("patient-0", VitalsProjection())
+        await append(store, 3, start=25)
+        projection = VitalsProjection()
+
+        result = await ReplayEngine(store, snapshot_every=10).load("patient-0", projection)
+
+        assert projection.applied == 8
+        assert result.snapshot_version == 20
+        assert result.version == 28
+        assert result.state == {"readings": 28, "max_heart_rate": 27}
+
+    @pytest.mark.asyncio
+    async def test_snapshots_of_another_schema_version_are_ignored(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 12)
+        await ReplayEngine(store, snapshot_every=10).load("patient-0", VitalsProjection())
+        projection = VitalsProjection()
+        projection.schema_version = 2
+
+        result = await ReplayEngine(store, snapshot_every=0).load("patient-0", projection)
+
+        assert projection.applied == 12
+        assert result.snapshot_version == 0
+
+    @pytest.mark.asyncio
+    async def test_unreadable_snapshot_falls_back_to_full_replay(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 12)
+        await ReplayEngine(store, snapshot_every=10).load("patient-0", VitalsProjection())
+        async with session_factory() as session:
+            await session.execute(update(AggregateSnapshot).values(state=b"corrupt"))
+            await session.commit()
+
+        result = await ReplayEngine(store, snapshot_every=0).load("patient-0", VitalsProjection())
+
+        assert result.version == 12 and result.snapshot_version == 0
+
+    @pytest.mark.asyncio
+    async def test_rebuild_folds_all_aggregates_with_bounded_workers(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 60, aggregates=6)
+        active = peak = 0
+        both_workers_saving = asyncio.Event()
+
+        class SlowProjection(VitalsProjection):
+            async def save(self, aggregate_id, state, version):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                if active == 2:
+                    both_workers_saving.set()
+                # Hold the first save open until the other worker reaches save too
+                await asyncio.wait_for(both_workers_saving.wait(), timeout=5)
+                active -= 1
+                await super().save(aggregate_id, state, version)
+
+        projection = SlowProjection()
+        summary = await ReplayEngine(store, workers=2, snapshot_every=5, batch_size=2).rebuild(projection)
+
+        assert summary["aggregates"] == 6 and summary["events_applied"] == 60
+        assert summary["snapshots_written"] == 12 and summary["failed"] == []
+        assert projection.saved["patient-3"] == ({"readings": 10, "max_heart_rate": 57}, 10)
+        assert both_workers_saving.is_set() and peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_reports_failed_aggregates(self, session_factory):
+        store = EventStore(session_factory)
+        await append(store, 6, aggregates=3)
+
+        class FailingProjection(VitalsProjection):
+            def apply(self, state, event):
+                if event.aggregate_id == "patient-1":
+                    raise ValueError("bad event")
+                return super().apply(state, event)
+
+        summary = await ReplayEngine(store, workers=3).rebuild(FailingProjection(), ["patient-0", "patient-1", "patient-2"])
+
+        assert summary["aggregates"] == 2
+        assert summary["failed"] == ["patient-1"]
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self):
+        super().__init__("recorder")
+        self.heart_rates = []
+
+    async def handle(self, event):
+        self.heart_rates.append(event.heart_rate)
+        return True
+
+
+class TestBusReplay:
+    """Test HybridEventBus replay"""
+
+    @pytest.mark.asyncio
+    async def test_replay_redelivers_without_appending_again(self, session_factory):
+        bus = HybridEventBus(session_factory)
+        bus.outbox_relay.workers = 0
+        handler = RecordingHandler()
+        bus.subscribe(handler)
+        await append(bus.event_store, 4)
+        await bus.start()
+        try:
+            assert await bus.replay_events("patient-0", from_version=1) == 3
+            for _ in range(100):
+                if len(handler.heart_rates) == 3:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await bus.stop(timeout=1)
+
+        assert handler.heart_rates == [1, 2, 3]
+        assert len(await bus.event_store.get_events_by_aggregate("patient-0")) == 4
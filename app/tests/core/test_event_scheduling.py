@@ -0,0 +1,181 @@
+"""
+Event bus scheduling tests.
+
+Covers priority lanes with weighted fair queuing across aggregate queues,
+publisher backpressure against depth limits and the per-priority latency
+histograms exported to EventBusMetrics.
+"""
+import asyncio
+from collections import Counter
+
+import pytest
+
+from app.core.event_bus_advanced import (
+    AggregateQueue,
+    BaseEvent,
+    EventHandler,
+    EventPriority,
+    HybridEventBus,
+    WeightedFairScheduler,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.event_bus]
+
+
+def event(aggregate_id, priority=EventPriority.NORMAL, n=0):
+    return BaseEvent(event_type="ObservationRecorded", aggregate_id=aggregate_id, aggregate_type="patient",
+                     publisher="test", priority=priority, headers={"n": n})
+
+
+async def filled_queue(aggregate_id, *priorities):
+    queue = AggregateQueue(aggregate_id)
+    for priority in priorities:
+        await queue.enqueue(event(aggregate_id, priority))
+    return queue
+
+
+class TestAggregateQueue:
+    """Test queue priority and enqueue timing"""
+
+    @pytest.mark.asyncio
+    async def test_priority_is_the_highest_pending(self):
+        queue = await filled_queue("patient-1", EventPriority.LOW, EventPriority.CRITICAL, EventPriority.LOW)
+
+        assert queue.priority is EventPriority.CRITICAL
+        queue.dequeue_nowait()
+        queued, enqueued_at = queue.dequeue_nowait()
+
+        assert queued.priority is EventPriority.CRITICAL and enqueued_at > 0
+        assert queue.priority is EventPriority.LOW
+
+    @pytest.mark.asyncio
+    async def test_reject_without_waiting_when_full(self):
+        queue = AggregateQueue("patient-1", max_size=1)
+        assert await queue.enqueue(event("patient-1"))
+
+        assert not await queue.enqueue(event("patient-1"), timeout=0)
+
+
+class TestWeightedFairScheduler:
+    """Test lane selection"""
+
+    @pytest.mark.asyncio
+    async def test_backlogged_lanes_share_dispatches_by_weight(self):
+        scheduler = WeightedFairScheduler()
+        queues = {
+            priority: [await filled_queue(f"{priority.value}-{n}", priority) for n in range(40)]
+            for priority in EventPriority
+        }
+        for lane in queues.values():
+            for queue in lane:
+                scheduler.schedule(queue)
+
+        dispatched = [(await scheduler.next()).priority for _ in range(30)]
+
+        assert dispatched[0] is EventPriority.CRITICAL
+        assert Counter(dispatched) == {
+            EventPriority.CRITICAL: 16, EventPriority.HIGH: 8, EventPriority.NORMAL: 4, EventPriority.LOW: 2
+        }
+
+    @pytest.mark.asyncio
+    async def test_aggregate_is_dispatched_to_one_processor_at_a_time(self):
+        scheduler = WeightedFairScheduler()
+        queue = await filled_queue("patient-1", EventPriority.NORMAL, EventPriority.NORMAL)
+        scheduler.schedule(queue)
+
+        assert await scheduler.next() is queue
+        scheduler.schedule(queue)
+        assert await scheduler.next(timeout=0.01) is None
+
+        scheduler.release(queue)
+        assert await scheduler.next() is queue
+
+    @pytest.mark.asyncio
+    async def test_critical_event_promotes_a_scheduled_aggregate(self):
+        scheduler = WeightedFairScheduler()
+        low = await filled_queue("patient-1", EventPriority.LOW)
+        normal = await filled_queue("patient-2", EventPriority.NORMAL)
+        scheduler.schedule(low)
+        scheduler.schedule(normal)
+
+        await low.enqueue(event("patient-1", EventPriority.CRITICAL))
+        scheduler.schedule(low)
+
+        assert await scheduler.next() is low
+        assert await scheduler.next() is normal
+        assert await scheduler.next(timeout=0.01) is None
+
+
+class SlowHandler(EventHandler):
+    def __init__(self):
+        super().__init__("slow")
+        self.order = []
+
+    async def handle(self, event):
+        await asyncio.sleep(0.002)
+        self.order.append(event.priority)
+        return True
+
+
+def memory_bus(**settings):
+    bus = HybridEventBus(None, max_memory_events=settings.pop("max_memory_events", 100000))
+    bus.outbox_relay.workers = 0
+    for name, value in settings.items():
+        setattr(bus, name, value)
+    return bus
+
+
+class TestBusScheduling:
+    """Test priority scheduling, backpressure and metrics on the bus"""
+
+    @pytest.mark.asyncio
+    async def test_critical_events_overtake_a_low_priority_burst(self):
+        bus = memory_bus()
+        handler = SlowHandler()
+        bus.subscribe(handler)
+        for n in range(200):
+            assert await bus._publish_to_memory(event(f"analytics-{n % 50}", EventPriority.LOW, n))
+        assert await bus._publish_to_memory(event("patient-1", EventPriority.CRITICAL))
+
+        await bus.start()
+        try:
+            for _ in range(500):
+                if EventPriority.CRITICAL in handler.order:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await bus.stop(timeout=1)
+
+        assert handler.order.index(EventPriority.CRITICAL) < 10
+        summary = bus.get_metrics()
+        assert "events.queue_latency_ms:priority=critical" in summary["histogram_percentiles"]
+        assert "events.end_to_end_latency_ms:priority=low" in summary["histogram_percentiles"]
+        assert summary["scheduler"]["dispatched"]["critical"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reject_mode_signals_backpressure_but_admits_critical(self):
+        bus = memory_bus(max_memory_events=3, backpressure_mode="reject")
+        for n in range(3):
+            assert await bus._publish_to_memory(event(f"patient-{n}"))
+
+        assert bus.under_backpressure
+        assert not await bus._publish_to_memory(event("patient-9", EventPriority.HIGH))
+        assert await bus._publish_to_memory(event("patient-9", EventPriority.CRITICAL))
+        assert not await bus.wait_for_capacity(timeout=0.01)
+        assert bus.metrics.counters["events.backpressure:priority=high:reason=bus_full"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_mode_publisher_resumes_when_queues_drain(self):
+        bus = memory_bus(max_memory_events=2, backpressure_timeout=5.0)
+        bus.subscribe(SlowHandler())
+        for n in range(2):
+            assert await bus._publish_to_memory(event(f"patient-{n}"))
+        waiting = asyncio.create_task(bus._publish_to_memory(event("patient-2")))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        await bus.start()
+        try:
+            assert await asyncio.wait_for(waiting, 2)
+        finally:
+            await bus.stop(timeout=1)
@@ -0,0 +1,194 @@
+"""
+Outbox relay tests.
+
+Appends events to the event store and outbox in SQLite and relays them,
+checking per-aggregate order, bulk settlement, retry holding back the rest
+of an aggregate, dead-lettering and delivery through HybridEventBus.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database_unified import Base, EventOutboxEntry, EventStoreRecord
+from app.core.event_bus_advanced import BaseEvent, EventHandler, EventStore, HybridEventBus, OutboxRelay
+
+pytest.importorskip("aiosqlite")
+
+pytestmark = [pytest.mark.event_bus]
+
+
+class MedicationAdministered(BaseEvent):
+    event_type: str = "MedicationAdministered"
+    aggregate_type: str = "patient"
+    publisher: str = "test"
+    dose: int = 0
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'events.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[EventStoreRecord.__table__, EventOutboxEntry.__table__])
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def append(session_factory, count, aggregates=3):
+    store = EventStore(session_factory)
+    for n in range(count):
+        assert await store.append_event(MedicationAdministered(aggregate_id=f"patient-{n % aggregates}", dose=n))
+
+
+async def statuses(session_factory):
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(EventOutboxEntry.status, func.count()).group_by(EventOutboxEntry.status)
+        )
+        return dict(rows.all())
+
+
+class Recorder:
+    def __init__(self, failing=()):
+        self.events = []
+        self.failing = set(failing)
+
+    async def __call__(self, event):
+        if event.aggregate_id in self.failing:
+            raise ConnectionError("bus unavailable")
+        self.events.append(event)
+        return True
+
+
+class TestOutboxRelay:
+    """Test claiming, ordering and settlement"""
+
+    @pytest.mark.asyncio
+    async def test_append_writes_store_and_outbox(self, session_factory):
+        await append(session_factory, 4)
+        await EventStore(session_factory).append_event(
+            MedicationAdministered(aggregate_id="patient-9"), enqueue_outbox=False
+        )
+
+        pending = await EventStore(session_factory).get_pending_outbox_events()
+        async with session_factory() as session:
+            stored = (await session.execute(select(func.count()).select_from(EventStoreRecord))).scalar()
+
+        assert stored == 5
+        assert [row["event_data"]["dose"] for row in pending] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_relays_in_order_and_settles_in_bulk(self, session_factory):
+        await append(session_factory, 25)
+        publish = Recorder()
+        relay = OutboxRelay(session_factory, publish, batch_size=10)
+
+        claimed = [await relay.relay_batch() for _ in range(4)]
+
+        assert claimed == [10, 10, 5, 0]
+        assert all(type(event) is MedicationAdministered for event in publish.events)
+        for aggregate in range(3):
+            doses = [e.dose for e in publish.events if e.aggregate_id == f"patient-{aggregate}"]
+            assert doses == list(range(aggregate, 25, 3))
+        assert await statuses(session_factory) == {"completed": 25}
+
+    @pytest.mark.asyncio
+    async def test_failure_holds_back_the_rest_of_the_aggregate(self, session_factory):
+        await append(session_factory, 6, aggregates=2)
+        publish = Recorder(failing={"patient-0"})
+        dead = []
+
+        async def on_dead_letter(event, reason):
+            dead.append((event.dose, reason))
+
+        relay = OutboxRelay(session_factory, publish, max_attempts=2, retry_backoff_seconds=0.05,
+                            on_dead_letter=on_dead_letter)
+
+        assert await relay.relay_batch() == 6
+        assert [e.dose for e in publish.events] == [1, 3, 5]
+        assert await relay.relay_batch() == 0  # head of patient-0 is backing off
+
+        await asyncio.sleep(0.1)
+        publish.failing.clear()
+        await relay.relay_batch()  # the retry succeeds and releases the held-back rows
+        assert [e.dose for e in publish.events] == [1, 3, 5, 0, 2, 4]
+        assert dead == []
+
+    @pytest.mark.asyncio
+    async def test_exhausted_rows_are_dead_lettered_and_unblock_the_aggregate(self, session_factory):
+        await append(session_factory, 2, aggregates=1)
+        dead = []
+
+        async def publish(event):
+            if event.dose == 0:
+                return False
+            return True
+
+        async def on_dead_letter(event, reason):
+            dead.append(event.dose)
+
+        relay = OutboxRelay(session_factory, publish, max_attempts=1, on_dead_letter=on_dead_letter)
+
+        await relay.relay_batch()
+        await relay.relay_batch()
+
+        assert dead == [0]
+        assert relay.metrics["delivered"] == 1
+        assert await statuses(session_factory) == {"dead_letter": 1, "completed": 1}
+
+    def test_heads_are_claimed_with_skip_locked(self):
+        relay = OutboxRelay(None, Recorder())
+
+        sql = str(relay.claim_heads_statement(datetime(2025, 8, 15)).compile(dialect=postgresql.dialect()))
+
+        assert sql.endswith("FOR UPDATE OF event_outbox_1 SKIP LOCKED")
+        assert "NOT (EXISTS" in sql
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self):
+        super().__init__("recorder")
+        self.doses = []
+
+    async def handle(self, event):
+        self.doses.append(event.dose)
+        return True
+
+
+class TestBusRelay:
+    """Test HybridEventBus delivering outbox rows"""
+
+    @pytest.mark.asyncio
+    async def test_bus_delivers_rows_appended_by_other_writers(self, session_factory):
+        bus = HybridEventBus(session_factory)
+        bus.outbox_relay.workers = 1
+        bus.outbox_relay.notify_dsn = None
+        bus.outbox_relay.poll_interval_seconds = 0.05
+        handler = RecordingHandler()
+        bus.subscribe(handler)
+        await bus.start()
+        try:
+            await append(session_factory, 5, aggregates=1)
+            bus.outbox_relay.wake()
+            for _ in range(100):
+                if len(handler.doses) == 5:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await bus.stop(timeout=1)
+
+        assert handler.doses == [0, 1, 2, 3, 4]
+        assert await statuses(session_factory) == {"completed": 5}
+
+    @pytest.mark.asyncio
+    async def test_direct_publish_does_not_enqueue_outbox(self, session_factory):
+        bus = HybridEventBus(session_factory)
+        bus.outbox_relay.notify_dsn = None
+
+        assert await bus.publish(MedicationAdministered(aggregate_id="patient-1"))
+
+        assert await statuses(session_factory) == {}
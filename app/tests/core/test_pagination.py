@@ -0,0 +1,125 @@
+"""
+Tests for keyset (cursor) pagination helpers
+
+Covers cursor encoding, scope validation, the SQL issued for a keyset
+page and count mode resolution.
+"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.core.database_unified import Patient
+from app.core.pagination import (
+    CountMode,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    fetch_keyset_page,
+    resolve_total_count,
+)
+
+SCOPE = "patients:created_at:desc"
+
+
+def _session_returning(rows):
+    session = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+def _compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestCursorEncoding:
+    """Test opaque cursor round trips and validation"""
+
+    def test_round_trip_preserves_types(self):
+        created_at = datetime(2025, 8, 11, 9, 30, 15, 123456)
+        row_id = uuid.uuid4()
+
+        cursor = encode_cursor(created_at, row_id, SCOPE)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, SCOPE) == (created_at, row_id)
+
+    def test_cursor_from_another_query_is_rejected(self):
+        cursor = encode_cursor(datetime(2025, 1, 1), uuid.uuid4(), "audit_logs:timestamp:desc")
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, SCOPE)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", ""])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, SCOPE)
+
+
+class TestFetchKeysetPage:
+    """Test keyset page queries"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_fetches_one_extra_row(self):
+        rows = [MagicMock(created_at=datetime(2025, 1, 3 - i), id=uuid.uuid4()) for i in range(3)]
+        session = _session_returning(rows)
+
+        page, next_cursor = await fetch_keyset_page(
+            session, select(Patient), Patient.created_at, Patient.id, 2, scope=SCOPE
+        )
+
+        statement = session.execute.call_args.args[0]
+        sql = _compiled(statement)
+        assert "ORDER BY patients.created_at DESC, patients.id DESC" in sql
+        assert "OFFSET" not in sql
+        assert statement.compile(dialect=postgresql.dialect()).params["param_1"] == 3
+        assert page == rows[:2]
+        assert decode_cursor(next_cursor, SCOPE) == (rows[1].created_at, rows[1].id)
+
+    @pytest.mark.asyncio
+    async def test_cursor_seeks_with_row_comparison(self):
+        session = _session_returning([])
+        cursor = encode_cursor(datetime(2025, 1, 1), uuid.uuid4(), SCOPE)
+
+        page, next_cursor = await fetch_keyset_page(
+            session, select(Patient), Patient.created_at, Patient.id, 50, cursor=cursor, scope=SCOPE
+        )
+
+        sql = _compiled(session.execute.call_args.args[0])
+        assert "(patients.created_at, patients.id) < (" in sql
+        assert page == []
+        assert next_cursor is None
+
+
+class TestResolveTotalCount:
+    """Test count modes"""
+
+    @pytest.mark.asyncio
+    async def test_none_skips_the_count_query(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        assert await resolve_total_count(session, select(Patient), CountMode.NONE) == (None, False)
+        session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_exact_counts_filtered_subquery(self):
+        session = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = 7
+        session.execute = AsyncMock(return_value=result)
+
+        total = await resolve_total_count(
+            session, select(Patient).order_by(Patient.created_at), CountMode.EXACT
+        )
+
+        assert total == (7, False)
+        sql = _compiled(session.execute.call_args.args[0])
+        assert sql.startswith("SELECT count(*)")
+        assert "ORDER BY" not in sql
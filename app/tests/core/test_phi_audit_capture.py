@@ -0,0 +1,192 @@
+"""
+PHI audit capture tests.
+
+Covers the ring buffer and its overflow policies, what PHIAuditMiddleware
+and PHIAuditRoute snapshot on the request path, fail-closed refusal, and
+the background writer's batching and fallback file.
+"""
+import json
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+
+from app.core.phi_audit_capture import (
+    PHIAccessRecord,
+    PHIAuditRingBuffer,
+    PHIAuditWriter,
+    build_phi_access_event,
+)
+from app.core import phi_audit_middleware
+from app.core.phi_audit_middleware import PHIAuditMiddleware, PHIAuditRoute
+
+pytestmark = [pytest.mark.unit, pytest.mark.hipaa]
+
+
+def record(n, status_code=200, error=None):
+    return PHIAccessRecord(
+        captured_at=1_750_000_000.0 + n,
+        method="GET",
+        route_template="/api/v1/patients/{patient_id}",
+        path=f"/api/v1/patients/p-{n}",
+        principal="user-1",
+        resource_id=f"p-{n}",
+        status_code=status_code,
+        duration_ms=1.5,
+        client_ip="10.0.0.7",
+        error=error
+    )
+
+
+def build_app(buffer, route_class=None, middleware=True):
+    app = FastAPI()
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+    calls = []
+
+    @router.get("/api/v1/patients/{patient_id}")
+    async def get_patient(patient_id: str, request: Request):
+        calls.append(patient_id)
+        request.state.user_id = "doctor-7"
+        if patient_id == "forbidden":
+            raise HTTPException(status_code=403, detail="no")
+        return {"id": patient_id}
+
+    @router.get("/api/v1/health")
+    async def health():
+        return {"ok": True}
+
+    app.include_router(router)
+    if middleware:
+        app.add_middleware(PHIAuditMiddleware, buffer=buffer)
+    return app, calls
+
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+class TestRingBuffer:
+    """Test the ring buffer and overflow policies"""
+
+    def test_fifo_across_wraparound(self):
+        buffer = PHIAuditRingBuffer(3)
+        for n in range(3):
+            assert buffer.reserve()
+            buffer.publish(record(n))
+        assert [r.resource_id for r in buffer.drain(2)] == ["p-0", "p-1"]
+        buffer.publish(record(3), reserved=False)
+        buffer.publish(record(4), reserved=False)
+
+        assert [r.resource_id for r in buffer.drain(10)] == ["p-2", "p-3", "p-4"]
+        assert len(buffer) == 0
+
+    def test_fail_closed_counts_in_flight_reservations(self):
+        buffer = PHIAuditRingBuffer(2)
+        buffer.publish(record(0), reserved=False)
+
+        assert buffer.reserve()
+        assert not buffer.reserve()
+        assert buffer.stats["rejected"] == 1
+
+    @pytest.mark.parametrize("policy, kept", [("drop_oldest", ["p-1", "p-2"]), ("drop_newest", ["p-0", "p-1"])])
+    def test_drop_policies(self, policy, kept):
+        buffer = PHIAuditRingBuffer(2, overflow_policy=policy)
+        for n in range(3):
+            assert buffer.reserve()
+            buffer.publish(record(n))
+
+        assert [r.resource_id for r in buffer.drain(10)] == kept
+        assert buffer.stats["dropped"] == 1
+
+
+class TestRequestCapture:
+    """Test what the request path snapshots"""
+
+    @pytest.mark.asyncio
+    async def test_middleware_snapshots_route_principal_and_status(self):
+        buffer = PHIAuditRingBuffer(10)
+        app, _ = build_app(buffer)
+
+        async with client(app) as http:
+            assert (await http.get("/api/v1/patients/p-42")).status_code == 200
+            assert (await http.get("/api/v1/patients/forbidden")).status_code == 403
+            await http.get("/api/v1/health")
+
+        ok, denied = buffer.drain(10)
+        assert ok.route_template == "/api/v1/patients/{patient_id}"
+        assert (ok.principal, ok.resource_id, ok.status_code) == ("doctor-7", "p-42", 200)
+        assert denied.status_code == 403
+        assert build_phi_access_event(denied).outcome == "denied"
+
+    @pytest.mark.asyncio
+    async def test_fail_closed_refuses_before_the_handler_runs(self):
+        buffer = PHIAuditRingBuffer(1)
+        buffer.publish(record(0), reserved=False)
+        app, calls = build_app(buffer)
+
+        async with client(app) as http:
+            response = await http.get("/api/v1/patients/p-1")
+            health = await http.get("/api/v1/health")
+
+        assert response.status_code == 503
+        assert calls == []
+        assert health.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_route_class_captures_without_middleware_and_never_twice(self, monkeypatch):
+        buffer = PHIAuditRingBuffer(10)
+        monkeypatch.setattr(phi_audit_middleware, "get_phi_audit_buffer", lambda: buffer)
+
+        route_only, _ = build_app(buffer, route_class=PHIAuditRoute, middleware=False)
+        both, _ = build_app(buffer, route_class=PHIAuditRoute)
+        async with client(route_only) as http:
+            await http.get("/api/v1/patients/p-1")
+        async with client(both) as http:
+            await http.get("/api/v1/patients/p-2")
+
+        assert [(r.route_template, r.resource_id) for r in buffer.drain(10)] == [
+            ("/api/v1/patients/{patient_id}", "p-1"),
+            ("/api/v1/patients/{patient_id}", "p-2"),
+        ]
+
+
+class TestWriter:
+    """Test background enrichment and persistence"""
+
+    @pytest.mark.asyncio
+    async def test_flush_persists_enriched_events_in_batches(self, tmp_path):
+        buffer = PHIAuditRingBuffer(100)
+        batches = []
+
+        async def persist(events):
+            batches.append(events)
+            return [True] * len(events)
+
+        writer = PHIAuditWriter(buffer, persist=persist, batch_size=4, fallback_dir=str(tmp_path))
+        for n in range(10):
+            buffer.publish(record(n), reserved=False)
+
+        assert await writer.flush() == 10
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        event = batches[0][0]
+        assert (event.user_id, event.resource_type, event.resource_id) == ("user-1", "patient_record", "p-0")
+        assert event.headers["route"] == "/api/v1/patients/{patient_id}"
+        assert writer.stats["persisted"] == 10
+
+    @pytest.mark.asyncio
+    async def test_rejected_events_go_to_fallback_file(self, tmp_path):
+        buffer = PHIAuditRingBuffer(10)
+
+        async def persist(events):
+            return [n % 2 == 0 for n in range(len(events))]
+
+        writer = PHIAuditWriter(buffer, persist=persist, fallback_dir=str(tmp_path))
+        await writer.start()
+        for n in range(4):
+            buffer.publish(record(n, status_code=500, error="RuntimeError"), reserved=False)
+        await writer.stop()
+
+        lines = [json.loads(line) for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+        assert [line["resource_id"] for line in lines] == ["p-1", "p-3"]
+        assert all(line["outcome"] == "error" and line["requires_manual_review"] for line in lines)
+        assert writer.stats == {"persisted": 2, "fallback": 2, "batches": 1, "failures": 2}
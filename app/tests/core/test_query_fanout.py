@@ -0,0 +1,155 @@
+"""
+Tests for concurrent query fan-out
+
+Uses a counting stand-in for the per-query read-only session to cover the
+concurrency cap, per-query deadlines, SOC2 circuit breakers, fallbacks and
+the dashboard bulk refresh assembled from partial results.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.query_fanout import FanOutQuery, fan_out
+from app.core.soc2_circuit_breaker import CircuitBreakerConfig, CircuitState, SOC2CircuitBreaker
+
+pytestmark = [pytest.mark.unit]
+
+
+class SessionScope:
+    """Hands out placeholder sessions and tracks how many are open at once."""
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+        self.closed = 0
+
+    @asynccontextmanager
+    async def __call__(self):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        try:
+            yield object()
+        finally:
+            self.open -= 1
+            self.closed += 1
+
+
+def sleeping(seconds, value=None):
+    async def run(session):
+        await asyncio.sleep(seconds)
+        return value
+    return run
+
+
+class TestFanOut:
+    """Test concurrency, deadlines and fallbacks"""
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently_up_to_the_cap(self):
+        scope = SessionScope()
+        queries = [FanOutQuery(f"q{n}", sleeping(0.05, n)) for n in range(6)]
+
+        started = time.perf_counter()
+        result = await fan_out(queries, max_concurrency=3, session_scope=scope)
+        elapsed = time.perf_counter() - started
+
+        assert result.results == {f"q{n}": n for n in range(6)}
+        assert not result.partial
+        assert scope.peak == 3 and scope.closed == 6
+        # Two waves of three, not six queries back to back
+        assert elapsed < 0.25
+
+    @pytest.mark.asyncio
+    async def test_slow_query_times_out_to_its_fallback(self):
+        scope = SessionScope()
+        seen = []
+
+        async def fallback(error):
+            seen.append(error)
+            return "cached"
+
+        result = await fan_out([
+            FanOutQuery("slow", sleeping(1.0, "fresh"), timeout_seconds=0.05, fallback=fallback),
+            FanOutQuery("fast", sleeping(0, "fresh"))
+        ], session_scope=scope)
+
+        assert result["slow"] == "cached" and result["fast"] == "fresh"
+        assert result.errors == {"slow": "timeout"}
+        assert isinstance(seen[0], asyncio.TimeoutError)
+        # The cancelled query's session is still closed
+        assert scope.open == 0 and scope.closed == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_without_fallback_reads_as_none(self):
+        async def broken(session):
+            raise RuntimeError("replica unavailable")
+
+        result = await fan_out([FanOutQuery("broken", broken)], session_scope=SessionScope())
+
+        assert result["broken"] is None
+        assert result.errors == {"broken": "replica unavailable"}
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_breaker_skips_the_query(self):
+        scope = SessionScope()
+        breaker = SOC2CircuitBreaker("fanout_test", CircuitBreakerConfig(timeout_seconds=60))
+        breaker.state = CircuitState.OPEN
+        breaker.last_failure_time = time.time()
+
+        result = await fan_out([FanOutQuery("guarded", sleeping(0, "fresh"), breaker=breaker)], session_scope=scope)
+
+        assert result.errors == {"guarded": "circuit_open"}
+        assert scope.closed == 0
+
+    @pytest.mark.asyncio
+    async def test_query_names_must_be_unique(self):
+        with pytest.raises(ValueError):
+            await fan_out([FanOutQuery("q", sleeping(0)), FanOutQuery("q", sleeping(0))], session_scope=SessionScope())
+
+
+class TestDashboardBulkRefresh:
+    """Test the bulk dashboard refresh built on fan_out"""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        from app.modules.dashboard.schemas import SecuritySummary
+        from app.modules.dashboard.service import DashboardService
+
+        service = DashboardService()
+        service.session_scope = SessionScope()
+        service.projection = None
+
+        async def patient_stats(db):
+            await asyncio.sleep(0.05)
+            return {"total": 10, "change": "+1 this week", "weekly_new": 1}
+
+        async def security_summary(db):
+            await asyncio.sleep(0.05)
+            return SecuritySummary(
+                security_events_today=0, failed_logins_24h=0, phi_access_events=3,
+                admin_actions=0, total_audit_events_24h=3, critical_alerts=0, compliance_score=100.0
+            )
+
+        async def failing_activities(db, limit, categories, hours):
+            raise RuntimeError("replica unavailable")
+
+        monkeypatch.setattr(service, "_get_patient_stats", patient_stats)
+        monkeypatch.setattr(service, "_get_security_summary", security_summary)
+        monkeypatch.setattr(service, "_get_dashboard_activities", failing_activities)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_sections_are_gathered_and_failures_reported(self, service):
+        from app.modules.dashboard.schemas import BulkRefreshRequest
+
+        response = await service.get_bulk_dashboard_data(
+            BulkRefreshRequest(include_stats=True, include_activities=True, include_alerts=False), None
+        )
+
+        assert response.stats.total_patients == 10
+        assert response.activities is None
+        assert set(response.metadata["query_time_ms"]) == {"patient_stats", "security_summary", "activities"}
+        assert response.metadata["fallbacks"] == {"activities": "replica unavailable"}
@@ -0,0 +1,126 @@
+"""
+Tests for read replica routing in the unified database layer
+
+Uses SQLite files as replica stand-ins to cover health checks, the lag
+threshold, fallback to the primary and read-your-writes stickiness.
+"""
+
+import asyncio
+import contextvars
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Integer, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.core import database_unified
+from app.core.database_unified import (
+    PrimarySession,
+    ReplicaRouter,
+    get_readonly_session_factory,
+    mark_primary_write,
+    should_read_from_primary,
+)
+
+pytest.importorskip("aiosqlite")
+
+
+class _ProbeBase(DeclarativeBase):
+    pass
+
+
+class _Probe(_ProbeBase):
+    __tablename__ = "replica_routing_probe"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+@pytest_asyncio.fixture
+async def replica_router(tmp_path):
+    router = ReplicaRouter(
+        [f"sqlite:///{tmp_path / 'replica_a.db'}", f"sqlite:///{tmp_path / 'replica_b.db'}"],
+        max_lag_seconds=5.0,
+        health_check_interval=60.0
+    )
+    yield router
+    await router.dispose()
+
+
+class TestReplicaRouter:
+    """Test replica selection and health checks"""
+
+    @pytest.mark.asyncio
+    async def test_round_robin_over_healthy_replicas(self, replica_router):
+        picked = [await replica_router.pick() for _ in range(4)]
+
+        assert picked[0] is not picked[1]
+        assert picked[0] is picked[2]
+        assert all(replica.healthy for replica in replica_router.replicas)
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_leaves_rotation(self, replica_router, monkeypatch):
+        lagging = replica_router.replicas[0]
+        original = replica_router._measure_lag
+
+        async def measure_lag(replica):
+            return 30.0 if replica is lagging else await original(replica)
+
+        monkeypatch.setattr(replica_router, "_measure_lag", measure_lag)
+        await replica_router.check_health(force=True)
+
+        assert not lagging.healthy
+        assert {id(await replica_router.pick()) for _ in range(3)} == {id(replica_router.replicas[1])}
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_marked_unhealthy(self, tmp_path):
+        router = ReplicaRouter([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+        try:
+            assert await router.pick() is None
+            status = router.get_status()[0]
+            assert status["healthy"] is False
+            assert status["consecutive_failures"] == 1
+        finally:
+            await router.dispose()
+
+
+class TestReadYourWrites:
+    """Test primary stickiness after writes"""
+
+    def test_write_makes_reads_sticky(self):
+        def scenario():
+            assert should_read_from_primary() is False
+            mark_primary_write()
+            return should_read_from_primary()
+
+        assert contextvars.Context().run(scenario) is True
+
+    def test_primary_session_flush_marks_write(self):
+        engine = create_engine("sqlite://")
+        _ProbeBase.metadata.create_all(engine)
+
+        def scenario():
+            with PrimarySession(bind=engine) as session:
+                session.add(_Probe(id=1))
+                session.flush()
+            return should_read_from_primary()
+
+        assert contextvars.Context().run(scenario) is True
+
+    @pytest.mark.asyncio
+    async def test_readonly_factory_routes_by_write_state(self, replica_router, monkeypatch):
+        primary_factory = object()
+
+        async def get_session_factory():
+            return primary_factory
+
+        monkeypatch.setattr(database_unified, "_replica_router", replica_router)
+        monkeypatch.setattr(database_unified, "get_session_factory", get_session_factory)
+
+        async def scenario():
+            factory, replica = await get_readonly_session_factory()
+            assert replica is not None and factory is replica.session_factory
+
+            mark_primary_write()
+            factory, replica = await get_readonly_session_factory()
+            assert replica is None and factory is primary_factory
+
+        await asyncio.create_task(scenario(), context=contextvars.Context())
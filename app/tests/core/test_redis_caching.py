@@ -0,0 +1,315 @@
+"""
+Healthcare cache tier tests.
+
+Covers the per-process LRU tier in front of Redis, single-flight loading of
+concurrent misses, stale-while-revalidate, hit rates per CacheKeyType and
+tag-set invalidation with its cross-worker broadcast, against an in-memory
+stand-in for the Redis commands and scripts the cache uses.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core import cache_invalidation
+from app.core.cache_invalidation import TagInvalidator
+from app.core.redis_caching import CacheKeyType, HealthcareRedisCache, LocalCacheTier
+
+pytestmark = [pytest.mark.unit]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.commands.append(lambda: self.redis.value(key))
+
+    def pttl(self, key):
+        self.commands.append(lambda: self.redis.pttl_of(key))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeScript:
+    """Python versions of the cache_invalidation Lua scripts."""
+
+    def __init__(self, redis, script):
+        self.redis = redis
+        self.script = script
+
+    async def __call__(self, keys=(), args=()):
+        if self.script == cache_invalidation._STORE_TAGGED:
+            key, *tag_keys = keys
+            await self.redis.setex(key, args[0], args[1])
+            for tag_key in tag_keys:
+                self.redis.sets.setdefault(tag_key, set()).add(key)
+            return 1
+
+        deleted, members = 0, []
+        for tag_key in keys:
+            for member in sorted(self.redis.sets.pop(tag_key, set())):
+                deleted += await self.redis.delete(member)
+                if member not in members:
+                    members.append(member)
+        return [deleted, members]
+
+
+class FakeRedis:
+    """Strings with expiry, sets and publish - just what HealthcareRedisCache calls."""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.published = []
+        self.gets = 0
+
+    def register_script(self, script):
+        return FakeScript(self, script)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def value(self, key):
+        self.gets += 1
+        entry = self.data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def pttl_of(self, key):
+        entry = self.data.get(key)
+        return int((entry[1] - time.monotonic()) * 1000) if entry else -2
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = (value, time.monotonic() + ttl)
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def info(self):
+        return {}
+
+
+@pytest.fixture
+def cache():
+    cache = HealthcareRedisCache()
+    cache.strategy_manager.redis_client = FakeRedis()
+    return cache
+
+
+class CountingLoader:
+    def __init__(self, value, delay=0.01):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class TestLocalCacheTier:
+    """Test LRU bounds and freshness"""
+
+    def test_evicts_least_recently_used(self):
+        tier = LocalCacheTier(max_size=2)
+        tier.put("a", 1, 60)
+        tier.put("b", 2, 60)
+        tier.get("a")
+        tier.put("c", 3, 60)
+
+        assert tier.get("b") is None
+        assert tier.get("a") == (1, True)
+        assert tier.eviction_count == 1
+
+    def test_entry_is_stale_then_expired(self):
+        tier = LocalCacheTier()
+        tier.put("a", 1, 0, stale_seconds=60)
+        assert tier.get("a") == (1, False)
+
+        tier.put("b", 2, 0, stale_seconds=0)
+        assert tier.get("b") is None
+
+    def test_invalidate_pattern(self):
+        tier = LocalCacheTier()
+        tier.put("patient_search:1", 1, 60)
+        tier.put("patient_lookup:1", 2, 60)
+
+        assert tier.invalidate_pattern("patient_search:*") == 1
+        assert len(tier) == 1
+
+
+class TestTwoTierCache:
+    """Test local tier, single-flight and stale-while-revalidate"""
+
+    @pytest.mark.asyncio
+    async def test_second_read_is_served_by_local_tier(self, cache):
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "daily", {"events": 10})
+        redis = cache.strategy_manager.redis_client
+
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "daily") == {"events": 10}
+        assert redis.gets == 0
+        stats = cache.get_key_type_stats()["audit_aggregation"]
+        assert stats["local_hits"] == 1 and stats["hit_rate_percent"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_types_without_local_ttl_always_read_redis(self, cache):
+        await cache.set(CacheKeyType.RATE_LIMIT, "user-1", {"count": 1})
+        redis = cache.strategy_manager.redis_client
+
+        assert await cache.get(CacheKeyType.RATE_LIMIT, "user-1") == {"count": 1}
+        assert redis.gets == 1
+        assert cache.get_key_type_stats()["rate_limit"]["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_loader(self, cache):
+        loader = CountingLoader({"total": 42})
+
+        results = await asyncio.gather(*[
+            cache.get_or_load(CacheKeyType.AUDIT_AGGREGATION, "summary", loader) for _ in range(20)
+        ])
+
+        assert loader.calls == 1
+        assert all(result == {"total": 42} for result in results)
+        stats = cache.get_key_type_stats()["audit_aggregation"]
+        assert stats["misses"] == 20 and stats["coalesced"] == 19 and stats["loads"] == 1
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "summary") == {"total": 42}
+
+    @pytest.mark.asyncio
+    async def test_loader_error_reaches_every_waiter(self, cache):
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database down")
+
+        results = await asyncio.gather(*[
+            cache.get_or_load(CacheKeyType.API_RESPONSE, "dashboard", failing) for _ in range(3)
+        ], return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not cache._inflight
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_while_one_reload_runs(self, cache):
+        config = cache.strategy_manager.cache_configs[CacheKeyType.API_RESPONSE]
+        await cache.set(CacheKeyType.API_RESPONSE, "dashboard", {"version": 1}, ttl_override=1)
+        cache.local_cache.clear()
+        redis = cache.strategy_manager.redis_client
+        key, (value, _) = next(iter(redis.data.items()))
+        # Leave the entry inside its stale window
+        redis.data[key] = (value, time.monotonic() + config.stale_seconds - 1)
+        loader = CountingLoader({"version": 2})
+
+        first = await cache.get_or_load(CacheKeyType.API_RESPONSE, "dashboard", loader)
+        second = await cache.get_or_load(CacheKeyType.API_RESPONSE, "dashboard", loader)
+        await asyncio.gather(*cache._revalidations)
+
+        assert first == second == {"version": 1}
+        assert loader.calls == 1
+        assert await cache.get(CacheKeyType.API_RESPONSE, "dashboard") == {"version": 2}
+        assert cache.get_key_type_stats()["api_response"]["stale_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_plain_get_treats_stale_entry_as_miss(self, cache):
+        config = cache.strategy_manager.cache_configs[CacheKeyType.PATIENT_SEARCH]
+        cache.local_tier_enabled = False
+        redis = cache.strategy_manager.redis_client
+        await redis.setex("patient_search:q", config.stale_seconds - 1, b'{"total": 1}')
+        config.encrypt_data = config.compress_data = False
+
+        assert await cache.get(CacheKeyType.PATIENT_SEARCH, "q") is None
+        assert cache.miss_count == 1
+
+    @pytest.mark.asyncio
+    async def test_delete_drops_local_copy(self, cache):
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "daily", {"events": 10})
+
+        await cache.delete(CacheKeyType.AUDIT_AGGREGATION, "daily")
+
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "daily") is None
+
+
+class TestTagInvalidation:
+    """Test tag-set invalidation and the cross-worker broadcast"""
+
+    @pytest.mark.asyncio
+    async def test_invalidates_only_tagged_entries(self, cache):
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "p1", {"n": 1}, tags=["patient:1"])
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "p2", {"n": 2}, tags=["patient:2"])
+
+        assert await cache.invalidate_tags(["patient:1"]) == 1
+
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "p1") is None
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "p2") == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_key_type_is_invalidated_through_its_tag(self, cache):
+        await cache.set(CacheKeyType.API_RESPONSE, "a", {"n": 1})
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "b", {"n": 2})
+
+        assert await cache.invalidate_pattern(CacheKeyType.API_RESPONSE) == 1
+        assert await cache.get(CacheKeyType.AUDIT_AGGREGATION, "b") == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_user_sessions_are_invalidated_by_user_tag(self):
+        from app.core.redis_caching import SessionCache
+
+        cache = HealthcareRedisCache()
+        cache.strategy_manager.redis_client = FakeRedis()
+        cache.strategy_manager.cache_configs[CacheKeyType.SESSION_DATA].encrypt_data = False
+        sessions = SessionCache(cache)
+        first = await sessions.create_session("user-1", {})
+        await sessions.create_session("user-1", {})
+        other = await sessions.create_session("user-2", {})
+
+        assert await sessions.invalidate_user_sessions("user-1") == 2
+        assert await sessions.get_session(first) is None
+        assert (await sessions.get_session(other))["user_id"] == "user-2"
+
+    @pytest.mark.asyncio
+    async def test_invalidation_broadcasts_deleted_keys(self, cache):
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "p1", {"n": 1}, tags=["patient:1"])
+
+        await cache.invalidate_tags(["patient:1"])
+
+        channel, message = cache.strategy_manager.redis_client.published[0]
+        payload = json.loads(message)
+        assert channel == cache_invalidation.INVALIDATION_CHANNEL
+        assert payload["keys"] == ["audit_aggregation:p1"]
+        assert payload["tags"] == ["patient:1"]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_from_another_worker_evicts_local_tier(self, cache):
+        await cache.set(CacheKeyType.AUDIT_AGGREGATION, "p1", {"n": 1}, tags=["patient:1"])
+        invalidator = await cache.get_invalidator()
+
+        invalidator._handle_message(json.dumps({
+            "origin": "other-worker", "tags": ["patient:1"], "keys": ["audit_aggregation:p1"]
+        }).encode())
+
+        assert cache.local_cache.get("audit_aggregation:p1") is None
+        assert invalidator.metrics["broadcasts_received"] == 1
+
+    def test_own_broadcast_is_ignored(self):
+        evicted = []
+        invalidator = TagInvalidator(FakeRedis())
+        invalidator.add_listener(evicted.append)
+
+        invalidator._handle_message(json.dumps({"origin": invalidator.instance_id, "keys": ["a"]}))
+        invalidator._handle_message(b"not json")
+
+        assert evicted == []
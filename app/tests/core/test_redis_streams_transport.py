@@ -0,0 +1,258 @@
+"""
+Event bus transport tests.
+
+Covers event serialization across processes, HybridEventBus delivery through
+a transport and its fallback to local memory queues, and - against a live
+Redis (EVENT_BUS_TEST_REDIS_URL, default redis://localhost:6379/15) - the
+Redis Streams transport's partitioning, lease rebalancing and reclaim of
+entries left pending by a dead node.
+"""
+import asyncio
+import os
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from app.core.event_bus_advanced import (
+    BaseEvent,
+    EventHandler,
+    EventTransport,
+    HybridEventBus,
+    deserialize_event,
+    serialize_event,
+)
+from app.core.redis_streams_transport import RedisStreamsTransport
+
+pytestmark = [pytest.mark.event_bus]
+
+REDIS_URL = os.environ.get("EVENT_BUS_TEST_REDIS_URL", "redis://localhost:6379/15")
+
+
+class VitalsRecorded(BaseEvent):
+    """Event subclass carried across the transport."""
+    event_type: str = "VitalsRecorded"
+    aggregate_type: str = "patient"
+    publisher: str = "test"
+    heart_rate: int = 70
+
+
+class RecordingHandler(EventHandler):
+    def __init__(self, handler_name="recorder"):
+        super().__init__(handler_name)
+        self.events = []
+
+    async def handle(self, event):
+        self.events.append(event)
+        return True
+
+
+class LoopbackTransport(EventTransport):
+    """In-process transport delivering sequentially, as one partition consumer would."""
+
+    name = "loopback"
+
+    def __init__(self, accept=True):
+        self.accept = accept
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    async def start(self, deliver):
+        async def consume():
+            while True:
+                data = await self.queue.get()
+                await deliver(deserialize_event(data))
+                self.queue.task_done()
+
+        self.task = asyncio.create_task(consume())
+
+    async def stop(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+    async def send(self, event):
+        if not self.accept:
+            raise ConnectionError("transport down")
+        await self.queue.put(serialize_event(event))
+        return True
+
+
+def db_session_factory():
+    session = AsyncMock()
+    return lambda: session
+
+
+def vitals(aggregate_id, n):
+    return VitalsRecorded(aggregate_id=aggregate_id, heart_rate=60 + n)
+
+
+class TestSerialization:
+    """Test event serialization and partitioning"""
+
+    def test_round_trip_keeps_event_class(self):
+        event = vitals("patient-1", 5)
+
+        decoded = deserialize_event(serialize_event(event))
+
+        assert type(decoded) is VitalsRecorded
+        assert decoded == event
+
+    def test_unknown_class_decodes_as_base_event(self):
+        data = serialize_event(vitals("patient-1", 1)).replace(b"VitalsRecorded\"", b"Missing\"", 1)
+
+        decoded = deserialize_event(data)
+
+        assert type(decoded) is BaseEvent
+        assert decoded.aggregate_id == "patient-1"
+
+    def test_partition_is_stable_and_bounded(self):
+        transport = RedisStreamsTransport(redis.Redis(), partitions=8)
+
+        partitions = {transport.partition_for(f"patient-{n}") for n in range(200)}
+
+        assert partitions == set(range(8))
+        assert transport.partition_for("patient-1") == transport.partition_for("patient-1")
+
+
+class TestBusTransport:
+    """Test HybridEventBus delivery through a transport"""
+
+    @pytest.mark.asyncio
+    async def test_events_are_delivered_through_the_transport_in_order(self):
+        transport = LoopbackTransport()
+        bus = HybridEventBus(db_session_factory(), transport=transport)
+        handler = RecordingHandler()
+        bus.subscribe(handler)
+        await bus.start()
+        try:
+            for n in range(20):
+                assert await bus.publish(vitals(f"patient-{n % 2}", n))
+            await asyncio.wait_for(transport.queue.join(), 5)
+        finally:
+            await bus.stop(timeout=1)
+
+        assert all(type(event) is VitalsRecorded for event in handler.events)
+        assert [e.heart_rate for e in handler.events if e.aggregate_id == "patient-0"] == list(range(60, 80, 2))
+        assert sum(queue.queue.qsize() for queue in bus.aggregate_queues.values()) == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_falls_back_to_local_memory_queues(self):
+        bus = HybridEventBus(db_session_factory(), transport=LoopbackTransport(accept=False))
+        handler = RecordingHandler()
+        bus.subscribe(handler)
+        await bus.start()
+        try:
+            assert await bus.publish(vitals("patient-1", 1))
+            for _ in range(50):
+                if handler.events:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await bus.stop(timeout=1)
+
+        assert [event.heart_rate for event in handler.events] == [61]
+        assert bus.get_metrics()["transport"] == {"transport": "loopback"}
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    client = redis.from_url(REDIS_URL, decode_responses=False)
+    try:
+        await client.ping()
+    except (redis.ConnectionError, OSError):
+        await client.aclose()
+        pytest.skip(f"Redis not reachable at {REDIS_URL}")
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def stream_prefix(redis_client):
+    return f"test:events:{uuid.uuid4().hex[:8]}"
+
+
+def node(client, prefix, name, **kwargs):
+    options = {"partitions": 4, "lease_ms": 600, "block_ms": 50, "claim_idle_ms": 300}
+    options.update(kwargs)
+    return RedisStreamsTransport(client, stream_prefix=prefix, consumer_name=name, **options)
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.integration
+class TestRedisStreamsTransport:
+    """Test the Redis Streams transport against a live Redis"""
+
+    @pytest.mark.asyncio
+    async def test_partitions_are_shared_and_each_event_is_delivered_once_in_order(self, redis_client, stream_prefix):
+        received = {"a": [], "b": []}
+        a, b = node(redis_client, stream_prefix, "a"), node(redis_client, stream_prefix, "b")
+
+        def deliver_to(name):
+            async def deliver(event):
+                received[name].append(event)
+            return deliver
+
+        await a.start(deliver_to("a"))
+        await b.start(deliver_to("b"))
+        try:
+            await a.rebalance()  # a sheds down to its fair share once b has joined
+            await b.rebalance()
+            assert a.owned_partitions | b.owned_partitions == set(range(4))
+            assert not a.owned_partitions & b.owned_partitions
+
+            for n in range(40):
+                await a.send(vitals(f"patient-{n % 5}", n))
+            await wait_for(lambda: len(received["a"]) + len(received["b"]) == 40)
+        finally:
+            await a.stop()
+            await b.stop()
+
+        delivered = received["a"] + received["b"]
+        assert len({event.event_id for event in delivered}) == 40
+        for aggregate in range(5):
+            rates = [e.heart_rate for e in delivered if e.aggregate_id == f"patient-{aggregate}"]
+            assert rates == sorted(rates)
+        assert {e.aggregate_id for e in received["a"]}.isdisjoint({e.aggregate_id for e in received["b"]})
+
+    @pytest.mark.asyncio
+    async def test_entries_pending_on_a_dead_node_are_reclaimed(self, redis_client, stream_prefix):
+        crashed = node(redis_client, stream_prefix, "crashed", partitions=1)
+        stall = asyncio.Event()
+
+        async def hang(event):
+            await stall.wait()
+
+        await crashed.start(hang)
+        await crashed.send(vitals("patient-1", 1))
+        await crashed.send(vitals("patient-1", 2))
+        await wait_for(lambda: crashed.metrics["published"] == 2)
+        await asyncio.sleep(0.2)
+        # Simulate a crash: consumer tasks die without acking or releasing the lease
+        crashed._rebalance_task.cancel()
+        for task in crashed._consumers.values():
+            task.cancel()
+
+        received = []
+
+        async def deliver(event):
+            received.append(event.heart_rate)
+
+        survivor = node(redis_client, stream_prefix, "survivor", partitions=1)
+        await survivor.start(deliver)
+        try:
+            await wait_for(lambda: received == [61, 62])  # after the crashed node's lease expires
+        finally:
+            await survivor.stop()
+
+        assert survivor.metrics["reclaimed"] >= 1
+        assert await redis_client.xpending(survivor.stream_key(0), survivor.group) == {
+            "pending": 0, "min": None, "max": None, "consumers": []
+        }
@@ -0,0 +1,242 @@
+"""
+Dashboard projection tests.
+
+Covers folding PatientCreated, PHIAccessLogged and SecurityViolationDetected
+events into windowed counters and the recent activity feed, reconciliation
+snapshots replacing the incremental state, the fallback signal when the
+trimmed feed cannot answer, and DashboardService serving its sections from
+the projection - in memory and against an in-memory stand-in for the Redis
+commands the store uses.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.events.definitions import PatientCreated, PHIAccessLogged, SecurityViolationDetected
+from app.modules.dashboard.projection import (
+    PATIENTS_CREATED,
+    PATIENTS_TOTAL,
+    TOTAL_AUDIT_EVENTS,
+    DashboardProjection,
+    MemoryProjectionStore,
+    RedisProjectionStore,
+    hour_bucket,
+)
+
+pytestmark = [pytest.mark.unit]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.commands.append(lambda: command(*args, **kwargs))
+
+    async def execute(self):
+        return [await command() for command in self.commands]
+
+
+class FakeRedis:
+    """Hashes, lists and sets with decoded responses - just what RedisProjectionStore calls."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hincrby(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        fields[str(field)] = str(int(fields.get(str(field), 0)) + amount)
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({str(k): str(v) for k, v in mapping.items()})
+
+    async def hmget(self, key, fields):
+        return [self.data.get(key, {}).get(str(field)) for field in fields]
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    async def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    async def ltrim(self, key, start, end):
+        self.data[key] = self.data.get(key, [])[start:end + 1]
+
+    async def lrange(self, key, start, end):
+        return list(self.data.get(key, []))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def projection(request):
+    store = MemoryProjectionStore(5) if request.param == "memory" else RedisProjectionStore(FakeRedis(), 5)
+    return DashboardProjection(store=store, max_activities=5)
+
+
+def patient_created(n=1, at=None):
+    return PatientCreated(
+        aggregate_id=f"patient-{n}", publisher="healthcare_records",
+        patient_id=f"patient-{n}", created_by_user_id="clinician-1",
+        **({"timestamp": at} if at else {})
+    )
+
+
+def phi_access(n=1, at=None):
+    return PHIAccessLogged(
+        aggregate_id=f"access-{n}", publisher="healthcare_records",
+        user_id="clinician-1", patient_id=f"patient-{n}", phi_fields_accessed=["name"],
+        access_purpose="treatment", access_method="view", legal_basis="treatment",
+        consent_verified=True, minimum_necessary_verified=True, session_id="session-1",
+        **({"timestamp": at} if at else {})
+    )
+
+
+def violation():
+    return SecurityViolationDetected(
+        aggregate_id="violation-1", publisher="security", violation_type="bulk_export",
+        severity="critical", user_id="user-9", resource_type="patient",
+        violation_description="Bulk export outside business hours", detection_method="rules"
+    )
+
+
+class TestEventIngestion:
+    """Test counters and activities maintained from events"""
+
+    @pytest.mark.asyncio
+    async def test_events_update_counters_and_totals(self, projection):
+        for event in [patient_created(1), patient_created(2), phi_access(), violation()]:
+            assert await projection.handle(event)
+
+        counts = await projection.get_counts(
+            ["PATIENT_CREATED", "PHI_ACCESSED", "SECURITY_VIOLATION", PATIENTS_CREATED, TOTAL_AUDIT_EVENTS], 24
+        )
+        assert counts == {
+            "PATIENT_CREATED": 2, "PHI_ACCESSED": 1, "SECURITY_VIOLATION": 1,
+            PATIENTS_CREATED: 2, TOTAL_AUDIT_EVENTS: 4
+        }
+        assert (await projection.get_totals())[PATIENTS_TOTAL] == 2
+
+    @pytest.mark.asyncio
+    async def test_redelivered_event_is_counted_once(self, projection):
+        event = phi_access()
+
+        await projection.handle(event)
+        await projection.handle(event)
+
+        assert (await projection.get_counts(["PHI_ACCESSED"], 1))["PHI_ACCESSED"] == 1
+        assert projection.stats["duplicate_events"] == 1
+
+    @pytest.mark.asyncio
+    async def test_counts_outside_the_window_are_excluded(self, projection):
+        await projection.handle(phi_access(1, at=datetime.now(timezone.utc) - timedelta(hours=30)))
+        await projection.handle(phi_access(2))
+
+        assert (await projection.get_counts(["PHI_ACCESSED"], 24))["PHI_ACCESSED"] == 1
+        assert (await projection.get_counts(["PHI_ACCESSED"], 48))["PHI_ACCESSED"] == 2
+
+    @pytest.mark.asyncio
+    async def test_activities_are_newest_first_and_filtered(self, projection):
+        await projection.handle(phi_access(1))
+        await projection.handle(violation())
+
+        activities = await projection.get_recent_activities(10, None, 24)
+        security = await projection.get_recent_activities(10, ["SECURITY_VIOLATION"], 24)
+
+        assert [a["event_type"] for a in activities] == ["SECURITY_VIOLATION", "PHI_ACCESSED"]
+        assert security[0]["outcome"] == "critical" and security[0]["user_id"] == "user-9"
+
+
+class TestReconciliation:
+    """Test snapshots from the database and trimmed-feed fallback"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_replaces_incremental_state(self, projection):
+        await projection.handle(phi_access())
+        assert not await projection.is_ready()
+        hour = hour_bucket(datetime.utcnow())
+
+        await projection.store.load(
+            {"USER_LOGIN_FAILED": {hour: 12}, TOTAL_AUDIT_EVENTS: {hour: 12}},
+            {PATIENTS_TOTAL: 1500, "reconciled_at": 1},
+            []
+        )
+        await projection.handle(patient_created())
+
+        assert await projection.is_ready()
+        counts = await projection.get_counts(["USER_LOGIN_FAILED", "PHI_ACCESSED", TOTAL_AUDIT_EVENTS], 24)
+        assert counts == {"USER_LOGIN_FAILED": 12, "PHI_ACCESSED": 0, TOTAL_AUDIT_EVENTS: 13}
+        assert (await projection.get_totals())[PATIENTS_TOTAL] == 1501
+
+    @pytest.mark.asyncio
+    async def test_full_feed_covering_only_part_of_the_window_defers_to_database(self, projection):
+        for n in range(7):
+            await projection.handle(phi_access(n))
+
+        assert len(await projection.get_recent_activities(3, None, 24)) == 3
+        assert await projection.get_recent_activities(3, ["SECURITY_VIOLATION"], 24) is None
+        assert await projection.get_recent_activities(3, ["SECURITY_VIOLATION"], 0) == []
+
+
+class TestDashboardServiceReads:
+    """Test dashboard sections served from the projection"""
+
+    @pytest.fixture
+    def service(self):
+        from app.modules.dashboard.service import DashboardService
+
+        service = DashboardService()
+        service.projection = DashboardProjection()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_sections_use_projection_once_reconciled(self, service):
+        hour = hour_bucket(datetime.utcnow())
+        await service.projection.store.load(
+            {"USER_LOGIN_FAILED": {hour: 11}, "SECURITY_VIOLATION": {hour: 2}, PATIENTS_CREATED: {hour: 4},
+             TOTAL_AUDIT_EVENTS: {hour: 40}},
+            {PATIENTS_TOTAL: 120, "reconciled_at": 1},
+            []
+        )
+        await service.projection.handle(phi_access())
+
+        # No database session: every read below must come from the projection
+        patients = await service._get_patient_stats(None)
+        security = await service._get_security_summary(None)
+        activities = await service._get_dashboard_activities(None, 10, ["phi"], 24)
+        alerts = await service._get_dashboard_alerts(None, 24)
+
+        assert patients == {"total": 120, "change": "+4 this week", "weekly_new": 4}
+        assert security.security_events_today == 13 and security.phi_access_events == 1
+        assert security.total_audit_events_24h == 41
+        assert [a.category for a in activities.activities] == ["phi"]
+        assert alerts.warning_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unreconciled_projection_falls_back_to_database(self, service):
+        await service.projection.handle(phi_access())
+
+        assert await service._get_projected_security_summary() is None
+        assert await service._get_projected_activity_logs(10, [], 24) is None
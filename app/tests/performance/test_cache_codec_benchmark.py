@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark
+
+Encodes and decodes cached healthcare payloads 500 times each (override with
+CACHE_CODEC_BENCHMARK_ROUNDS) with the legacy cache serialization (JSON +
+gzip) and each available cache codec:
+
+- a 200-patient FHIR searchset bundle (a big cached search)
+- a dashboard payload of stats, activities and alerts
+- small single-patient bundles, with and without a zstd dictionary trained
+  for the key type
+
+Reports stored bytes and encode + decode time per payload. Encryption is
+left out; it costs the same per byte for every codec, so smaller entries
+also encrypt faster.
+"""
+
+import gzip
+import json
+import os
+import time
+
+import pytest
+import structlog
+
+from app.core import cache_codec
+from app.core.cache_codec import CacheCodec
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ROUNDS = int(os.environ.get("CACHE_CODEC_BENCHMARK_ROUNDS", "500"))
+
+
+def fhir_bundle(entries, offset=0):
+    return {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "total": entries,
+        "link": [{"relation": "self", "url": "https://fhir.example.org/Patient?family=Doe&_count=200"}],
+        "entry": [
+            {
+                "fullUrl": f"https://fhir.example.org/Patient/{n}",
+                "resource": {
+                    "resourceType": "Patient",
+                    "id": str(n),
+                    "meta": {"versionId": "3", "lastUpdated": "2026-10-01T12:00:00Z"},
+                    "identifier": [{"system": "urn:oid:2.16.840.1.113883.4.1", "value": f"MRN{n:08d}"}],
+                    "active": True,
+                    "name": [{"use": "official", "family": "Doe", "given": ["Jane", f"Q{n % 26}"]}],
+                    "gender": "female" if n % 2 else "male",
+                    "birthDate": f"19{50 + n % 50}-0{1 + n % 9}-1{n % 10}",
+                    "address": [{"line": [f"{n} Main St"], "city": "Springfield", "state": "IL", "postalCode": "62701"}]
+                },
+                "search": {"mode": "match", "score": 1}
+            }
+            for n in range(offset, offset + entries)
+        ]
+    }
+
+
+def dashboard_payload():
+    return {
+        "stats": {"total_patients": 182734, "active_users": 412, "phi_accesses_24h": 95123, "compliance_score": 98.7},
+        "activities": [
+            {"id": f"act-{n}", "type": "phi_access", "user": f"clinician-{n % 40}", "resource": f"Patient/{n}",
+             "timestamp": f"2026-10-16T12:{n % 60:02d}:00Z", "severity": "info"}
+            for n in range(100)
+        ],
+        "alerts": [
+            {"id": f"alert-{n}", "level": "warning", "message": "Unusual access volume", "source": "soc2_monitor"}
+            for n in range(20)
+        ]
+    }
+
+
+def legacy_encode(data):
+    return gzip.compress(json.dumps(data, default=str).encode("utf-8"))
+
+
+def legacy_decode(data):
+    return json.loads(gzip.decompress(data).decode("utf-8"))
+
+
+def measure(encode, decode, payloads):
+    sizes = [len(encode(payload)) for payload in payloads]
+    started = time.perf_counter()
+    for n in range(ROUNDS):
+        decode(encode(payloads[n % len(payloads)]))
+    return sum(sizes) / len(sizes), (time.perf_counter() - started) * 1e6 / ROUNDS
+
+
+def codecs():
+    # "json" writes through orjson whenever it is installed, so only one JSON variant is measured
+    serializers = ["orjson" if cache_codec.ORJSON_AVAILABLE else "json"] + \
+        (["msgpack"] if cache_codec.MSGPACK_AVAILABLE else [])
+    compression = "zstd" if cache_codec.ZSTD_AVAILABLE else "gzip"
+    return {f"{serializer}+{compression}": CacheCodec(serializer=serializer, compression=compression)
+            for serializer in serializers}
+
+
+def test_cache_codec_benchmark():
+    """Benchmark stored size and round trip of cached payloads per codec."""
+    payloads = {
+        "fhir_search_200": [fhir_bundle(200)],
+        "dashboard": [dashboard_payload()],
+        "single_patient": [fhir_bundle(1, offset=n) for n in range(50)]
+    }
+    results = {name: {"legacy": measure(legacy_encode, legacy_decode, values)} for name, values in payloads.items()}
+    for codec_name, codec in codecs().items():
+        for name, values in payloads.items():
+            results[name][codec_name] = measure(
+                lambda value: codec.encode(value, key_type="patient_search"), codec.decode, values
+            )
+
+    if cache_codec.ZSTD_AVAILABLE:
+        codec = CacheCodec(min_compress_bytes=64)
+        samples = [fhir_bundle(n % 5 + 1, offset=1000 + n) for n in range(500)]
+        codec.add_dictionary(codec.train_dictionary(samples, dict_size=8192), "patient_search")
+        results["single_patient"]["dictionary"] = measure(
+            lambda value: codec.encode(value, key_type="patient_search"), codec.decode, payloads["single_patient"]
+        )
+
+    logger.info(
+        "Cache codec benchmark",
+        rounds=ROUNDS,
+        **{f"{name}_{codec_name}_bytes": round(size)
+           for name, by_codec in results.items() for codec_name, (size, _) in by_codec.items()},
+        **{f"{name}_{codec_name}_round_trip_us": round(us, 1)
+           for name, by_codec in results.items() for codec_name, (_, us) in by_codec.items()}
+    )
+    print(f"\nCache codecs ({ROUNDS:,} encode+decode rounds per payload):")
+    for name, by_codec in results.items():
+        print(f"  {name}: " + ", ".join(
+            f"{codec_name} {size:,.0f} B / {us:,.1f} us" for codec_name, (size, us) in by_codec.items()
+        ))
+
+    for name, by_codec in results.items():
+        legacy_size = by_codec["legacy"][0]
+        assert min(size for codec_name, (size, _) in by_codec.items() if codec_name != "legacy") <= legacy_size
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Dashboard Projection Benchmark
+
+Fills the in-memory dashboard projection with 1,000, 10,000 and 100,000 audit
+events spread over 30 days, then times the reads behind one dashboard
+refresh: the 30-day security summary counters, the weekly patient counter,
+the 24-hour failed login counter and the recent activity feed.
+
+Read time should stay flat as the event count grows; the aggregate queries
+it replaces scan the audit rows in the window.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import structlog
+
+from app.modules.dashboard.projection import (
+    PATIENTS_CREATED,
+    TOTAL_AUDIT_EVENTS,
+    DashboardProjection,
+    hour_bucket,
+)
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+EVENT_TYPES = ["PHI_ACCESSED", "USER_LOGIN", "USER_LOGIN_FAILED", "SECURITY_VIOLATION", "PATIENT_CREATED"]
+READ_ROUNDS = 200
+
+
+async def filled_projection(events):
+    projection = DashboardProjection()
+    now = datetime.utcnow()
+    for n in range(events):
+        at = now - timedelta(minutes=(n * 43200) // events)
+        event_type = EVENT_TYPES[n % len(EVENT_TYPES)]
+        counts = {event_type: 1, TOTAL_AUDIT_EVENTS: 1}
+        if event_type == "PATIENT_CREATED":
+            counts[PATIENTS_CREATED] = 1
+        await projection.store.apply(hour_bucket(at), counts, {}, {
+            "id": str(n), "event_type": event_type, "action": "view", "outcome": "success",
+            "resource_type": "patient", "resource_id": str(n), "user_id": "clinician-1",
+            "timestamp": at.isoformat()
+        })
+    return projection
+
+
+async def dashboard_reads(projection):
+    await projection.get_counts(
+        ["USER_LOGIN_FAILED", "SECURITY_VIOLATION", "PHI_ACCESSED", "USER_CREATED", "USER_UPDATED",
+         TOTAL_AUDIT_EVENTS], 30 * 24
+    )
+    await projection.get_counts([PATIENTS_CREATED], 7 * 24)
+    await projection.get_counts(["USER_LOGIN_FAILED"], 24)
+    await projection.get_totals()
+    await projection.get_recent_activities(50, None, 24)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_projection_benchmark():
+    """Benchmark dashboard refresh reads against the number of events folded in."""
+    results = {}
+    for events in (1_000, 10_000, 100_000):
+        projection = await filled_projection(events)
+        started = time.perf_counter()
+        for _ in range(READ_ROUNDS):
+            await dashboard_reads(projection)
+        results[events] = (time.perf_counter() - started) * 1e6 / READ_ROUNDS
+
+    logger.info("Dashboard projection benchmark",
+               **{f"refresh_us_{events}_events": round(us, 1) for events, us in results.items()})
+    print(f"\nDashboard refresh reads ({READ_ROUNDS} rounds):")
+    for events, us in results.items():
+        print(f"  {events:>7,} events: {us:,.1f} us")
+
+    # Reads touch window buckets and the capped feed, not events
+    assert results[100_000] < results[1_000] * 3
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Event Codec Benchmark
+
+Publishes 5k patient-created events (override with
+EVENT_CODEC_BENCHMARK_EVENTS) one at a time through
+``HealthcareEventBus.publish_patient_created`` for each available codec. Events travel an in-process transport that encodes and decodes
+envelopes the way the Redis Streams transport does, and the event store
+append (payload dump and checksum) runs against a no-op session, so the
+measured path is publish, store, encode, decode and handler dispatch.
+
+Reports p50/p99 publish-to-handle latency, the envelope size and the
+encode + decode time per event for each codec.
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+import structlog
+
+from app.core.event_bus_advanced import EventHandler, EventTransport, HybridEventBus, deserialize_event
+from app.core.event_codec import available_codecs, get_event_codec
+from app.core.events.definitions import PatientCreated
+from app.core.events.event_bus import HealthcareEventBus
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+EVENTS = int(os.environ.get("EVENT_CODEC_BENCHMARK_EVENTS", "5000"))
+WARMUP = 200
+
+
+class NullSession:
+    """Accepts event store writes without a database."""
+
+    async def execute(self, statement):
+        return None
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class CodecLoopbackTransport(EventTransport):
+    """Encodes on send and decodes on delivery, like a network transport."""
+
+    name = "codec_loopback"
+
+    def __init__(self, codec):
+        self.codec = codec
+        self.queue = asyncio.Queue()
+        self.bytes_sent = 0
+        self.task = None
+
+    async def start(self, deliver):
+        async def consume():
+            while True:
+                data = await self.queue.get()
+                await deliver(deserialize_event(data))
+
+        self.task = asyncio.create_task(consume())
+
+    async def stop(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+    async def send(self, event):
+        data = event.encode(self.codec)
+        self.bytes_sent += len(data)
+        self.queue.put_nowait(data)
+        return True
+
+
+class LatencyHandler(EventHandler):
+    def __init__(self):
+        super().__init__("latency")
+        self.started = 0.0
+        self.latencies = []
+        self.handled = asyncio.Event()
+
+    async def handle(self, event):
+        self.latencies.append((time.perf_counter() - self.started) * 1000)
+        self.handled.set()
+        return True
+
+
+async def _run(codec_name, count):
+    transport = CodecLoopbackTransport(get_event_codec(codec_name))
+    hybrid_bus = HybridEventBus(NullSession, transport=transport)
+    hybrid_bus.outbox_relay.workers = 0
+    handler = LatencyHandler()
+    hybrid_bus.subscribe(handler)
+    bus = HealthcareEventBus(hybrid_bus)
+    await hybrid_bus.start()
+    try:
+        for n in range(count):
+            handler.handled.clear()
+            handler.started = time.perf_counter()
+            await bus.publish_patient_created(
+                patient_id=f"patient-{n}", created_by_user_id="clinician-7", mrn=f"MRN{n:08d}",
+                fhir_id=f"Patient/{n}", gender="female", birth_year=1980, consent_obtained=True
+            )
+            await asyncio.wait_for(handler.handled.wait(), 10)
+    finally:
+        await hybrid_bus.stop(timeout=1)
+    return handler.latencies, transport.bytes_sent / count
+
+
+def _codec_round_trip_us(codec_name, count):
+    codec = get_event_codec(codec_name)
+    events = [
+        PatientCreated(aggregate_id=f"patient-{n}", patient_id=f"patient-{n}", publisher="healthcare_records",
+                       created_by_user_id="clinician-7", mrn=f"MRN{n:08d}")
+        for n in range(count)
+    ]
+    started = time.perf_counter()
+    for event in events:
+        deserialize_event(event.encode(codec))
+    return (time.perf_counter() - started) * 1e6 / count
+
+
+@pytest.mark.asyncio
+async def test_event_codec_publish_to_handle_benchmark():
+    """Benchmark publish-to-handle latency of patient-created events per codec."""
+    results = {}
+    for codec_name in available_codecs():
+        await _run(codec_name, WARMUP)
+        latencies, envelope_bytes = await _run(codec_name, EVENTS)
+        quantiles = statistics.quantiles(latencies, n=100)
+        results[codec_name] = (quantiles[49], quantiles[98], envelope_bytes)
+    round_trip_us = {name: _codec_round_trip_us(name, EVENTS) for name in results}
+
+    logger.info(
+        "Event codec benchmark",
+        events=EVENTS,
+        **{f"{name}_p50_ms": round(p50, 4) for name, (p50, _, _) in results.items()},
+        **{f"{name}_p99_ms": round(p99, 4) for name, (_, p99, _) in results.items()},
+        **{f"{name}_envelope_bytes": round(size) for name, (_, _, size) in results.items()},
+        **{f"{name}_round_trip_us": round(us, 2) for name, us in round_trip_us.items()}
+    )
+    print(
+        f"\nEvent codecs ({EVENTS:,} patient-created events): "
+        + ", ".join(
+            f"{name} p50 {p50:.3f} ms / p99 {p99:.3f} ms / {size:.0f} B / "
+            f"encode+decode {round_trip_us[name]:.1f} us"
+            for name, (p50, p99, size) in results.items()
+        )
+    )
+
+    assert set(results) == set(available_codecs())
+    assert all(p99 > 0 for _, p99, _ in results.values())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Merkle Accumulator Benchmark
+
+Appends a 10M-entry audit log (override with MERKLE_BENCHMARK_ENTRIES) to
+the append-only Merkle accumulator in leaf-reader mode, where leaf hashes
+are recomputed on demand instead of held in memory. Reports append
+throughput per slice, which stays flat if appends are O(log n), the memory
+held by the accumulator and the latency of inclusion and consistency
+proofs at the full tree size.
+"""
+
+import os
+import time
+
+import pytest
+import structlog
+
+from app.core.audit_integrity_verification import (
+    MerkleAccumulator,
+    hash_merkle_leaf,
+    verify_consistency_proof,
+    verify_inclusion_proof,
+)
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ENTRIES = int(os.environ.get("MERKLE_BENCHMARK_ENTRIES", "10000000"))
+SLICES = 10
+
+
+def _leaf_hash(index: int) -> bytes:
+    return hash_merkle_leaf(f"audit-entry-{index}".encode())
+
+
+def _read_leaf_hashes(start: int, end: int) -> bytes:
+    return b"".join(_leaf_hash(i) for i in range(start, end))
+
+
+def test_merkle_accumulator_10m_entries_benchmark():
+    """Benchmark appends and proofs over a 10M-entry log."""
+    accumulator = MerkleAccumulator(tile_height=8, leaf_hash_reader=_read_leaf_hashes)
+    slice_size = ENTRIES // SLICES
+    slice_rates = []
+
+    for slice_index in range(SLICES):
+        start = time.perf_counter()
+        for i in range(slice_index * slice_size, (slice_index + 1) * slice_size):
+            accumulator.append_leaf_hash(_leaf_hash(i))
+        slice_rates.append(slice_size / (time.perf_counter() - start))
+
+    size = accumulator.size
+    root = accumulator.root()
+
+    leaf_index = size * 3 // 7
+    start = time.perf_counter()
+    inclusion = accumulator.inclusion_proof(leaf_index)
+    inclusion_ms = (time.perf_counter() - start) * 1000
+
+    old_size = size * 5 // 9
+    start = time.perf_counter()
+    consistency = accumulator.consistency_proof(old_size)
+    consistency_ms = (time.perf_counter() - start) * 1000
+    old_root = accumulator.root(old_size)
+
+    logger.info(
+        "Merkle accumulator benchmark",
+        entries=size,
+        first_slice_appends_per_second=round(slice_rates[0]),
+        last_slice_appends_per_second=round(slice_rates[-1]),
+        accumulator_bytes=accumulator.storage_bytes(),
+        inclusion_proof_ms=round(inclusion_ms, 2),
+        consistency_proof_ms=round(consistency_ms, 2)
+    )
+    print(
+        f"\nMerkle accumulator ({size:,} entries): "
+        f"{slice_rates[0]:,.0f} appends/s first slice, {slice_rates[-1]:,.0f} appends/s last slice, "
+        f"{accumulator.storage_bytes() / 1024:.0f} KiB held, "
+        f"inclusion proof {inclusion_ms:.2f} ms ({len(inclusion)} nodes), "
+        f"consistency proof {consistency_ms:.2f} ms ({len(consistency)} nodes)"
+    )
+
+    assert verify_inclusion_proof(_leaf_hash(leaf_index), leaf_index, size, inclusion, root)
+    assert verify_consistency_proof(old_size, size, old_root, root, consistency)
+    # O(log n) appends: throughput does not degrade as the log grows
+    assert slice_rates[-1] > slice_rates[0] * 0.5
+    # Sparse levels only: well under one hash per leaf
+    assert accumulator.storage_bytes() < size * 32 / 100
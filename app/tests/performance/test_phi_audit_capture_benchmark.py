@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+PHI Audit Capture Benchmark
+
+Drives a patient-read endpoint directly over ASGI (no network) 20k times
+(override with PHI_AUDIT_BENCHMARK_REQUESTS) in three configurations:
+
+- no PHI auditing (baseline)
+- PHIAuditMiddleware capturing into the ring buffer, drained by the
+  background writer
+- the same route enriching and persisting its audit event inline, as the
+  request path did before capture moved to the ring buffer
+
+Reports p50/p99 per-request latency and the p99 overhead of each audited
+configuration over the baseline.
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+import structlog
+from fastapi import FastAPI
+
+from app.core.phi_audit_capture import PHIAccessRecord, PHIAuditRingBuffer, PHIAuditWriter, build_phi_access_event
+from app.core.phi_audit_middleware import PHIAuditMiddleware
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+REQUESTS = int(os.environ.get("PHI_AUDIT_BENCHMARK_REQUESTS", "20000"))
+WARMUP = 500
+
+
+async def _persist(events):
+    # Stand-in for the audit pipeline: yields once, as a queue hand-off would
+    await asyncio.sleep(0)
+    return [True] * len(events)
+
+
+class InlineAuditMiddleware:
+    """Enriches and persists the audit event before the response completes."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
+        await self.app(scope, receive, send)
+        event = build_phi_access_event(PHIAccessRecord(
+            captured_at=time.time(), method=scope["method"], route_template=scope["route"].path_format,
+            path=scope["path"], principal=None, resource_id=scope["path_params"]["patient_id"],
+            status_code=200, duration_ms=(time.perf_counter() - started) * 1000, client_ip="10.0.0.7"
+        ))
+        await _persist([event])
+
+
+def _app(middleware=None, **options):
+    app = FastAPI()
+
+    @app.get("/api/v1/patients/{patient_id}")
+    async def get_patient(patient_id: str):
+        return {"id": patient_id}
+
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def _drive(app, requests):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    latencies = []
+    for n in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/api/v1/patients/p-{n % 1000}", "raw_path": b"", "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"test")], "client": ("10.0.0.7", 50000),
+            "server": ("test", 80)
+        }
+        started = time.perf_counter()
+        await app(scope, receive, send)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if n % 200 == 0:
+            await asyncio.sleep(0)  # let the background writer run
+    return latencies
+
+
+def _percentiles(latencies):
+    quantiles = statistics.quantiles(latencies, n=100)
+    return quantiles[49], quantiles[98]
+
+
+@pytest.mark.asyncio
+async def test_phi_audit_capture_p99_overhead_benchmark():
+    """Benchmark p99 request overhead of ring-buffer capture vs. inline auditing."""
+    buffer = PHIAuditRingBuffer(max(REQUESTS, 1000))
+    writer = PHIAuditWriter(buffer, persist=_persist, flush_interval_seconds=0.01)
+    await writer.start()
+
+    apps = {
+        "baseline": _app(),
+        "ring_buffer": _app(PHIAuditMiddleware, buffer=buffer),
+        "inline": _app(InlineAuditMiddleware),
+    }
+    results = {}
+    for name, app in apps.items():
+        await _drive(app, WARMUP)
+        results[name] = _percentiles(await _drive(app, REQUESTS))
+    await writer.stop()
+
+    baseline_p99 = results["baseline"][1]
+    capture_overhead = results["ring_buffer"][1] - baseline_p99
+    inline_overhead = results["inline"][1] - baseline_p99
+
+    logger.info(
+        "PHI audit capture benchmark",
+        requests=REQUESTS,
+        **{f"{name}_p50_ms": round(p50, 4) for name, (p50, _) in results.items()},
+        **{f"{name}_p99_ms": round(p99, 4) for name, (_, p99) in results.items()},
+        ring_buffer_p99_overhead_ms=round(capture_overhead, 4),
+        inline_p99_overhead_ms=round(inline_overhead, 4)
+    )
+    print(
+        f"\nPHI audit capture ({REQUESTS:,} requests): "
+        + ", ".join(f"{name} p50 {p50:.3f} ms / p99 {p99:.3f} ms" for name, (p50, p99) in results.items())
+        + f"; p99 overhead ring buffer {capture_overhead:.3f} ms, inline {inline_overhead:.3f} ms"
+    )
+
+    # Every audited request reached the writer
+    assert writer.stats["persisted"] == REQUESTS + WARMUP
+    assert buffer.stats["dropped"] == buffer.stats["rejected"] == 0
+    # Capture stays well under the cost of auditing inline
+    assert capture_overhead < inline_overhead
+    assert capture_overhead < 0.5
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+PHI Bulk Decryption Benchmark
+
+Compares the per-field decrypt() path used by patient search pages with the
+batched, thread-offloaded EncryptionService.decrypt_rows() path. The metric
+that matters for the API is how long the event loop is blocked while a page
+of patients is decrypted, so a ticker task measures the worst loop stall.
+
+Every row belongs to a different patient, as on a real search page, so each
+field has its own HKDF key and no two envelopes on the page share one.
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+import structlog
+
+from app.core.security import EncryptionService
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance]
+
+PAGE_SIZE = 200
+PHI_FIELDS = ["first_name", "last_name", "date_of_birth", "ssn"]
+
+
+async def _build_page(service: EncryptionService) -> List[SimpleNamespace]:
+    """Build a page of patient-like rows, one patient per row."""
+    rows = []
+    for i in range(PAGE_SIZE):
+        patient_id = str(uuid.uuid4())
+        values = {
+            "first_name": f"Patient{i}",
+            "last_name": f"Benchmark{i}",
+            "date_of_birth": "1985-06-15",
+            "ssn": f"{i:03d}-45-6789"
+        }
+        row = SimpleNamespace(id=i)
+        for field, value in values.items():
+            setattr(
+                row,
+                f"{field}_encrypted",
+                await service.encrypt(value, context={"field": field, "patient_id": patient_id})
+            )
+        rows.append(row)
+    return rows
+
+
+async def _max_loop_stall(coro) -> float:
+    """Run coro while sampling event loop responsiveness; return the worst stall in ms."""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            tick = time.perf_counter()
+            await asyncio.sleep(0)
+            stalls.append(time.perf_counter() - tick)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        await coro
+    finally:
+        done.set()
+        await ticker_task
+    return max(stalls, default=0.0) * 1000
+
+
+async def _per_field_path(service: EncryptionService, rows: List[SimpleNamespace]) -> None:
+    for row in rows:
+        for field in PHI_FIELDS:
+            setattr(row, field, await service.decrypt(getattr(row, f"{field}_encrypted")))
+
+
+async def _batched_path(service: EncryptionService, rows: List[SimpleNamespace]) -> None:
+    for row, values in zip(rows, await service.decrypt_rows(rows, PHI_FIELDS)):
+        for field, value in values.items():
+            setattr(row, field, value)
+
+
+@pytest.mark.asyncio
+async def test_bulk_decryption_vs_per_field_benchmark():
+    """Benchmark a 200-patient search page through both decryption paths."""
+    rows = await _build_page(EncryptionService())
+
+    # Fresh services so both paths start with a cold key cache
+    per_field_service = EncryptionService()
+    batched_service = EncryptionService()
+
+    start = time.perf_counter()
+    per_field_stall_ms = await _max_loop_stall(_per_field_path(per_field_service, rows))
+    per_field_ms = (time.perf_counter() - start) * 1000
+    per_field_values = [[getattr(row, f) for f in PHI_FIELDS] for row in rows]
+
+    start = time.perf_counter()
+    batched_stall_ms = await _max_loop_stall(_batched_path(batched_service, rows))
+    batched_ms = (time.perf_counter() - start) * 1000
+    batched_values = [[getattr(row, f) for f in PHI_FIELDS] for row in rows]
+
+    logger.info(
+        "PHI bulk decryption benchmark",
+        page_size=PAGE_SIZE,
+        fields=len(PHI_FIELDS),
+        per_field_total_ms=round(per_field_ms, 2),
+        per_field_max_loop_stall_ms=round(per_field_stall_ms, 2),
+        batched_total_ms=round(batched_ms, 2),
+        batched_max_loop_stall_ms=round(batched_stall_ms, 2)
+    )
+    print(
+        f"\nPHI decryption ({PAGE_SIZE} patients x {len(PHI_FIELDS)} fields): "
+        f"per-field {per_field_ms:.1f} ms (max loop stall {per_field_stall_ms:.1f} ms), "
+        f"batched {batched_ms:.1f} ms (max loop stall {batched_stall_ms:.1f} ms)"
+    )
+
+    assert batched_values == per_field_values
+    # Per-field decryption blocks the loop for the whole page; batched decryption
+    # only for about one cold PBKDF2 field master, which holds the GIL
+    assert batched_stall_ms < per_field_stall_ms * 0.5
+    # Moving work to the pool must not cost much more wall time than it saves
+    assert batched_ms < per_field_ms * 2
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Query Fan-Out Benchmark
+
+Times a dashboard-shaped set of independent reads - four aggregates taking
+10 to 40 ms, like the bulk dashboard refresh - run one after another on a
+single session and through fan_out() on per-query sessions.
+
+Sequential latency is the sum of the queries; fan-out latency should track
+the slowest one.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+import structlog
+
+from app.core.query_fanout import FanOutQuery, fan_out
+
+logger = structlog.get_logger()
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+QUERY_MS = {"patient_stats": 30, "security_summary": 40, "activities": 20, "alerts": 10}
+ROUNDS = 10
+
+
+@asynccontextmanager
+async def session_scope():
+    yield object()
+
+
+def aggregate(ms):
+    async def run(session):
+        await asyncio.sleep(ms / 1000)
+    return run
+
+
+@pytest.mark.asyncio
+async def test_query_fanout_benchmark():
+    """Benchmark sequential reads against fan_out for one dashboard refresh."""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        session = object()
+        for ms in QUERY_MS.values():
+            await aggregate(ms)(session)
+    sequential_ms = (time.perf_counter() - started) * 1000 / ROUNDS
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await fan_out([FanOutQuery(name, aggregate(ms)) for name, ms in QUERY_MS.items()],
+                      max_concurrency=4, session_scope=session_scope)
+    fanout_ms = (time.perf_counter() - started) * 1000 / ROUNDS
+
+    logger.info("Query fan-out benchmark", sequential_ms=round(sequential_ms, 1), fanout_ms=round(fanout_ms, 1))
+    print(f"\nDashboard refresh ({ROUNDS} rounds, queries {QUERY_MS}):")
+    print(f"  sequential: {sequential_ms:,.1f} ms")
+    print(f"  fan-out:    {fanout_ms:,.1f} ms")
+
+    # Bounded by the slowest query, not the sum
+    assert fanout_ms < sum(QUERY_MS.values()) * 0.75
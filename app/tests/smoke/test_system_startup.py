@@ -174,16 +174,14 @@ class TestSystemStartup:
         decrypted = await encryption_service.decrypt(encrypted)
         assert decrypted == test_phi, "Decryption failed"
         
-        # Verify it's the advanced AES-256-GCM format (base64 encoded JSON)
+        # Verify it's the compact AES-256-GCM binary envelope (base64 encoded once)
         import base64
-        import json
         try:
             decoded = base64.b64decode(encrypted)
-            parsed = json.loads(decoded)
-            assert parsed.get("version") == "v2", "Should use v2 encryption format"
-            assert parsed.get("algorithm") == "AES-256-GCM", "Should use AES-256-GCM"
-        except (json.JSONDecodeError, base64.binascii.Error):
-            pytest.fail("Encrypted data should be base64-encoded JSON")
+            assert decoded[0] == 0x03, "Should use v3 binary envelope format"
+            assert encryption_service.get_envelope_version(encrypted) == "v3"
+        except base64.binascii.Error:
+            pytest.fail("Encrypted data should be a base64-encoded envelope")
         
         print("✓ PHI encryption service verified")
     